@@ -0,0 +1,3 @@
+cdef extern from "divsufsort.h" nogil:
+
+    int divsufsort(const unsigned char *T, int *SA, int n)
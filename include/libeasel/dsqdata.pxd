@@ -1,4 +1,9 @@
-from libc.stdint cimport uint32_t, int32_t, int64_t
+from libc.stdint cimport uint32_t, uint64_t, int32_t, int64_t
+from libc.stdio cimport FILE
+
+from libeasel cimport ESL_DSQ
+from libeasel.alphabet cimport ESL_ALPHABET
+from libeasel.sqio cimport ESL_SQFILE
 
 cdef extern from "esl_dsqdata.h" nogil:
 
@@ -34,7 +39,7 @@ cdef extern from "esl_dsqdata.h" nogil:
 
 
     ctypedef esl_dsqdata_s ESL_DSQDATA
-    cdef esl_dsqdata_s:
+    cdef struct esl_dsqdata_s:
         char* basename
         FILE* stubfp
         FILE* ifp
@@ -48,9 +53,9 @@ cdef extern from "esl_dsqdata.h" nogil:
         uint32_t max_namelen
         uint32_t max_acclen
         uint32_t max_desclen
-        uint32_t max_seqlen
-        uint32_t nseq
-        uint32_t nres
+        uint64_t max_seqlen
+        uint64_t nseq
+        uint64_t nres
 
         int chunk_maxseq
         int chunk_maxpacket
@@ -60,26 +65,31 @@ cdef extern from "esl_dsqdata.h" nogil:
         int nconsumers
         int n_unpackers
 
-        ESL_DSQDATA_CHUNK*[eslDSQDATA_UMAX] inbox
-        pthread_mutex_t[eslDSQDATA_UMAX] outbox_mutex
-        pthread_cond_t[eslDSQDATA_UMAX] outbox_cv
-        int[eslDSQDATA_UMAX] outbox_eod
+        # ESL_DSQDATA_CHUNK* inbox[eslDSQDATA_UMAX]
+        # pthread_mutex_t inbox_mutex[eslDSQDATA_UMAX]
+        # pthread_cond_t inbox_cv[eslDSQDATA_UMAX]
+        # int inbox_eod[eslDSQDATA_UMAX]
+
+        # ESL_DSQDATA_CHUNK* outbox[eslDSQDATA_UMAX]
+        # pthread_mutex_t[eslDSQDATA_UMAX] outbox_mutex
+        # pthread_cond_t[eslDSQDATA_UMAX] outbox_cv
+        # int outbox_eod[eslDSQDATA_UMAX]
 
         int64_t nchunk
-        pthread_mutex_t nchunk_mutex
+        # pthread_mutex_t nchunk_mutex
 
         ESL_DSQDATA_CHUNK* recycling
-        pthread_mutex_t recycling_mutex
-        pthread_cond_t recycling_cv
+        # pthread_mutex_t recycling_mutex
+        # pthread_cond_t recycling_cv
 
         int go
-        pthread_mutex_t go_mutex
-        pthread_cond_t go_cv
+        # pthread_mutex_t go_mutex
+        # pthread_cond_t go_cv
 
-        pthread_t loader_t
-        pthread_t unpacker_t[eslDSQDATA_UMAX]
+        # pthread_t loader_t
+        # pthread_t unpacker_t[eslDSQDATA_UMAX]
 
-        char[eslERRBUFSIZE] errbuf
+        char* errbuf
 
 
     int  esl_dsqdata_Open   (ESL_ALPHABET **byp_abc, char *basename, int nconsumers, ESL_DSQDATA **ret_dd)
@@ -91,12 +91,12 @@ cdef extern from "esl_sqio.h":
     int  esl_sqfile_SetDigital(ESL_SQFILE *sqfp, const ESL_ALPHABET *abc) except -1
     int  esl_sqfile_GuessAlphabet(ESL_SQFILE *sqfp, int *ret_type) except -1
 
-    int   esl_sqio_Read        (ESL_SQFILE *sqfp, ESL_SQ *sq) except -1
+    int   esl_sqio_Read        (ESL_SQFILE *sqfp, ESL_SQ *sq) nogil except -1
     int   esl_sqio_ReadInfo    (ESL_SQFILE *sqfp, ESL_SQ *sq) except -1
     int   esl_sqio_ReadWindow  (ESL_SQFILE *sqfp, int C, int W, ESL_SQ *sq) except -1
     int   esl_sqio_ReadSequence(ESL_SQFILE *sqfp, ESL_SQ *sq) except -1
     int   esl_sqio_ReadBlock   (ESL_SQFILE *sqfp, ESL_SQ_BLOCK *sqBlock, int max_residues, int max_sequences, int max_init_window, int long_target) except -1
-    int   esl_sqio_Parse       (char *buffer, int size, ESL_SQ *s, int format) except -1
+    int   esl_sqio_Parse       (char *buffer, int size, ESL_SQ *s, int format) nogil except -1
 
     int   esl_sqio_Write       (FILE *fp, ESL_SQ *s, int format, int update)
     int   esl_sqio_Echo        (ESL_SQFILE *sqfp, const ESL_SQ *sq, FILE *ofp)
@@ -1,8 +1,58 @@
 from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t, int64_t
+from libc.stdio cimport FILE
 
 
 cdef extern from "hmmer.h" nogil:
 
+    cdef enum fm_alphabettypes_e:
+        fm_DNA = 0
+        fm_AMINO = 4
+
+    cdef enum fm_direction_e:
+        fm_forward = 0
+        fm_backward = 1
+
+    ctypedef struct FM_INTERVAL:
+        int lower
+        int upper
+
+    ctypedef struct FM_AMBIGLIST:
+        FM_INTERVAL* ranges
+        uint32_t     count
+        uint32_t     size
+
+    ctypedef struct FM_SEQDATA:
+        uint32_t target_id
+        uint64_t target_start
+        uint32_t fm_start
+        uint32_t length
+        uint16_t name_length
+        uint16_t source_length
+        uint16_t acc_length
+        uint16_t desc_length
+        char*    name
+        char*    source
+        char*    acc
+        char*    desc
+
+    ctypedef struct FM_METADATA:
+        uint8_t       fwd_only
+        uint8_t       alph_type
+        uint8_t       alph_size
+        uint8_t       charBits
+        uint32_t      freq_SA
+        uint32_t      freq_cnt_sb
+        uint32_t      freq_cnt_b
+        uint16_t      block_count
+        uint32_t      seq_count
+        uint64_t      char_count
+        char*         alph
+        char*         inv_alph
+        int*          compl_alph
+        FILE*         fp
+        FM_SEQDATA*   seq_data
+        FM_AMBIGLIST* ambig_list
+
     cdef struct fm_data_s:
         uint64_t N
         uint32_t term_loc
@@ -21,4 +71,30 @@ cdef extern from "hmmer.h" nogil:
     ctypedef fm_data_s FM_DATA
 
     ctypedef struct FM_CFG:
-        pass
+        int          occCallCnt
+        int          max_depth
+        float        drop_lim
+        int          drop_max_len
+        int          consec_pos_req
+        int          consensus_match_req
+        float        score_density_req
+        int          ssv_length
+        float        scthreshFM
+        float        sc_thresh_ratio
+        FM_METADATA* meta
+
+    # fm_alphabet.c
+    int fm_alphabetCreate(FM_METADATA *meta, uint8_t *alph_bits)
+    int fm_alphabetDestroy(FM_METADATA *meta)
+    int fm_reverseString(char *str, int N)
+
+    # fm_general.c
+    int fm_readFMmeta(FM_METADATA *meta)
+    int fm_FM_read(FM_DATA *fm, FM_METADATA *meta, int getAll)
+    void fm_FM_destroy(FM_DATA *fm, int isMainFM)
+    int fm_configAlloc(FM_CFG **cfg)
+    int fm_configDestroy(FM_CFG *cfg)
+    int fm_metaDestroy(FM_METADATA *meta)
+
+    # fm_sse.c
+    int fm_configInit(FM_CFG *cfg, void *go)
@@ -21,7 +21,7 @@ from . import easel
 from . import plan7
 from . import daemon
 
-from .hmmer import hmmalign, hmmsearch, hmmpress, nhmmer, phmmer
+from .hmmer import hmmalign, hmmbuild, hmmsearch, hmmscan, hmmpress, nhmmer, phmmer
 
 
 __author__ = "Martin Larralde <martin.larralde@embl.de>"
@@ -33,7 +33,9 @@ __all__ = [
     plan7.__name__,
     daemon.__name__,
     hmmalign.__name__,
+    hmmbuild.__name__,
     hmmsearch.__name__,
+    hmmscan.__name__,
     hmmpress.__name__,
     phmmer.__name__,
     nhmmer.__name__,
@@ -9,12 +9,15 @@ from posix.types cimport off_t
 cimport libeasel.sq
 from libeasel.alphabet cimport ESL_ALPHABET
 from libeasel.bitfield cimport ESL_BITFIELD
+from libeasel.dsqdata cimport ESL_DSQDATA, ESL_DSQDATA_CHUNK
+from libeasel.gencode cimport ESL_GENCODE, ESL_GENCODE_WORKSTATE
 from libeasel.keyhash cimport ESL_KEYHASH
 from libeasel.msa cimport ESL_MSA
 from libeasel.msafile cimport ESL_MSAFILE
 from libeasel.random cimport ESL_RANDOMNESS
 from libeasel.sq cimport ESL_SQ
 from libeasel.sqio cimport ESL_SQFILE
+from libeasel.sqio.ascii cimport ESL_SQASCII_DATA
 from libeasel.ssi cimport ESL_SSI, ESL_NEWSSI
 
 
@@ -155,6 +158,8 @@ cdef class MSAFile:
 
     cpdef MSA read(self)
     cpdef void close(self)
+    cdef bytes _next_line(self)
+    cdef void _check_stockholm(self) except *
 
 
 # --- Randomness -------------------------------------------------------------
@@ -196,20 +201,77 @@ cdef class DigitalSequence(Sequence):
     cpdef DigitalSequence reverse_complement(self, bint inplace=*)
 
 
+# --- Genetic Code -----------------------------------------------------------
+
+cdef class GeneticCode:
+    cdef ESL_GENCODE*      _gcode
+    cdef readonly Alphabet nucleotide_alphabet
+    cdef readonly Alphabet amino_alphabet
+
+    cdef ESL_GENCODE_WORKSTATE* _new_workstate(self, int min_length) except NULL
+    cpdef DigitalSequence translate(self, DigitalSequence sequence)
+    cpdef list orfs(self, object sequences, int min_length=*, str strand=*)
+
+
 # --- Sequence File ----------------------------------------------------------
 
 cdef class SequenceFile:
     cdef          ESL_SQFILE* _sqfp
     cdef          object      _file
     cdef readonly Alphabet    alphabet
+    # the worker threads used to parse blocks of sequences in parallel
+    cdef          object      _executor
+    cdef          int         _executor_threads
 
     @staticmethod
     cdef ESL_SQFILE* _open_fileobj(object fh, int fmt) except NULL
+    @staticmethod
+    cdef int _parse_records(
+        char* mem,
+        const off_t* bounds,
+        ESL_SQ** sqs,
+        size_t length,
+        off_t start,
+        size_t* failed,
+    ) nogil
+    @staticmethod
+    cdef int64_t _count_lines(const char* mem, size_t length) nogil
     cdef Alphabet guess_alphabet(self)
+    cdef Sequence _new_sequence(self)
+    cdef ssize_t _read_block(
+        self,
+        list block,
+        ssize_t max_sequences,
+        int64_t max_residues,
+        int threads,
+    ) except -1
+    cdef int _parse_error(self, off_t offset, int64_t linenumber) except 1
+    cdef bint _parallel_readable(self)
+    cdef ESL_SQASCII_DATA* _indexable(self) except NULL
 
     cpdef void close(self)
     cpdef Sequence read(self, bint skip_info=*, bint skip_sequence=*)
     cpdef Sequence readinto(self, Sequence, bint skip_info=*, bint skip_sequence=*)
+    cpdef void open_index(self, object index=*) except *
+    cpdef Sequence fetch(self, bytes key)
+    cpdef list fetch_many(self, object keys)
+    cpdef Sequence fetch_subsequence(self, bytes key, int64_t start, int64_t end=*)
+
+
+# --- Sequence Database ------------------------------------------------------
+
+cdef class DigitalSequenceDatabase:
+    cdef          ESL_DSQDATA*       _dd
+    cdef          ESL_DSQDATA_CHUNK* _chunk
+    cdef          int                _index
+    cdef readonly Alphabet           alphabet
+
+    cdef DigitalSequence _chunk_sequence(self, int index)
+    cdef int _stop(self) nogil except 1
+
+    cpdef void close(self) except *
+    cpdef DigitalSequence read(self)
+    cpdef list read_chunk(self)
 
 
 # --- Sequence/Subsequence Index ---------------------------------------------
@@ -440,6 +440,9 @@ class MSAFile(typing.ContextManager[MSAFile], typing.Iterator[MSA]):
     def format(self) -> str: ...
     def read(self) -> typing.Optional[MSA]: ...
     def close(self) -> None: ...
+    def read_sequences(self) -> typing.Optional[typing.Iterator[Sequence]]: ...
+    def scan(self) -> typing.List[typing.Tuple[typing.Optional[bytes], int]]: ...
+    def seek(self, offset: int) -> None: ...
 
 # --- Randomness -------------------------------------------------------------
 
@@ -468,6 +471,8 @@ class Sequence(typing.Sized, abc.ABC):
     def __copy__(self) -> Sequence: ...
     def __len__(self) -> int: ...
     def __eq__(self, other: object) -> bool: ...
+    def __getstate__(self) -> typing.Dict[str, object]: ...
+    def __setstate__(self, state: typing.Dict[str, object]) -> None: ...
     @property
     def accession(self) -> bytes: ...
     @accession.setter
@@ -546,6 +551,31 @@ class DigitalSequence(Sequence):
         self, inplace: Literal[False] = False
     ) -> DigitalSequence: ...
 
+# --- Genetic Code -----------------------------------------------------------
+
+class GeneticCode(object):
+    nucleotide_alphabet: Alphabet
+    amino_alphabet: Alphabet
+    def __init__(
+        self,
+        translation_table: int = 1,
+        *,
+        nucleotide_alphabet: typing.Optional[Alphabet] = None,
+        amino_alphabet: typing.Optional[Alphabet] = None,
+    ) -> None: ...
+    def __repr__(self) -> str: ...
+    @property
+    def translation_table(self) -> int: ...
+    @property
+    def description(self) -> str: ...
+    def translate(self, sequence: DigitalSequence) -> DigitalSequence: ...
+    def orfs(
+        self,
+        sequences: typing.Iterable[DigitalSequence],
+        min_length: int = 20,
+        strand: typing.Optional[Literal["watson", "crick"]] = None,
+    ) -> typing.List[DigitalSequence]: ...
+
 # --- Sequence File ----------------------------------------------------------
 
 class SequenceFile(typing.ContextManager[SequenceFile], typing.Iterator[Sequence]):
@@ -588,7 +618,62 @@ class SequenceFile(typing.ContextManager[SequenceFile], typing.Iterator[Sequence
     def readinto(
         self, seq: Sequence, skip_info: bool = False, skip_sequence: bool = False
     ) -> typing.Optional[Sequence]: ...
+    def read_block(
+        self,
+        sequences: typing.Optional[int] = None,
+        residues: typing.Optional[int] = None,
+        threads: int = 1,
+    ) -> typing.List[Sequence]: ...
+    def readinto_block(
+        self,
+        block: typing.List[Sequence],
+        residues: typing.Optional[int] = None,
+        threads: int = 1,
+    ) -> int: ...
+    def open_index(
+        self, index: typing.Union[str, bytes, os.PathLike[str], None] = None
+    ) -> None: ...
+    def build_index(
+        self,
+        index: typing.Union[str, bytes, os.PathLike[str], None] = None,
+        exclusive: bool = False,
+    ) -> str: ...
+    def fetch(self, key: bytes) -> Sequence: ...
+    def fetch_many(self, keys: typing.Iterable[bytes]) -> typing.List[Sequence]: ...
+    def fetch_subsequence(self, key: bytes, start: int, end: int = 0) -> Sequence: ...
+    def close(self) -> None: ...
+
+# --- Sequence Database ------------------------------------------------------
+
+class DigitalSequenceDatabase(
+    typing.ContextManager[DigitalSequenceDatabase], typing.Iterator[DigitalSequence]
+):
+    alphabet: Alphabet
+    def __init__(
+        self,
+        file: typing.Union[typing.AnyStr, os.PathLike[typing.AnyStr]],
+        alphabet: typing.Optional[Alphabet] = None,
+    ) -> None: ...
+    def __enter__(self) -> DigitalSequenceDatabase: ...
+    def __exit__(
+        self,
+        exc_type: typing.Optional[typing.Type[BaseException]],
+        exc_value: typing.Optional[BaseException],
+        traceback: typing.Optional[types.TracebackType],
+    ) -> bool: ...
+    def __iter__(self) -> DigitalSequenceDatabase: ...
+    def __next__(self) -> DigitalSequence: ...
+    def __len__(self) -> int: ...
+    @property
+    def closed(self) -> bool: ...
     def close(self) -> None: ...
+    def read(self) -> typing.Optional[DigitalSequence]: ...
+    def read_chunk(self) -> typing.Optional[typing.List[DigitalSequence]]: ...
+    @staticmethod
+    def write(
+        sequences: SequenceFile,
+        file: typing.Union[typing.AnyStr, os.PathLike[typing.AnyStr]],
+    ) -> None: ...
 
 # --- Sequence/Subsequence Index ---------------------------------------------
 
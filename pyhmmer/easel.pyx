@@ -29,14 +29,17 @@ from cpython.ref cimport Py_INCREF
 from cpython.tuple cimport PyTuple_New, PyTuple_SET_ITEM
 from cpython.unicode cimport PyUnicode_DecodeASCII
 from libc.stdint cimport int32_t, int64_t, uint8_t, uint16_t, uint32_t, uint64_t
-from libc.stdio cimport fclose
+from libc.stdio cimport fclose, fread, fseek, SEEK_SET, SEEK_END
 from libc.stdlib cimport calloc, malloc, realloc, free
-from libc.string cimport memcmp, memcpy, memmove, strdup, strlen, strncpy
+from libc.string cimport memchr, memcmp, memcpy, memmove, memset, strdup, strlen, strncmp, strncpy
+from posix.stdio cimport fseeko
 from posix.types cimport off_t
 
 cimport libeasel
 cimport libeasel.alphabet
 cimport libeasel.bitfield
+cimport libeasel.dsqdata
+cimport libeasel.gencode
 cimport libeasel.buffer
 cimport libeasel.keyhash
 cimport libeasel.matrixops
@@ -50,7 +53,9 @@ cimport libeasel.ssi
 cimport libeasel.vec
 from libeasel cimport ESL_DSQ, esl_pos_t
 from libeasel.buffer cimport ESL_BUFFER
-from libeasel.sq cimport ESL_SQ
+from libeasel.sq cimport ESL_SQ, ESL_SQ_BLOCK
+from libeasel.alphabet cimport ESL_ALPHABET
+from libeasel.gencode cimport ESL_GENCODE, ESL_GENCODE_WORKSTATE
 from libeasel.sqio cimport ESL_SQFILE, ESL_SQASCII_DATA
 from libeasel.random cimport ESL_RANDOMNESS
 
@@ -93,6 +98,7 @@ import array
 import io
 import os
 import collections
+import concurrent.futures
 import pickle
 import sys
 import warnings
@@ -3913,8 +3919,17 @@ cdef class MSAFile:
         Close the file and free the resources used by the parser.
 
         """
+        cdef FILE* fp = NULL
+
+        # the stream wrapping a file-like object is not closed by Easel,
+        # since it is owned by the caller
+        if self._msaf != NULL and self._msaf.bf.mode_is == libeasel.buffer.eslBUFFER_STREAM:
+            if not isinstance(self._file, (str, bytes, os.PathLike)):
+                fp = self._msaf.bf.fp
         libeasel.msafile.esl_msafile_Close(self._msaf)
         self._msaf = NULL
+        if fp != NULL:
+            fclose(fp)
 
     cpdef MSA read(self):
         """read(self)\n--
@@ -3952,6 +3967,238 @@ cdef class MSAFile:
         else:
             raise UnexpectedError(status, "esl_msafile_Read")
 
+    def read_sequences(self):
+        """read_sequences(self)\n--
+
+        Read the sequences of the next alignment one at a time.
+
+        Unlike `MSAFile.read`, this method does not store the whole
+        alignment in memory, and only keeps the sequence currently being
+        read. It is only supported for alignments in Stockholm format
+        where each sequence fits on a single line, such as the alignments
+        distributed by Pfam.
+
+        Returns:
+            iterator of `Sequence`: An iterator over the sequences of the
+            next alignment in the file, without gaps, or `None` if all the
+            alignments were read from the file already. Sequences are
+            returned in digital mode if the file is in digital mode.
+
+        Raises:
+            `ValueError`: When attempting to read from a closed file,
+                when the file is not in Stockholm format, or when the
+                file could not be parsed. The iterator also raises a
+                `ValueError` when it finds a sequence split across several
+                blocks of the alignment.
+
+        Example:
+            >>> with MSAFile("tests/data/msa/LuxC.sto") as msa_file:
+            ...     for seq in msa_file.read_sequences():
+            ...         if seq.name.startswith(b"Q2WLE3"):
+            ...             print(seq.name, seq.accession)
+            b'Q2WLE3_CLOBE/35-425' b'Q2WLE3.1'
+
+        Hint:
+            The iterator must be exhausted before reading the next
+            alignment from the file.
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef bytes line
+
+        if self._msaf == NULL:
+            raise ValueError("I/O operation on closed file.")
+        self._check_stockholm()
+
+        # find the header of the next alignment
+        line = self._next_line()
+        while line is not None and not line.strip():
+            line = self._next_line()
+        if line is None:
+            return None
+        if not line.startswith(b"# STOCKHOLM 1."):
+            raise ValueError("Could not parse file: missing Stockholm header")
+
+        def sequences():
+            cdef bytes        line
+            cdef bytes        name
+            cdef bytes        aligned
+            cdef list         fields
+            cdef dict         attributes
+            cdef dict         annotations = {}
+            cdef set          seen        = set()
+            cdef TextSequence seq
+
+            while True:
+                line = self._next_line()
+                if line is None:
+                    raise ValueError("Could not parse file: missing alignment terminator")
+                elif line.startswith(b"//"):
+                    return
+                elif line.startswith(b"#=GS"):
+                    # keep the accession and description of the sequences
+                    # until the sequences are read
+                    fields = line.split(None, 3)
+                    if len(fields) == 4 and fields[2] in (b"AC", b"DE"):
+                        annotations.setdefault(fields[1], {})[fields[2]] = fields[3].strip()
+                elif not line.startswith(b"#") and line.strip():
+                    fields = line.split()
+                    if len(fields) != 2:
+                        raise ValueError(f"Could not parse file: invalid sequence line {line[:20]!r}")
+                    name, aligned = fields
+                    if name in seen:
+                        raise ValueError("Could not parse file: sequences spanning several blocks cannot be read incrementally")
+                    seen.add(name)
+                    attributes = annotations.pop(name, {})
+                    seq = TextSequence(
+                        name=name,
+                        accession=attributes.get(b"AC"),
+                        description=attributes.get(b"DE"),
+                        sequence=aligned.translate(None, b"-_.~").decode("ascii"),
+                    )
+                    yield seq if self.alphabet is None else seq.digitize(self.alphabet)
+
+        return sequences()
+
+    def scan(self):
+        """scan(self)\n--
+
+        Scan the remaining alignments of the file without parsing them.
+
+        Returns:
+            `list` of `tuple`: A list of ``(name, offset)`` pairs for each
+            remaining alignment in the file, where ``name`` is the
+            identifier of the alignment (or `None` if the alignment does
+            not have an ``ID`` line), and ``offset`` is the position of
+            the alignment, which can be passed to `MSAFile.seek`.
+
+        Raises:
+            `ValueError`: When attempting to scan a closed file, or when
+                the file is not in Stockholm format.
+
+        Example:
+            >>> with MSAFile("tests/data/msa/LuxC.sto") as msa_file:
+            ...     entries = msa_file.scan()
+            ...     msa_file.seek(entries[0][1])
+            ...     msa = msa_file.read()
+            >>> entries
+            [(b'LuxC', 0)]
+            >>> msa.name
+            b'LuxC'
+
+        Hint:
+            The position of the file is restored after the scan, so the
+            alignments can be read afterwards. When reading from a
+            file-like object, the remaining contents of the file are
+            kept in memory until the end of the scan.
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef int       status
+        cdef char*     p
+        cdef esl_pos_t n
+        cdef esl_pos_t start
+        cdef int64_t   linenumber
+        cdef esl_pos_t offset      = -1
+        cdef object    name        = None
+        cdef list      entries     = []
+
+        if self._msaf == NULL:
+            raise ValueError("I/O operation on closed file.")
+        self._check_stockholm()
+
+        start = libeasel.buffer.esl_buffer_GetOffset(self._msaf.bf)
+        linenumber = self._msaf.linenumber
+
+        # streams cannot be rewound, so make the buffer keep the data
+        # read from the starting position
+        anchored = (
+            self._msaf.bf.mode_is == libeasel.buffer.eslBUFFER_STREAM
+            or self._msaf.bf.mode_is == libeasel.buffer.eslBUFFER_CMDPIPE
+        )
+        if anchored:
+            status = libeasel.buffer.esl_buffer_SetAnchor(self._msaf.bf, start)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_buffer_SetAnchor")
+
+        try:
+            while True:
+                status = libeasel.msafile.esl_msafile_GetLine(self._msaf, &p, &n)
+                if status == libeasel.eslEOF:
+                    break
+                elif status != libeasel.eslOK:
+                    raise UnexpectedError(status, "esl_msafile_GetLine")
+                # only inspect the lines that start an alignment, give its
+                # name, or end an alignment
+                if n >= 11 and strncmp(p, b"# STOCKHOLM", 11) == 0:
+                    offset = self._msaf.lineoffset
+                    name = None
+                elif n > 4 and strncmp(p, b"#=GF", 4) == 0:
+                    fields = p[:n].split(None, 2)
+                    if len(fields) == 3 and fields[1] == b"ID":
+                        name = fields[2].strip()
+                elif n >= 2 and strncmp(p, b"//", 2) == 0 and offset >= 0:
+                    entries.append((name, offset))
+                    offset = -1
+            self.seek(start)
+            self._msaf.linenumber = linenumber
+        finally:
+            if anchored:
+                libeasel.buffer.esl_buffer_RaiseAnchor(self._msaf.bf, start)
+
+        return entries
+
+    def seek(self, object offset):
+        """seek(self, offset)\n--
+
+        Move to the alignment starting at the given position in the file.
+
+        Arguments:
+            offset (`int`): The position of the beginning of an alignment
+                in the file, such as returned by `MSAFile.scan`.
+
+        Raises:
+            `ValueError`: When attempting to seek a closed file, or when
+                ``offset`` is negative.
+            `io.UnsupportedOperation`: When the file is not seekable.
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef int status
+
+        if self._msaf == NULL:
+            raise ValueError("I/O operation on closed file.")
+        if offset < 0:
+            raise ValueError(f"`offset` must be positive or null, got {offset!r}")
+
+        status = libeasel.buffer.esl_buffer_SetOffset(self._msaf.bf, offset)
+        if status == libeasel.eslEINVAL:
+            raise io.UnsupportedOperation("cannot seek in a non-seekable stream")
+        elif status != libeasel.eslOK:
+            raise UnexpectedError(status, "esl_buffer_SetOffset")
+        # line numbers are lost after positioning, like in `esl_msafile_PositionByKey`
+        self._msaf.linenumber = -1
+
+    cdef bytes _next_line(self):
+        cdef int       status
+        cdef char*     p
+        cdef esl_pos_t n
+
+        status = libeasel.msafile.esl_msafile_GetLine(self._msaf, &p, &n)
+        if status == libeasel.eslOK:
+            return p[:n]
+        elif status == libeasel.eslEOF:
+            return None
+        else:
+            raise UnexpectedError(status, "esl_msafile_GetLine")
+
+    cdef void _check_stockholm(self) except *:
+        if self._msaf.format != libeasel.msafile.eslMSAFILE_STOCKHOLM and self._msaf.format != libeasel.msafile.eslMSAFILE_PFAM:
+            raise ValueError(f"Unsupported format for incremental reading: {self.format!r}")
+
 
 # --- Randomness -------------------------------------------------------------
 
@@ -4187,6 +4434,12 @@ cdef class Sequence:
     def __copy__(self):
         return self.copy()
 
+    def __getstate__(self):
+        return {"residue_markups": self.residue_markups}
+
+    def __setstate__(self, dict state):
+        self.residue_markups = state["residue_markups"]
+
     # --- Properties ---------------------------------------------------------
 
     @property
@@ -4484,6 +4737,16 @@ cdef class TextSequence(Sequence):
         assert self._sq.desc != NULL
         assert self._sq.acc != NULL
 
+    def __reduce__(self):
+        return TextSequence, (
+            self.name,
+            self.description,
+            self.accession,
+            self.sequence,
+            self.source,
+            self.taxonomy_id,
+        ), self.__getstate__()
+
     # --- Properties ---------------------------------------------------------
 
     @property
@@ -4688,6 +4951,18 @@ cdef class DigitalSequence(Sequence):
         assert self._sq.desc != NULL
         assert self._sq.acc != NULL
 
+    def __reduce__(self):
+        assert self._sq != NULL
+        return DigitalSequence, (
+            self.alphabet,
+            self.name,
+            self.description,
+            self.accession,
+            PyBytes_FromStringAndSize(<char*> &self._sq.dsq[1], self._sq.n),
+            self.source,
+            self.taxonomy_id,
+        ), self.__getstate__()
+
     # --- Properties ---------------------------------------------------------
 
     @property
@@ -4815,6 +5090,355 @@ cdef class DigitalSequence(Sequence):
         return None if inplace else rc
 
 
+# --- Genetic Code -----------------------------------------------------------
+
+cdef class GeneticCode:
+    """A genetic code table, used to translate nucleotide sequences.
+
+    The translation tables are identified by their ``transl_table`` number
+    in the `NCBI Genetic Codes <https://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi>`_
+    list, e.g. ``1`` for the standard code or ``11`` for the bacterial,
+    archaeal and plant plastid code.
+
+    Attributes:
+        nucleotide_alphabet (`Alphabet`, *readonly*): The alphabet of the
+            nucleotide sequences to translate.
+        amino_alphabet (`Alphabet`, *readonly*): The alphabet of the
+            protein sequences obtained from a translation.
+
+    Example:
+        >>> gencode = GeneticCode(11)
+        >>> gencode.translation_table
+        11
+        >>> gencode.description
+        'Bacterial, archaeal; and plant plastid'
+
+    .. versionadded:: 0.7.0
+
+    """
+
+    # --- Magic methods ------------------------------------------------------
+
+    def __cinit__(self):
+        self._gcode = NULL
+        self.nucleotide_alphabet = None
+        self.amino_alphabet = None
+
+    def __dealloc__(self):
+        libeasel.gencode.esl_gencode_Destroy(self._gcode)
+
+    def __init__(
+        self,
+        int translation_table = 1,
+        *,
+        Alphabet nucleotide_alphabet = None,
+        Alphabet amino_alphabet = None,
+    ):
+        """__init__(self, translation_table=1, *, nucleotide_alphabet=None, amino_alphabet=None)\n--
+
+        Create a new genetic code for the given translation table.
+
+        Arguments:
+            translation_table (`int`): The NCBI identifier of the
+                translation table to use.
+            nucleotide_alphabet (`Alphabet`, optional): The alphabet of
+                the nucleotide sequences to translate. Defaults to
+                `Alphabet.dna`.
+            amino_alphabet (`Alphabet`, optional): The alphabet of the
+                translated sequences. Defaults to `Alphabet.amino`.
+
+        Raises:
+            `ValueError`: When ``translation_table`` is not a known NCBI
+                translation table, or when the alphabets are not a
+                nucleotide and a protein alphabet, respectively.
+
+        """
+        cdef int status
+
+        if nucleotide_alphabet is None:
+            nucleotide_alphabet = Alphabet.dna()
+        elif not nucleotide_alphabet.is_nucleotide():
+            raise ValueError(f"Expected nucleotide alphabet, found {nucleotide_alphabet!r}")
+        if amino_alphabet is None:
+            amino_alphabet = Alphabet.amino()
+        elif not amino_alphabet.is_amino():
+            raise ValueError(f"Expected amino alphabet, found {amino_alphabet!r}")
+
+        # support calling __init__ multiple times
+        libeasel.gencode.esl_gencode_Destroy(self._gcode)
+        self._gcode = libeasel.gencode.esl_gencode_Create(
+            nucleotide_alphabet._abc,
+            amino_alphabet._abc,
+        )
+        if self._gcode == NULL:
+            raise AllocationError("ESL_GENCODE", sizeof(ESL_GENCODE))
+        self.nucleotide_alphabet = nucleotide_alphabet
+        self.amino_alphabet = amino_alphabet
+
+        status = libeasel.gencode.esl_gencode_Set(self._gcode, translation_table)
+        if status == libeasel.eslENOTFOUND:
+            raise ValueError(f"Invalid translation table: {translation_table!r}")
+        elif status != libeasel.eslOK:
+            raise UnexpectedError(status, "esl_gencode_Set")
+        # ORFs are extracted between stop codons, like `esl-translate` does
+        # by default, so any codon other than a stop codon is an initiator
+        libeasel.gencode.esl_gencode_SetInitiatorAny(self._gcode)
+
+    def __repr__(self):
+        assert self._gcode != NULL
+
+        cdef str ty = type(self).__name__
+        return f"{ty}({self._gcode.transl_table!r})"
+
+    # --- Properties ---------------------------------------------------------
+
+    @property
+    def translation_table(self):
+        """`int`: The NCBI identifier of the translation table.
+        """
+        assert self._gcode != NULL
+        return self._gcode.transl_table
+
+    @property
+    def description(self):
+        """`str`: A description of the translation table.
+        """
+        assert self._gcode != NULL
+        return self._gcode.desc.decode('ascii')
+
+    # --- Utils --------------------------------------------------------------
+
+    cdef ESL_GENCODE_WORKSTATE* _new_workstate(self, int min_length) except NULL:
+        # NB: `esl_gencode_WorkstateCreate` reads its configuration from
+        #     the command line options of `esl-translate`, so the workstate
+        #     is initialized here in the same way
+        cdef int                    f
+        cdef ESL_GENCODE_WORKSTATE* wrk
+
+        wrk = <ESL_GENCODE_WORKSTATE*> calloc(1, sizeof(ESL_GENCODE_WORKSTATE))
+        if wrk == NULL:
+            raise AllocationError("ESL_GENCODE_WORKSTATE", sizeof(ESL_GENCODE_WORKSTATE))
+
+        for f in range(3):
+            wrk.psq[f] = libeasel.sq.esl_sq_CreateDigital(self.amino_alphabet._abc)
+            if wrk.psq[f] == NULL:
+                libeasel.gencode.esl_gencode_WorkstateDestroy(wrk)
+                raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+            wrk.psq[f].dsq[0] = libeasel.eslDSQ_SENTINEL
+            wrk.in_orf[f] = False
+
+        # the ORFs are collected in a block instead of being written to a file
+        wrk.orf_block = libeasel.sq.esl_sq_CreateDigitalBlock(128, self.amino_alphabet._abc)
+        if wrk.orf_block == NULL:
+            libeasel.gencode.esl_gencode_WorkstateDestroy(wrk)
+            raise AllocationError("ESL_SQ_BLOCK", sizeof(ESL_SQ_BLOCK))
+
+        wrk.apos = 1
+        wrk.frame = 0
+        wrk.codon = 0
+        wrk.inval = 0
+        wrk.is_revcomp = False
+        wrk.orfcount = 0
+        wrk.do_watson = True
+        wrk.do_crick = True
+        wrk.using_initiators = False
+        wrk.minlen = min_length
+        wrk.outfp = NULL
+        wrk.outformat = libeasel.sqio.eslSQFILE_FASTA
+
+        return wrk
+
+    # --- Methods ------------------------------------------------------------
+
+    cpdef DigitalSequence translate(self, DigitalSequence sequence):
+        """translate(self, sequence)\n--
+
+        Translate a nucleotide sequence into a protein sequence.
+
+        Arguments:
+            sequence (`DigitalSequence`): The nucleotide sequence to
+                translate, starting with the first nucleotide of the
+                first codon.
+
+        Returns:
+            `DigitalSequence`: The translated sequence, with the same
+            name, accession and description as ``sequence``. Stop codons
+            are translated to ``*`` symbols.
+
+        Raises:
+            `~pyhmmer.errors.AlphabetMismatch`: When the sequence alphabet
+                is not the nucleotide alphabet of the genetic code.
+            `ValueError`: When the length of the sequence is not a
+                multiple of 3.
+
+        Example:
+            >>> gencode = GeneticCode()
+            >>> dna = TextSequence(sequence="ATGCCGTAA").digitize(gencode.nucleotide_alphabet)
+            >>> gencode.translate(dna).textize().sequence
+            'MP*'
+
+        """
+        assert self._gcode != NULL
+        assert sequence._sq != NULL
+
+        cdef int64_t         i
+        cdef int64_t         n
+        cdef int             status
+        cdef ESL_SQ*         src    = sequence._sq
+        cdef DigitalSequence protein
+
+        if not self.nucleotide_alphabet._eq(sequence.alphabet):
+            raise AlphabetMismatch(self.nucleotide_alphabet, sequence.alphabet)
+        if src.n % 3 != 0:
+            raise ValueError(f"Sequence length is not a multiple of 3: {src.n!r}")
+
+        protein = DigitalSequence.__new__(DigitalSequence, self.amino_alphabet)
+        protein._sq = libeasel.sq.esl_sq_CreateDigital(self.amino_alphabet._abc)
+        if protein._sq == NULL:
+            raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+
+        n = src.n // 3
+        with nogil:
+            status = libeasel.sq.esl_sq_GrowTo(protein._sq, n)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_sq_GrowTo")
+            # translate each codon, handling degenerate nucleotides
+            for i in range(n):
+                protein._sq.dsq[i+1] = libeasel.gencode.esl_gencode_GetTranslation(self._gcode, &src.dsq[3*i+1])
+            protein._sq.dsq[0] = protein._sq.dsq[n+1] = libeasel.eslDSQ_SENTINEL
+            # set the coor bookkeeping like it would happen
+            protein._sq.start = 1
+            protein._sq.C = 0
+            protein._sq.end = protein._sq.W = protein._sq.L = protein._sq.n = n
+            # copy the sequence metadata
+            status = libeasel.sq.esl_sq_SetName(protein._sq, src.name)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_sq_SetName")
+            status = libeasel.sq.esl_sq_SetAccession(protein._sq, src.acc)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_sq_SetAccession")
+            status = libeasel.sq.esl_sq_SetDesc(protein._sq, src.desc)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_sq_SetDesc")
+
+        return protein
+
+    cpdef list orfs(self, object sequences, int min_length=20, str strand=None):
+        """orfs(self, sequences, min_length=20, strand=None)\n--
+
+        Extract the open reading frames of nucleotide sequences.
+
+        The ORFs are extracted in the six reading frames of each sequence,
+        between two stop codons, in the same way as ``esl-translate`` does
+        by default.
+
+        Arguments:
+            sequences (iterable of `DigitalSequence`): The nucleotide
+                sequences to extract the ORFs from. Sequences are only
+                read once, so an open `SequenceFile` can be given to
+                process a file without loading all of it in memory.
+            min_length (`int`): The minimum length of the ORFs to report,
+                in amino acids.
+            strand (`str`, optional): The strand to extract the ORFs from,
+                either ``"watson"`` or ``"crick"``, or `None` to use
+                both strands.
+
+        Returns:
+            `list` of `DigitalSequence`: The translated ORFs. ORFs are
+            named ``orf1``, ``orf2``, etc., with their ``source`` set to
+            the name of the nucleotide sequence they were extracted from.
+            Their ``description`` records the source coordinates and
+            frame of the ORF, in ``esl-translate`` format, e.g.
+            ``source=seq1 coords=4..63 length=20 frame=1 desc=``. ORFs
+            extracted from the reverse strand have their start coordinate
+            greater than their end coordinate.
+
+        Raises:
+            `~pyhmmer.errors.AlphabetMismatch`: When a sequence alphabet
+                is not the nucleotide alphabet of the genetic code.
+            `ValueError`: When ``min_length`` is negative, or ``strand``
+                is not a valid strand.
+
+        """
+        assert self._gcode != NULL
+
+        cdef size_t                 i
+        cdef int                    status
+        cdef ESL_SQ                 window
+        cdef DigitalSequence        seq
+        cdef DigitalSequence        rc
+        cdef DigitalSequence        orf
+        cdef ESL_GENCODE_WORKSTATE* wrk
+        cdef ESL_SQ_BLOCK*          block
+        cdef list                   orfs   = []
+
+        if min_length < 0:
+            raise ValueError(f"`min_length` must be a positive integer or zero, got {min_length!r}")
+
+        wrk = self._new_workstate(min_length)
+        block = wrk.orf_block
+        try:
+            if strand == "watson":
+                wrk.do_crick = False
+            elif strand == "crick":
+                wrk.do_watson = False
+            elif strand is not None:
+                raise ValueError(f"invalid strand: {strand!r}")
+
+            for seq in sequences:
+                if not self.nucleotide_alphabet._eq(seq.alphabet):
+                    raise AlphabetMismatch(self.nucleotide_alphabet, seq.alphabet)
+                # Easel requires at least a complete codon
+                if seq._sq.n < 3:
+                    continue
+                # use a view of the sequence with the coordinates expected
+                # by the ORF processing functions (`start > end` marks
+                # the reverse strand)
+                memset(&window, 0, sizeof(ESL_SQ))
+                window.name = seq._sq.name
+                window.acc = seq._sq.acc
+                window.desc = seq._sq.desc
+                window.source = seq._sq.source
+                window.abc = seq._sq.abc
+                window.n = window.L = window.W = seq._sq.n
+                if wrk.do_watson:
+                    window.dsq = seq._sq.dsq
+                    window.start = 1
+                    window.end = window.n
+                    with nogil:
+                        libeasel.gencode.esl_gencode_ProcessStart(self._gcode, wrk, &window)
+                        libeasel.gencode.esl_gencode_ProcessPiece(self._gcode, wrk, &window)
+                        libeasel.gencode.esl_gencode_ProcessEnd(wrk, &window)
+                if wrk.do_crick:
+                    rc = seq.reverse_complement()
+                    window.dsq = rc._sq.dsq
+                    window.start = window.n
+                    window.end = 1
+                    with nogil:
+                        libeasel.gencode.esl_gencode_ProcessStart(self._gcode, wrk, &window)
+                        libeasel.gencode.esl_gencode_ProcessPiece(self._gcode, wrk, &window)
+                        libeasel.gencode.esl_gencode_ProcessEnd(wrk, &window)
+                # copy the ORFs out of the workstate block
+                for i in range(block.count):
+                    orf = DigitalSequence.__new__(DigitalSequence, self.amino_alphabet)
+                    orf._sq = libeasel.sq.esl_sq_CreateDigital(self.amino_alphabet._abc)
+                    if orf._sq == NULL:
+                        raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+                    status = libeasel.sq.esl_sq_Copy(&block.list[i], orf._sq)
+                    if status != libeasel.eslOK:
+                        raise UnexpectedError(status, "esl_sq_Copy")
+                    # record the length of the source sequence, as Easel
+                    # does for subsequences
+                    orf._sq.L = window.n
+                    orfs.append(orf)
+                    libeasel.sq.esl_sq_Reuse(&block.list[i])
+                block.count = 0
+        finally:
+            libeasel.gencode.esl_gencode_WorkstateDestroy(wrk)
+
+        return orfs
+
+
 # --- Sequence File ----------------------------------------------------------
 
 cdef class SequenceFile:
@@ -5130,6 +5754,8 @@ cdef class SequenceFile:
     def __cinit__(self):
         self.alphabet = None
         self._sqfp = NULL
+        self._executor = None
+        self._executor_threads = 0
 
     def __init__(
         self,
@@ -5367,6 +5993,9 @@ cdef class SequenceFile:
         """
         libeasel.sqio.esl_sqfile_Close(self._sqfp)
         self._sqfp = NULL
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     cpdef Sequence read(self, bint skip_info=False, bint skip_sequence=False):
         """read(self, skip_info=False, skip_sequence=False)\n--
@@ -5475,6 +6104,1107 @@ cdef class SequenceFile:
         else:
             raise UnexpectedError(status, funcname)
 
+    def read_block(self, object sequences=None, object residues=None, int threads=1):
+        """read_block(self, sequences=None, residues=None, threads=1)\n--
+
+        Read several sequences from the file at once.
+
+        Arguments:
+            sequences (`int`, optional): The maximum number of sequences
+                to read. If `None` given, sequences are read until the end
+                of the file, or until the ``residues`` limit is reached.
+            residues (`int`, optional): The number of residues after which
+                to stop reading. If `None` given, the number of residues
+                in the block is not limited.
+            threads (`int`): The number of threads to use to parse and
+                digitize the sequences. Pass ``0`` to use one thread per
+                CPU. Only uncompressed FASTA files opened from a path can
+                be parsed in parallel, other files are always read in the
+                calling thread.
+
+        Returns:
+            `list` of `~pyhmmer.easel.Sequence`: The sequences read from
+            the file, which may be empty if all sequences were read.
+
+        Raises:
+            `ValueError`: When attempting to read sequences from a closed
+                file, or when the file could not be parsed.
+
+        Example:
+            Read the sequences of a file in blocks of 5 sequences::
+
+                >>> with SequenceFile("tests/data/seqs/LuxC.faa") as sf:
+                ...     block = sf.read_block(5)
+                ...     while block:
+                ...         print(len(block), block[0].name)
+                ...         block = sf.read_block(5)
+                5 b'sp|P19841|LUXC_PHOPO'
+                5 b'sp|P29236|LUXC2_PHOLE'
+                2 b'tr|B6ESM7|B6ESM7_ALISL'
+
+        Hint:
+            When the file was opened from a path, the GIL is released
+            while the sequences are parsed, so a block can be read in a
+            background thread while the previous one is being searched.
+            When ``threads`` is greater than one, the ``residues`` limit is
+            checked against the size of the records in the file, so the
+            block may contain slightly fewer residues than when reading in
+            a single thread.
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef list    block         = []
+        cdef ssize_t max_sequences = -1 if sequences is None else sequences
+        cdef int64_t max_residues  = -1 if residues is None else residues
+
+        if sequences is not None and max_sequences < 0:
+            raise ValueError(f"`sequences` must be a positive integer or None, got {sequences!r}")
+        if residues is not None and max_residues < 0:
+            raise ValueError(f"`residues` must be a positive integer or None, got {residues!r}")
+
+        self._read_block(block, max_sequences, max_residues, threads)
+        return block
+
+    def readinto_block(self, list block not None, object residues=None, int threads=1):
+        """readinto_block(self, block, residues=None, threads=1)\n--
+
+        Read several sequences from the file, using ``block`` to store data.
+
+        Arguments:
+            block (`list` of `~pyhmmer.easel.Sequence`): The sequence
+                objects to use to store the next entries in the file. At
+                most ``len(block)`` sequences are read, and the sequences
+                are cleared before being reused.
+            residues (`int`, optional): The number of residues after which
+                to stop reading. If `None` given, the number of residues
+                in the block is not limited.
+            threads (`int`): The number of threads to use to parse and
+                digitize the sequences, as in `SequenceFile.read_block`.
+
+        Returns:
+            `int`: The number of sequences read from the file, which are
+            stored in the first elements of ``block``, or ``0`` if all
+            sequences were read.
+
+        Raises:
+            `ValueError`: When attempting to read sequences from a closed
+                file, or when the file could not be parsed.
+
+        Example:
+            Read the sequences of a file in blocks of 5 sequences, while
+            recycling the same `Sequence` buffers::
+
+                >>> with SequenceFile("tests/data/seqs/LuxC.faa") as sf:
+                ...     block = [TextSequence() for _ in range(5)]
+                ...     n = sf.readinto_block(block)
+                ...     while n > 0:
+                ...         print(n, block[0].name)
+                ...         n = sf.readinto_block(block)
+                5 b'sp|P19841|LUXC_PHOPO'
+                5 b'sp|P29236|LUXC2_PHOLE'
+                2 b'tr|B6ESM7|B6ESM7_ALISL'
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef object  seq
+        cdef int64_t max_residues = -1 if residues is None else residues
+
+        if residues is not None and max_residues < 0:
+            raise ValueError(f"`residues` must be a positive integer or None, got {residues!r}")
+        for seq in block:
+            if not isinstance(seq, Sequence):
+                raise TypeError(f"Expected Sequence, found {type(seq).__name__}")
+
+        return self._read_block(block, len(block), max_residues, threads)
+
+    cdef ssize_t _read_block(
+        self,
+        list block,
+        ssize_t max_sequences,
+        int64_t max_residues,
+        int threads,
+    ) except -1:
+        # read sequences into the sequences of `block`, appending new
+        # sequences to `block` if it is too short, and return the number
+        # of sequences that were read
+        cdef int         status
+        cdef Sequence    seq
+        cdef const char* errbuf
+        cdef str         msg
+        cdef ssize_t     n      = 0
+        cdef int64_t     nres   = 0
+
+        if threads < 0:
+            raise ValueError(f"`threads` must be a positive integer or zero, got {threads!r}")
+        if self._sqfp == NULL:
+            raise ValueError("I/O operation on closed file.")
+        if max_sequences == 0 or max_residues == 0:
+            return 0
+
+        if threads == 0:
+            threads = os.cpu_count() or 1
+        if threads > 1 and self._parallel_readable():
+            return self._read_block_parallel(block, max_sequences, max_residues, threads)
+
+        while max_sequences == -1 or n < max_sequences:
+            if n < len(block):
+                seq = block[n]
+                libeasel.sq.esl_sq_Reuse(seq._sq)
+            else:
+                seq = self._new_sequence()
+            if isinstance(self._file, (str, bytes, os.PathLike)):
+                with nogil:
+                    status = libeasel.sqio.esl_sqio_Read(self._sqfp, seq._sq)
+            else:
+                # reading from a Python file-object requires the GIL
+                status = libeasel.sqio.esl_sqio_Read(self._sqfp, seq._sq)
+            if status == libeasel.eslEOF:
+                break
+            elif status == libeasel.eslEFORMAT:
+                errbuf = libeasel.sqio.esl_sqfile_GetErrorBuf(self._sqfp)
+                msg = errbuf.decode("utf-8", "replace")
+                raise ValueError("Could not parse file: {}".format(msg))
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_sqio_Read")
+            if n == len(block):
+                block.append(seq)
+            n += 1
+            nres += seq._sq.n
+            if max_residues != -1 and nres >= max_residues:
+                break
+
+        return n
+
+    cdef Sequence _new_sequence(self):
+        cdef Sequence seq
+        if self.alphabet is None:
+            seq = TextSequence.__new__(TextSequence)
+            seq._sq = libeasel.sq.esl_sq_Create()
+        else:
+            seq = DigitalSequence.__new__(DigitalSequence, self.alphabet)
+            seq._sq = libeasel.sq.esl_sq_CreateDigital(self.alphabet._abc)
+        if seq._sq == NULL:
+            raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+        return seq
+
+    cdef bint _parallel_readable(self):
+        return (
+            self._sqfp.format == libeasel.sqio.eslSQFILE_FASTA
+            and isinstance(self._file, (str, bytes, os.PathLike))
+            and libeasel.sqio.esl_sqfile_IsRewindable(self._sqfp)
+        )
+
+    def _read_block_parallel(
+        self,
+        list block,
+        ssize_t max_sequences,
+        int64_t max_residues,
+        int threads
+    ):
+        """_read_block_parallel(self, block, max_sequences, max_residues, threads)\n--
+
+        Read a block of FASTA records and parse them in several threads.
+
+        The raw records are read from the current position of the file and
+        split on record boundaries without the GIL, then parsed and
+        digitized in parallel by the worker threads of the file, which
+        also count the lines of their records. The file is finally
+        positioned at the start of the first record that was not read.
+
+        """
+        assert self._sqfp != NULL
+        assert self._sqfp.format == libeasel.sqio.eslSQFILE_FASTA
+
+        cdef ESL_SQASCII_DATA* ascii      = &self._sqfp.data.ascii
+        cdef off_t             start      = ascii.boff + ascii.bpos
+        cdef int64_t           linenumber = ascii.linenumber
+        cdef char*             mem        = NULL
+        cdef size_t            size       = 0
+        cdef size_t            allocated  = 0
+        cdef off_t*            bounds     = NULL
+        cdef ESL_SQ**          sqs        = NULL
+        cdef size_t            nrecords   = 0
+        cdef size_t            nalloc     = 0
+        cdef size_t            n
+        cdef size_t            i
+        cdef size_t            begin      = 0
+        cdef size_t            end        = 0
+        cdef size_t            scan       = 0
+        cdef int64_t           nlines     = 0
+        cdef int64_t           total      = 0
+        cdef int64_t           nres       = 0
+        cdef bint              eof        = False
+        cdef bint              more       = True
+        cdef bint              started    = False
+        cdef bint              invalid    = False
+        cdef void*             tmp
+        cdef const char*       newline
+        cdef const char*       header
+        cdef list              ranges
+        cdef int               status
+
+        # the parser already reached the end of file
+        if ascii.nc == 0:
+            return 0
+
+        try:
+            # read raw records from the file until the block is complete;
+            # records start with a '>' at the beginning of a line, so only
+            # the '>' characters need to be checked, not every line
+            with nogil:
+                if fseeko(ascii.fp, start, SEEK_SET) != 0:
+                    raise OSError("Failed to seek in sequence file")
+                while True:
+                    # read more data from the file if needed
+                    if more:
+                        if allocated - size < 0x100000:
+                            allocated = max(2 * allocated, size + 0x100000)
+                            tmp = realloc(mem, allocated * sizeof(char))
+                            if tmp == NULL:
+                                raise AllocationError("char", sizeof(char), allocated)
+                            mem = <char*> tmp
+                        n = fread(&mem[size], sizeof(char), 0x100000, ascii.fp)
+                        size += n
+                        eof = n == 0
+                        more = False
+                    # skip blank lines before the first record
+                    if not started:
+                        while scan < size and mem[scan] in b" \t\r\n\v\f":
+                            if mem[scan] == b'\n':
+                                nlines += 1
+                            scan += 1
+                        if scan == size:
+                            if eof:
+                                break
+                            more = True
+                            continue
+                        if mem[scan] != b'>':
+                            invalid = True
+                            break
+                        started = True
+                        begin = scan
+                        scan += 1
+                    # find the start of the next record
+                    header = <const char*> memchr(&mem[scan], b'>', size - scan)
+                    while header != NULL and header[-1] != b'\n':
+                        scan = header - mem + 1
+                        header = <const char*> memchr(&mem[scan], b'>', size - scan)
+                    if header == NULL:
+                        scan = size
+                        if not eof:
+                            more = True
+                            continue
+                        end = size
+                    else:
+                        end = header - mem
+                        scan = end + 1
+                    # record the record boundaries and approximate residue count
+                    if nrecords == nalloc:
+                        nalloc = 2 * nalloc + 64
+                        tmp = realloc(bounds, 2 * nalloc * sizeof(off_t))
+                        if tmp == NULL:
+                            raise AllocationError("off_t", sizeof(off_t), 2 * nalloc)
+                        bounds = <off_t*> tmp
+                    bounds[2*nrecords] = begin
+                    bounds[2*nrecords+1] = end
+                    nrecords += 1
+                    newline = <const char*> memchr(&mem[begin], b'\n', end - begin)
+                    if newline != NULL:
+                        nres += &mem[end] - newline - 1
+                    begin = end
+                    if end == size:
+                        break
+                    if max_sequences != -1 and nrecords >= <size_t> max_sequences:
+                        break
+                    if max_residues != -1 and nres >= max_residues:
+                        break
+
+            # let the Easel parser report invalid data before the first record
+            if invalid:
+                self._parse_error(start, linenumber)
+
+            # position the file after the last record that was read, which
+            # may be the end of the file
+            if nrecords > 0:
+                end = bounds[2*nrecords-1]
+            status = libeasel.sqio.esl_sqfile_Position(self._sqfp, start + end)
+            if status != libeasel.eslOK and status != libeasel.eslEOF:
+                raise UnexpectedError(status, "esl_sqfile_Position")
+            if nrecords == 0:
+                if linenumber != -1:
+                    ascii.linenumber = linenumber + nlines
+                return 0
+
+            # recycle the sequences of the block, allocating new ones if needed
+            sqs = <ESL_SQ**> malloc(nrecords * sizeof(ESL_SQ*))
+            if sqs == NULL:
+                raise AllocationError("ESL_SQ*", sizeof(ESL_SQ*), nrecords)
+            while <size_t> len(block) < nrecords:
+                block.append(self._new_sequence())
+            for i in range(nrecords):
+                sqs[i] = (<Sequence> block[i])._sq
+
+            # parse contiguous ranges of records in each thread
+            threads = min(threads, nrecords)
+            ranges = [(i * nrecords // threads, (i + 1) * nrecords // threads) for i in range(threads)]
+            if self._executor is None or self._executor_threads < threads:
+                if self._executor is not None:
+                    self._executor.shutdown()
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+                self._executor_threads = threads
+
+            def parse(tuple range_):
+                cdef size_t  lo     = range_[0]
+                cdef size_t  hi     = range_[1]
+                cdef size_t  failed = 0
+                cdef int64_t count  = 0
+                cdef int     status
+                with nogil:
+                    status = SequenceFile._parse_records(
+                        mem, &bounds[2*lo], &sqs[lo], hi - lo, start, &failed
+                    )
+                    if status == libeasel.eslOK:
+                        count = SequenceFile._count_lines(
+                            &mem[bounds[2*lo]], bounds[2*hi-1] - bounds[2*lo]
+                        )
+                return status, lo + failed, count
+
+            for status, i, count in self._executor.map(parse, ranges):
+                if status == libeasel.eslEFORMAT or status == libeasel.eslEINVAL:
+                    if linenumber != -1:
+                        linenumber += nlines + SequenceFile._count_lines(
+                            &mem[bounds[0]], bounds[2*i] - bounds[0]
+                        )
+                    self._parse_error(start + bounds[2*i], linenumber)
+                elif status != libeasel.eslOK:
+                    raise UnexpectedError(status, "esl_sqio_Parse")
+                total += count
+
+            if linenumber != -1:
+                ascii.linenumber = linenumber + nlines + total
+            return nrecords
+
+        finally:
+            free(mem)
+            free(bounds)
+            free(sqs)
+
+    cdef int _parse_error(self, off_t offset, int64_t linenumber) except 1:
+        # read the invalid record at `offset` again with the Easel reader,
+        # to raise an error with the same message as a sequential read
+        cdef int          status
+        cdef const char*  errbuf
+        cdef str          msg
+        cdef Sequence     seq    = self._new_sequence()
+
+        status = libeasel.sqio.esl_sqfile_Position(self._sqfp, offset)
+        if status != libeasel.eslOK:
+            raise UnexpectedError(status, "esl_sqfile_Position")
+        self._sqfp.data.ascii.linenumber = linenumber
+
+        with nogil:
+            status = libeasel.sqio.esl_sqio_Read(self._sqfp, seq._sq)
+        if status == libeasel.eslEFORMAT:
+            errbuf = libeasel.sqio.esl_sqfile_GetErrorBuf(self._sqfp)
+            msg = errbuf.decode("utf-8", "replace")
+            raise ValueError("Could not parse file: {}".format(msg))
+        elif status != libeasel.eslOK and status != libeasel.eslEOF:
+            raise UnexpectedError(status, "esl_sqio_Read")
+        raise ValueError("Could not parse file: invalid FASTA record")
+
+    @staticmethod
+    cdef int _parse_records(
+        char* mem,
+        const off_t* bounds,
+        ESL_SQ** sqs,
+        size_t length,
+        off_t start,
+        size_t* failed,
+    ) nogil:
+        # parse the records into a text mode buffer, and copy them to the
+        # target sequences, which recycles their memory and digitizes them
+        # if needed; on error, `failed` is set to the index of the record
+        cdef size_t  i
+        cdef int     status = libeasel.eslOK
+        cdef ESL_SQ* sq     = libeasel.sq.esl_sq_Create()
+
+        if sq == NULL:
+            failed[0] = 0
+            return libeasel.eslEMEM
+
+        for i in range(length):
+            libeasel.sq.esl_sq_Reuse(sq)
+            status = libeasel.sqio.esl_sqio_Parse(
+                &mem[bounds[2*i]],
+                bounds[2*i+1] - bounds[2*i],
+                sq,
+                libeasel.sqio.eslSQFILE_FASTA,
+            )
+            if status == libeasel.eslOK:
+                # make the offsets relative to the start of the file (the
+                # offsets set by `esl_sqio_Parse` are off by one, since the
+                # memory buffer it uses starts at offset -1)
+                sq.roff = start + bounds[2*i]
+                sq.hoff += start + bounds[2*i] + 1
+                sq.doff += start + bounds[2*i] + 1
+                sq.eoff += start + bounds[2*i] + 1
+                libeasel.sq.esl_sq_Reuse(sqs[i])
+                status = libeasel.sq.esl_sq_Copy(sq, sqs[i])
+            if status != libeasel.eslOK:
+                failed[0] = i
+                break
+
+        libeasel.sq.esl_sq_Destroy(sq)
+        return status
+
+    @staticmethod
+    cdef int64_t _count_lines(const char* mem, size_t length) nogil:
+        cdef const char* end   = mem + length
+        cdef int64_t     count = 0
+        mem = <const char*> memchr(mem, b'\n', length)
+        while mem != NULL:
+            count += 1
+            mem = <const char*> memchr(mem + 1, b'\n', end - mem - 1)
+        return count
+
+    # --- Index --------------------------------------------------------------
+
+    cdef ESL_SQASCII_DATA* _indexable(self) except NULL:
+        if self._sqfp == NULL:
+            raise ValueError("I/O operation on closed file.")
+        if self._sqfp.format == libeasel.sqio.eslSQFILE_NCBI or libeasel.sqio.esl_sqio_IsAlignment(self._sqfp.format):
+            raise ValueError(f"Cannot use an index with a {self.format!r} file")
+        if self._sqfp.data.ascii.do_gzip:
+            raise ValueError("Cannot use an index with a compressed file")
+        return &self._sqfp.data.ascii
+
+    cpdef void open_index(self, object index=None) except *:
+        """open_index(self, index=None)\n--
+
+        Open the sequence/subsequence index of the file.
+
+        Arguments:
+            index (`str`, `bytes` or `os.PathLike`, optional): The path to
+                the SSI file to use. If `None` given, use the file with the
+                same path as the sequence file, with an ``.ssi`` extension.
+
+        Raises:
+            `FileNotFoundError`: When the index file could not be found.
+            `ValueError`: When the file is closed, cannot be repositioned
+                (such as a compressed file), or when the index file is not
+                in the correct format.
+
+        Note:
+            Methods fetching sequences from the file will open the default
+            index automatically, so this is only needed to use an index
+            at a non-default location.
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef int               status
+        cdef bytes             fspath
+        cdef ESL_SQASCII_DATA* ascii  = self._indexable()
+
+        if index is not None:
+            fspath = os.fsencode(index)
+        elif isinstance(self._file, (str, bytes, os.PathLike)):
+            fspath = os.fsencode(self._file) + b".ssi"
+        else:
+            raise ValueError("Cannot find the index of a file-like object, use the `index` argument")
+
+        # close the previous index, if any
+        libeasel.ssi.esl_ssi_Close(ascii.ssi)
+        free(ascii.ssifile)
+        ascii.ssi = NULL
+        ascii.ssifile = NULL
+
+        status = libeasel.sqio.esl_sqfile_OpenSSI(self._sqfp, fspath)
+        if status == libeasel.eslENOTFOUND:
+            raise FileNotFoundError(2, "No such file or directory: {!r}".format(os.fsdecode(fspath)))
+        elif status == libeasel.eslEFORMAT:
+            raise ValueError("File is not in correct SSI format")
+        elif status == libeasel.eslERANGE:
+            raise RuntimeError("File has 64-bit file offsets, which are unsupported on this system")
+        elif status != libeasel.eslOK:
+            raise UnexpectedError(status, "esl_sqfile_OpenSSI")
+
+    def build_index(self, object index=None, bint exclusive=False):
+        """build_index(self, index=None, exclusive=False)\n--
+
+        Build a sequence/subsequence index for the file.
+
+        The whole file is scanned once to record the name, accession and
+        offsets of every sequence into a new SSI file, which is then
+        opened to fetch sequences from this `SequenceFile`. The current
+        position of the file is unchanged.
+
+        Arguments:
+            index (`str`, `bytes` or `os.PathLike`, optional): The path to
+                the SSI file to create. If `None` given, create a file with
+                the same path as the sequence file, with an ``.ssi``
+                extension, which is where the index is looked up by
+                default.
+            exclusive (`bool`): Whether to fail instead of overwriting
+                an existing index.
+
+        Returns:
+            `str`: The path to the SSI file that was created.
+
+        Raises:
+            `ValueError`: When the file is closed, was not opened from a
+                path, cannot be repositioned, or could not be parsed.
+            `FileExistsError`: When the index file exists and ``exclusive``
+                is `True`.
+
+        Example:
+            >>> import tempfile, os, shutil
+            >>> with tempfile.TemporaryDirectory() as tmp:
+            ...     path = shutil.copy("tests/data/seqs/LuxC.faa", tmp)
+            ...     with SequenceFile(path) as sf:
+            ...         index = sf.build_index()
+            ...         seq = sf.fetch(b"sp|P23113|LUXC_PHOLU")
+            ...     print(os.path.basename(index), seq.sequence[:30])
+            LuxC.faa.ssi MNKKISFIINGRVEIFPESDDLVQSINFGD
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef ESL_SQASCII_DATA* ascii
+        cdef SequenceFile      reader
+        cdef SSIWriter         writer
+        cdef uint16_t          fd
+        cdef int               status
+        cdef str               path
+        cdef const char*       errbuf
+        cdef str               msg
+        cdef ESL_SQ*           sq     = NULL
+
+        self._indexable()
+        if not isinstance(self._file, (str, bytes, os.PathLike)):
+            raise ValueError("Cannot index a file-like object")
+
+        # use a separate reader so that the position of this file is kept
+        path = os.fsdecode(self._file)
+        index = path + ".ssi" if index is None else os.fsdecode(index)
+        reader = SequenceFile(path, self.format)
+        writer = SSIWriter(index, exclusive=exclusive)
+        try:
+            sq = libeasel.sq.esl_sq_Create()
+            if sq == NULL:
+                raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+            fd = writer.add_file(path, reader._sqfp.format)
+            status = libeasel.sqio.esl_sqio_ReadInfo(reader._sqfp, sq)
+            while status == libeasel.eslOK:
+                writer.add_key(sq.name, fd, sq.roff, sq.doff, sq.L)
+                if sq.acc[0] != b'\0':
+                    writer.add_alias(sq.acc, sq.name)
+                libeasel.sq.esl_sq_Reuse(sq)
+                status = libeasel.sqio.esl_sqio_ReadInfo(reader._sqfp, sq)
+            if status == libeasel.eslEFORMAT:
+                errbuf = libeasel.sqio.esl_sqfile_GetErrorBuf(reader._sqfp)
+                msg = errbuf.decode("utf-8", "replace")
+                raise ValueError("Could not parse file: {}".format(msg))
+            elif status != libeasel.eslEOF:
+                raise UnexpectedError(status, "esl_sqio_ReadInfo")
+            # record the line lengths, if constant, to position the file
+            # directly at the start of a subsequence when fetching
+            ascii = &reader._sqfp.data.ascii
+            if ascii.bpl > 0 and ascii.rpl > 0:
+                status = libeasel.ssi.esl_newssi_SetSubseq(writer._newssi, fd, ascii.bpl, ascii.rpl)
+                if status != libeasel.eslOK:
+                    raise UnexpectedError(status, "esl_newssi_SetSubseq")
+            writer.close()
+        except:
+            # discard the partial index instead of writing it
+            libeasel.ssi.esl_newssi_Close(writer._newssi)
+            writer._newssi = NULL
+            raise
+        finally:
+            libeasel.sq.esl_sq_Destroy(sq)
+            reader.close()
+
+        self.open_index(index)
+        return index
+
+    cpdef Sequence fetch(self, bytes key):
+        """fetch(self, key)\n--
+
+        Fetch the sequence with the given name or accession from the file.
+
+        Arguments:
+            key (`bytes`): The name or the accession of the sequence to
+                retrieve.
+
+        Returns:
+            `~pyhmmer.easel.Sequence`: The sequence with the given key.
+
+        Raises:
+            `KeyError`: When no sequence with the given key exists in the
+                index.
+            `FileNotFoundError`: When the file has no index.
+            `ValueError`: When the file is closed, cannot be repositioned,
+                or when the file could not be parsed.
+
+        Note:
+            The file is positioned using the index, so reading from the
+            file afterwards will resume after the fetched sequence.
+
+        .. versionadded:: 0.7.0
+
+        """
+        return self.fetch_many([key])[0]
+
+    cpdef list fetch_many(self, object keys):
+        """fetch_many(self, keys)\n--
+
+        Fetch several sequences from the file using the index.
+
+        Sequences are read in the order they appear in the file, so that
+        fetching many sequences from a large file only reads each part of
+        the file once, sequentially.
+
+        Arguments:
+            keys (iterable of `bytes`): The names or accessions of the
+                sequences to retrieve.
+
+        Returns:
+            `list` of `~pyhmmer.easel.Sequence`: The sequences with the
+            given keys, in the same order as ``keys``.
+
+        Raises:
+            `KeyError`: When a key is missing from the index.
+            `FileNotFoundError`: When the file has no index.
+            `ValueError`: When the file is closed, cannot be repositioned,
+                or when the file could not be parsed.
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef uint16_t          fh
+        cdef off_t             roff
+        cdef int               status
+        cdef size_t            i
+        cdef Sequence          seq
+        cdef const char*       errbuf
+        cdef str               msg
+        cdef list              offsets   = []
+        cdef list              sequences
+        cdef ESL_SQASCII_DATA* ascii     = self._indexable()
+
+        if ascii.ssi == NULL:
+            self.open_index()
+
+        # find the record offsets of all keys before reading anything
+        for key in keys:
+            status = libeasel.ssi.esl_ssi_FindName(ascii.ssi, key, &fh, &roff, NULL, NULL)
+            if status == libeasel.eslENOTFOUND:
+                raise KeyError(key)
+            elif status == libeasel.eslEFORMAT:
+                raise ValueError("malformed index")
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_ssi_FindName")
+            offsets.append((roff, len(offsets)))
+
+        # read the sequences in file order
+        sequences = [None] * len(offsets)
+        for roff, i in sorted(offsets):
+            if self.alphabet is None:
+                seq = TextSequence()
+            else:
+                seq = DigitalSequence(self.alphabet)
+            status = libeasel.sqio.esl_sqfile_Position(self._sqfp, roff)
+            if status == libeasel.eslOK:
+                status = libeasel.sqio.esl_sqio_Read(self._sqfp, seq._sq)
+            if status == libeasel.eslEOF:
+                raise ValueError("Index offset is off the end of the file")
+            elif status == libeasel.eslEFORMAT:
+                errbuf = libeasel.sqio.esl_sqfile_GetErrorBuf(self._sqfp)
+                msg = errbuf.decode("utf-8", "replace")
+                raise ValueError("Could not parse file: {}".format(msg))
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_sqio_Read")
+            sequences[i] = seq
+
+        return sequences
+
+    cpdef Sequence fetch_subsequence(self, bytes key, int64_t start, int64_t end=0):
+        """fetch_subsequence(self, key, start, end=0)\n--
+
+        Fetch a subsequence of a sequence from the file using the index.
+
+        Coordinates are 1-based and inclusive, like the coordinates of
+        `~pyhmmer.plan7.Domain` and `~pyhmmer.plan7.Alignment` objects.
+        When the index records that all sequence lines have the same
+        length, the file is positioned directly at the subsequence
+        without reading the residues before it.
+
+        Arguments:
+            key (`bytes`): The name or the accession of the sequence to
+                retrieve.
+            start (`int`): The coordinate of the first residue of the
+                subsequence.
+            end (`int`): The coordinate of the last residue of the
+                subsequence, or ``0`` to fetch the suffix of the sequence
+                starting at ``start``.
+
+        Returns:
+            `~pyhmmer.easel.Sequence`: The subsequence, named after the
+            source sequence and the coordinates (*e.g.* ``seq1/10-20``).
+
+        Raises:
+            `KeyError`: When no sequence with the given key exists in the
+                index.
+            `FileNotFoundError`: When the file has no index.
+            `ValueError`: When the coordinates are invalid, or when the
+                file could not be parsed.
+
+        Example:
+            >>> import tempfile, os
+            >>> with tempfile.TemporaryDirectory() as tmp:
+            ...     with SequenceFile("tests/data/seqs/LuxC.faa") as sf:
+            ...         _ = sf.build_index(os.path.join(tmp, "LuxC.ssi"))
+            ...         subseq = sf.fetch_subsequence(b"sp|P23113|LUXC_PHOLU", 3, 10)
+            >>> subseq.name
+            b'sp|P23113|LUXC_PHOLU/3-10'
+            >>> subseq.sequence
+            'KKISFIIN'
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef int               status
+        cdef Sequence          seq
+        cdef const char*       errbuf
+        cdef str               msg
+        cdef ESL_SQASCII_DATA* ascii  = self._indexable()
+
+        if start < 1:
+            raise ValueError(f"Invalid subsequence start: {start!r}")
+        if end != 0 and end < start:
+            raise ValueError(f"Invalid subsequence end: {end!r}")
+        if ascii.ssi == NULL:
+            self.open_index()
+
+        if self.alphabet is None:
+            seq = TextSequence()
+        else:
+            seq = DigitalSequence(self.alphabet)
+
+        status = libeasel.sqio.esl_sqio_FetchSubseq(self._sqfp, key, start, end, seq._sq)
+        if status == libeasel.eslOK:
+            return seq
+        elif status == libeasel.eslENOTFOUND:
+            raise KeyError(key)
+        errbuf = libeasel.sqio.esl_sqfile_GetErrorBuf(self._sqfp)
+        msg = errbuf.decode("utf-8", "replace").strip()
+        if status == libeasel.eslERANGE:
+            raise ValueError("Invalid subsequence coordinates: {}".format(msg))
+        elif status == libeasel.eslEFORMAT or status == libeasel.eslEOF:
+            raise ValueError("Could not parse file: {}".format(msg))
+        else:
+            raise UnexpectedError(status, "esl_sqio_FetchSubseq")
+
+
+# --- Sequence Database ------------------------------------------------------
+
+cdef class DigitalSequenceDatabase:
+    """A reader for sequence databases in the Easel ``dsqdata`` format.
+
+    The ``dsqdata`` format stores pre-digitized sequences packed into
+    2-bit or 5-bit chunks, so that they can be loaded without having to
+    parse and digitize a text file. A database is made of a stub file and
+    three binary files sharing the same basename, with the ``.dsqi``,
+    ``.dsqm`` and ``.dsqs`` extensions. Sequences are loaded and unpacked
+    in background threads, and made available in chunks of up to 4096
+    sequences.
+
+    Example:
+        Create a database from a digital `SequenceFile`, and load the
+        sequences back::
+
+            >>> import tempfile, os
+            >>> with tempfile.TemporaryDirectory() as tmp:
+            ...     db = os.path.join(tmp, "LuxC")
+            ...     with SequenceFile("tests/data/seqs/LuxC.faa", digital=True) as sf:
+            ...         DigitalSequenceDatabase.write(sf, db)
+            ...     with DigitalSequenceDatabase(db) as dsqdata:
+            ...         sequences = list(dsqdata)
+            >>> len(sequences)
+            12
+            >>> sequences[0].name
+            b'sp|P19841|LUXC_PHOPO'
+
+    .. versionadded:: 0.7.0
+
+    """
+
+    # --- Magic methods ------------------------------------------------------
+
+    def __cinit__(self):
+        self._dd = NULL
+        self._chunk = NULL
+        self._index = 0
+        self.alphabet = None
+
+    def __init__(self, object file, Alphabet alphabet = None):
+        """__init__(self, file, alphabet=None)\n--
+
+        Open a ``dsqdata`` sequence database for reading.
+
+        Arguments:
+            file (`str` or `os.PathLike`): The basename of the database to
+                open, i.e. the path to the stub file.
+            alphabet (`~pyhmmer.easel.Alphabet`, optional): The alphabet
+                the database is expected to use. If `None` given, the
+                alphabet recorded in the database is used.
+
+        Raises:
+            `FileNotFoundError`: When one of the database files could not
+                be found.
+            `ValueError`: When the database files could not be parsed, or
+                when the database alphabet does not match ``alphabet``.
+
+        """
+        cdef int           status
+        cdef bytes         fspath = os.fsencode(file)
+        cdef ESL_ALPHABET* abc    = NULL if alphabet is None else alphabet._abc
+        cdef str           msg
+
+        if self._dd != NULL:
+            raise RuntimeError("Database is already open")
+
+        status = libeasel.dsqdata.esl_dsqdata_Open(&abc, fspath, 1, &self._dd)
+        if status == libeasel.eslOK:
+            if alphabet is None:
+                self.alphabet = Alphabet.__new__(Alphabet)
+                self.alphabet._abc = abc
+            else:
+                self.alphabet = alphabet
+            return
+
+        # on normal errors, the reader is returned before any thread was
+        # started, so it must be released without `esl_dsqdata_Close`
+        if self._dd != NULL:
+            msg = self._dd.errbuf.decode("utf-8", "replace")
+            if self._dd.stubfp != NULL:
+                fclose(self._dd.stubfp)
+            if self._dd.ifp != NULL:
+                fclose(self._dd.ifp)
+            if self._dd.sfp != NULL:
+                fclose(self._dd.sfp)
+            if self._dd.mfp != NULL:
+                fclose(self._dd.mfp)
+            free(self._dd.basename)
+            free(self._dd)
+            self._dd = NULL
+
+        if status == libeasel.eslENOTFOUND:
+            raise FileNotFoundError(2, "No such file or directory: {!r}".format(file))
+        elif status == libeasel.eslEFORMAT:
+            raise ValueError("Could not parse database: {}".format(msg))
+        else:
+            raise UnexpectedError(status, "esl_dsqdata_Open")
+
+    def __dealloc__(self):
+        if self._dd != NULL:
+            with nogil:
+                self._stop()
+                libeasel.dsqdata.esl_dsqdata_Close(self._dd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_value, exc_type, traceback):
+        self.close()
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        cdef DigitalSequence seq = self.read()
+        if seq is None:
+            raise StopIteration()
+        return seq
+
+    def __len__(self):
+        if self._dd == NULL:
+            raise ValueError("I/O operation on closed file.")
+        return self._dd.nseq
+
+    # --- Properties ---------------------------------------------------------
+
+    @property
+    def closed(self):
+        """`bool`: Whether the `DigitalSequenceDatabase` is closed or not.
+        """
+        return self._dd == NULL
+
+    # --- Utils --------------------------------------------------------------
+
+    cdef DigitalSequence _chunk_sequence(self, int index):
+        assert self._chunk != NULL
+        assert index < self._chunk.N
+
+        cdef DigitalSequence seq = DigitalSequence.__new__(DigitalSequence, self.alphabet)
+
+        with nogil:
+            seq._sq = libeasel.sq.esl_sq_CreateDigitalFrom(
+                self.alphabet._abc,
+                self._chunk.name[index],
+                self._chunk.dsq[index],
+                self._chunk.L[index],
+                self._chunk.desc[index],
+                self._chunk.acc[index],
+                NULL,
+            )
+        if seq._sq == NULL:
+            raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+        seq._sq.tax_id = self._chunk.taxid[index]
+        return seq
+
+    cdef int _stop(self) nogil except 1:
+        # the loader thread only terminates once it reaches the end of the
+        # index and every chunk it loaded was recycled: moving the index to
+        # its end makes the loader stop after the chunks already in flight,
+        # which only need to be recycled before the reader can be closed
+        cdef int status = libeasel.eslOK
+        fseek(self._dd.ifp, 0, SEEK_END)
+        while status == libeasel.eslOK:
+            if self._chunk != NULL:
+                libeasel.dsqdata.esl_dsqdata_Recycle(self._dd, self._chunk)
+                self._chunk = NULL
+            status = libeasel.dsqdata.esl_dsqdata_Read(self._dd, &self._chunk)
+        if status != libeasel.eslEOF:
+            raise UnexpectedError(status, "esl_dsqdata_Read")
+        return 0
+
+    # --- Methods ------------------------------------------------------------
+
+    cpdef void close(self) except *:
+        """close(self)\n--
+
+        Close the database and stop the background reader threads.
+
+        """
+        if self._dd != NULL:
+            with nogil:
+                self._stop()
+                libeasel.dsqdata.esl_dsqdata_Close(self._dd)
+            self._dd = NULL
+
+    cpdef DigitalSequence read(self):
+        """read(self)\n--
+
+        Read the next sequence from the database.
+
+        Returns:
+            `~pyhmmer.easel.DigitalSequence`: The next sequence in the
+            database, or `None` if all sequences were read.
+
+        Raises:
+            `ValueError`: When attempting to read a sequence from a closed
+                database.
+
+        """
+        cdef int             status
+        cdef DigitalSequence seq
+
+        if self._dd == NULL:
+            raise ValueError("I/O operation on closed file.")
+
+        while self._chunk == NULL or self._index >= self._chunk.N:
+            with nogil:
+                if self._chunk != NULL:
+                    libeasel.dsqdata.esl_dsqdata_Recycle(self._dd, self._chunk)
+                    self._chunk = NULL
+                status = libeasel.dsqdata.esl_dsqdata_Read(self._dd, &self._chunk)
+            if status == libeasel.eslEOF:
+                return None
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "esl_dsqdata_Read")
+            self._index = 0
+
+        seq = self._chunk_sequence(self._index)
+        self._index += 1
+        return seq
+
+    cpdef list read_chunk(self):
+        """read_chunk(self)\n--
+
+        Read the next chunk of sequences from the database.
+
+        Returns:
+            `list` of `~pyhmmer.easel.DigitalSequence`: The sequences of
+            the next chunk in the database, or `None` if all sequences
+            were read. If `read` was called before, the sequences remaining
+            in the current chunk are returned.
+
+        Raises:
+            `ValueError`: When attempting to read from a closed database.
+
+        """
+        cdef int             i
+        cdef list            sequences
+        cdef DigitalSequence seq = self.read()
+
+        if seq is None:
+            return None
+
+        sequences = [seq]
+        for i in range(self._index, self._chunk.N):
+            sequences.append(self._chunk_sequence(i))
+        self._index = self._chunk.N
+        return sequences
+
+    @staticmethod
+    def write(SequenceFile sequences not None, object file):
+        """write(sequences, file)\n--
+
+        Write the sequences of a sequence file to a ``dsqdata`` database.
+
+        Arguments:
+            sequences (`~pyhmmer.easel.SequenceFile`): A sequence file open
+                in digital mode. The file will be rewound and read twice,
+                so it must have been opened from a path.
+            file (`str` or `os.PathLike`): The basename of the database to
+                create. The stub file will be written at this location, and
+                the binary files next to it.
+
+        Raises:
+            `ValueError`: When ``sequences`` is closed or not in digital
+                mode, or when it could not be parsed.
+            `OSError`: When one of the database files could not be opened
+                for writing.
+
+        """
+        cdef int                            status
+        cdef bytes                          fspath = os.fsencode(file)
+        cdef char[eslERRBUFSIZE]            errbuf
+
+        if sequences._sqfp == NULL:
+            raise ValueError("I/O operation on closed file.")
+        if sequences.alphabet is None:
+            raise ValueError("Cannot write a database from a sequence file in text mode")
+        if not libeasel.sqio.esl_sqfile_IsRewindable(sequences._sqfp):
+            raise ValueError("Cannot write a database from a sequence file that is not rewindable")
+
+        status = libeasel.sqio.esl_sqfile_Position(sequences._sqfp, 0)
+        if status != libeasel.eslOK:
+            raise UnexpectedError(status, "esl_sqfile_Position")
+
+        errbuf[0] = b'\0'
+        status = libeasel.dsqdata.esl_dsqdata_Write(sequences._sqfp, fspath, errbuf)
+        if status == libeasel.eslEWRITE:
+            raise OSError(errbuf.decode("utf-8", "replace"))
+        elif status == libeasel.eslEFORMAT:
+            raise ValueError("Could not parse file: {}".format(errbuf.decode("utf-8", "replace")))
+        elif status != libeasel.eslOK:
+            raise UnexpectedError(status, "esl_dsqdata_Write")
+
 
 # --- Sequence/Subsequence Index ---------------------------------------------
 
@@ -49,6 +49,9 @@ class UnexpectedError(RuntimeError):
         self.code = code
         self.function = function
 
+    def __reduce__(self):
+        return type(self), (self.code, self.function)
+
     def __repr__(self):
         return "{}({!r}, {!r})".format(type(self).__name__, self.code, self.function)
 
@@ -69,6 +72,9 @@ class AllocationError(MemoryError):
         self.itemsize = itemsize
         self.count = count
 
+    def __reduce__(self):
+        return type(self), (self.ctype, self.itemsize, self.count)
+
     def __repr__(self):
         cdef str typename = type(self).__name__
         if self.count == 1:
@@ -89,6 +95,9 @@ class EaselError(RuntimeError):
         self.code = code
         self.message = message
 
+    def __reduce__(self):
+        return type(self), (self.code, self.message)
+
     def __repr__(self):
         return "{}({!r}, {!r})".format(type(self).__name__, self.code, self.message)
 
@@ -124,6 +133,9 @@ class AlphabetMismatch(ValueError):
         self.expected = expected
         self.actual = actual
 
+    def __reduce__(self):
+        return type(self), (self.expected, self.actual)
+
     def __repr__(self):
         return f"{type(self).__name__}({self.expected}, {self.actual})"
 
@@ -144,6 +156,9 @@ class ServerError(RuntimeError):
         self.code = code
         self.message = message
 
+    def __reduce__(self):
+        return type(self), (self.code, self.message)
+
     def __repr__(self):
         return "{}({!r}, {!r})".format(type(self).__name__, self.code, self.message)
 
@@ -5,7 +5,9 @@
 import abc
 import contextlib
 import collections
+import concurrent.futures
 import ctypes
+import hashlib
 import itertools
 import io
 import queue
@@ -17,8 +19,9 @@ import multiprocessing
 
 import psutil
 
-from .easel import Alphabet, DigitalSequence, DigitalMSA, MSA, MSAFile, TextSequence, SequenceFile, SSIWriter
-from .plan7 import Builder, Background, Pipeline, PipelineSearchTargets, LongTargetsPipeline, TopHits, HMM, HMMFile, Profile, TraceAligner, OptimizedProfile
+from .easel import Alphabet, DigitalSequence, DigitalMSA, MSA, MSAFile, TextSequence, SequenceFile, SSIReader, SSIWriter
+from .plan7 import Builder, Background, FMIndex, Pipeline, PipelineScanTargets, PipelineSearchTargets, LongTargetsPipeline, TopHits, HMM, HMMFile, Profile, TraceAligner, OptimizedProfile
+from .errors import AlphabetMismatch
 from .utils import peekable
 
 # the query type for the pipeline
@@ -91,6 +94,112 @@ class _Chore(typing.Generic[_Q]):
         self.event.set()
 
 
+# --- Model cache ------------------------------------------------------------
+
+class ModelCache:
+    """A thread-safe LRU cache of models built from query sequences.
+
+    When the same query sequences are searched several times, for instance
+    in an all-vs-all `phmmer` search or in successive search iterations,
+    a `ModelCache` can be passed to `phmmer` to avoid rebuilding the query
+    HMM every time the same sequence is encountered. A single cache can be
+    shared between the worker threads of a search, and reused across
+    different searches.
+
+    Models are indexed by the checksum, the length and the name of the
+    query sequence, by the whole configuration of the
+    `~pyhmmer.plan7.Builder` used to build them, including the parameters
+    used to calibrate their E-values, and by the residue frequencies of
+    the `~pyhmmer.plan7.Background` model.
+
+    Attributes:
+        maxsize (`int`): The maximum number of models to keep in the
+            cache before evicting the least recently used ones.
+        hits (`int`): The number of times a model was found in the cache.
+        misses (`int`): The number of times a model had to be built.
+
+    Example:
+        >>> cache = ModelCache(maxsize=16)
+        >>> all_hits = list(phmmer(proteins[:2], proteins, cache=cache))
+        >>> all_hits = list(phmmer(proteins[:2], proteins, cache=cache))
+        >>> cache.hits, cache.misses
+        (2, 2)
+
+    .. versionadded:: 0.7.0
+
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """Create a new model cache storing at most ``maxsize`` models.
+        """
+        if maxsize <= 0:
+            raise ValueError(f"Invalid cache size: {maxsize!r}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._models: "collections.OrderedDict[typing.Hashable, typing.Tuple[HMM, Profile, OptimizedProfile]]"
+        self._models = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    @staticmethod
+    def _key(
+        sequence: DigitalSequence,
+        builder: Builder,
+        background: Background,
+    ) -> typing.Hashable:
+        return (
+            sequence.checksum(),
+            len(sequence),
+            sequence.name,
+            builder.alphabet.symbols,
+            tuple(sorted(builder._arguments().items())),
+            background.uniform,
+            background.L,
+            background.omega,
+            tuple(background.residue_frequencies),
+        )
+
+    def build(
+        self,
+        sequence: DigitalSequence,
+        builder: Builder,
+        background: Background,
+    ) -> typing.Tuple[HMM, Profile, OptimizedProfile]:
+        """Get the model for ``sequence``, building it if needed.
+
+        Profiles returned by this method are copies of the cached ones,
+        so they can be reconfigured freely by the caller.
+
+        """
+        key = self._key(sequence, builder, background)
+        with self._lock:
+            models = self._models.get(key)
+            if models is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+        # build the models outside of the lock so that other threads
+        # are not blocked while the model is being calibrated
+        if models is None:
+            models = builder.build(sequence, background)
+            with self._lock:
+                self.misses += 1
+                self._models[key] = models
+                self._models.move_to_end(key)
+                while len(self._models) > self.maxsize:
+                    self._models.popitem(last=False)
+        hmm, profile, opt = models
+        return hmm, profile.copy(), opt.copy()
+
+    def clear(self) -> None:
+        """Remove all the models from the cache.
+        """
+        with self._lock:
+            self._models.clear()
+
+
 # --- Pipeline threads -------------------------------------------------------
 
 class _PipelineThread(typing.Generic[_Q], threading.Thread):
@@ -187,6 +296,23 @@ class _ModelPipelineThread(typing.Generic[_M], _PipelineThread[_M]):
         return self.pipeline.search_hmm(query, self.sequences)
 
 
+class _ShardedModelPipelineThread(typing.Generic[_M], _PipelineThread[typing.Tuple[_M, PipelineSearchTargets]]):  # type: ignore
+    def process(self, query: typing.Tuple[_M, PipelineSearchTargets]) -> TopHits:  # type: ignore
+        # the callback is called by the runner once the hits of all the
+        # shards have been merged, not after each shard is processed
+        hits = self.search(query)
+        self.pipeline.clear()
+        return hits
+
+    def search(self, query: typing.Tuple[_M, PipelineSearchTargets]) -> TopHits:  # type: ignore
+        model, shard = query
+        # profiles are reconfigured for each target length during the
+        # search, so they cannot be shared between the shard threads
+        if isinstance(model, (Profile, OptimizedProfile)):
+            model = model.copy()
+        return self.pipeline.search_hmm(model, shard)
+
+
 class _SequencePipelineThread(_PipelineThread[DigitalSequence]):
     def __init__(
         self,
@@ -200,6 +326,7 @@ class _SequencePipelineThread(_PipelineThread[DigitalSequence]):
         pipeline_class: typing.Type[Pipeline],
         alphabet: Alphabet,
         builder: Builder,
+        cache: typing.Optional[ModelCache] = None,
     ) -> None:
         super().__init__(
             sequences,
@@ -213,9 +340,16 @@ class _SequencePipelineThread(_PipelineThread[DigitalSequence]):
             alphabet,
         )
         self.builder = builder
+        self.cache = cache
 
     def search(self, query: DigitalSequence) -> TopHits:
-        return self.pipeline.search_seq(query, self.sequences, self.builder)
+        if self.cache is None:
+            return self.pipeline.search_seq(query, self.sequences, self.builder)
+        # reuse the model built for an identical query if possible
+        hmm, _, opt = self.cache.build(query, self.builder, self.pipeline.background)
+        if isinstance(self.pipeline, LongTargetsPipeline):
+            return self.pipeline.search_hmm(hmm, self.sequences)
+        return self.pipeline.search_hmm(opt, self.sequences)
 
 
 class _MSAPipelineThread(_PipelineThread[DigitalMSA]):
@@ -249,6 +383,73 @@ class _MSAPipelineThread(_PipelineThread[DigitalMSA]):
         return self.pipeline.search_msa(query, self.sequences, self.builder)
 
 
+class _ScanPipelineThread(_PipelineThread[DigitalSequence]):
+    def __init__(
+        self,
+        profiles: PipelineScanTargets,
+        query_available: threading.Semaphore,
+        query_queue: "queue.Queue[typing.Optional[_Chore[DigitalSequence]]]",
+        query_count: multiprocessing.Value,  # type: ignore
+        kill_switch: threading.Event,
+        callback: typing.Optional[typing.Callable[[DigitalSequence, int], None]],
+        options: typing.Dict[str, typing.Any],
+        pipeline_class: typing.Type[Pipeline],
+        alphabet: Alphabet,
+    ) -> None:
+        super().__init__(
+            PipelineSearchTargets([]),
+            query_available,
+            query_queue,
+            query_count,
+            kill_switch,
+            callback,
+            options,
+            pipeline_class,
+            alphabet,
+        )
+        self.profiles = profiles
+
+    def search(self, query: DigitalSequence) -> TopHits:
+        return self.pipeline.scan_seq(query, self.profiles)
+
+
+# --- Pipeline processes -----------------------------------------------------
+
+# the pipeline worker of the current process, created by `_process_initializer`
+_process_worker: typing.Optional[_PipelineThread[typing.Any]] = None
+
+
+def _process_initializer(search: "_Search[_Q]") -> None:
+    """Create the pipeline worker of a new worker process.
+
+    The `_Search` instance is inherited from the parent process when the
+    ``fork`` start method is used, so the target database is not copied
+    to the worker process. The worker thread is only used to recycle the
+    pipeline configuration code, and is never started.
+
+    """
+    global _process_worker
+    _process_worker = search._new_thread(
+        threading.Semaphore(0),
+        queue.Queue(),
+        multiprocessing.Value(ctypes.c_ulong),
+        threading.Event(),
+    )
+
+
+def _process_search(query: _Q) -> bytes:
+    """Process a query in a worker process.
+
+    The hits are returned serialized with `TopHits.dumps`, and must be
+    loaded back with `TopHits.loads` in the main process.
+
+    """
+    assert _process_worker is not None
+    hits = _process_worker.search(query)
+    _process_worker.pipeline.clear()
+    return hits.dumps()
+
+
 # --- Search runners ---------------------------------------------------------
 
 class _Search(typing.Generic[_Q], abc.ABC):
@@ -261,15 +462,19 @@ class _Search(typing.Generic[_Q], abc.ABC):
         callback: typing.Optional[typing.Callable[[_Q, int], None]] = None,
         pipeline_class: typing.Type[Pipeline] = Pipeline,
         alphabet: Alphabet = Alphabet.amino(),
+        backend: str = "thread",
         **options # type: object
     ) -> None:
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Invalid backend: {backend!r}")
         self.queries: typing.Iterable[_Q] = queries
         self.cpus = cpus
         self.callback: typing.Optional[typing.Callable[[_Q, int], None]] = callback
         self.options = options
         self.pipeline_class = pipeline_class
         self.alphabet = alphabet
-        if isinstance(sequences, PipelineSearchTargets):
+        self.backend = backend
+        if isinstance(sequences, (PipelineSearchTargets, FMIndex)):
             self.sequences = sequences
         else:
             self.sequences = PipelineSearchTargets(sequences)
@@ -353,15 +558,74 @@ class _Search(typing.Generic[_Q], abc.ABC):
             kill_switch.set()
             raise
 
+    def _multi_process(self) -> typing.Iterator[TopHits]:
+        # use the `fork` start method so that the worker processes inherit
+        # the target database from the parent process instead of receiving
+        # a copy: since the targets are never written to, their memory
+        # pages stay shared between all processes
+        context = multiprocessing.get_context("fork")
+        callback = self.callback or _PipelineThread._none_callback
+        # record the pending results in submission order, together with
+        # their query so that the callback can be called in this process
+        results: typing.Deque[typing.Tuple[_Q, "multiprocessing.pool.AsyncResult[bytes]"]] = collections.deque()
+        query_count = 0
+
+        # the pool is terminated when exiting the context manager, so that
+        # worker processes are killed if the generator is not exhausted,
+        # e.g. after a KeyboardInterrupt
+        with context.Pool(self.cpus, _process_initializer, (self,)) as pool:
+            for query in self.queries:
+                # submit the next query to the pool; it will be pickled
+                # and sent to a worker process by the pool task handler
+                query_count += 1
+                results.append((query, pool.apply_async(_process_search, (query,))))
+                # yield back results that are already available, and block
+                # on the oldest result if too many queries are pending so
+                # that queries are not all loaded in memory at once
+                while results and (results[0][1].ready() or len(results) > 2 * self.cpus):
+                    done, result = results.popleft()
+                    hits = TopHits.loads(result.get())
+                    callback(done, query_count)
+                    yield hits
+            # yield all remaining results, in order
+            while results:
+                done, result = results.popleft()
+                hits = TopHits.loads(result.get()) # <-- blocks until result is available
+                callback(done, query_count)
+                yield hits
+
     def run(self) -> typing.Iterator[TopHits]:
         if self.cpus == 1:
             return self._single_threaded()
+        elif self.backend == "process":
+            return self._multi_process()
         else:
             return self._multi_threaded()
 
 
 class _ModelSearch(typing.Generic[_M], _Search[_M]):
 
+    def __init__(
+        self,
+        queries: typing.Iterable[_M],
+        sequences: typing.Iterable[DigitalSequence],
+        cpus: int = 0,
+        callback: typing.Optional[typing.Callable[[_M, int], None]] = None,
+        pipeline_class: typing.Type[Pipeline] = Pipeline,
+        alphabet: Alphabet = Alphabet.amino(),
+        backend: str = "thread",
+        shards: int = 1,
+        **options, # type: typing.Dict[str, object]
+    ) -> None:
+        super().__init__(queries, sequences, cpus, callback, pipeline_class, alphabet, backend, **options)
+        if shards < 1:
+            raise ValueError(f"Invalid number of shards: {shards!r}")
+        if shards > 1 and backend != "thread":
+            raise ValueError("Target shards are only supported with the thread backend")
+        if shards > 1 and isinstance(self.sequences, FMIndex):
+            raise ValueError("Target shards are not supported with an FM-index")
+        self.shards = shards
+
     def _new_thread(
         self,
         query_available: threading.Semaphore,
@@ -381,6 +645,177 @@ class _ModelSearch(typing.Generic[_M], _Search[_M]):
             self.alphabet,
         )
 
+    def _new_shard_thread(
+        self,
+        query_available: threading.Semaphore,
+        query_queue: "queue.Queue[typing.Optional[_Chore[typing.Tuple[_M, PipelineSearchTargets]]]]",
+        query_count: "multiprocessing.Value[int]",  # type: ignore
+        kill_switch: threading.Event,
+        options: typing.Dict[str, typing.Any],
+    ) -> _ShardedModelPipelineThread[_M]:
+        return _ShardedModelPipelineThread(
+            self.sequences,
+            query_available,
+            query_queue,  # type: ignore
+            query_count,
+            kill_switch,
+            None,
+            options,
+            self.pipeline_class,
+            self.alphabet,
+        )
+
+    def _sharded(self) -> typing.Iterator[TopHits]:
+        # split the targets into contiguous shards of (almost) equal size,
+        # making sure no shard is empty
+        n = len(self.sequences)
+        k = max(1, min(self.shards, n))
+        shards = [self.sequences[i*n//k:(i+1)*n//k] for i in range(k)]
+        # `Z` is left to be set from the number of targets of each shard
+        # (unless given explicitly), so that merging the hits of the shards
+        # sums it, also when the shards come from a block of a larger search
+        options = self.options.copy()
+
+        # create the semaphore and queues used to pass chores around, each
+        # chore being the search of a query against a single shard
+        query_available = threading.Semaphore(0)
+        results: typing.Deque[typing.Tuple[_M, typing.List[_Chore[typing.Tuple[_M, PipelineSearchTargets]]]]] = collections.deque()
+        query_queue = queue.Queue(maxsize=self.cpus)  # type: ignore
+        query_count = multiprocessing.Value(ctypes.c_ulong)
+        kill_switch = threading.Event()
+        callback = self.callback or _PipelineThread._none_callback
+
+        # create and launch one pipeline thread per CPU
+        threads = []
+        for _ in range(self.cpus):
+            thread = self._new_shard_thread(query_available, query_queue, query_count, kill_switch, options)
+            thread.start()
+            threads.append(thread)
+
+        # merge the hits from every shard, which rethresholds them with
+        # the accounting parameters summed over all the shards
+        def merge_chores() -> TopHits:
+            query, chores = results.popleft()
+            hits = [chore.get() for chore in chores]
+            merged = hits[0].merge(*hits[1:])
+            callback(query, query_count.value)  # type: ignore
+            return merged
+
+        # catch exceptions to kill threads in the background before exiting
+        try:
+            for query in self.queries:
+                # add a chore for each shard to the query queue
+                query_count.value += 1
+                chores = [_Chore((query, shard)) for shard in shards]
+                for chore in chores:
+                    query_queue.put(chore) # <-- blocks if too many chores in queue
+                    query_available.release()
+                results.append((query, chores))
+                # yield the hits of the oldest query if all shards are done
+                if all(chore.available() for chore in results[0][1]):
+                    yield merge_chores()
+            # now that we exhausted all queries, poison pill the
+            # threads so they stop on their own gracefully
+            for _ in threads:
+                query_queue.put(None)
+                query_available.release()
+            # yield all remaining results, in order
+            while results:
+                yield merge_chores() # <-- blocks until results are available
+        except BaseException:
+            # make sure threads are killed to avoid being stuck,
+            # e.g. after a KeyboardInterrupt
+            kill_switch.set()
+            raise
+
+    def run(self) -> typing.Iterator[TopHits]:
+        if self.shards > 1 and self.cpus > 1:
+            return self._sharded()
+        return super().run()
+
+
+class _StreamingModelSearch(typing.Generic[_M]):
+    """A runner searching queries against consecutive blocks of targets.
+
+    Only a single block of target sequences is loaded in memory at a time:
+    all the queries are searched against a block before the next one is
+    read, and the hits of each query are merged across blocks.
+
+    """
+
+    def __init__(
+        self,
+        queries: typing.Iterable[_M],
+        sequences: typing.Iterable[DigitalSequence],
+        block_size: int,
+        cpus: int = 0,
+        callback: typing.Optional[typing.Callable[[_M, int], None]] = None,
+        backend: str = "thread",
+        shards: int = 1,
+        **options, # type: typing.Dict[str, object]
+    ) -> None:
+        if block_size < 1:
+            raise ValueError(f"Invalid block size: {block_size!r}")
+        if isinstance(sequences, SequenceFile) and sequences.alphabet is None:
+            raise ValueError("Sequence file must be opened in digital mode")
+        self.queries = queries
+        self.sequences = sequences
+        self.block_size = block_size
+        self.cpus = cpus
+        self.callback = callback
+        self.backend = backend
+        self.shards = shards
+        self.options = options
+
+    def _blocks(self) -> typing.Iterator[PipelineSearchTargets]:
+        if isinstance(self.sequences, SequenceFile):
+            # recycle the same sequence buffers for every block, since the
+            # hits only reference the targets by index, and parse the
+            # records of each block with the worker threads
+            block = [DigitalSequence(self.sequences.alphabet) for _ in range(self.block_size)]
+            n = self.sequences.readinto_block(block, threads=self.cpus)
+            while n > 0:
+                yield PipelineSearchTargets(block[:n])
+                n = self.sequences.readinto_block(block, threads=self.cpus)
+        else:
+            sequences = iter(self.sequences)
+            targets = list(itertools.islice(sequences, self.block_size))
+            while targets:
+                yield PipelineSearchTargets(targets)
+                targets = list(itertools.islice(sequences, self.block_size))
+
+    def run(self) -> typing.Iterator[TopHits]:
+        # all queries are needed for every block, so they must be loaded
+        queries = list(self.queries)
+        results: typing.List[typing.Optional[TopHits]] = [None] * len(queries)
+        callback = self.callback or _PipelineThread._none_callback
+
+        # search each block, and merge the hits with the ones from previous
+        # blocks; since the hits are thresholded again when merged, `Z` can
+        # be counted as the blocks are searched instead of in a first pass
+        for targets in self._blocks():
+            runner: _ModelSearch[_M] = _ModelSearch(
+                queries,
+                targets,
+                self.cpus,
+                None,
+                backend=self.backend,
+                shards=self.shards,
+                **self.options,
+            )
+            for i, hits in enumerate(runner.run()):
+                block_hits = results[i]
+                results[i] = hits if block_hits is None else block_hits.merge(hits)
+
+        # yield the final hits of each query, searching an empty target
+        # database if there were no target sequences at all
+        if queries and results[0] is None:
+            runner = _ModelSearch(queries, [], 1, None, **self.options)
+            results = list(runner.run())
+        for query, hits in zip(queries, results):
+            callback(query, len(queries))
+            yield typing.cast(TopHits, hits)
+
 
 class _SequenceSearch(_Search[DigitalSequence]):
 
@@ -393,10 +828,13 @@ class _SequenceSearch(_Search[DigitalSequence]):
         callback: typing.Optional[typing.Callable[[DigitalSequence, int], None]] = None,
         pipeline_class: typing.Type[Pipeline] = Pipeline,
         alphabet: Alphabet = Alphabet.amino(),
+        backend: str = "thread",
+        cache: typing.Optional[ModelCache] = None,
         **options, # type: typing.Dict[str, object]
     ) -> None:
-        super().__init__(queries, sequences, cpus, callback, pipeline_class, alphabet, **options)
+        super().__init__(queries, sequences, cpus, callback, pipeline_class, alphabet, backend, **options)
         self.builder = builder
+        self.cache = cache
 
     def _new_thread(
         self,
@@ -416,6 +854,7 @@ class _SequenceSearch(_Search[DigitalSequence]):
             self.pipeline_class,
             self.alphabet,
             self.builder.copy(),
+            self.cache,
         )
 
 
@@ -430,9 +869,10 @@ class _MSASearch(_Search[DigitalMSA]):
         callback: typing.Optional[typing.Callable[[DigitalMSA, int], None]] = None,
         pipeline_class: typing.Type[Pipeline] = Pipeline,
         alphabet: Alphabet = Alphabet.amino(),
+        backend: str = "thread",
         **options, # type: typing.Dict[str, object]
     ) -> None:
-        super().__init__(queries, sequences, cpus, callback, pipeline_class, alphabet, **options)
+        super().__init__(queries, sequences, cpus, callback, pipeline_class, alphabet, backend, **options)
         self.builder = builder
 
     def _new_thread(
@@ -456,6 +896,45 @@ class _MSASearch(_Search[DigitalMSA]):
         )
 
 
+class _ScanSearch(_Search[DigitalSequence]):
+
+    def __init__(
+        self,
+        queries: typing.Iterable[DigitalSequence],
+        profiles: typing.Iterable[OptimizedProfile],
+        cpus: int = 0,
+        callback: typing.Optional[typing.Callable[[DigitalSequence, int], None]] = None,
+        pipeline_class: typing.Type[Pipeline] = Pipeline,
+        alphabet: Alphabet = Alphabet.amino(),
+        backend: str = "thread",
+        **options, # type: typing.Dict[str, object]
+    ) -> None:
+        super().__init__(queries, [], cpus, callback, pipeline_class, alphabet, backend, **options)
+        if isinstance(profiles, PipelineScanTargets):
+            self.profiles = profiles
+        else:
+            self.profiles = PipelineScanTargets(profiles)
+
+    def _new_thread(
+        self,
+        query_available: threading.Semaphore,
+        query_queue: "queue.Queue[typing.Optional[_Chore[DigitalSequence]]]",
+        query_count: "multiprocessing.Value[int]",  # type: ignore
+        kill_switch: threading.Event,
+    ) -> _ScanPipelineThread:
+        return _ScanPipelineThread(
+            self.profiles,
+            query_available,
+            query_queue,
+            query_count,
+            kill_switch,
+            self.callback,
+            self.options,
+            self.pipeline_class,
+            self.alphabet,
+        )
+
+
 # --- hmmsearch --------------------------------------------------------------
 
 def hmmsearch(
@@ -463,6 +942,9 @@ def hmmsearch(
     sequences: typing.Iterable[DigitalSequence],
     cpus: int = 0,
     callback: typing.Optional[typing.Callable[[_M, int], None]] = None,
+    backend: str = "thread",
+    shards: int = 1,
+    block_size: typing.Optional[int] = None,
     **options,  # type: typing.Dict[str, object]
 ) -> typing.Iterator[TopHits]:
     """Search HMM profiles against a sequence database.
@@ -479,6 +961,18 @@ def hmmsearch(
         callback (callable): A callback that is called everytime a query is
             processed with two arguments: the query, and the total number
             of queries. This can be used to display progress in UI.
+        backend (`str`): The parallel backend to use for workers to be
+            executed. Supports ``thread`` to use thread-based parallelism,
+            or ``process`` to use process-based parallelism. See the
+            *Hint* section below for details.
+        shards (`int`): The number of shards to split the target sequences
+            into. Each query is searched against every shard in parallel,
+            and the hits of all shards are merged afterwards. Only supported
+            with the ``thread`` backend.
+        block_size (`int`, optional): The number of target sequences to
+            load in memory at once. If given, the target sequences are read
+            in blocks, instead of being loaded all at once. See the *Hint*
+            section below for details.
 
     Yields:
         `~pyhmmer.plan7.TopHits`: An object reporting *top hits* for each
@@ -487,20 +981,74 @@ def hmmsearch(
     Raises:
         `~pyhmmer.errors.AlphabetMismatch`: When any of the query HMMs
         and the sequences do not share the same alphabet.
+        `ValueError`: When ``shards`` is given with the ``process``
+        backend, or when ``sequences`` is a `~pyhmmer.easel.SequenceFile`
+        not opened in digital mode while streaming.
 
     Note:
         Any additional arguments passed to the `hmmsearch` function will be
         passed transparently to the `~pyhmmer.plan7.Pipeline` to be created.
 
+    Hint:
+        With ``backend="process"``, the queries are dispatched to a pool of
+        worker processes created with the ``fork`` start method, so that
+        the target database is shared with the workers instead of being
+        copied. Queries are sent to the workers using `pickle`, and the
+        results are sent back to the main process in the compact format of
+        `TopHits.dumps`; the callback is called in the main process when
+        the results of a query are yielded. This avoids
+        contention on the GIL when the hits are post-processed in Python,
+        at the cost of serializing the results. Only `HMM` queries can
+        be used with this backend, since `Profile` and `OptimizedProfile`
+        objects cannot be pickled.
+
+    Hint:
+        Queries are processed in parallel, so a search with fewer queries
+        than available CPUs will leave some of them idle. Use ``shards``
+        to split the target sequences as well, so that a single query
+        can be searched with several threads::
+
+            >>> hits = next(pyhmmer.hmmsearch([thioesterase], proteins, cpus=4, shards=4))
+
+        Shards are searched with ``Z`` fixed to the total number of target
+        sequences (unless ``Z`` is given explicitly), and merged with
+        `TopHits.merge`, so that the E-values and the reported hits are the
+        same as with a search against the whole database. Each shard keeps
+        only the hits passing the reporting threshold for the whole
+        database, so the merged `TopHits` may contain fewer hits below the
+        reporting threshold than an unsharded search.
+
+    Hint:
+        Target databases too large to fit in memory can be searched by
+        passing an open `~pyhmmer.easel.SequenceFile` as ``sequences``
+        together with a ``block_size``::
+
+            >>> with SequenceFile("tests/data/seqs/938293.PRJEB85.HG003687.faa", digital=True) as seqs:
+            ...     hits = next(pyhmmer.hmmsearch([thioesterase], seqs, block_size=1000))
+
+        Target sequences are then read in blocks of ``block_size`` sequences
+        recycling the same buffers, and every query is searched against a
+        block before the next one is read. The hits of each query are merged
+        across blocks and thresholded again, so the E-values and the reported
+        hits are the same as with a search against the whole database.
+        Queries are all loaded in memory, and results are only available
+        once all blocks have been searched.
+
     .. versionadded:: 0.1.0
 
     .. versionchanged:: 0.4.9
        Allow using `Profile` and `OptimizedProfile` queries.
 
+    .. versionchanged:: 0.7.0
+       Added the ``backend``, ``shards`` and ``block_size`` arguments.
+
     """
     # count the number of CPUs to use
     _cpus = cpus if cpus > 0 else psutil.cpu_count(logical=False) or os.cpu_count() or 1
-    runner: _ModelSearch[_M] = _ModelSearch(queries, sequences, _cpus, callback, **options) # type: ignore
+    if block_size is not None:
+        streamer: _StreamingModelSearch[_M] = _StreamingModelSearch(queries, sequences, block_size, _cpus, callback, backend=backend, shards=shards, **options) # type: ignore
+        return streamer.run()
+    runner: _ModelSearch[_M] = _ModelSearch(queries, sequences, _cpus, callback, backend=backend, shards=shards, **options) # type: ignore
     return runner.run()
 
 
@@ -512,6 +1060,8 @@ def phmmer(
     cpus: int = 0,
     callback: typing.Optional[typing.Callable[[_S, int], None]] = None,
     builder: typing.Optional[Builder] = None,
+    backend: str = "thread",
+    cache: typing.Optional[ModelCache] = None,
     **options, # type: typing.Dict[str, object]
 ) -> typing.Iterator[TopHits]:
     """Search protein sequences against a sequence database.
@@ -531,6 +1081,15 @@ def phmmer(
         builder (`~pyhmmer.plan7.Builder`, optional): A builder to configure
             how the queries are converted to HMMs. Passing `None` will create
             a default instance.
+        backend (`str`): The parallel backend to use for workers to be
+            executed. Supports ``thread`` to use thread-based parallelism,
+            or ``process`` to use process-based parallelism. See
+            `hmmsearch` for details about the ``process`` backend.
+        cache (`~pyhmmer.hmmer.ModelCache`, optional): A cache of models
+            to reuse the HMMs built from query sequences that were already
+            seen, in this search or in a previous one. Ignored for
+            `DigitalMSA` queries. With ``backend="process"``, each worker
+            process uses its own copy of the cache.
 
     Yields:
         `~pyhmmer.plan7.TopHits`: A *top hits* instance for each query,
@@ -546,6 +1105,9 @@ def phmmer(
     .. versionchanged:: 0.3.0
        Allow using `DigitalMSA` queries.
 
+    .. versionchanged:: 0.7.0
+       Added the ``backend`` and ``cache`` arguments.
+
     """
     _cpus = cpus if cpus > 0 else psutil.cpu_count(logical=False) or os.cpu_count() or 1
     _builder = Builder(Alphabet.amino()) if builder is None else builder
@@ -566,11 +1128,13 @@ def phmmer(
             callback,  # type: ignore
             pipeline_class=Pipeline,
             alphabet=Alphabet.amino(),
+            backend=backend,
+            cache=cache,
             **options
         )
     elif isinstance(_item, DigitalMSA):
         runner = _MSASearch(
-            _builder, _queries, sequences, _cpus, callback, pipeline_class=Pipeline, alphabet=Alphabet.amino(), **options   # type: ignore
+            _builder, _queries, sequences, _cpus, callback, pipeline_class=Pipeline, alphabet=Alphabet.amino(), backend=backend, **options   # type: ignore
         )
     else:
         name = type(_item).__name__
@@ -583,10 +1147,11 @@ def phmmer(
 
 def nhmmer(
     queries: typing.Iterable[_Q],
-    sequences: typing.Iterable[DigitalSequence],
+    sequences: typing.Union[typing.Iterable[DigitalSequence], FMIndex],
     cpus: int = 0,
     callback: typing.Optional[typing.Callable[[_Q, int], None]] = None,
     builder: typing.Optional[Builder] = None,
+    backend: str = "thread",
     **options, # type: typing.Dict[str, object]
 ) -> typing.Iterator[TopHits]:
     """Search nucleotide sequences against a sequence database.
@@ -595,8 +1160,9 @@ def nhmmer(
         queries (iterable of `DigitalSequence`, `DigitalMSA`, `HMM`): The
             query sequences or profiles to search for in the sequence
             database.
-        sequences (collection of `~pyhmmer.easel.DigitalSequence`): A
-            database of sequences to query.
+        sequences (collection of `~pyhmmer.easel.DigitalSequence`, or `~pyhmmer.plan7.FMIndex`):
+            A database of sequences to query, or an FM-index built over
+            the target sequences.
         cpus (`int`): The number of threads to run in parallel. Pass ``1`` to
             run everything in the main thread, ``0`` to automatically
             select a suitable number (using `psutil.cpu_count`), or any
@@ -607,6 +1173,10 @@ def nhmmer(
         builder (`~pyhmmer.plan7.Builder`, optional): A builder to configure
             how the queries are converted to HMMs. Passing `None` will create
             a default instance.
+        backend (`str`): The parallel backend to use for workers to be
+            executed. Supports ``thread`` to use thread-based parallelism,
+            or ``process`` to use process-based parallelism. See
+            `hmmsearch` for details about the ``process`` backend.
 
     Yields:
         `~pyhmmer.plan7.TopHits`: A *top hits* instance for each query,
@@ -616,7 +1186,11 @@ def nhmmer(
         Any additional keyword arguments passed to the `nhmmer` function
         will be passed to the `~pyhmmer.plan7.LongTargetsPipeline` created
         in each worker thread. The ``strand`` argument can be used to
-        restrict the search on the direct or reverse strand.
+        restrict the search on the direct or reverse strand. The
+        ``threads`` argument can be used to split the windows of the target
+        sequences between several threads for each query, which helps
+        when there are fewer queries than CPUs, e.g. when searching a
+        single query against a large genome.
 
     Hint:
         This function is not just `phmmer` for nucleotide sequences; it
@@ -631,6 +1205,9 @@ def nhmmer(
     .. versionchanged:: 0.4.9
        Allow using `Profile` and `OptimizedProfile` queries.
 
+    .. versionchanged:: 0.7.0
+       Added the ``backend`` argument, and support for `~pyhmmer.plan7.FMIndex` targets.
+
     """
     _cpus = cpus if cpus > 0 else psutil.cpu_count(logical=False) or os.cpu_count() or 1
     _builder = Builder(Alphabet.dna()) if builder is None else builder
@@ -651,6 +1228,7 @@ def nhmmer(
             callback,  # type: ignore
             pipeline_class=LongTargetsPipeline,
             alphabet=_item.alphabet if _item is not None else Alphabet.dna(),  # type: ignore
+            backend=backend,
             **options,
         )
     elif isinstance(_item, DigitalMSA):
@@ -662,6 +1240,7 @@ def nhmmer(
             callback,
             pipeline_class=LongTargetsPipeline,
             alphabet=_item.alphabet,
+            backend=backend,
             **options,
         )
     elif isinstance(_item, (HMM, Profile, OptimizedProfile)):
@@ -672,6 +1251,7 @@ def nhmmer(
             callback,  # type: ignore
             pipeline_class=LongTargetsPipeline,
             alphabet=_item.alphabet,
+            backend=backend,
             **options,
         )
     else:
@@ -680,10 +1260,123 @@ def nhmmer(
     return runner.run()
 
 
+# --- hmmscan ----------------------------------------------------------------
+
+def hmmscan(
+    queries: typing.Iterable[DigitalSequence],
+    profiles: typing.Iterable[_M],
+    cpus: int = 0,
+    callback: typing.Optional[typing.Callable[[DigitalSequence, int], None]] = None,
+    background: typing.Optional[Background] = None,
+    backend: str = "thread",
+    **options, # type: typing.Dict[str, object]
+) -> typing.Iterator[TopHits]:
+    """Scan query sequences against a profile database.
+
+    Arguments:
+        queries (iterable of `~pyhmmer.easel.DigitalSequence`): The query
+            sequences to scan the profile database with.
+        profiles (iterable of `HMM`, `Profile` or `OptimizedProfile`): A
+            database of profiles to query. If a pressed `HMMFile` is given,
+            the optimized profiles will be read directly from the pressed
+            database. Pass a `~pyhmmer.plan7.PipelineScanTargets` to reuse
+            the same converted profiles between several calls.
+        cpus (`int`): The number of threads to run in parallel. Pass ``1``
+            to run everything in the main thread, ``0`` to automatically
+            select a suitable number (using `psutil.cpu_count`), or any
+            positive number otherwise.
+        callback (callable): A callback that is called everytime a query is
+            processed with two arguments: the query, and the total number
+            of queries. This can be used to display progress in UI.
+        background (`~pyhmmer.plan7.Background`, optional): A background
+            model to use to configure the `HMM` profiles into optimized
+            profiles. Passing `None` will create a default instance.
+        backend (`str`): The parallel backend to use for workers to be
+            executed. Supports ``thread`` to use thread-based parallelism,
+            or ``process`` to use process-based parallelism. See
+            `hmmsearch` for details about the ``process`` backend.
+
+    Yields:
+        `~pyhmmer.plan7.TopHits`: A *top hits* instance for each query,
+        in the same order the queries were passed in the input.
+
+    Raises:
+        `~pyhmmer.errors.AlphabetMismatch`: When any of the query sequences
+        and the profiles do not share the same alphabet.
+
+    Note:
+        Any additional keyword arguments passed to the `hmmscan` function
+        will be passed to the `~pyhmmer.plan7.Pipeline` created in each
+        worker thread.
+
+    Hint:
+        The profiles are converted to `OptimizedProfile` objects only
+        once before the scan starts, and then shared between the worker
+        threads, instead of being reconfigured from scratch for every
+        query. When given a pressed `HMMFile`, only the MSV filter part
+        of each profile is loaded up front (from the ``.h3f`` file); the
+        rest of a profile is only read from the ``.h3p`` file when a query
+        passes its MSV filter, like ``hmmscan`` does.
+
+    Hint:
+        With ``backend="process"``, pass a
+        `~pyhmmer.plan7.PipelineScanTargets` created with ``shared=True``
+        to store the profiles in a read-only memory-mapped file, which
+        processes started by other means can also attach to.
+
+    .. versionadded:: 0.7.0
+
+    """
+    _cpus = cpus if cpus > 0 else psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+    # read optimized profiles directly if a pressed database is available,
+    # only loading the rest of each profile when it passes the MSV filter
+    if isinstance(profiles, HMMFile) and profiles.is_pressed():
+        profiles = profiles.optimized_profiles(lazy=True)  # type: ignore
+
+    # convert all profiles to optimized profiles once
+    if not isinstance(profiles, PipelineScanTargets):
+        profiles = PipelineScanTargets(profiles, background)  # type: ignore
+    if background is not None:
+        options.setdefault("background", background)  # type: ignore
+
+    runner = _ScanSearch(
+        queries,
+        profiles,  # type: ignore
+        _cpus,
+        callback,
+        pipeline_class=Pipeline,
+        alphabet=profiles.alphabet or Alphabet.amino(),  # type: ignore
+        backend=backend,
+        **options,
+    )
+    return runner.run()
+
+
 # --- hmmpress ---------------------------------------------------------------
 
+def _press_model(hmm: HMM, background: Background, L: int) -> OptimizedProfile:
+    # configure and convert the profile, releasing the GIL in both steps
+    gm = Profile(hmm.M, hmm.alphabet)
+    gm.configure(hmm, background, L)
+    return gm.optimized()
+
+
+def _hmm_fingerprint(hmm: HMM) -> typing.Union[int, bytes]:
+    # use the HMM checksum when available, or a digest of the whole model
+    # otherwise, e.g. for HMMs that were not built from an alignment
+    if hmm.checksum is not None:
+        return hmm.checksum
+    with io.BytesIO() as buffer:
+        hmm.write(buffer, binary=True)
+        return hashlib.sha1(buffer.getvalue()).digest()
+
+
 def hmmpress(
-    hmms: typing.Iterable[HMM], output: typing.Union[str, "os.PathLike[str]"],
+    hmms: typing.Iterable[HMM],
+    output: typing.Union[str, "os.PathLike[str]"],
+    cpus: int = 0,
+    append: bool = False,
 ) -> int:
     """Press several HMMs into a database.
 
@@ -698,38 +1391,107 @@ def hmmpress(
             together in the file.
         output (`str` or `os.PathLike`): The path to an output location
             where to write the different files.
+        cpus (`int`): The number of threads to use to build the optimized
+            profiles. Pass ``1`` to run everything in the main thread,
+            ``0`` to automatically select a suitable number (using
+            `psutil.cpu_count`), or any positive number otherwise.
+        append (`bool`): Set to `True` to add the HMMs to an existing
+            pressed database at the ``output`` location instead of
+            overwriting it, or creating it if it does not exist. HMMs
+            with the same name and checksum as a model of the database
+            are skipped (HMMs without a checksum are compared on their
+            binary serialization instead).
+
+    Returns:
+        `int`: The number of HMMs written to the database.
+
+    Raises:
+        `ValueError`: When an HMM has no name, or when appending an HMM
+            with the same name as a different model of the database.
+        `~pyhmmer.errors.AlphabetMismatch`: When appending HMMs with a
+            different alphabet than the models of the database.
+
+    All the HMMs are checked before any file is opened, so the database
+    is left untouched when one of these errors is raised.
+
+    Hint:
+        Only the conversion of the HMMs into optimized profiles is done
+        in parallel: the models are still written in the main thread, in
+        the order they were given, so the pressed database is the same
+        regardless of the number of threads.
+
+    Hint:
+        In append mode, the new models are written at the end of the
+        ``.h3m``, ``.h3f`` and ``.h3p`` files, which are not rewritten;
+        only the ``.h3i`` index is created again, with the keys of the
+        existing models read from the previous index. Models cannot be
+        replaced, since the files are read sequentially by
+        `~pyhmmer.hmmer.hmmscan`: press the whole database again to
+        update an existing model.
+
+    .. versionadded:: 0.7.0
+       The ``cpus`` and ``append`` arguments.
 
     """
     DEFAULT_L = 400
     path = os.fspath(output)
     nmodel = 0
+    mode = "ab" if append else "wb"
+    _cpus = cpus if cpus > 0 else psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+    # collect the keys of the models already in the database
+    alphabet: typing.Optional[Alphabet] = None
+    entries: typing.List[typing.Tuple[bytes, typing.Optional[bytes], int]] = []
+    fingerprints: typing.Dict[bytes, typing.Union[int, bytes]] = {}
+    if append and os.path.exists("{}.h3m".format(path)):
+        with HMMFile("{}.h3m".format(path)) as hmm_file, SSIReader("{}.h3i".format(path)) as h3i_old:
+            for hmm in hmm_file:
+                alphabet = hmm.alphabet
+                offset = h3i_old.find_name(hmm.name).record_offset
+                entries.append((hmm.name, hmm.accession, offset))
+                fingerprints[hmm.name] = _hmm_fingerprint(hmm)
+
+    # check all the HMMs before opening the files, so that an invalid
+    # model does not leave a truncated or partially appended database
+    models: typing.List[HMM] = []
+    for hmm in hmms:
+        # check that hmm has a name
+        if hmm.name is None:
+            raise ValueError("HMMs must have a name to be pressed.")
+        # skip models already in the database, and reject models that
+        # would shadow a different model with the same name
+        if append:
+            fingerprint = _hmm_fingerprint(hmm)
+            if hmm.name in fingerprints:
+                if fingerprints[hmm.name] == fingerprint:
+                    continue
+                raise ValueError(f"Database already contains a different HMM named {hmm.name!r}")
+            if alphabet is None:
+                alphabet = hmm.alphabet
+            elif hmm.alphabet != alphabet:
+                raise AlphabetMismatch(alphabet, hmm.alphabet)
+            fingerprints[hmm.name] = fingerprint
+        models.append(hmm)
 
     with contextlib.ExitStack() as ctx:
-        h3p = ctx.enter_context(open("{}.h3p".format(path), "wb"))
-        h3m = ctx.enter_context(open("{}.h3m".format(path), "wb"))
-        h3f = ctx.enter_context(open("{}.h3f".format(path), "wb"))
+        h3p = ctx.enter_context(open("{}.h3p".format(path), mode))
+        h3m = ctx.enter_context(open("{}.h3m".format(path), mode))
+        h3f = ctx.enter_context(open("{}.h3f".format(path), mode))
         h3i = ctx.enter_context(SSIWriter("{}.h3i".format(path)))
         fh = h3i.add_file(path, format=0)
 
-        for hmm in hmms:
-            # create the background model on the first iteration
-            if nmodel == 0:
-                bg = Background(hmm.alphabet)
-                bg.L = DEFAULT_L
-
-            # build the optimized models
-            gm = Profile(hmm.M, hmm.alphabet)
-            gm.configure(hmm, bg, DEFAULT_L)
-            om = gm.optimized()
+        # add the keys of the models already in the database
+        for name, accession, offset in entries:
+            h3i.add_key(name, fh, offset, 0, 0)
+            if accession is not None:
+                h3i.add_alias(accession, name)
 
+        def write(hmm: HMM, om: OptimizedProfile) -> None:
             # update the disk offsets of the optimized model to be written
             om.offsets.model = h3m.tell()
             om.offsets.profile = h3p.tell()
             om.offsets.filter = h3f.tell()
 
-            # check that hmm has a name
-            if hmm.name is None:
-                raise ValueError("HMMs must have a name to be pressed.")
             # add the HMM name, and optionally the HMM accession to the index
             h3i.add_key(hmm.name, fh, om.offsets.model, 0, 0)
             if hmm.accession is not None:
@@ -738,12 +1500,133 @@ def hmmpress(
             # write the HMM in binary format, and the optimized profile
             hmm.write(h3m, binary=True)
             om.write(h3f, h3p)
+
+        # build the optimized models in a thread pool, keeping a bounded
+        # number of pending models so that the optimized profiles are not
+        # all kept in memory at once, and write them back in order
+        pool = None
+        if _cpus > 1:
+            pool = ctx.enter_context(concurrent.futures.ThreadPoolExecutor(_cpus))
+        pending: typing.Deque[typing.Tuple[HMM, "concurrent.futures.Future[OptimizedProfile]"]] = collections.deque()
+
+        for hmm in models:
+            # create the background model on the first iteration
+            if nmodel == 0:
+                bg = Background(hmm.alphabet)
+                bg.L = DEFAULT_L
             nmodel += 1
 
+            if pool is None:
+                write(hmm, _press_model(hmm, bg, DEFAULT_L))
+                continue
+
+            pending.append((hmm, pool.submit(_press_model, hmm, bg, DEFAULT_L)))
+            while pending and (pending[0][1].done() or len(pending) > 2 * _cpus):
+                done, future = pending.popleft()
+                write(done, future.result())
+
+        while pending:
+            done, future = pending.popleft()
+            write(done, future.result())
+
     # return the number of written HMMs
     return nmodel
 
 
+# --- hmmbuild ---------------------------------------------------------------
+
+def hmmbuild(
+    msas: typing.Iterable[DigitalMSA],
+    builder: typing.Optional[Builder] = None,
+    background: typing.Optional[Background] = None,
+    cpus: int = 0,
+) -> typing.Iterator[typing.Tuple[HMM, Profile, OptimizedProfile]]:
+    """Build HMMs from several multiple sequence alignments.
+
+    Arguments:
+        msas (iterable of `~pyhmmer.easel.DigitalMSA`): The alignments
+            to build HMMs from. Every alignment must have a name.
+        builder (`~pyhmmer.plan7.Builder`, optional): A builder to use
+            to create the HMMs, or `None` to create a builder with the
+            default parameters for the alphabet of the alignments.
+        background (`~pyhmmer.plan7.Background`, optional): The
+            background model to use to build the HMMs, or `None` to use
+            the default background for the alphabet of the alignments.
+        cpus (`int`): The number of threads to use to build the HMMs.
+            Pass ``1`` to run everything in the main thread, ``0`` to
+            automatically select a suitable number (using
+            `psutil.cpu_count`), or any positive number otherwise.
+
+    Yields:
+        (`~pyhmmer.plan7.HMM`, `~pyhmmer.plan7.Profile`, `~pyhmmer.plan7.OptimizedProfile`):
+        A tuple containing the HMM built from each alignment, as well as
+        profiles to be used directly in a `~pyhmmer.plan7.Pipeline`, in
+        the same order as the alignments.
+
+    Raises:
+        `~pyhmmer.errors.AlphabetMismatch`: When the alignments, the
+            builder and the background do not share the same alphabet.
+        `ValueError`: When a HMM cannot be built from an alignment.
+
+    Hint:
+        Each thread uses its own copy of the builder and of the
+        background model, and `Builder.build_msa` releases the GIL, so
+        the HMMs are built concurrently. A bounded number of alignments
+        are read in advance, so ``msas`` can be a lazy iterator, such as
+        an `~pyhmmer.easel.MSAFile` in digital mode.
+
+    Caution:
+        Like `~pyhmmer.plan7.Builder.build_msa`, this function modifies
+        the alignments it is given (e.g. to store the sequence weights),
+        so the same `~pyhmmer.easel.DigitalMSA` object must not appear
+        several times in ``msas``.
+
+    .. versionadded:: 0.7.0
+
+    """
+    _cpus = cpus if cpus > 0 else psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    msa_iter = peekable(msas)
+
+    # get the alphabet from the first alignment
+    try:
+        alphabet = msa_iter.peek().alphabet
+    except StopIteration:
+        return
+    if builder is None:
+        builder = Builder(alphabet)
+    if background is None:
+        background = Background(alphabet)
+
+    if _cpus == 1:
+        for msa in msa_iter:
+            yield builder.build_msa(msa, background)
+        return
+
+    # give each worker thread its own builder and background, since
+    # building a HMM modifies them
+    local = threading.local()
+    def build(msa: DigitalMSA) -> typing.Tuple[HMM, Profile, OptimizedProfile]:
+        if not hasattr(local, "builder"):
+            local.builder = builder.copy()  # type: ignore
+            local.background = background.copy()  # type: ignore
+        return local.builder.build_msa(msa, local.background)  # type: ignore
+
+    # keep a bounded number of pending alignments, and yield the results
+    # in the order of the alignments
+    with concurrent.futures.ThreadPoolExecutor(_cpus) as pool:
+        pending: typing.Deque["concurrent.futures.Future[typing.Tuple[HMM, Profile, OptimizedProfile]]"] = collections.deque()
+        try:
+            for msa in msa_iter:
+                pending.append(pool.submit(build, msa))
+                while pending and (pending[0].done() or len(pending) > 2 * _cpus):
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 # --- hmmalign ---------------------------------------------------------------
 
 def hmmalign(
@@ -803,15 +1686,18 @@ if __name__ == "__main__":
 
     def _hmmsearch(args: argparse.Namespace) -> int:
         try:
-            with SequenceFile(args.seqdb, digital=True) as seqfile:
-                sequences: typing.List[DigitalSequence] = list(seqfile)  # type: ignore
+            seqfile = SequenceFile(args.seqdb, digital=True)
         except EOFError as err:
             print(err, file=sys.stderr)
             return 1
 
-        with HMMFile(args.hmmfile) as hmms:
+        with seqfile, HMMFile(args.hmmfile) as hmms:
+            if args.block_size is None:
+                sequences: typing.Iterable[DigitalSequence] = list(seqfile)  # type: ignore
+            else:
+                sequences = seqfile  # type: ignore
             queries = hmms.optimized_profiles() if hmms.is_pressed() else hmms
-            hits_list = hmmsearch(queries, sequences, cpus=args.jobs)  # type: ignore
+            hits_list = hmmsearch(queries, sequences, cpus=args.jobs, block_size=args.block_size)  # type: ignore
             for hits in hits_list:
                 for hit in hits:
                     if hit.is_reported():
@@ -876,6 +1762,32 @@ if __name__ == "__main__":
 
         return 0
 
+    def _hmmscan(args: argparse.Namespace) -> int:
+        try:
+            with SequenceFile(args.seqfile, digital=True) as seqfile:
+                queries: typing.List[DigitalSequence] = list(seqfile)  # type: ignore
+        except EOFError as err:
+            print(err, file=sys.stderr)
+            return 1
+
+        with HMMFile(args.hmmdb) as hmms:
+            hits_list = hmmscan(queries, hmms, cpus=args.jobs)  # type: ignore
+            for query, hits in zip(queries, hits_list):
+                for hit in hits:
+                    if hit.is_reported():
+                        print(
+                            hit.name.decode(),
+                            hit.accession.decode() if hit.accession is not None else "-",
+                            query.name.decode(),
+                            "-",
+                            hit.evalue,
+                            hit.score,
+                            hit.bias,
+                            sep="\t",
+                        )
+
+        return 0
+
     def _hmmpress(args: argparse.Namespace) -> int:
         for ext in ["h3m", "h3i", "h3f", "h3p"]:
             path = "{}.{}".format(args.hmmfile, ext)
@@ -887,7 +1799,20 @@ if __name__ == "__main__":
                     return 1
 
         with HMMFile(args.hmmfile) as hmms:
-            hmmpress(hmms, args.hmmfile)
+            hmmpress(hmms, args.hmmfile, cpus=args.jobs)
+
+        return 0
+
+    def _hmmbuild(args: argparse.Namespace) -> int:
+        try:
+            msafile = MSAFile(args.msafile, digital=True)
+        except (EOFError, ValueError) as err:
+            print(err, file=sys.stderr)
+            return 1
+
+        with msafile, open(args.hmmfile, "wb") as out:
+            for hmm, _, _ in hmmbuild(msafile, cpus=args.jobs):  # type: ignore
+                hmm.write(out)
 
         return 0
 
@@ -926,6 +1851,7 @@ if __name__ == "__main__":
     parser_hmmsearch.set_defaults(call=_hmmsearch)
     parser_hmmsearch.add_argument("hmmfile")
     parser_hmmsearch.add_argument("seqdb")
+    parser_hmmsearch.add_argument("-b", "--block-size", required=False, default=None, type=int)
 
     parser_phmmer = subparsers.add_parser("phmmer")
     parser_phmmer.set_defaults(call=_phmmer)
@@ -937,11 +1863,21 @@ if __name__ == "__main__":
     parser_nhmmer.add_argument("seqfile")
     parser_nhmmer.add_argument("seqdb")
 
+    parser_hmmscan = subparsers.add_parser("hmmscan")
+    parser_hmmscan.set_defaults(call=_hmmscan)
+    parser_hmmscan.add_argument("hmmdb")
+    parser_hmmscan.add_argument("seqfile")
+
     parser_hmmpress = subparsers.add_parser("hmmpress")
     parser_hmmpress.set_defaults(call=_hmmpress)
     parser_hmmpress.add_argument("hmmfile")
     parser_hmmpress.add_argument("-f", "--force", action="store_true")
 
+    parser_hmmbuild = subparsers.add_parser("hmmbuild")
+    parser_hmmbuild.set_defaults(call=_hmmbuild)
+    parser_hmmbuild.add_argument("hmmfile")
+    parser_hmmbuild.add_argument("msafile")
+
     parser_hmmalign = subparsers.add_parser("hmmalign")
     parser_hmmalign.set_defaults(call=_hmmalign)
     parser_hmmalign.add_argument(
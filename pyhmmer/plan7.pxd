@@ -3,14 +3,18 @@
 
 # --- C imports --------------------------------------------------------------
 
-from libc.stdint cimport uint32_t
+from libc.stddef cimport ptrdiff_t
+from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t, int64_t
 from posix.types cimport off_t
 
+from libeasel cimport ESL_DSQ
+from libeasel.alphabet cimport ESL_ALPHABET
 from libeasel.sq cimport ESL_SQ
 from libhmmer.p7_alidisplay cimport P7_ALIDISPLAY
 from libhmmer.p7_bg cimport P7_BG
 from libhmmer.p7_builder cimport P7_BUILDER
 from libhmmer.p7_domain cimport P7_DOMAIN
+from libhmmer.fm cimport FM_CFG, FM_DATA
 from libhmmer.p7_hit cimport P7_HIT
 from libhmmer.p7_hmm cimport P7_HMM
 from libhmmer.p7_hmmfile cimport P7_HMMFILE
@@ -25,13 +29,15 @@ IF HMMER_IMPL == "VMX":
 ELIF HMMER_IMPL == "SSE":
     from libhmmer.impl_sse.p7_oprofile cimport P7_OPROFILE
 
-from .easel cimport Alphabet, DigitalSequence, DigitalMSA, KeyHash, MSA, Randomness, VectorF
+from .easel cimport Alphabet, DigitalSequence, DigitalMSA, GeneticCode, KeyHash, MSA, Randomness, VectorF
 
 
 cdef extern from "hmmer.h" nogil:
     DEF p7_NOFFSETS = 3
     DEF p7_NEVPARAM = 6
     DEF p7_NCUTOFFS = 6
+    cdef enum:
+        p7P_NR
 
 
 # --- Cython classes ---------------------------------------------------------
@@ -69,6 +75,7 @@ cdef class Builder:
     cpdef tuple build(self, DigitalSequence sequence, Background background)
     cpdef tuple build_msa(self, DigitalMSA msa, Background background)
     cpdef Builder copy(self)
+    cpdef dict _arguments(self)
 
 
 cdef class Cutoffs:
@@ -100,6 +107,37 @@ cdef class EvalueParameters:
     cpdef VectorF as_vector(self)
 
 
+cdef class FMIndex:
+    cdef FM_CFG*           _cfg
+    cdef FM_DATA*          _fwd
+    cdef FM_DATA*          _bwd
+    cdef uint64_t*         _lengths
+    cdef uint32_t          _ntargets
+    cdef readonly Alphabet alphabet
+
+    cdef int _clear(self) except 1
+    cdef int _read_metadata(self, object fh) except 1
+
+    @staticmethod
+    cdef int _build(
+        uint8_t*  T,
+        int*      SA,
+        uint8_t*  BWT,
+        uint8_t*  Tc,
+        uint32_t* SAsamp,
+        uint16_t* occ_b,
+        uint32_t* occ_sb,
+        int64_t   N,
+        uint32_t  freq_SA,
+        uint32_t  freq_cnt_b,
+        uint32_t  freq_cnt_sb,
+        uint32_t* term_loc,
+    ) nogil except 1
+
+    @staticmethod
+    cdef void _pack(const uint8_t* src, uint8_t* dst, int64_t N) nogil
+
+
 cdef class Hit:
     # a reference to the TopHits that owns the wrapped P7_HIT, kept so that
     # the internal data is never deallocated before the Python class.
@@ -141,23 +179,44 @@ cdef class HMMFile:
     cdef P7_HMMFILE* _hfp
     cdef Alphabet    _alphabet
     cdef object      _file
+    cdef object      _handle
 
     cpdef HMM read(self)
+    cdef list _parse_records(self, bytes data, list bounds, int threads)
+    @staticmethod
+    cdef int _parse_record(
+        const char* mem,
+        size_t size,
+        ESL_ALPHABET* abc,
+        P7_HMM** hmm,
+        char* errbuf,
+    ) nogil
     cpdef void close(self)
     cpdef bint is_pressed(self)
-    cpdef HMMPressedFile optimized_profiles(self)
+    cpdef HMMPressedFile optimized_profiles(self, bint lazy=*)
 
     @staticmethod
     cdef P7_HMMFILE* _open_fileobj(object fh) except *
 
 
+cdef class _PressedDatabase:
+    cdef P7_HMMFILE*     _hfp
+    cdef readonly bytes  path  # the absolute path to the `.h3p` file
+    cdef readonly object lock  # the lock to acquire before reading from `_hfp`
+
+
 cdef class HMMPressedFile:
     cdef P7_HMMFILE* _hfp
     cdef Alphabet _alphabet
     cdef HMMFile _hmmfile
+    cdef bint _lazy
+    cdef _PressedDatabase _pressed
 
     cpdef OptimizedProfile read(self)
 
+    @staticmethod
+    cdef P7_HMMFILE* _open_pressed(bytes path) except NULL
+
 
 cdef class IterationResult:
     cdef readonly TopHits    hits
@@ -185,6 +244,12 @@ cdef class IterativeSearch:
 cdef class OptimizedProfile:
     cdef P7_OPROFILE* _om
     cdef readonly Alphabet alphabet
+    # the pressed database the profile was partially loaded from, used
+    # to read the rest of the profile, or `None` if complete
+    cdef _PressedDatabase _pressed
+    # the object owning the read-only memory the profile points to,
+    # or `None` if the profile owns its vector buffers
+    cdef object _owner
 
     cpdef OptimizedProfile copy(self)
     cpdef bint is_local(self)
@@ -192,6 +257,7 @@ cdef class OptimizedProfile:
 
     # @staticmethod
     cdef int _convert(self, P7_PROFILE* gm) nogil except 1
+    cdef int _read_rest(self) except 1
 
     cpdef object ssv_filter(self, DigitalSequence seq)
 
@@ -201,14 +267,47 @@ cdef class Offsets:
     cdef off_t[p7_NOFFSETS]* _offs
 
 
+cdef class PipelineScanTargets:
+    cdef const    P7_OPROFILE** _refs      # the array to pass the profile references to the C code
+    cdef          size_t        _nref      # the total size of `self._refs`
+    cdef          int           _max_M     # the length of the largest profile in the array
+    cdef          list          _storage   # the actual Python list where `OptimizedProfile` objects are stored
+    cdef          bytes         _pressed_db  # the pressed database of partially loaded profiles, if any
+    cdef          void*         _mem       # the shared memory mapping storing the profiles, if any
+    cdef          size_t        _memsize   # the total size of `self._mem`
+    cdef          str           _path      # the path to the file mapped in `self._mem`, if any
+    cdef          bint          _unlink    # whether to remove the file at `self._path` on deallocation
+    cdef readonly Alphabet      alphabet   # the target alphabets
+
+    cdef int _record_refs(self) except 1
+    cdef int _share(self) except 1
+    cdef int _load_shared(self) except 1
+
+    @staticmethod
+    cdef size_t _shared_size(const P7_OPROFILE* om) nogil
+    @staticmethod
+    cdef void _shared_copy(const P7_OPROFILE* om, char* block) nogil
+    @staticmethod
+    cdef P7_OPROFILE* _shared_attach(char* block, const ESL_ALPHABET* abc) nogil
+
+
 cdef class PipelineSearchTargets:
     cdef const    ESL_SQ**   _refs         # the array to pass the sequence references to the C code
     cdef          size_t     _nref         # the total size of `self._refs`
     cdef          list       _storage      # the actual Python list where `Sequence` objects are stored
     cdef          ssize_t    _max_len      # the length of the largest sequence in the array
     cdef          object     _owner        # the owner, if the object is just a shallow copy
+    cdef          ESL_SQ*    _arena        # the contiguous sequence storage, if built from a file
+    cdef          ESL_DSQ*   _residues     # the contiguous residue buffer of the arena
+    cdef          char*      _strings      # the string pool for names, accessions and descriptions
+    cdef          ESL_DSQ**  _revcomp      # the reverse complement of each sequence, if computed
+    cdef          ESL_DSQ*   _revcomp_dsq  # the contiguous residue buffer of the reverse complements
     cdef readonly Alphabet   alphabet      # the target alphabets
 
+    cdef DigitalSequence _sequence(self, size_t index)
+    cdef int _pack(self, object sequences) except 1
+    cdef int _reverse_complement(self) except 1
+
 
 cdef class Pipeline:
     cdef          object     _Z            # either `Z` as an int, or `None`
@@ -224,15 +323,26 @@ cdef class Pipeline:
 
     cdef OptimizedProfile _optimized
     cdef P7_PIPELINE* _pli
+    cdef P7_HMMFILE*  _pressed_hfp  # a private handle to read partially loaded profiles
+    cdef bytes        _pressed_db   # the path to the pressed database opened in `_pressed_hfp`
 
     cdef int _save_cutoff_parameters(self) except 1
     cdef int _restore_cutoff_parameters(self) except 1
     cdef P7_OPROFILE* _get_om_from_query(self, object query, int L = *) except NULL
+    cdef int _prepare_lazy_scan(self, bytes pressed_db, int M) except 1
     cpdef list    arguments(self)
     cpdef void    clear(self)
     cpdef TopHits search_hmm(self, object query, object seqs)
     cpdef TopHits search_msa(self, DigitalMSA query, object seqs, Builder builder = ?)
     cpdef TopHits search_seq(self, DigitalSequence query, object seqs, Builder builder = ?)
+    cpdef TopHits search_hmm_translated(
+        self,
+        object query,
+        object seqs,
+        GeneticCode genetic_code = ?,
+        int min_length = ?,
+        int64_t block_length = ?,
+    )
     @staticmethod
     cdef  int  _search_loop(
               P7_PIPELINE* pli,
@@ -241,21 +351,57 @@ cdef class Pipeline:
         const ESL_SQ**     sq,
               P7_TOPHITS*  th,
     ) nogil except 1
-    cpdef TopHits scan_seq(self, DigitalSequence query, object hmms)
+    @staticmethod
+    cdef int _map_translated_hits(TopHits hits, list orfs) except 1
+    @staticmethod
+    cdef int64_t _orf_codon_start(const ESL_SQ* orf, int64_t pos) nogil
+    @staticmethod
+    cdef int64_t _orf_codon_end(const ESL_SQ* orf, int64_t pos) nogil
+    cpdef TopHits scan_seq(self, DigitalSequence query, object targets)
+    @staticmethod
     cdef int _scan_loop(
-                           self,
-              P7_PIPELINE* pli,
-              ESL_SQ*      sq,
-              P7_BG*       bg,
-              P7_HMM*      hm,
-              P7_TOPHITS*  th,
-              object       hmm_iter,
-              Alphabet     hmm_alphabet
-    ) except 1
+              P7_PIPELINE*  pli,
+        const ESL_SQ*       sq,
+              P7_BG*        bg,
+        const P7_OPROFILE** om,
+              P7_TOPHITS*   th,
+              P7_HMMFILE*   hfp,
+              P7_OPROFILE*  scratch,
+    ) nogil except 1
 
 
 cdef class LongTargetsPipeline(Pipeline):
-    cdef DigitalSequence _tmpsq
+    cdef int _threads
+
+    cdef TopHits _search_hmm_fm(self, object query, FMIndex index)
+    cdef int _search_loop_parallel(
+        self,
+        P7_OPROFILE*          om,
+        PipelineSearchTargets targets,
+        TopHits               hits,
+        ScoreData             scoredata,
+        int                   threads,
+    ) except 1
+
+    @staticmethod
+    cdef P7_PIPELINE* _clone_pipeline(const P7_PIPELINE* pli) nogil
+
+    @staticmethod
+    cdef int _new_model(P7_PIPELINE* pli, P7_OPROFILE* om, P7_BG* bg) nogil except 1
+
+    @staticmethod
+    cdef int _search_windows(
+              P7_PIPELINE*  pli,
+              P7_OPROFILE*  om,
+              P7_BG*        bg,
+        const ESL_SQ*       sq,
+        const ESL_DSQ*      rc,
+              int64_t       seqidx,
+              int64_t       start,
+              int64_t       end,
+              P7_TOPHITS*   th,
+              P7_SCOREDATA* scoredata,
+    ) nogil except 1
 
     @staticmethod
     cdef int _search_loop_longtargets(
@@ -263,9 +409,9 @@ cdef class LongTargetsPipeline(Pipeline):
               P7_OPROFILE*  om,
               P7_BG*        bg,
         const ESL_SQ**      sq,
+        const ESL_DSQ**     rc,
               P7_TOPHITS*   th,
               P7_SCOREDATA* scoredata,
-              ESL_SQ*       tmpsq,
     ) nogil except 1
 
 
@@ -301,11 +447,28 @@ cdef class TopHits:
     cdef int _sort_by_key(self) nogil except 1
     cdef int _sort_by_seqidx(self) nogil except 1
 
+    @staticmethod
+    cdef uint32_t _load_u32(const uint8_t* buf) nogil
+    @staticmethod
+    cdef uint64_t _load_u64(const uint8_t* buf) nogil
+    @staticmethod
+    cdef const uint8_t* _check_string(const uint8_t* ptr, const uint8_t* end, uint64_t length) nogil
+    @staticmethod
+    cdef ptrdiff_t _check_alidisplay(const uint8_t* buf, size_t size) nogil
+    @staticmethod
+    cdef ptrdiff_t _check_domain(const uint8_t* buf, size_t size) nogil
+    @staticmethod
+    cdef ptrdiff_t _check_hit(const uint8_t* buf, size_t size) nogil
+    @staticmethod
+    cdef ptrdiff_t _check_stats(const uint8_t* buf, size_t size) nogil
+
     cpdef void sort(self, str by=*) except *
     cpdef bint is_sorted(self, str by=*) except *
     cpdef int compare_ranking(self, KeyHash) except -1
     cpdef TopHits copy(self)
+    cpdef bytes dumps(self)
     cpdef MSA to_msa(self, Alphabet alphabet, list sequences=?, list traces=?, bint trim=*, bint digitize=?, bint all_consensus_cols=?)
+    cpdef dict to_arrays(self, bint domains=*)
 
 
 cdef class Trace:
@@ -1,4 +1,5 @@
 # coding: utf-8
+import array
 import collections.abc
 import datetime
 import os
@@ -18,7 +19,9 @@ from .easel import (
     MSA,
     DigitalMSA,
     TextMSA,
+    GeneticCode,
     Randomness,
+    SequenceFile,
     VectorF,
     VectorU8,
     MatrixU8,
@@ -138,6 +141,7 @@ class Builder(object):
         background: Background,
     ) -> typing.Tuple[HMM, Profile, OptimizedProfile]: ...
     def copy(self) -> Builder: ...
+    def _arguments(self) -> typing.Dict[str, typing.Any]: ...
 
 class Cutoffs(object):
     def __init__(self, owner: typing.Union[Profile, HMM]) -> None: ...
@@ -242,6 +246,23 @@ class EvalueParameters:
     def f_lambda(self, l: typing.Optional[float]) -> None: ...
     def as_vector(self) -> VectorF: ...
 
+class FMIndex(typing.Sized):
+    alphabet: Alphabet
+    def __init__(self, file: typing.Union[str, bytes, os.PathLike[str]]) -> None: ...
+    def __len__(self) -> int: ...
+    def __repr__(self) -> str: ...
+    @property
+    def residues(self) -> int: ...
+    @staticmethod
+    def write(
+        sequences: typing.Iterable[DigitalSequence],
+        file: typing.Union[str, bytes, os.PathLike[str]],
+        *,
+        block_size: int = 50000000,
+        sa_freq: int = 8,
+        bin_length: int = 256,
+    ) -> None: ...
+
 class Hit(object):
     hits: TopHits
     @property
@@ -346,6 +367,9 @@ class HMMFile(typing.ContextManager[HMMFile], typing.Iterator[HMM]):
         self,
         file: typing.Union[typing.AnyStr, os.PathLike[typing.AnyStr], typing.BinaryIO],
         db: bool = True,
+        *,
+        threads: int = 0,
+        cache: typing.Union[bool, str, os.PathLike[str]] = False,
     ) -> None: ...
     def __enter__(self) -> HMMFile: ...
     def __exit__(
@@ -361,8 +385,9 @@ class HMMFile(typing.ContextManager[HMMFile], typing.Iterator[HMM]):
     def closed(self) -> bool: ...
     def is_pressed(self) -> bool: ...
     def read(self) -> typing.Optional[HMM]: ...
+    def read_all(self, threads: int = 0) -> typing.List[HMM]: ...
     def close(self) -> None: ...
-    def optimized_profiles(self) -> HMMPressedFile: ...
+    def optimized_profiles(self, lazy: bool = False) -> HMMPressedFile: ...
 
 class HMMPressedFile(typing.Iterator[OptimizedProfile]):
     def __iter__(self) -> HMMPressedFile: ...
@@ -462,8 +487,28 @@ class Offsets(object):
     @profile.setter
     def profile(self, profile: typing.Optional[int]) -> None: ...
 
+class PipelineScanTargets(typing.Sequence[OptimizedProfile]):
+    def __init__(
+        self,
+        profiles: typing.Iterable[typing.Union[HMM, Profile, OptimizedProfile]],
+        background: typing.Optional[Background] = None,
+        shared: bool = False,
+    ) -> None: ...
+    def __iter__(self) -> typing.Iterator[OptimizedProfile]: ...
+    def __len__(self) -> int: ...
+    @typing.overload
+    def __getitem__(self, index: int) -> OptimizedProfile: ...
+    @typing.overload
+    def __getitem__(self, index: slice) -> PipelineScanTargets: ...
+    @property
+    def path(self) -> typing.Optional[str]: ...
+    @classmethod
+    def attach(cls, path: typing.Union[str, os.PathLike[str]]) -> PipelineScanTargets: ...
+
 class PipelineSearchTargets(typing.Sequence[DigitalSequence]):
-    def __init__(self, sequences: typing.Iterable[DigitalSequence]) -> None: ...
+    def __init__(
+        self, sequences: typing.Union[typing.Iterable[DigitalSequence], SequenceFile]
+    ) -> None: ...
     def __iter__(self) -> typing.Iterator[DigitalSequence]: ...
     def __len__(self) -> int: ...
     @typing.overload
@@ -589,10 +634,21 @@ class Pipeline(object):
         sequences: typing.Iterable[DigitalSequence],
         builder: typing.Optional[Builder] = None,
     ) -> TopHits: ...
-    def scan_hmm(
+    def search_hmm_translated(
+        self,
+        query: typing.Union[HMM, Profile, OptimizedProfile],
+        sequences: typing.Iterable[DigitalSequence],
+        genetic_code: typing.Optional[GeneticCode] = None,
+        min_length: int = 20,
+        block_length: int = 1000000,
+    ) -> TopHits: ...
+    def scan_seq(
         self,
         query: DigitalSequence,
-        hmms: typing.Iterable[HMM],
+        targets: typing.Union[
+            PipelineScanTargets,
+            typing.Iterable[typing.Union[HMM, Profile, OptimizedProfile]]
+        ],
     ) -> TopHits: ...
     def iterate_seq(
         self,
@@ -619,6 +675,7 @@ class LongTargetsPipeline(Pipeline):
         B2: int = 240,
         B3: int = 1000,
         block_length: int = 1024 * 256,
+        threads: int = 1,
         bias_filter: bool = True,
         null2: bool = True,
         seed: typing.Optional[int] = None,
@@ -653,6 +710,27 @@ class LongTargetsPipeline(Pipeline):
     def strand(self) -> typing.Optional[STRAND]: ...
     @strand.setter
     def strand(self, strand: typing.Optional[STRAND]) -> None: ...
+    @property
+    def threads(self) -> int: ...
+    @threads.setter
+    def threads(self, threads: int) -> None: ...
+    def search_hmm(
+        self,
+        query: typing.Union[HMM, Profile, OptimizedProfile],
+        sequences: typing.Union[typing.Iterable[DigitalSequence], FMIndex],
+    ) -> TopHits: ...
+    def search_msa(
+        self,
+        query: DigitalMSA,
+        sequences: typing.Union[typing.Iterable[DigitalSequence], FMIndex],
+        builder: typing.Optional[Builder] = None,
+    ) -> TopHits: ...
+    def search_seq(
+        self,
+        query: DigitalSequence,
+        sequences: typing.Union[typing.Iterable[DigitalSequence], FMIndex],
+        builder: typing.Optional[Builder] = None,
+    ) -> TopHits: ...
 
 class Profile(object):
     alphabet: Alphabet
@@ -699,6 +777,8 @@ class ScoreData(object):
     def copy(self) -> ScoreData: ...
 
 class TopHits(typing.Sequence[Hit]):
+    @classmethod
+    def loads(cls, data: typing.ByteString) -> TopHits: ...
     def __init__(self) -> None: ...
     def __bool__(self) -> bool: ...
     def __copy__(self) -> TopHits: ...
@@ -753,6 +833,7 @@ class TopHits(typing.Sequence[Hit]):
     def is_sorted(self, by: SORT_KEY = "key") -> bool: ...
     def copy(self) -> TopHits: ...
     def merge(self, *others: TopHits) -> TopHits: ...
+    def dumps(self) -> bytes: ...
     def to_msa(
         self,
         alphabet: Alphabet,
@@ -763,6 +844,9 @@ class TopHits(typing.Sequence[Hit]):
         digitize: bool = False,
         all_consensus_cols: bool = False,
     ) -> MSA: ...
+    def to_arrays(
+        self, domains: bool = False
+    ) -> typing.Dict[str, typing.Union[bytes, array.array]]: ...
 
 class Trace(object):
     def __init__(self, posteriors: bool = False) -> None: ...
@@ -13,19 +13,23 @@ See Also:
 # --- C imports --------------------------------------------------------------
 
 cimport cython
+from cpython cimport array
 from cpython.bytes cimport PyBytes_FromStringAndSize
 from cpython.list cimport PyList_New, PyList_SET_ITEM
 from cpython.ref cimport PyObject
-from cpython.exc cimport PyErr_Clear
+from cpython.exc cimport PyErr_Clear, PyErr_SetFromErrnoWithFilenameObject
 from cpython.unicode cimport PyUnicode_DecodeASCII
-from libc.math cimport exp, ceil
+from libc.math cimport exp, ceil, sqrt
 from libc.stddef cimport ptrdiff_t
 from libc.stdio cimport printf
 from libc.stdlib cimport calloc, malloc, realloc, free
-from libc.stdint cimport uint8_t, uint32_t, int64_t
-from libc.stdio cimport fprintf, FILE, stdout, fclose
-from libc.string cimport memset, memcpy, memmove, strdup, strndup, strlen, strcmp, strncpy
+from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t, int64_t, UINT32_MAX, UINT64_MAX
+from libc.stdio cimport fprintf, FILE, stdout, fclose, fopen, fread, fseek, SEEK_SET
+from libc.string cimport memchr, memset, memcpy, memmove, strdup, strndup, strlen, strcmp, strncpy
 from libc.time cimport ctime, strftime, time, time_t, tm, localtime_r
+from posix.stdio cimport ftello
+from posix.types cimport off_t
+from posix.mman cimport mmap, munmap, mprotect, PROT_READ, PROT_WRITE, MAP_SHARED, MAP_FAILED
 from unicode cimport PyUnicode_DATA, PyUnicode_KIND, PyUnicode_READ, PyUnicode_READY, PyUnicode_GET_LENGTH
 
 cimport libeasel
@@ -38,6 +42,7 @@ cimport libeasel.scorematrix
 cimport libeasel.getopts
 cimport libeasel.vec
 cimport libhmmer
+cimport libhmmer.fm
 cimport libhmmer.modelconfig
 cimport libhmmer.modelstats
 cimport libhmmer.p7_alidisplay
@@ -45,6 +50,7 @@ cimport libhmmer.p7_hmm
 cimport libhmmer.p7_builder
 cimport libhmmer.p7_bg
 cimport libhmmer.p7_domaindef
+cimport libhmmer.hmmpgmd
 cimport libhmmer.p7_hit
 cimport libhmmer.p7_hmmfile
 cimport libhmmer.p7_pipeline
@@ -54,13 +60,15 @@ cimport libhmmer.p7_scoredata
 cimport libhmmer.p7_tophits
 cimport libhmmer.p7_trace
 cimport libhmmer.tracealign
-from libeasel cimport eslERRBUFSIZE, eslCONST_LOG2R
+from libeasel cimport ESL_DSQ, eslERRBUFSIZE, eslCONST_LOG2, eslCONST_LOG2R
 from libeasel.alphabet cimport ESL_ALPHABET, esl_alphabet_Create, esl_abc_ValidateType
 from libeasel.getopts cimport ESL_GETOPTS, ESL_OPTIONS
 from libeasel.sq cimport ESL_SQ
 from libeasel.keyhash cimport ESL_KEYHASH
 from libeasel.fileparser cimport ESL_FILEPARSER
 from libhmmer cimport p7_LOCAL, p7_EVPARAM_UNSET, p7_CUTOFF_UNSET, p7_NEVPARAM, p7_NCUTOFFS, p7_offsets_e, p7_cutoffs_e, p7_evparams_e
+from libhmmer.hmmpgmd cimport HMMD_SEARCH_STATS, HMMD_SEARCH_STATS_SERIAL_BASE
+from libhmmer.fm cimport FM_CFG, FM_DATA, FM_METADATA, FM_SEQDATA, fm_alphabettypes_e
 from libhmmer.logsum cimport p7_FLogsumInit
 from libhmmer.p7_builder cimport P7_BUILDER, p7_archchoice_e, p7_wgtchoice_e, p7_effnchoice_e
 from libhmmer.p7_hmm cimport p7H_NTRANSITIONS, p7H_TC, p7H_GA, p7H_NC, p7H_MAP
@@ -68,8 +76,9 @@ from libhmmer.p7_hmmfile cimport p7_hmmfile_formats_e
 from libhmmer.p7_hit cimport p7_hitflags_e, P7_HIT
 from libhmmer.p7_alidisplay cimport P7_ALIDISPLAY
 from libhmmer.p7_pipeline cimport P7_PIPELINE, p7_pipemodes_e, p7_zsetby_e, p7_strands_e, p7_complementarity_e
-from libhmmer.p7_profile cimport p7_LOCAL, p7_GLOCAL, p7_UNILOCAL, p7_UNIGLOCAL
+from libhmmer.p7_profile cimport p7_LOCAL, p7_GLOCAL, p7_UNILOCAL, p7_UNIGLOCAL, p7_NO_MODE, p7P_MSC
 from libhmmer.p7_trace cimport P7_TRACE, p7t_statetype_e
+from divsufsort cimport divsufsort
 
 IF HMMER_IMPL == "VMX":
     from libhmmer.impl_vmx cimport p7_oprofile, p7_omx, impl_Init
@@ -77,6 +86,8 @@ IF HMMER_IMPL == "VMX":
     from libhmmer.impl_vmx.p7_oprofile cimport (
         P7_OPROFILE,
         p7O_NQB,
+        p7O_NQW,
+        p7O_NQF,
         p7_oprofile_Compare,
         p7_oprofile_Dump,
         p7_oprofile_Sizeof,
@@ -85,8 +96,12 @@ ELIF HMMER_IMPL == "SSE":
     from libhmmer.impl_sse cimport p7_oprofile, p7_omx, impl_Init, p7_SSVFilter, p7O_EXTRA_SB
     from libhmmer.impl_sse.io cimport p7_oprofile_Write, p7_oprofile_ReadMSV, p7_oprofile_ReadRest
     from libhmmer.impl_sse.p7_oprofile cimport (
+        __m128,
+        __m128i,
         P7_OPROFILE,
         p7O_NQB,
+        p7O_NQW,
+        p7O_NQF,
         p7_oprofile_Compare,
         p7_oprofile_Dump,
         p7_oprofile_Sizeof,
@@ -96,6 +111,9 @@ from .easel cimport (
     Alphabet,
     Sequence,
     DigitalSequence,
+    DigitalSequenceDatabase,
+    SequenceFile,
+    GeneticCode,
     KeyHash,
     MSA,
     TextMSA,
@@ -126,17 +144,22 @@ ELIF UNAME_SYSNAME == "Darwin" or UNAME_SYSNAME.endswith("BSD"):
 
 import array
 import collections.abc
+import concurrent.futures
 import datetime
 import errno
 import math
 import io
 import itertools
 import os
+import shutil
+import struct
 import sys
+import tempfile
+import threading
 import warnings
 
 from .errors import AllocationError, UnexpectedError, AlphabetMismatch
-from .utils import peekable
+from .utils import peekable, ParallelGzipReader
 
 
 # --- Constants --------------------------------------------------------------
@@ -186,6 +209,54 @@ cdef dict PIPELINE_BIT_CUTOFFS = {
     "trusted": libhmmer.p7_hmm.p7H_TC,
 }
 
+# pipeline parameters of a `TopHits` not covered by `HMMD_SEARCH_STATS`,
+# serialized in network order after the hits in `TopHits.dumps`
+cdef object TOPHITS_PIPELINE_STRUCT = struct.Struct(
+    "!"
+    "iddiddi"    # by_E, E, T, dom_by_E, domE, domT, use_bit_cutoffs
+    "iddidd"     # inc_by_E, incE, incT, incdom_by_E, incdomE, incdomT
+    "idddiiiii"  # do_max, F1, F2, F3, B1, B2, B3, do_biasfilter, do_null2
+    "QQQ"        # nres, nnodes, n_output
+    "QQQQQ"      # pos_past_msv, pos_past_bias, pos_past_vit, pos_past_fwd, pos_output
+    "IiIii"      # mode, long_targets, strands, W, block_length
+    "ii"         # is_sorted_by_sortkey, is_sorted_by_seqidx
+)
+
+# layout of the FM-index databases written by `makehmmerdb`, which are
+# stored in native byte order without any padding between fields
+cdef object FMINDEX_HEADER_STRUCT = struct.Struct(
+    "="
+    "BBBB"       # fwd_only, alph_type, alph_size, charBits
+    "IIIH"       # freq_SA, freq_cnt_sb, freq_cnt_b, block_count
+    "IIQ"        # seq_count, ambig_list->count, char_count
+)
+cdef object FMINDEX_SEQDATA_STRUCT = struct.Struct(
+    "="
+    "IQII"       # target_id, target_start, fm_start, length
+    "HHHH"       # name_length, acc_length, source_length, desc_length
+)
+cdef object FMINDEX_AMBIGUITY_STRUCT = struct.Struct(
+    "="
+    "ii"         # lower, upper
+)
+cdef object FMINDEX_BLOCK_STRUCT = struct.Struct(
+    "="
+    "Q"          # N
+    "IIIIII"     # term_loc, seq_offset, ambig_offset, overlap, seq_cnt, ambig_cnt
+)
+
+# header of the files storing shared `PipelineScanTargets`, which are only
+# meant to be read by the same build, and so use the native byte order
+cdef bytes  SHARED_TARGETS_MAGIC  = b"p7st"
+cdef object SHARED_TARGETS_HEADER = struct.Struct(
+    "="
+    "4s"         # magic
+    "Q"          # sizeof(P7_OPROFILE)
+    "i"          # alphabet type
+    "4x"         # padding
+    "Q"          # number of profiles
+)
+
 # --- Cython classes ---------------------------------------------------------
 
 
@@ -948,9 +1019,13 @@ cdef class Builder:
         Create a duplicate `Builder` instance with the same arguments.
 
         """
+        return Builder(self.alphabet, **self._arguments())
+
+    cpdef dict _arguments(self):
+        # the keyword arguments to create a builder with the same
+        # configuration, also used to identify the models it builds
         assert self._bld != NULL
-        return Builder(
-            self.alphabet,
+        return dict(
             architecture=self.architecture,
             weighting=self.weighting,
             effective_number=self.effective_number,
@@ -971,6 +1046,7 @@ cdef class Builder:
             ere=self._bld.re_target,
             popen=self.popen,
             pextend=self.pextend,
+            score_matrix=self.score_matrix,
             window_length=self.window_length,
             window_beta=self.window_beta,
         )
@@ -1556,6 +1632,627 @@ cdef class EvalueParameters:
         return new
 
 
+cdef class FMIndex:
+    """An FM-index over a database of nucleotide sequences.
+
+    FM-indices are the binary databases created by the ``makehmmerdb``
+    program of HMMER. A `LongTargetsPipeline` can search an FM-index
+    instead of a collection of sequences: high-scoring seeds are then
+    found in the index with an SSV-based search, and only the regions
+    around these seeds are passed to the rest of the pipeline, which
+    avoids scanning the whole database with the SSV filter.
+
+    The index is loaded in memory once, and can then be searched several
+    times, possibly by several pipelines running in parallel.
+
+    Attributes:
+        alphabet (`~pyhmmer.easel.Alphabet`): The alphabet of the
+            sequences in the index.
+
+    .. versionadded:: 0.7.0
+
+    """
+
+    DEF FM_BLOCK_OVERLAP = 20000
+
+    # --- Magic methods ------------------------------------------------------
+
+    def __cinit__(self):
+        self._cfg = NULL
+        self._fwd = NULL
+        self._bwd = NULL
+        self._lengths = NULL
+        self._ntargets = 0
+        self.alphabet = None
+
+    def __init__(self, object file):
+        """__init__(self, file)\n--
+
+        Load an FM-index from a file.
+
+        Arguments:
+            file (`str` or `os.PathLike`): The path to an FM-index
+                database, as created by ``makehmmerdb`` or with
+                `FMIndex.write`.
+
+        Raises:
+            `FileNotFoundError`: When the file could not be found.
+            `ValueError`: When the file could not be parsed as an
+                FM-index over nucleotide sequences.
+            `NotImplementedError`: When the platform does not support
+                the SSE implementation of the FM-index search.
+
+        """
+        IF HMMER_IMPL != "SSE":
+            raise NotImplementedError("FM-index search is only available on platforms supporting SSE")
+        ELSE:
+            cdef int          status
+            cdef uint32_t     i
+            cdef uint64_t     end
+            cdef FILE*        fp
+            cdef long         offset
+            cdef FM_METADATA* meta
+            cdef bytes        fspath = os.fsencode(file)
+
+            # release memory in case `__init__` was called more than once
+            self._clear()
+
+            # allocate the configuration and the metadata
+            self._cfg = <FM_CFG*> calloc(1, sizeof(FM_CFG))
+            if self._cfg == NULL:
+                raise AllocationError("FM_CFG", sizeof(FM_CFG))
+            self._cfg.meta = meta = <FM_METADATA*> calloc(1, sizeof(FM_METADATA))
+            if meta == NULL:
+                raise AllocationError("FM_METADATA", sizeof(FM_METADATA))
+            meta.ambig_list = <libhmmer.fm.FM_AMBIGLIST*> calloc(1, sizeof(libhmmer.fm.FM_AMBIGLIST))
+            if meta.ambig_list == NULL:
+                raise AllocationError("FM_AMBIGLIST", sizeof(libhmmer.fm.FM_AMBIGLIST))
+
+            # read the metadata header with Python and record where the
+            # binary blocks of the index start
+            with open(file, "rb") as fh:
+                self._read_metadata(fh)
+                offset = fh.tell()
+
+            # configure the search masks and the alphabet of the index
+            status = libhmmer.fm.fm_configInit(self._cfg, NULL)
+            if status == libeasel.eslEMEM:
+                raise AllocationError("FM_CFG", sizeof(FM_CFG))
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "fm_configInit")
+            status = libhmmer.fm.fm_alphabetCreate(meta, NULL)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "fm_alphabetCreate")
+
+            # use the default seed parameters of `nhmmer`, since they are
+            # set to -1 by `fm_configInit` when no options are given
+            self._cfg.ssv_length = 70
+            self._cfg.max_depth = 15
+            self._cfg.drop_max_len = 4
+            self._cfg.consec_pos_req = 5
+            self._cfg.consensus_match_req = 11
+            self._cfg.drop_lim = 0.3 * eslCONST_LOG2
+            self._cfg.score_density_req = 0.8 * eslCONST_LOG2
+            self._cfg.scthreshFM = 15.0 * eslCONST_LOG2
+            self._cfg.sc_thresh_ratio = 1.0
+
+            # load the forward and backward index of every block
+            self._fwd = <FM_DATA*> calloc(max(meta.block_count, 1), sizeof(FM_DATA))
+            self._bwd = <FM_DATA*> calloc(max(meta.block_count, 1), sizeof(FM_DATA))
+            if self._fwd == NULL or self._bwd == NULL:
+                raise AllocationError("FM_DATA", sizeof(FM_DATA), meta.block_count)
+            fp = fopen(fspath, "rb")
+            if fp == NULL:
+                PyErr_SetFromErrnoWithFilenameObject(OSError, file)
+            with nogil:
+                meta.fp = fp
+                status = libeasel.eslOK if fseek(fp, offset, SEEK_SET) == 0 else libeasel.eslEFORMAT
+                i = 0
+                while status == libeasel.eslOK and i < meta.block_count:
+                    status = libhmmer.fm.fm_FM_read(&self._fwd[i], meta, True)
+                    if status != libeasel.eslOK:
+                        # `fm_FM_read` frees the buffers without resetting them
+                        memset(&self._fwd[i], 0, sizeof(FM_DATA))
+                        break
+                    status = libhmmer.fm.fm_FM_read(&self._bwd[i], meta, False)
+                    if status != libeasel.eslOK:
+                        memset(&self._bwd[i], 0, sizeof(FM_DATA))
+                        break
+                    # the text and the suffix array are only stored once
+                    self._bwd[i].SA = self._fwd[i].SA
+                    self._bwd[i].T = self._fwd[i].T
+                    i += 1
+                fclose(fp)
+                meta.fp = NULL
+            if status == libeasel.eslEMEM:
+                raise AllocationError("FM_DATA", sizeof(FM_DATA))
+            elif status == libeasel.eslEFORMAT:
+                raise ValueError(f"Could not read FM-index block {i} from {file!r}")
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "fm_FM_read")
+
+            # record the number and the full length of every target sequence
+            self._ntargets = 0 if meta.seq_count == 0 else meta.seq_data[meta.seq_count - 1].target_id + 1
+            self._lengths = <uint64_t*> calloc(max(self._ntargets, 1), sizeof(uint64_t))
+            if self._lengths == NULL:
+                raise AllocationError("uint64_t", sizeof(uint64_t), self._ntargets)
+            for i in range(meta.seq_count):
+                if meta.seq_data[i].target_id >= self._ntargets:
+                    raise ValueError(f"Invalid target identifier in FM-index metadata: {meta.seq_data[i].target_id}")
+                end = meta.seq_data[i].target_start + meta.seq_data[i].length - 1
+                if end > self._lengths[meta.seq_data[i].target_id]:
+                    self._lengths[meta.seq_data[i].target_id] = end
+
+            self.alphabet = Alphabet.dna()
+
+    def __dealloc__(self):
+        self._clear()
+
+    def __len__(self):
+        return self._ntargets
+
+    def __repr__(self):
+        return f"<{type(self).__name__} of {self._ntargets} sequences>"
+
+    # --- Properties ---------------------------------------------------------
+
+    @property
+    def residues(self):
+        """`int`: The number of residues indexed in the database.
+        """
+        return 0 if self._cfg == NULL else self._cfg.meta.char_count
+
+    # --- Utils --------------------------------------------------------------
+
+    cdef int _clear(self) except 1:
+        cdef uint16_t i
+        if self._cfg != NULL:
+            if self._fwd != NULL:
+                for i in range(self._cfg.meta.block_count):
+                    libhmmer.fm.fm_FM_destroy(&self._fwd[i], True)
+            if self._bwd != NULL:
+                for i in range(self._cfg.meta.block_count):
+                    libhmmer.fm.fm_FM_destroy(&self._bwd[i], False)
+            # destroys the metadata and the alphabet as well
+            libhmmer.fm.fm_configDestroy(self._cfg)
+        free(self._fwd)
+        free(self._bwd)
+        free(self._lengths)
+        self._cfg = NULL
+        self._fwd = NULL
+        self._bwd = NULL
+        self._lengths = NULL
+        self._ntargets = 0
+        return 0
+
+    cdef int _read_metadata(self, object fh) except 1:
+        cdef uint32_t     i
+        cdef uint32_t     seq_count
+        cdef uint32_t     ambig_count
+        cdef tuple        header
+        cdef tuple        fields
+        cdef list         strings
+        cdef bytes        data
+        cdef int          length
+        cdef FM_METADATA* meta   = self._cfg.meta
+
+        data = fh.read(FMINDEX_HEADER_STRUCT.size)
+        if len(data) != FMINDEX_HEADER_STRUCT.size:
+            raise ValueError("Could not read FM-index metadata: unexpected end of file")
+        header = FMINDEX_HEADER_STRUCT.unpack(data)
+        meta.fwd_only, meta.alph_type, meta.alph_size, meta.charBits = header[:4]
+        meta.freq_SA, meta.freq_cnt_sb, meta.freq_cnt_b, meta.block_count = header[4:8]
+        seq_count, ambig_count, meta.char_count = header[8:]
+
+        # only indices over nucleotide sequences can be searched by `nhmmer`,
+        # and the search requires both the forward and the backward index
+        if meta.alph_type != fm_alphabettypes_e.fm_DNA or meta.alph_size != 4 or meta.charBits != 2:
+            raise ValueError("Could not read FM-index metadata: expected an index over nucleotide sequences")
+        if meta.fwd_only:
+            raise ValueError("Could not read FM-index metadata: index was built with forward strand only")
+        if meta.freq_SA == 0 or meta.freq_SA > 10000 or meta.freq_cnt_b == 0 or meta.freq_cnt_sb == 0:
+            raise ValueError("Could not read FM-index metadata: invalid sampling frequencies")
+
+        # read the metadata of every indexed sequence, only updating the
+        # sequence count once the array is allocated so that
+        # `fm_metaDestroy` never reads uninitialized memory
+        meta.seq_data = <FM_SEQDATA*> calloc(max(seq_count, 1), sizeof(FM_SEQDATA))
+        if meta.seq_data == NULL:
+            raise AllocationError("FM_SEQDATA", sizeof(FM_SEQDATA), seq_count)
+        meta.seq_count = seq_count
+        for i in range(seq_count):
+            data = fh.read(FMINDEX_SEQDATA_STRUCT.size)
+            if len(data) != FMINDEX_SEQDATA_STRUCT.size:
+                raise ValueError("Could not read FM-index metadata: unexpected end of file")
+            fields = FMINDEX_SEQDATA_STRUCT.unpack(data)
+            meta.seq_data[i].target_id = fields[0]
+            meta.seq_data[i].target_start = fields[1]
+            meta.seq_data[i].fm_start = fields[2]
+            meta.seq_data[i].length = fields[3]
+            meta.seq_data[i].name_length = fields[4]
+            meta.seq_data[i].acc_length = fields[5]
+            meta.seq_data[i].source_length = fields[6]
+            meta.seq_data[i].desc_length = fields[7]
+            strings = []
+            for length in fields[4:]:
+                data = fh.read(length + 1)
+                if len(data) != length + 1 or data[length] != 0:
+                    raise ValueError("Could not read FM-index metadata: invalid sequence metadata")
+                strings.append(data)
+            meta.seq_data[i].name = strdup(strings[0])
+            meta.seq_data[i].acc = strdup(strings[1])
+            meta.seq_data[i].source = strdup(strings[2])
+            meta.seq_data[i].desc = strdup(strings[3])
+            if meta.seq_data[i].name == NULL or meta.seq_data[i].acc == NULL or meta.seq_data[i].source == NULL or meta.seq_data[i].desc == NULL:
+                raise AllocationError("char", sizeof(char), sum(fields[4:]) + 4)
+
+        # read the ranges of ambiguous residues
+        meta.ambig_list.ranges = <libhmmer.fm.FM_INTERVAL*> calloc(max(ambig_count, 1), sizeof(libhmmer.fm.FM_INTERVAL))
+        if meta.ambig_list.ranges == NULL:
+            raise AllocationError("FM_INTERVAL", sizeof(libhmmer.fm.FM_INTERVAL), ambig_count)
+        meta.ambig_list.size = max(ambig_count, 1)
+        for i in range(ambig_count):
+            data = fh.read(FMINDEX_AMBIGUITY_STRUCT.size)
+            if len(data) != FMINDEX_AMBIGUITY_STRUCT.size:
+                raise ValueError("Could not read FM-index metadata: unexpected end of file")
+            meta.ambig_list.ranges[i].lower, meta.ambig_list.ranges[i].upper = FMINDEX_AMBIGUITY_STRUCT.unpack(data)
+            meta.ambig_list.count += 1
+
+        return 0
+
+    @staticmethod
+    cdef int _build(
+        uint8_t*  T,
+        int*      SA,
+        uint8_t*  BWT,
+        uint8_t*  Tc,
+        uint32_t* SAsamp,
+        uint16_t* occ_b,
+        uint32_t* occ_sb,
+        int64_t   N,
+        uint32_t  freq_SA,
+        uint32_t  freq_cnt_b,
+        uint32_t  freq_cnt_sb,
+        uint32_t* term_loc,
+    ) nogil except 1:
+        # NOTE: this is a port of `buildAndWriteFMIndex` from `makehmmerdb.c`:
+        #       when `SAsamp` is not NULL, the index is built on the reversed
+        #       text, and the text and suffix array samples are recorded too.
+        cdef int       status
+        cdef int       c
+        cdef int64_t   i
+        cdef int64_t   j
+        cdef int64_t   joffset
+        cdef uint16_t  cnts_b[4]
+        cdef uint32_t  cnts_sb[4]
+        cdef int64_t   num_freq_cnts_b  = 1 + <int64_t> ceil(<double> N / freq_cnt_b)
+        cdef int64_t   num_freq_cnts_sb = 1 + <int64_t> ceil(<double> N / freq_cnt_sb)
+
+        if SAsamp != NULL:
+            libhmmer.fm.fm_reverseString(<char*> T, N - 1)
+
+        # construct the suffix array on the text
+        status = divsufsort(T, SA, N)
+        if status == -2:
+            raise AllocationError("int", sizeof(int), N)
+        elif status != 0:
+            raise UnexpectedError(status, "divsufsort")
+
+        # construct the BWT, the suffix array samples and the occurrence counts
+        for c in range(4):
+            cnts_sb[c] = cnts_b[c] = 0
+            occ_sb[c] = occ_b[c] = 0
+        for j in range(N - 1):
+            T[j] -= 1
+        T[N-1] = 0
+
+        BWT[0] = 0 if SA[0] == 0 else T[SA[0] - 1]
+        cnts_sb[BWT[0]] += 1
+        cnts_b[BWT[0]] += 1
+        if SAsamp != NULL:
+            SAsamp[0] = 0
+
+        term_loc[0] = 0
+        for j in range(1, N):
+            if SA[j] == 0:
+                term_loc[0] = j
+                BWT[j] = 0
+            else:
+                BWT[j] = T[SA[j] - 1]
+            if SAsamp != NULL and j % freq_SA == 0:
+                SAsamp[j // freq_SA] = <uint32_t> -1 if SA[j] == N - 1 else <uint32_t> SA[j]
+            cnts_sb[BWT[j]] += 1
+            cnts_b[BWT[j]] += 1
+            joffset = j + 1
+            if joffset % freq_cnt_b == 0:
+                for c in range(4):
+                    occ_b[4*(joffset // freq_cnt_b) + c] = cnts_b[c]
+                if joffset % freq_cnt_sb == 0:
+                    for c in range(4):
+                        occ_sb[4*(joffset // freq_cnt_sb) + c] = cnts_sb[c]
+                        cnts_b[c] = 0
+        for c in range(4):
+            occ_b[4*(num_freq_cnts_b - 1) + c] = cnts_b[c]
+            occ_sb[4*(num_freq_cnts_sb - 1) + c] = cnts_sb[c]
+
+        # pack the BWT with 4 characters per byte
+        FMIndex._pack(BWT, BWT, N)
+        # de-reverse and pack the text if this is the first pass
+        if SAsamp != NULL:
+            libhmmer.fm.fm_reverseString(<char*> T, N - 1)
+            FMIndex._pack(T, Tc, N)
+
+        # move the text values back up in case another pass is needed
+        for j in range(N - 1):
+            T[j] += 1
+        T[N-1] = 0
+        return 0
+
+    @staticmethod
+    cdef void _pack(const uint8_t* src, uint8_t* dst, int64_t N) nogil:
+        cdef int64_t i = 0
+        while i < N - 3:
+            dst[i//4] = src[i] << 6 | src[i+1] << 4 | src[i+2] << 2 | src[i+3]
+            i += 4
+        if i <= N - 1:
+            dst[i//4] = src[i] << 6
+        if i + 1 <= N - 1:
+            dst[i//4] |= src[i+1] << 4
+        if i + 2 <= N - 1:
+            dst[i//4] |= src[i+2] << 2
+
+    # --- Methods ------------------------------------------------------------
+
+    @staticmethod
+    def write(
+        object sequences,
+        object file,
+        *,
+        uint32_t block_size=50000000,
+        uint32_t sa_freq=8,
+        uint32_t bin_length=256,
+    ):
+        """write(sequences, file, *, block_size=50000000, sa_freq=8, bin_length=256)\n--
+
+        Build an FM-index from nucleotide sequences and write it to a file.
+
+        The database is written in the same binary format as the one used
+        by the ``makehmmerdb`` program of HMMER, so it can be loaded with
+        `FMIndex` or given to ``nhmmer --tformat fmindex``.
+
+        Arguments:
+            sequences (iterable of `~pyhmmer.easel.DigitalSequence`): The
+                nucleotide sequences to index. Ambiguous residues are
+                replaced with random nucleotides in the index, but are
+                masked from the alignments of the search pipeline.
+            file (`str` or `os.PathLike`): The path of the file where to
+                write the index.
+
+        Keyword Arguments:
+            block_size (`int`): The number of residues to index in each
+                block of the FM-index. Sequences longer than this are
+                split across several blocks, with enough overlap between
+                consecutive blocks not to miss any hit.
+            sa_freq (`int`): The sampling rate of the suffix array,
+                which must be a power of 2. Higher values make the index
+                smaller but the search slower.
+            bin_length (`int`): The number of residues in each bin of
+                occurrence counts, which must be a power of 2 between 32
+                and 4096.
+
+        Raises:
+            `ValueError`: When one of the parameters is invalid, or when
+                ``sequences`` contains non-nucleotide sequences.
+
+        Hint:
+            This method corresponds to running ``makehmmerdb`` on the
+            ``sequences``.
+
+        """
+        cdef int64_t         N
+        cdef int64_t         k
+        cdef int64_t         r
+        cdef int64_t         take
+        cdef int64_t         pos            = 0
+        cdef int64_t         overlap
+        cdef int64_t         filled
+        cdef uint32_t        term_loc
+        cdef uint32_t        seq_offset
+        cdef uint32_t        ambig_offset
+        cdef int64_t         compressed_bytes
+        cdef int64_t         num_SA_samples
+        cdef int64_t         num_freq_cnts_b
+        cdef int64_t         num_freq_cnts_sb
+        cdef ESL_DSQ         x
+        cdef ESL_DSQ*        dsq
+        cdef bint            in_ambig_run
+        cdef int             fwd
+        cdef uint64_t        char_count     = 0
+        cdef int             target_id      = -1
+        cdef DigitalSequence seq            = None
+        cdef DigitalSequence chunk_seq
+        cdef Randomness      rng            = Randomness(42, fast=True)
+        cdef list            chunks
+        cdef list            seq_data       = []
+        cdef list            ambig_list     = []
+        cdef list            field
+        cdef uint8_t*        T              = NULL
+        cdef int*            SA             = NULL
+        cdef uint8_t*        BWT            = NULL
+        cdef uint8_t*        Tc             = NULL
+        cdef uint32_t*       SAsamp         = NULL
+        cdef uint16_t*       occ_b          = NULL
+        cdef uint32_t*       occ_sb         = NULL
+        cdef uint32_t        freq_cnt_sb    = 1 << 16
+        cdef size_t          block_count    = 0
+        cdef object          iterator       = iter(sequences)
+
+        if bin_length < 32 or bin_length > 4096 or (bin_length & (bin_length - 1)):
+            raise ValueError(f"Invalid bin length: {bin_length!r}")
+        if sa_freq == 0 or (sa_freq & (sa_freq - 1)):
+            raise ValueError(f"Invalid suffix array sampling rate: {sa_freq!r}")
+        # the text of a block, with the overlap, must be indexable by `int`
+        if block_size == 0 or block_size > 2147483647 - FM_BLOCK_OVERLAP - 1:
+            raise ValueError(f"Invalid block size: {block_size!r}")
+
+        with tempfile.TemporaryFile() as tmp:
+            while True:
+                # collect the chunks of sequences to index in the next block,
+                # splitting the last sequence if it does not fit entirely
+                chunks = []
+                filled = 0
+                while filled < block_size:
+                    if seq is None:
+                        seq = next(iterator, None)
+                        if seq is None:
+                            break
+                        if not seq.alphabet.is_nucleotide():
+                            raise ValueError("Expected nucleotide sequences to build an FM-index")
+                        target_id += 1
+                        pos = 0
+                    # keep some overlap with the previous block to avoid missing
+                    # hits spanning the boundary of the two blocks
+                    overlap = min(FM_BLOCK_OVERLAP, pos)
+                    take = min(seq._sq.n - pos, block_size - filled)
+                    chunks.append((seq, target_id, pos - overlap, overlap + take, overlap))
+                    char_count += take
+                    filled += take
+                    pos += take
+                    if pos >= seq._sq.n:
+                        seq = None
+                if not chunks:
+                    break
+
+                # allocate memory for the block, leaving space for the sentinel
+                N = sum(chunk[3] for chunk in chunks) + 1
+                compressed_bytes = (N + 3) // 4
+                num_SA_samples = N // sa_freq
+                num_freq_cnts_b = 1 + <int64_t> ceil(<double> N / bin_length)
+                num_freq_cnts_sb = 1 + <int64_t> ceil(<double> N / freq_cnt_sb)
+                try:
+                    T = <uint8_t*> malloc(N * sizeof(uint8_t))
+                    SA = <int*> malloc(N * sizeof(int))
+                    BWT = <uint8_t*> malloc(N * sizeof(uint8_t))
+                    Tc = <uint8_t*> malloc(compressed_bytes * sizeof(uint8_t))
+                    SAsamp = <uint32_t*> malloc((num_SA_samples + 1) * sizeof(uint32_t))
+                    occ_b = <uint16_t*> malloc(4 * num_freq_cnts_b * sizeof(uint16_t))
+                    occ_sb = <uint32_t*> malloc(4 * num_freq_cnts_sb * sizeof(uint32_t))
+                    if T == NULL or SA == NULL or BWT == NULL or Tc == NULL or SAsamp == NULL or occ_b == NULL or occ_sb == NULL:
+                        raise AllocationError("uint8_t", sizeof(uint8_t), 7*N)
+
+                    # record the metadata of each chunk (like the sequence
+                    # windows read by `makehmmerdb`, the source defaults to
+                    # the sequence name), then convert the residues to the
+                    # FM alphabet, shifted by 1 to reserve 0 for the sentinel,
+                    # replacing ambiguous residues with random nucleotides
+                    seq_offset = len(seq_data)
+                    ambig_offset = len(ambig_list)
+                    k = 0
+                    for chunk in chunks:
+                        chunk_seq = chunk[0]
+                        seq_data.append((
+                            chunk[1],
+                            chunk[2] + 1,
+                            k,
+                            chunk[3],
+                            [
+                                chunk_seq.name,
+                                chunk_seq.accession,
+                                chunk_seq.source or chunk_seq.name,
+                                chunk_seq.description,
+                            ],
+                        ))
+                        dsq = chunk_seq._sq.dsq
+                        in_ambig_run = False
+                        for r in range(chunk[2] + 1, chunk[2] + chunk[3] + 1):
+                            x = dsq[r]
+                            if x < 4:
+                                T[k] = x + 1
+                                in_ambig_run = False
+                            else:
+                                T[k] = <uint8_t> (libeasel.random.esl_random(rng._rng) * 4) + 1
+                                if in_ambig_run:
+                                    field[1] = k
+                                else:
+                                    field = [k, k]
+                                    ambig_list.append(field)
+                                    in_ambig_run = True
+                            k += 1
+                    T[N-1] = 0
+
+                    # build and write the index on the reversed text, then
+                    # the index on the forward text
+                    for fwd in range(2):
+                        with nogil:
+                            FMIndex._build(
+                                T, SA, BWT, Tc, SAsamp if fwd == 0 else NULL,
+                                occ_b, occ_sb, N, sa_freq, bin_length, freq_cnt_sb,
+                                &term_loc,
+                            )
+                        tmp.write(FMINDEX_BLOCK_STRUCT.pack(
+                            N,
+                            term_loc,
+                            seq_offset,
+                            ambig_offset,
+                            chunks[0][4] if fwd == 0 else 0,
+                            len(chunks),
+                            len(ambig_list) - ambig_offset,
+                        ))
+                        if fwd == 0:
+                            tmp.write(PyBytes_FromStringAndSize(<char*> Tc, compressed_bytes))
+                        tmp.write(PyBytes_FromStringAndSize(<char*> BWT, compressed_bytes))
+                        if fwd == 0 and num_SA_samples > 0:
+                            tmp.write(PyBytes_FromStringAndSize(<char*> SAsamp, num_SA_samples * sizeof(uint32_t)))
+                        tmp.write(PyBytes_FromStringAndSize(<char*> occ_b, 4 * num_freq_cnts_b * sizeof(uint16_t)))
+                        tmp.write(PyBytes_FromStringAndSize(<char*> occ_sb, 4 * num_freq_cnts_sb * sizeof(uint32_t)))
+                finally:
+                    free(T)
+                    free(SA)
+                    free(BWT)
+                    free(Tc)
+                    free(SAsamp)
+                    free(occ_b)
+                    free(occ_sb)
+                    T = BWT = Tc = NULL
+                    SA = NULL
+                    SAsamp = NULL
+                    occ_b = NULL
+                    occ_sb = NULL
+
+                block_count += 1
+                if block_count > 0xFFFF:
+                    raise ValueError("Too many blocks in FM-index, consider using a larger block size")
+
+            # write the metadata, then copy the blocks from the temporary file
+            with open(file, "wb") as dst:
+                dst.write(FMINDEX_HEADER_STRUCT.pack(
+                    False,
+                    fm_alphabettypes_e.fm_DNA,
+                    4,
+                    2,
+                    sa_freq,
+                    freq_cnt_sb,
+                    bin_length,
+                    block_count,
+                    len(seq_data),
+                    len(ambig_list),
+                    char_count,
+                ))
+                for target_id, start, fm_start, length, strings in seq_data:
+                    if any(len(s) > 0xFFFF for s in strings):
+                        raise ValueError(f"Sequence metadata too long for FM-index: {strings[0]!r}")
+                    dst.write(FMINDEX_SEQDATA_STRUCT.pack(
+                        target_id, start, fm_start, length, *map(len, strings)
+                    ))
+                    for s in strings:
+                        dst.write(s)
+                        dst.write(b"\0")
+                for lower, upper in ambig_list:
+                    dst.write(FMINDEX_AMBIGUITY_STRUCT.pack(lower, upper))
+                tmp.seek(0)
+                shutil.copyfileobj(tmp, dst)
+
+
 cdef class Hit:
     """A high-scoring database hit found by the comparison pipeline.
     """
@@ -2781,6 +3478,7 @@ cdef class HMMFile:
 
     _FORMATS = dict(HMM_FILE_FORMATS)
     _MAGIC = dict(HMM_FILE_MAGIC)
+    _CACHE_MAGIC = b"PYHMMER\x00"
 
     # --- Constructor --------------------------------------------------------
 
@@ -2879,14 +3577,76 @@ cdef class HMMFile:
         # return the finalized P7_HMMFILE*
         return hfp
 
+    @staticmethod
+    def _is_gzip(bytes fspath):
+        try:
+            with open(fspath, "rb") as f:
+                return f.read(2) == b"\x1f\x8b"
+        except OSError:
+            return False
+
+    @staticmethod
+    def _open_cache(bytes fspath, object cache, bint db, int threads):
+        cdef HMM     hmm
+        cdef HMMFile hmm_file
+        cdef str     path       = os.fsdecode(fspath)
+        cdef str     cache_path = path + ".h3c" if cache is True else os.fsdecode(cache)
+        cdef object  st         = os.stat(path)
+        cdef bytes   key        = HMMFile._CACHE_MAGIC + struct.pack("<qq", st.st_mtime_ns, st.st_size)
+        cdef object  buffer     = io.BytesIO()
+
+        # use the cache if it was created from the current version of the file
+        try:
+            handle = open(cache_path, "rb")
+        except FileNotFoundError:
+            pass
+        else:
+            if handle.read(len(key)) == key:
+                return handle
+            handle.close()
+
+        # read the HMMs, unless they are already in binary format
+        with HMMFile(fspath, db=db, threads=threads) as hmm_file:
+            if hmm_file._hfp.parser == read_bin30hmm:
+                return None
+            hmms = hmm_file.read_all(threads=threads)
+
+        # serialize the HMMs in binary format
+        buffer.write(key)
+        for hmm in hmms:
+            hmm.write(buffer, binary=True)
+
+        # write the cache to a temporary file first so that concurrent
+        # readers never see a partially written cache
+        tmp = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(cache_path) or None,
+                prefix=".{}.".format(os.path.basename(cache_path)),
+                delete=False,
+            ) as tmp:
+                tmp.write(buffer.getbuffer())
+            # give the cache the permissions of the original file instead
+            # of the restrictive ones of temporary files
+            os.chmod(tmp.name, st.st_mode & 0o666)
+            os.replace(tmp.name, cache_path)
+        except OSError as err:
+            warnings.warn(f"failed to write HMM cache: {err}", RuntimeWarning)
+            if tmp is not None and os.path.exists(tmp.name):
+                os.remove(tmp.name)
+
+        buffer.seek(len(key))
+        return buffer
+
     # --- Magic methods ------------------------------------------------------
 
     def __cinit__(self):
         self._alphabet = None
         self._hfp = NULL
+        self._handle = None
 
-    def __init__(self, object file, bint db = True):
-        """__init__(self, file, db=True)\n--
+    def __init__(self, object file, bint db = True, *, int threads = 0, object cache = False):
+        """__init__(self, file, db=True, *, threads=0, cache=False)\n--
 
         Create a new HMM reader from the given file.
 
@@ -2897,14 +3657,59 @@ cdef class HMMFile:
             db (`bool`): Set to `False` to force the parser to ignore the
                 pressed HMM database if it finds one. Defaults to `True`.
 
+        Keyword Arguments:
+            threads (`int`): The number of threads to use to decompress
+                the file if it is compressed with gzip. Pass ``0`` to use
+                one thread per CPU.
+            cache (`bool`, `str` or `os.PathLike`): Pass `True` to keep
+                a binary copy of the HMMs next to the file, or a path to
+                the binary copy. The copy is created when it does not
+                exist or is outdated, and the HMMs are read from it
+                otherwise.
+
+        Hint:
+            Files compressed with ``bgzip``, or multi-member gzip files
+            with a ``bgzip`` index (``.gzi``) next to them, are made of
+            independent blocks that are decompressed in parallel, ahead
+            of the parser. Other gzip files are decompressed in a
+            background thread.
+
+        Hint:
+            Reading HMMs in binary format is much faster than parsing
+            them from text, so ``cache=True`` is useful for files that
+            are opened many times. The cache stores the modification
+            time and size of the file it was created from, and is only
+            used if they are unchanged. Files in binary format and
+            pressed databases are never cached.
+
+        .. versionadded:: 0.7.0
+           The ``threads`` and ``cache`` keyword arguments.
+
         """
         cdef int       status
         cdef bytes     fspath
         cdef bytearray errbuf = bytearray(eslERRBUFSIZE)
 
+        if threads < 0:
+            raise ValueError(f"`threads` must be positive or null, got {threads!r}")
+
+        if cache and not isinstance(file, (str, bytes, os.PathLike)):
+            raise TypeError("`cache` can only be used when reading from a path")
+
         try:
             fspath = os.fsencode(file)
-            if db:
+            if cache:
+                self._handle = HMMFile._open_cache(fspath, cache, db, threads)
+            if self._handle is None and HMMFile._is_gzip(fspath):
+                self._handle = ParallelGzipReader(file, threads=threads)
+            if self._handle is not None:
+                try:
+                    self._hfp = HMMFile._open_fileobj(self._handle)
+                except BaseException:
+                    self._handle.close()
+                    raise
+                status = libeasel.eslOK
+            elif db:
                 function = "p7_hmmfile_OpenE"
                 status = libhmmer.p7_hmmfile.p7_hmmfile_OpenE(fspath, NULL, &self._hfp, errbuf)
             else:
@@ -3011,6 +3816,179 @@ cdef class HMMFile:
         else:
             raise UnexpectedError(status, "p7_hmmfile_Read")
 
+    def read_all(self, int threads=0):
+        """read_all(self, threads=0)\n--
+
+        Read all the remaining HMMs from the file.
+
+        Arguments:
+            threads (`int`): The number of threads to use to parse the
+                HMMs. Pass ``0`` to use one thread per CPU.
+
+        Returns:
+            `list` of `HMM`: The HMMs remaining in the file, in the order
+            they appear in.
+
+        Raises:
+            `ValueError`: When attempting to read HMMs from a closed file,
+                or when the file could not be parsed.
+            `~pyhmmer.errors.AllocationError`: When memory for the HMMs
+                could not be allocated successfully.
+
+        Example:
+            >>> with HMMFile("tests/data/hmms/txt/PKSI-AT.hmm") as hmm_file:
+            ...     hmms = hmm_file.read_all()
+            >>> [hmm.name for hmm in hmms]
+            [b'PKS-AT.tcoffee']
+
+        Hint:
+            For files in text format, the rest of the file is read in
+            memory, split into records, and the records are parsed in
+            parallel without holding the GIL. HMMs from binary files or
+            pressed databases are read sequentially.
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef HMM          hmm
+        cdef object       first
+        cdef off_t        base
+        cdef size_t       n
+        cdef char[0x10000] buffer
+        cdef bytearray    data     = bytearray()
+        cdef list         bounds   = []
+        cdef list         hmms     = []
+        cdef ssize_t      start    = 0
+        cdef ssize_t      pos
+        cdef ssize_t      eol
+
+        if threads < 0:
+            raise ValueError(f"`threads` must be a positive integer or zero, got {threads!r}")
+        if self._hfp == NULL:
+            raise ValueError("I/O operation on closed file.")
+        if threads == 0:
+            threads = os.cpu_count() or 1
+
+        # binary files are not parsed, and pressed databases are read
+        # from a binary file as well, so simply read HMMs one by one
+        if self._hfp.parser != read_asc30hmm and self._hfp.parser != read_asc20hmm:
+            return list(iter(self.read, None))
+
+        # read the first HMM to consume the format tag, which has been
+        # read already when opening the file, and to get the alphabet
+        if self._hfp.newly_opened:
+            first = self.read()
+            if first is None:
+                return hmms
+            hmms.append(first)
+
+        # read the rest of the file in memory
+        if not self._hfp.do_gzip and not self._hfp.do_stdin:
+            base = ftello(self._hfp.f)
+        else:
+            base = -1
+        n = fread(buffer, 1, sizeof(buffer), self._hfp.f)
+        while n > 0:
+            data.extend(buffer[:n])
+            n = fread(buffer, 1, sizeof(buffer), self._hfp.f)
+
+        # find the boundaries of each record, ending with a `//` line
+        pos = data.find(b"//")
+        while pos != -1:
+            if pos == 0 or data[pos - 1] == ord("\n"):
+                eol = data.find(b"\n", pos)
+                eol = len(data) if eol == -1 else eol + 1
+                bounds.append((start, eol))
+                start = eol
+                pos = data.find(b"//", start)
+            else:
+                pos = data.find(b"//", pos + 2)
+        if data[start:].strip():
+            bounds.append((start, len(data)))
+
+        # parse records in parallel, and record their position in the file
+        for hmm in self._parse_records(bytes(data), bounds, threads):
+            hmm._hmm.offset = hmm._hmm.offset + base if base >= 0 else 0
+            hmms.append(hmm)
+
+        return hmms
+
+    cdef list _parse_records(self, bytes data, list bounds, int threads):
+        cdef HMM           hmm
+        cdef size_t        i
+        cdef const char*   mem    = data
+        cdef ESL_ALPHABET* abc    = self._alphabet._abc
+        cdef list          hmms   = []
+        cdef size_t        length = len(bounds)
+        cdef size_t        chunk  = (length + threads - 1) // threads if length else 1
+
+        for start, end in bounds:
+            hmm = HMM.__new__(HMM)
+            hmm.alphabet = self._alphabet
+            hmm._hmm = NULL
+            hmms.append(hmm)
+
+        def parse(range_):
+            cdef size_t   j
+            cdef int      status = libeasel.eslOK
+            cdef size_t   start_
+            cdef size_t   end_
+            cdef P7_HMM*  p7_hmm
+            cdef bytearray errbuf = bytearray(eslERRBUFSIZE)
+            cdef char*     errptr = errbuf
+
+            for j in range_:
+                start_, end_ = bounds[j]
+                p7_hmm = NULL
+                with nogil:
+                    status = HMMFile._parse_record(&mem[start_], end_ - start_, abc, &p7_hmm, errptr)
+                (<HMM> hmms[j])._hmm = p7_hmm
+                if status == libeasel.eslOK:
+                    p7_hmm.offset = start_
+                # EOF is returned for records without a HMM, such as
+                # trailing comments, which are skipped
+                if status != libeasel.eslOK and status != libeasel.eslEOF:
+                    break
+            return status, bytes(errbuf).split(b"\0", 1)[0]
+
+        ranges = [range(i, min(i + chunk, length)) for i in range(0, length, chunk)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            for status, errbuf in executor.map(parse, ranges):
+                if status == libeasel.eslOK or status == libeasel.eslEOF:
+                    continue
+                elif status == libeasel.eslEMEM:
+                    raise AllocationError("P7_HMM", sizeof(P7_HMM))
+                elif status == libeasel.eslEFORMAT:
+                    raise ValueError("Invalid format in file: {}".format(errbuf.decode("utf-8", "replace")))
+                elif status == libeasel.eslEINCOMPAT:
+                    alphabet = libeasel.alphabet.esl_abc_DecodeType(self._alphabet.type)
+                    raise ValueError("HMM is not in the expected {} alphabet".format(alphabet))
+                else:
+                    raise UnexpectedError(status, "p7_hmmfile_Read")
+
+        return [hmm for hmm in hmms if hmm._hmm != NULL]
+
+    @staticmethod
+    cdef int _parse_record(
+        const char* mem,
+        size_t size,
+        ESL_ALPHABET* abc,
+        P7_HMM** hmm,
+        char* errbuf,
+    ) nogil:
+        cdef int         status
+        cdef P7_HMMFILE* hfp    = NULL
+
+        status = libhmmer.p7_hmmfile.p7_hmmfile_OpenBuffer(mem, size, &hfp)
+        if status == libeasel.eslOK:
+            if hfp.format == p7_hmmfile_formats_e.p7_HMMFILE_20:
+                status = read_asc20hmm(hfp, &abc, hmm)
+            else:
+                status = read_asc30hmm(hfp, &abc, hmm)
+            strncpy(errbuf, hfp.errbuf, eslERRBUFSIZE)
+            libhmmer.p7_hmmfile.p7_hmmfile_Close(hfp)
+        return status
+
     # --- Utils --------------------------------------------------------------
 
     cpdef void close(self):
@@ -3028,6 +4006,9 @@ cdef class HMMFile:
         if self._hfp:
             libhmmer.p7_hmmfile.p7_hmmfile_Close(self._hfp)
             self._hfp = NULL
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
 
     cpdef bint is_pressed(self):
         """is_pressed(self)\n--
@@ -3054,17 +4035,27 @@ cdef class HMMFile:
             raise ValueError("I/O operation on closed file.")
         return self._hfp.is_pressed
 
-    cpdef HMMPressedFile optimized_profiles(self):
-        """optimized_profiles(self)\n--
+    cpdef HMMPressedFile optimized_profiles(self, bint lazy=False):
+        """optimized_profiles(self, lazy=False)\n--
 
         Get an iterator over the `OptimizedProfile` in the HMM database.
 
+        Arguments:
+            lazy (`bool`): Set to `True` to only load the MSV filter
+                parameters of each profile from the ``.h3f`` file. The
+                rest of each profile will only be read from the ``.h3p``
+                file when needed, e.g. when the profile passes the MSV
+                filter in `Pipeline.scan_seq`.
+
         Returns:
             `~pyhmmer.plan7.HMMPressedFile`: An iterator over the optimized
             profiles in a pressed HMM database.
 
         .. versionadded:: 0.4.11
 
+        .. versionchanged:: 0.7.0
+           Added the ``lazy`` keyword argument.
+
         """
         if self._hfp == NULL:
             raise ValueError("I/O operation on closed file.")
@@ -3074,9 +4065,39 @@ cdef class HMMFile:
         optimized._alphabet = self._alphabet
         optimized._hmmfile = self
         optimized._hfp = self._hfp
+        optimized._lazy = lazy
+        if lazy:
+            # the `.h3p` file name is obtained from the `.h3m` file name,
+            # like in `p7_hmmfile_OpenE`, and made absolute so that the
+            # rest of the profiles can still be read after a `os.chdir`
+            path = os.path.abspath(<bytes> self._hfp.fname)[:-1] + b"p"
+            optimized._pressed = _PressedDatabase(path)
         return optimized
 
 
+cdef class _PressedDatabase:
+    """A handle to the ``.h3p`` file of a pressed HMM database.
+
+    The handle is shared by all the profiles partially loaded from the
+    same `HMMPressedFile`, which read the rest of their parameters from
+    it while holding `_PressedDatabase.lock`.
+
+    """
+
+    def __cinit__(self):
+        self._hfp = NULL
+        self.path = None
+        self.lock = None
+
+    def __init__(self, bytes path not None):
+        self.path = path
+        self.lock = threading.Lock()
+        self._hfp = HMMPressedFile._open_pressed(path)
+
+    def __dealloc__(self):
+        libhmmer.p7_hmmfile.p7_hmmfile_Close(self._hfp)
+
+
 cdef class HMMPressedFile:
     """An iterator over each `OptimizedProfile` in a pressed HMM database.
 
@@ -3107,6 +4128,8 @@ cdef class HMMPressedFile:
         self._alphabet = None
         self._hmmfile = None
         self._hfp = NULL
+        self._lazy = False
+        self._pressed = None
 
     def __init__(self, *args, **kwargs):
         cdef str ty = type(self).__name__
@@ -3144,19 +4167,27 @@ cdef class HMMPressedFile:
         cdef int              status
         cdef OptimizedProfile py_om
         cdef P7_OPROFILE*     om     = NULL
+        cdef bint             lazy   = self._lazy
 
         if self._hfp == NULL:
             raise ValueError("I/O operation on closed file.")
 
+        # partially loaded profiles are only supported with SSE, since the
+        # vector buffers are not exposed to Cython for other platforms
+        IF HMMER_IMPL != "SSE":
+            lazy = False
+
         with nogil:
             status = p7_oprofile_ReadMSV(self._hfp, &self._alphabet._abc, &om)
-            if status == libeasel.eslOK:
+            if status == libeasel.eslOK and not lazy:
                 status = p7_oprofile_ReadRest(self._hfp, om)
 
         if status == libeasel.eslOK:
             py_om = OptimizedProfile.__new__(OptimizedProfile)
             py_om.alphabet = self._alphabet # keep a reference to the alphabet
             py_om._om = om
+            if lazy:
+                py_om._pressed = self._pressed
             return py_om
         elif status == libeasel.eslEOF:
             return None
@@ -3172,6 +4203,21 @@ cdef class HMMPressedFile:
         else:
             raise UnexpectedError(status, "p7_oprofile_ReadMSV")
 
+    @staticmethod
+    cdef P7_HMMFILE* _open_pressed(bytes path) except NULL:
+        # create a `P7_HMMFILE` that only wraps the `.h3p` file at `path`,
+        # which is all `p7_oprofile_ReadRest` needs to read the rest of
+        # a partially loaded optimized profile
+        cdef P7_HMMFILE* hfp = <P7_HMMFILE*> calloc(1, sizeof(P7_HMMFILE))
+        if hfp == NULL:
+            raise AllocationError("P7_HMMFILE", sizeof(P7_HMMFILE))
+        hfp.is_pressed = True
+        hfp.pfp = fopen(path, "rb")
+        if hfp.pfp == NULL:
+            libhmmer.p7_hmmfile.p7_hmmfile_Close(hfp)
+            raise FileNotFoundError(errno.ENOENT, "no such file or directory: {!r}".format(path))
+        return hfp
+
 
 cdef class IterationResult:
     """The results of a single iteration from an `IterativeSearch`.
@@ -3347,6 +4393,8 @@ cdef class OptimizedProfile:
 
     def __cinit__(self):
         self._om = NULL
+        self._pressed = None
+        self._owner = None
         self.alphabet = None
 
     def __init__(self, int M, Alphabet alphabet):
@@ -3385,9 +4433,13 @@ cdef class OptimizedProfile:
         if not isinstance(other, OptimizedProfile):
             return NotImplemented
 
-        cdef OptimizedProfile op     = <Profile> other
+        cdef OptimizedProfile op     = <OptimizedProfile> other
         cdef bytearray        errbuf = bytearray(eslERRBUFSIZE)
-        cdef int              status = p7_oprofile_Compare(self._om, op._om, 0.0, errbuf)
+        cdef int              status
+
+        self._read_rest()
+        op._read_rest()
+        status = p7_oprofile_Compare(self._om, op._om, 0.0, errbuf)
 
         if status == libeasel.eslOK:
             return True
@@ -3449,6 +4501,7 @@ cdef class OptimizedProfile:
 
         """
         assert self._om != NULL
+        self._read_rest()
         return None if self._om.acc == NULL else <bytes> self._om.acc
 
     @property
@@ -3459,6 +4512,7 @@ cdef class OptimizedProfile:
 
         """
         assert self._om != NULL
+        self._read_rest()
         return None if self._om.desc == NULL else <bytes> self._om.desc
 
     @property
@@ -3469,6 +4523,7 @@ cdef class OptimizedProfile:
 
         """
         assert self._om != NULL
+        self._read_rest()
         if self._om.consensus[0] == b'\0':
             return None
         return (&self._om.consensus[1]).decode("ascii")
@@ -3481,6 +4536,7 @@ cdef class OptimizedProfile:
 
         """
         assert self._om != NULL
+        self._read_rest()
         if self._om.cs[0] == b'\0':
             return None
         return (&self._om.cs[1]).decode("ascii")
@@ -3588,6 +4644,7 @@ cdef class OptimizedProfile:
         """`~plan7.Cutoffs`: The bitscore cutoffs for this profile, if any.
         """
         assert self._om != NULL
+        self._read_rest()
         cdef Cutoffs cutoffs = Cutoffs.__new__(Cutoffs)
         cutoffs._cutoffs = &self._om.cutoff
         cutoffs._flags = NULL
@@ -3603,6 +4660,7 @@ cdef class OptimizedProfile:
 
         """
         assert self._om != NULL
+        self._read_rest()
         return p7_oprofile.p7_oprofile_IsLocal(self._om)
 
     cpdef OptimizedProfile copy(self):
@@ -3614,6 +4672,7 @@ cdef class OptimizedProfile:
         assert self._om != NULL
         cdef OptimizedProfile new = OptimizedProfile.__new__(OptimizedProfile)
         new.alphabet = self.alphabet
+        new._pressed = self._pressed
         with nogil:
             new._om = p7_oprofile.p7_oprofile_Copy(self._om)
         if new._om == NULL:
@@ -3637,6 +4696,7 @@ cdef class OptimizedProfile:
         cdef FILE*        ffp
 
         assert self._om != NULL
+        self._read_rest()
 
         pfp = fopen_obj(fh_profile, mode="w")
         ffp = fopen_obj(fh_filter, mode="w")
@@ -3660,12 +4720,23 @@ cdef class OptimizedProfile:
             `OptimizedProfile` directly from a profile without having to
             allocate first.
 
+        Raises:
+            `ValueError`: When the optimized profile is stored in read-only
+                memory, e.g. when obtained from a `PipelineScanTargets`
+                created with ``shared=True``.
+
+        .. versionchanged:: 0.7.0
+           Raise `ValueError` when the optimized profile is read-only.
+
         """
         assert self._om != NULL
         assert profile._gm != NULL
 
+        if self._owner is not None:
+            raise ValueError("Cannot convert into a read-only optimized profile")
         with nogil:
             self._convert(profile._gm)
+        self._pressed = None
 
     cdef int _convert(self, P7_PROFILE* gm) nogil except 1:
         cdef int status
@@ -3681,6 +4752,42 @@ cdef class OptimizedProfile:
         elif status != libeasel.eslOK:
             raise UnexpectedError(status, "p7_oprofile_Convert")
 
+    cdef int _read_rest(self) except 1:
+        cdef int              status
+        cdef _PressedDatabase pressed = self._pressed
+
+        # nothing to do if the profile was fully loaded already
+        if pressed is None:
+            return 0
+
+        # read the remaining parameters from the `.h3p` file of the pressed
+        # database: the lock prevents several threads from moving the file
+        # position concurrently, or from filling the same profile twice
+        with pressed.lock:
+            if self._pressed is None:
+                return 0
+            with nogil:
+                status = p7_oprofile_ReadRest(pressed._hfp, self._om)
+            if status == libeasel.eslOK:
+                self._pressed = None
+                return 0
+            # `p7_oprofile_ReadRest` does not release the strings it
+            # allocated before failing, which would leak on a new attempt
+            free(self._om.acc)
+            free(self._om.desc)
+            self._om.acc = NULL
+            self._om.desc = NULL
+
+        if status == libeasel.eslEMEM:
+            raise AllocationError("P7_OPROFILE", sizeof(P7_OPROFILE))
+        elif status == libeasel.eslESYS:
+            raise OSError("failed to read optimized profile from pressed database")
+        elif status == libeasel.eslEFORMAT:
+            errbuf = pressed._hfp.errbuf.decode("utf-8", "replace")
+            raise ValueError("Invalid format in pressed database: {}".format(errbuf))
+        else:
+            raise UnexpectedError(status, "p7_oprofile_ReadRest")
+
     cpdef object ssv_filter(self, DigitalSequence seq):
         """ssv_filter(self, seq)\n--
 
@@ -3806,93 +4913,137 @@ cdef class Offsets:
     @profile.setter
     def profile(self, object profile):
         assert self._offs != NULL
-        self._offs[0][<int> p7_offsets_e.p7_MOFFSET] = -1 if profile is None else profile
+        self._offs[0][<int> p7_offsets_e.p7_POFFSET] = -1 if profile is None else profile
 
 
-cdef class PipelineSearchTargets:
-    """An optimized storage of search target sequences for a `Pipeline`.
+cdef class PipelineScanTargets:
+    """An optimized storage of scan target profiles for a `Pipeline`.
 
-    To pass the target sequences efficiently in `Pipeline.search_hmm`,
-    an array is allocated so that the inner loop can iterate over the
-    target sequences without having to acquire the GIL for each new
-    sequence (this gave a huge performance boost in v0.4.5). However,
-    there was no way to reuse this between different queries; some memory
-    recycling was done, but the target sequences had to be indexed for
-    every query.
+    To pass the target profiles efficiently in `Pipeline.scan_seq`, the
+    profiles are converted to `OptimizedProfile` objects once, and an
+    array of pointers is allocated so that the inner loop can iterate
+    over the target profiles without having to acquire the GIL for each
+    new profile. Unlike an `HMMFile`, this class can be reused between
+    several queries, so the conversion cost is only paid once.
 
-    This class allows the reference array to be maintained between
-    several queries. Internally, `Pipeline.search_hmm` will build one
-    from any other argument type; but if a `PipelineSearchTargets` is
-    passed it will be used as-is in the search loop.
+    When created with ``shared=True``, the vector buffers of all profiles
+    are written to a temporary file, which is then memory-mapped read-only.
+    Other processes can map the same file with `PipelineScanTargets.attach`
+    (which is also used to unpickle shared scan targets), so that several
+    worker processes can scan against the same database without each of
+    them holding a private copy of the profiles, whether they were forked
+    or spawned.
 
     Attributes:
         alphabet (`Alphabet`, *readonly*): The biological alphabet shared by
-            all sequences in the search targets.
+            all profiles in the scan targets.
 
-    .. versionadded:: 0.5.0
+    .. versionadded:: 0.7.0
 
     """
 
     def __cinit__(self):
         self._refs = NULL
         self._nref = 0
-        self._max_len = -1
+        self._max_M = 0
         self._storage = None
+        self._pressed_db = None
+        self._mem = NULL
+        self._memsize = 0
+        self._path = None
+        self._unlink = False
         self.alphabet = None
 
-    def __init__(self, object sequences not None):
-        """__init__(self, sequences)\n--
+    def __init__(
+        self,
+        object profiles not None,
+        Background background = None,
+        bint shared = False,
+    ):
+        """__init__(self, profiles, background=None, shared=False)\n--
 
-        Create a new list of search targets.
+        Create a new list of scan targets.
 
         Arguments:
-            sequence (iterable of `DigitalSequence`): An iterable of sequences
-                stored in digital mode to use as targets for a search
-                pipeline.
+            profiles (iterable of `HMM`, `Profile` or `OptimizedProfile`):
+                An iterable of profiles to use as targets for a scan
+                pipeline. Pass the `HMMPressedFile` returned by
+                `HMMFile.optimized_profiles` to load the optimized profiles
+                of a pressed database without any conversion; profiles
+                loaded with ``lazy=True`` are kept partially loaded, and
+                the rest of each profile will only be read from the pressed
+                database when it passes the MSV filter.
+            background (`~pyhmmer.plan7.Background`, optional): The
+                background model to use to configure `HMM` targets into
+                profiles. Passing `None` will create a default instance.
+            shared (`bool`): Whether to write the optimized profiles to a
+                temporary file memory-mapped read-only, which can be
+                attached to by other processes. Partially loaded profiles
+                are fully loaded before being written. The file is
+                removed when the scan targets are deallocated, and the
+                `OptimizedProfile` objects of shared scan targets cannot
+                be modified in place.
 
         Raises:
-            `~pyhmmer.errors.AlphabetMismatch`: When all sequences don't have
+            `~pyhmmer.errors.AlphabetMismatch`: When all profiles don't have
                 the same `~pyhmmer.easel.Alphabet`.
+            `ValueError`: When partially loaded profiles were obtained
+                from different pressed databases.
 
         """
-        cdef size_t          i
-        cdef DigitalSequence seq
-
-        # store a hard reference to the `Sequence` objects in a list
-        # to prevent the garbage collector from deallocating them
-        #
-        # NB (@althonos): this is not super efficient in terms of memory if
-        #                 the sequences are already in a list, but it's safer
-        #                 to do so rather than trusting the user not to give
-        #                 us an iterator -- besides, we are not duplicating
-        #                 the actual storage, only the Python wrappers, which
-        #                 only store a pointer
-        self._storage = list(sequences)
-
-        # allocate an array to store pointers to the raw sequences
-        self._nref = len(self._storage)
-        self._refs = <const ESL_SQ**> malloc(sizeof(ESL_SQ*) * (self._nref+1))
-        if self._refs == NULL:
-            raise AllocationError("ESL_SQ**", sizeof(ESL_SQ*), (self._nref+1))
-
-        # store the alphabet of the first sequence
-        if self._nref > 0:
-            self.alphabet = self._storage[0].alphabet
+        cdef size_t           i
+        cdef object           target
+        cdef Profile          profile
+        cdef OptimizedProfile om
 
-        # check all sequences have the same alphabet and record a pointer
-        for i, seq in enumerate(self._storage):
+        # convert all profiles to optimized profiles once, storing a hard
+        # reference to the `OptimizedProfile` objects in a list to prevent
+        # the garbage collector from deallocating them
+        self._storage = []
+        for target in profiles:
             # check alphabet
-            if not self.alphabet._eq(seq.alphabet):
-                raise AlphabetMismatch(self.alphabet, seq.alphabet)
-            # record length if maximum
-            if len(seq) > self._max_len:
-                self._max_len = len(seq)
-            # record the pointer to the raw C struct
-            self._refs[i] = <const ESL_SQ*> seq._sq
-        self._refs[self._nref] = NULL
+            if self.alphabet is None:
+                self.alphabet = target.alphabet
+            elif not self.alphabet._eq(target.alphabet):
+                raise AlphabetMismatch(self.alphabet, target.alphabet)
+            # convert to optimized profile if needed
+            if isinstance(target, HMM):
+                if background is None:
+                    background = Background(self.alphabet)
+                profile = Profile(target.M, self.alphabet)
+                profile.configure(target, background, 400)
+                target = profile
+            if isinstance(target, Profile):
+                target = target.optimized()
+            if not isinstance(target, OptimizedProfile):
+                ty = type(target).__name__
+                raise TypeError(f"Expected HMM, Profile or OptimizedProfile, found {ty}")
+            # record the database of partially loaded profiles
+            om = target
+            if om._pressed is not None:
+                if self._pressed_db is None:
+                    self._pressed_db = om._pressed.path
+                elif self._pressed_db != om._pressed.path:
+                    raise ValueError("Cannot mix partially loaded profiles from different databases")
+            # record the largest model size
+            if om._om.M > self._max_M:
+                self._max_M = om._om.M
+            self._storage.append(om)
+
+        # copy the profiles to a shared memory mapping if requested
+        if shared:
+            self._share()
+        self._record_refs()
 
     def __dealloc__(self):
         free(self._refs)
+        if self._mem != NULL:
+            munmap(self._mem, self._memsize)
+        if self._unlink:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
 
     def __iter__(self):
         return iter(self._storage)
@@ -3902,34 +5053,755 @@ cdef class PipelineSearchTargets:
 
     def __getitem__(self, object index):
         if isinstance(index, slice):
-            return PipelineSearchTargets(self._storage[index])
+            return PipelineScanTargets(self._storage[index])
         else:
             return self._storage[index]
 
+    def __reduce__(self):
+        if self._path is None:
+            raise TypeError("Only shared scan targets can be pickled")
+        return type(self).attach, (self._path,)
 
-cdef class Pipeline:
-    """An HMMER3 accelerated sequence/profile comparison pipeline.
+    # --- Properties ---------------------------------------------------------
 
-    The Plan7 pipeline handles the platform-accelerated comparison of
-    sequences to profile HMMs. It performs either a *search* (comparing
-    a single query profile to a target sequence database) or a *scan*
-    (comparing a single query sequence to a target profile database). The
-    two methods are yielding equivalent results: if you have a collection
-    of :math:`M` sequences and :math:`N` HMMs to compare, doing a search
-    or a scan should give the same hits.
+    @property
+    def path(self):
+        """`str` or `None`: The path to the file storing shared profiles.
+        """
+        return self._path
 
-    The main reason for which you should choose *search* or *scan* is the
-    relative size of the sequences and HMMs databases. In the original
-    HMMER3 code, the memory was managed in a way that you never had to
-    load the entirety of the target sequences in memory. In PyHMMER, the
-    *search* methods will **require** that you have the entirety of target
-    sequences loaded in memory, which may not be feasible if you have too
-    many sequences.
+    # --- Methods ------------------------------------------------------------
 
-    Attributes:
-        alphabet (`~pyhmmer.easel.Alphabet`): The alphabet for which the
-            pipeline is configured.
-        background (`~pyhmmer.plan7.Background`): The null background model
+    @classmethod
+    def attach(cls, object path):
+        """attach(cls, path)\n--
+
+        Attach to the profiles of shared scan targets created elsewhere.
+
+        Arguments:
+            path (`str` or `os.PathLike`): The path to the file storing
+                the profiles, as given by the `~PipelineScanTargets.path`
+                property of scan targets created with ``shared=True``.
+
+        Returns:
+            `~pyhmmer.plan7.PipelineScanTargets`: Scan targets using the
+            profiles stored in the file, mapped read-only. The file is
+            not removed when the returned object is deallocated.
+
+        Raises:
+            `ValueError`: When the file does not contain shared scan
+                targets created by this version of PyHMMER.
+
+        Example:
+            >>> targets = PipelineScanTargets([thioesterase], shared=True)
+            >>> attached = PipelineScanTargets.attach(targets.path)
+            >>> attached[0].name == targets[0].name
+            True
+
+        """
+        cdef int                 fd
+        cdef PipelineScanTargets targets = cls.__new__(cls)
+
+        targets._path = os.fsdecode(path)
+        fd = os.open(targets._path, os.O_RDONLY)
+        try:
+            targets._memsize = os.fstat(fd).st_size
+            if targets._memsize < SHARED_TARGETS_HEADER.size:
+                raise ValueError("Invalid shared scan targets: file is too short")
+            targets._mem = mmap(NULL, targets._memsize, PROT_READ, MAP_SHARED, fd, 0)
+            if targets._mem == MAP_FAILED:
+                targets._mem = NULL
+                raise OSError(errno.ENOMEM, "failed to map shared scan targets", targets._path)
+        finally:
+            os.close(fd)
+
+        targets._load_shared()
+        targets._record_refs()
+        return targets
+
+    # --- Utils --------------------------------------------------------------
+
+    cdef int _record_refs(self) except 1:
+        cdef size_t           i
+        cdef OptimizedProfile om
+
+        # allocate an array to store pointers to the raw profiles
+        self._nref = len(self._storage)
+        self._refs = <const P7_OPROFILE**> malloc(sizeof(P7_OPROFILE*) * (self._nref+1))
+        if self._refs == NULL:
+            raise AllocationError("P7_OPROFILE**", sizeof(P7_OPROFILE*), (self._nref+1))
+
+        # record a pointer to each optimized profile, and the largest size
+        for i, om in enumerate(self._storage):
+            self._refs[i] = <const P7_OPROFILE*> om._om
+            if om._om.M > self._max_M:
+                self._max_M = om._om.M
+        self._refs[self._nref] = NULL
+        return 0
+
+    cdef int _share(self) except 1:
+        cdef int              fd
+        cdef size_t           i
+        cdef size_t           size
+        cdef bytes            header
+        cdef OptimizedProfile om
+        cdef list             offsets = []
+        cdef size_t           nprofiles = len(self._storage)
+        cdef int              abctype   = 0 if self.alphabet is None else self.alphabet._abc.type
+
+        IF HMMER_IMPL != "SSE":
+            raise NotImplementedError(f"Shared scan targets are not available on {HMMER_IMPL} platforms")
+
+        # read the rest of partially loaded profiles, since the mapping
+        # will be read-only once the profiles have been copied
+        for om in self._storage:
+            om._read_rest()
+        self._pressed_db = None
+
+        # compute the offset of each profile in the file, after a header
+        # storing the number of profiles and a table of profile offsets
+        size = SHARED_TARGETS_HEADER.size + nprofiles * sizeof(uint64_t)
+        size = (size + 15) & ~(<size_t> 15)
+        for om in self._storage:
+            offsets.append(size)
+            size += PipelineScanTargets._shared_size(om._om)
+
+        # create the file in the temporary folder, and map it in memory
+        # so that the profiles can be written directly to the mapping
+        fd, self._path = tempfile.mkstemp(prefix="pyhmmer-", suffix=".targets")
+        self._unlink = True
+        try:
+            os.ftruncate(fd, size)
+            self._mem = mmap(NULL, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0)
+            if self._mem == MAP_FAILED:
+                self._mem = NULL
+                raise OSError(errno.ENOMEM, "failed to map shared scan targets", self._path)
+            self._memsize = size
+        finally:
+            os.close(fd)
+
+        # write the header, the offset table, then each profile
+        header = SHARED_TARGETS_HEADER.pack(SHARED_TARGETS_MAGIC, sizeof(P7_OPROFILE), abctype, nprofiles)
+        memcpy(self._mem, <char*> header, len(header))
+        for i, om in enumerate(self._storage):
+            (<uint64_t*> (<char*> self._mem + len(header)))[i] = offsets[i]
+            PipelineScanTargets._shared_copy(om._om, <char*> self._mem + <size_t> offsets[i])
+
+        # make the mapping read-only now that it has been filled, and
+        # replace the profiles with the ones stored in the mapping
+        if mprotect(self._mem, self._memsize, PROT_READ) != 0:
+            raise OSError("Failed to make shared memory mapping read-only")
+        return self._load_shared()
+
+    cdef int _load_shared(self) except 1:
+        cdef size_t           i
+        cdef size_t           offset
+        cdef OptimizedProfile om
+        cdef const uint64_t*  offsets
+        cdef list             storage   = []
+        cdef size_t           hsize     = SHARED_TARGETS_HEADER.size
+        cdef bytes            header    = PyBytes_FromStringAndSize(<char*> self._mem, hsize)
+
+        IF HMMER_IMPL != "SSE":
+            raise NotImplementedError(f"Shared scan targets are not available on {HMMER_IMPL} platforms")
+
+        # check the header was written by a compatible build
+        magic, struct_size, abctype, nprofiles = SHARED_TARGETS_HEADER.unpack(header)
+        if magic != SHARED_TARGETS_MAGIC or struct_size != sizeof(P7_OPROFILE):
+            raise ValueError("Invalid shared scan targets: unexpected header")
+        if hsize + nprofiles * sizeof(uint64_t) > self._memsize:
+            raise ValueError("Invalid shared scan targets: file is too short")
+        if self.alphabet is None and nprofiles > 0:
+            self.alphabet = Alphabet.__new__(Alphabet)
+            self.alphabet._init_default(abctype)
+
+        # create an optimized profile pointing to each stored profile
+        offsets = <const uint64_t*> (<char*> self._mem + hsize)
+        for i in range(nprofiles):
+            offset = offsets[i]
+            if offset + sizeof(P7_OPROFILE) > self._memsize:
+                raise ValueError("Invalid shared scan targets: file is too short")
+            om = OptimizedProfile.__new__(OptimizedProfile)
+            om.alphabet = self.alphabet
+            om._owner = self
+            om._om = PipelineScanTargets._shared_attach(<char*> self._mem + offset, self.alphabet._abc)
+            if om._om == NULL:
+                raise AllocationError("P7_OPROFILE", sizeof(P7_OPROFILE))
+            storage.append(om)
+
+        self._storage = storage
+        return 0
+
+    @staticmethod
+    cdef size_t _shared_size(const P7_OPROFILE* om) nogil:
+        cdef size_t size = 0
+        cdef size_t Kp   = om.abc.Kp
+        cdef size_t nqb  = p7O_NQB(om.M)
+        cdef size_t nqw  = p7O_NQW(om.M)
+        cdef size_t nqf  = p7O_NQF(om.M)
+
+        IF HMMER_IMPL == "SSE":
+            # the profile structure, padded to keep vectors aligned
+            size += (sizeof(P7_OPROFILE) + 15) & ~(<size_t> 15)
+            # vector buffers, with 8 rows of transitions for `twv` and `tfv`
+            size += 16 * nqb * Kp
+            size += 16 * (nqb + p7O_EXTRA_SB) * Kp
+            size += 16 * nqw * (Kp + 8)
+            size += 16 * nqf * (Kp + 8)
+            # annotation lines and optional strings, with nul-terminators
+            size += 4 * (om.M + 2)
+            if om.name != NULL:
+                size += strlen(om.name) + 1
+            if om.acc != NULL:
+                size += strlen(om.acc) + 1
+            if om.desc != NULL:
+                size += strlen(om.desc) + 1
+            # pad so that the next profile is aligned on 16 bytes
+            size = (size + 15) & ~(<size_t> 15)
+
+        return size
+
+    @staticmethod
+    cdef void _shared_copy(const P7_OPROFILE* om, char* block) nogil:
+        # store `om` in `block`, replacing its pointers with offsets from
+        # the start of the block so that the stored profile can be used
+        # by any process mapping the block, at any address
+        cdef size_t       x
+        cdef size_t       n
+        cdef P7_OPROFILE* stored = <P7_OPROFILE*> block
+        cdef size_t       offset = (sizeof(P7_OPROFILE) + 15) & ~(<size_t> 15)
+        cdef size_t       Kp     = om.abc.Kp
+        cdef size_t       nqb    = p7O_NQB(om.M)
+        cdef size_t       nqw    = p7O_NQW(om.M)
+        cdef size_t       nqf    = p7O_NQF(om.M)
+
+        memcpy(stored, om, sizeof(P7_OPROFILE))
+        stored.abc      = NULL
+        stored.clone    = 1
+        stored.allocM   = om.M
+        stored.allocQ16 = nqb
+        stored.allocQ8  = nqw
+        stored.allocQ4  = nqf
+
+        IF HMMER_IMPL == "SSE":
+            stored.rbv_mem = stored.sbv_mem = stored.rwv_mem = stored.twv_mem = NULL
+            stored.rfv_mem = stored.tfv_mem = NULL
+            # copy vector rows one by one, since rows may be strided
+            # differently if the source was allocated for a larger model
+            stored.rbv = <__m128i**> offset
+            for x in range(Kp):
+                memcpy(block + offset, om.rbv[x], 16 * nqb)
+                offset += 16 * nqb
+            stored.sbv = <__m128i**> offset
+            for x in range(Kp):
+                memcpy(block + offset, om.sbv[x], 16 * (nqb + p7O_EXTRA_SB))
+                offset += 16 * (nqb + p7O_EXTRA_SB)
+            stored.rwv = <__m128i**> offset
+            for x in range(Kp):
+                memcpy(block + offset, om.rwv[x], 16 * nqw)
+                offset += 16 * nqw
+            stored.twv = <__m128i*> offset
+            memcpy(block + offset, om.twv, 16 * nqw * 8)
+            offset += 16 * nqw * 8
+            stored.rfv = <__m128**> offset
+            for x in range(Kp):
+                memcpy(block + offset, om.rfv[x], 16 * nqf)
+                offset += 16 * nqf
+            stored.tfv = <__m128*> offset
+            memcpy(block + offset, om.tfv, 16 * nqf * 8)
+            offset += 16 * nqf * 8
+            # copy annotation lines
+            stored.rf = <char*> offset
+            memcpy(block + offset, om.rf, om.M + 2)
+            offset += om.M + 2
+            stored.mm = <char*> offset
+            memcpy(block + offset, om.mm, om.M + 2)
+            offset += om.M + 2
+            stored.cs = <char*> offset
+            memcpy(block + offset, om.cs, om.M + 2)
+            offset += om.M + 2
+            stored.consensus = <char*> offset
+            memcpy(block + offset, om.consensus, om.M + 2)
+            offset += om.M + 2
+            # copy optional strings
+            if om.name != NULL:
+                n = strlen(om.name) + 1
+                stored.name = <char*> offset
+                memcpy(block + offset, om.name, n)
+                offset += n
+            if om.acc != NULL:
+                n = strlen(om.acc) + 1
+                stored.acc = <char*> offset
+                memcpy(block + offset, om.acc, n)
+                offset += n
+            if om.desc != NULL:
+                n = strlen(om.desc) + 1
+                stored.desc = <char*> offset
+                memcpy(block + offset, om.desc, n)
+                offset += n
+
+    @staticmethod
+    cdef P7_OPROFILE* _shared_attach(char* block, const ESL_ALPHABET* abc) nogil:
+        # create a profile pointing to the profile stored in `block` by
+        # `_shared_copy`, turning the stored offsets back into pointers
+        cdef size_t             x
+        cdef P7_OPROFILE*       om
+        cdef const P7_OPROFILE* stored = <const P7_OPROFILE*> block
+        cdef size_t             Kp     = abc.Kp
+        cdef size_t             nqb    = p7O_NQB(stored.M)
+        cdef size_t             nqw    = p7O_NQW(stored.M)
+        cdef size_t             nqf    = p7O_NQF(stored.M)
+
+        # allocate the row pointers together with the profile, so that
+        # `p7_oprofile_Destroy` releases both when the profile is a clone
+        om = <P7_OPROFILE*> malloc(sizeof(P7_OPROFILE) + 4 * Kp * sizeof(void*))
+        if om == NULL:
+            return NULL
+        memcpy(om, stored, sizeof(P7_OPROFILE))
+        om.abc = abc
+
+        IF HMMER_IMPL == "SSE":
+            om.rbv = <__m128i**> (om + 1)
+            om.sbv = om.rbv + Kp
+            om.rwv = om.sbv + Kp
+            om.rfv = <__m128**> (om.rwv + Kp)
+            for x in range(Kp):
+                om.rbv[x] = <__m128i*> (block + <size_t> stored.rbv + x * 16 * nqb)
+                om.sbv[x] = <__m128i*> (block + <size_t> stored.sbv + x * 16 * (nqb + p7O_EXTRA_SB))
+                om.rwv[x] = <__m128i*> (block + <size_t> stored.rwv + x * 16 * nqw)
+                om.rfv[x] = <__m128*> (block + <size_t> stored.rfv + x * 16 * nqf)
+            om.twv = <__m128i*> (block + <size_t> stored.twv)
+            om.tfv = <__m128*> (block + <size_t> stored.tfv)
+            om.rf = block + <size_t> stored.rf
+            om.mm = block + <size_t> stored.mm
+            om.cs = block + <size_t> stored.cs
+            om.consensus = block + <size_t> stored.consensus
+            om.name = NULL if stored.name == NULL else block + <size_t> stored.name
+            om.acc = NULL if stored.acc == NULL else block + <size_t> stored.acc
+            om.desc = NULL if stored.desc == NULL else block + <size_t> stored.desc
+
+        return om
+
+
+cdef class PipelineSearchTargets:
+    """An optimized storage of search target sequences for a `Pipeline`.
+
+    To pass the target sequences efficiently in `Pipeline.search_hmm`,
+    an array is allocated so that the inner loop can iterate over the
+    target sequences without having to acquire the GIL for each new
+    sequence (this gave a huge performance boost in v0.4.5). However,
+    there was no way to reuse this between different queries; some memory
+    recycling was done, but the target sequences had to be indexed for
+    every query.
+
+    This class allows the reference array to be maintained between
+    several queries. Internally, `Pipeline.search_hmm` will build one
+    from any other argument type; but if a `PipelineSearchTargets` is
+    passed it will be used as-is in the search loop.
+
+    When created from a `~pyhmmer.easel.SequenceFile` or a
+    `~pyhmmer.easel.DigitalSequenceDatabase`, the sequences are not
+    wrapped into individual `~pyhmmer.easel.DigitalSequence` objects:
+    the residues of all sequences are packed into a single contiguous
+    buffer, and their names, accessions and descriptions into a single
+    string pool. This avoids allocating several blocks of memory for each
+    target, which adds up for databases of millions of short sequences.
+
+    When used as the targets of a `LongTargetsPipeline`, the reverse
+    complement of each sequence is computed once, during the first search
+    of the bottom strand, and then shared by all the following queries.
+    The sequences should therefore not be modified after the search
+    targets have been created.
+
+    Attributes:
+        alphabet (`Alphabet`, *readonly*): The biological alphabet shared by
+            all sequences in the search targets.
+
+    .. versionadded:: 0.5.0
+
+    .. versionchanged:: 0.7.0
+       Support building contiguous search targets from a sequence file,
+       and cache the reverse complement of long targets.
+
+    """
+
+    def __cinit__(self):
+        self._refs = NULL
+        self._nref = 0
+        self._max_len = -1
+        self._storage = None
+        self._owner = None
+        self._arena = NULL
+        self._residues = NULL
+        self._strings = NULL
+        self._revcomp = NULL
+        self._revcomp_dsq = NULL
+        self.alphabet = None
+
+    def __init__(self, object sequences not None):
+        """__init__(self, sequences)\n--
+
+        Create a new list of search targets.
+
+        Arguments:
+            sequence (iterable of `DigitalSequence`): An iterable of sequences
+                stored in digital mode to use as targets for a search
+                pipeline. If given a `~pyhmmer.easel.SequenceFile` or a
+                `~pyhmmer.easel.DigitalSequenceDatabase`, the sequences are
+                read until the end of the file and stored in contiguous
+                memory.
+
+        Raises:
+            `~pyhmmer.errors.AlphabetMismatch`: When all sequences don't have
+                the same `~pyhmmer.easel.Alphabet`.
+            `ValueError`: When given a `~pyhmmer.easel.SequenceFile` that
+                is not in digital mode.
+
+        Example:
+            Load the target sequences of a search from a sequence file,
+            without creating a `~pyhmmer.easel.DigitalSequence` for each
+            of them::
+
+                >>> with easel.SequenceFile("tests/data/seqs/LuxC.faa", digital=True) as seqs_file:
+                ...     targets = PipelineSearchTargets(seqs_file)
+                >>> len(targets)
+                12
+                >>> targets[0].name
+                b'sp|P19841|LUXC_PHOPO'
+
+        .. versionchanged:: 0.7.0
+           Support `~pyhmmer.easel.SequenceFile` and
+           `~pyhmmer.easel.DigitalSequenceDatabase` arguments.
+
+        """
+        cdef size_t          i
+        cdef DigitalSequence seq
+
+        if isinstance(sequences, SequenceFile):
+            if sequences.alphabet is None:
+                raise ValueError("Cannot build search targets from a sequence file in text mode")
+            self.alphabet = sequences.alphabet
+            self._pack(self._recycle(sequences))
+            return
+        elif isinstance(sequences, DigitalSequenceDatabase):
+            self.alphabet = sequences.alphabet
+            self._pack(sequences)
+            return
+
+        # store a hard reference to the `Sequence` objects in a list
+        # to prevent the garbage collector from deallocating them
+        #
+        # NB (@althonos): this is not super efficient in terms of memory if
+        #                 the sequences are already in a list, but it's safer
+        #                 to do so rather than trusting the user not to give
+        #                 us an iterator -- besides, we are not duplicating
+        #                 the actual storage, only the Python wrappers, which
+        #                 only store a pointer
+        self._storage = list(sequences)
+
+        # allocate an array to store pointers to the raw sequences
+        self._nref = len(self._storage)
+        self._refs = <const ESL_SQ**> malloc(sizeof(ESL_SQ*) * (self._nref+1))
+        if self._refs == NULL:
+            raise AllocationError("ESL_SQ**", sizeof(ESL_SQ*), (self._nref+1))
+
+        # store the alphabet of the first sequence
+        if self._nref > 0:
+            self.alphabet = self._storage[0].alphabet
+
+        # check all sequences have the same alphabet and record a pointer
+        for i, seq in enumerate(self._storage):
+            # check alphabet
+            if not self.alphabet._eq(seq.alphabet):
+                raise AlphabetMismatch(self.alphabet, seq.alphabet)
+            # record length if maximum
+            if len(seq) > self._max_len:
+                self._max_len = len(seq)
+            # record the pointer to the raw C struct
+            self._refs[i] = <const ESL_SQ*> seq._sq
+        self._refs[self._nref] = NULL
+
+    def __dealloc__(self):
+        free(self._refs)
+        free(self._arena)
+        free(self._residues)
+        free(self._strings)
+        free(self._revcomp)
+        free(self._revcomp_dsq)
+
+    def __iter__(self):
+        if self._storage is not None:
+            return iter(self._storage)
+        return (self._sequence(i) for i in range(self._nref))
+
+    def __len__(self):
+        return self._nref
+
+    def __getitem__(self, object index):
+        cdef ssize_t               i
+        cdef ssize_t               j
+        cdef PipelineSearchTargets view
+
+        if self._storage is not None:
+            if isinstance(index, slice):
+                return PipelineSearchTargets(self._storage[index])
+            else:
+                return self._storage[index]
+
+        if isinstance(index, slice):
+            # create a view referencing the contiguous storage of this object
+            indices = range(*index.indices(self._nref))
+            view = PipelineSearchTargets.__new__(PipelineSearchTargets)
+            view._owner = self if self._owner is None else self._owner
+            view.alphabet = self.alphabet
+            view._nref = len(indices)
+            view._refs = <const ESL_SQ**> malloc(sizeof(ESL_SQ*) * (view._nref+1))
+            if view._refs == NULL:
+                raise AllocationError("ESL_SQ**", sizeof(ESL_SQ*), (view._nref+1))
+            for j, i in enumerate(indices):
+                view._refs[j] = self._refs[i]
+                if self._refs[i].n > view._max_len:
+                    view._max_len = self._refs[i].n
+            view._refs[view._nref] = NULL
+            return view
+
+        i = index
+        if i < 0:
+            i += self._nref
+        if i < 0 or i >= <ssize_t> self._nref:
+            raise IndexError("list index out of range")
+        return self._sequence(i)
+
+    # --- Utils --------------------------------------------------------------
+
+    @staticmethod
+    def _recycle(SequenceFile sequences):
+        # read all sequences of the file into the same buffer, since
+        # `_pack` copies the data of each sequence before reading the next
+        cdef DigitalSequence seq = DigitalSequence(sequences.alphabet)
+        while sequences.readinto(seq) is not None:
+            yield seq
+            seq.clear()
+
+    cdef DigitalSequence _sequence(self, size_t index):
+        assert index < self._nref
+
+        cdef const ESL_SQ*   sq  = self._refs[index]
+        cdef DigitalSequence seq = DigitalSequence.__new__(DigitalSequence, self.alphabet)
+
+        with nogil:
+            seq._sq = libeasel.sq.esl_sq_CreateDigitalFrom(
+                sq.abc, sq.name, sq.dsq, sq.n, sq.desc, sq.acc, NULL
+            )
+        if seq._sq == NULL:
+            raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+        seq._sq.tax_id = sq.tax_id
+        return seq
+
+    cdef int _pack(self, object sequences) except 1:
+        """_pack(self, sequences)\n--
+
+        Copy the given sequences into contiguous storage.
+
+        Each `~pyhmmer.easel.DigitalSequence` is copied as soon as it is
+        obtained, so the sequences may be recycled by the iterator. While
+        the storage is growing, the position of each sequence in the
+        residue buffer and in the string pool is recorded in an offsets
+        array, and the `ESL_SQ` pointers are only set once the buffers are
+        not reallocated anymore.
+
+        """
+        assert self.alphabet is not None
+
+        cdef DigitalSequence seq
+        cdef size_t          i
+        cdef ESL_SQ*         sq
+        cdef const ESL_SQ*   src
+        cdef void*           mem
+        cdef size_t          namelen
+        cdef size_t          acclen
+        cdef size_t          desclen
+        cdef size_t          nseq      = 0
+        cdef size_t          nres      = 0
+        cdef size_t          nstr      = 0
+        cdef size_t          arena_cap = 0
+        cdef size_t          res_cap   = 0
+        cdef size_t          str_cap   = 0
+        cdef size_t*         offsets   = NULL
+
+        try:
+            for seq in sequences:
+                src = seq._sq
+                # check the alphabet of the sequence
+                if not self.alphabet._eq(seq.alphabet):
+                    raise AlphabetMismatch(self.alphabet, seq.alphabet)
+                # grow the sequence and offsets arrays if needed
+                if nseq == arena_cap:
+                    arena_cap = 2*arena_cap if arena_cap > 0 else 256
+                    mem = realloc(self._arena, arena_cap * sizeof(ESL_SQ))
+                    if mem == NULL:
+                        raise AllocationError("ESL_SQ", sizeof(ESL_SQ), arena_cap)
+                    self._arena = <ESL_SQ*> mem
+                    mem = realloc(offsets, 4 * arena_cap * sizeof(size_t))
+                    if mem == NULL:
+                        raise AllocationError("size_t", sizeof(size_t), 4*arena_cap)
+                    offsets = <size_t*> mem
+                # grow the residue buffer if needed
+                if nres + src.n + 2 > res_cap:
+                    res_cap = max(2*res_cap, nres + src.n + 2)
+                    mem = realloc(self._residues, res_cap * sizeof(ESL_DSQ))
+                    if mem == NULL:
+                        raise AllocationError("ESL_DSQ", sizeof(ESL_DSQ), res_cap)
+                    self._residues = <ESL_DSQ*> mem
+                # grow the string pool if needed
+                namelen = strlen(src.name) + 1
+                acclen = strlen(src.acc) + 1
+                desclen = strlen(src.desc) + 1
+                if nstr + namelen + acclen + desclen > str_cap:
+                    str_cap = max(2*str_cap, nstr + namelen + acclen + desclen)
+                    mem = realloc(self._strings, str_cap * sizeof(char))
+                    if mem == NULL:
+                        raise AllocationError("char", sizeof(char), str_cap)
+                    self._strings = <char*> mem
+                # copy the residues, including the sentinels
+                offsets[4*nseq] = nres
+                memcpy(&self._residues[nres], src.dsq, (src.n + 2) * sizeof(ESL_DSQ))
+                nres += src.n + 2
+                # copy the name, accession and description
+                offsets[4*nseq + 1] = nstr
+                memcpy(&self._strings[nstr], src.name, namelen)
+                nstr += namelen
+                offsets[4*nseq + 2] = nstr
+                memcpy(&self._strings[nstr], src.acc, acclen)
+                nstr += acclen
+                offsets[4*nseq + 3] = nstr
+                memcpy(&self._strings[nstr], src.desc, desclen)
+                nstr += desclen
+                # record the sequence metadata
+                sq = &self._arena[nseq]
+                memset(sq, 0, sizeof(ESL_SQ))
+                sq.tax_id = src.tax_id
+                sq.n = sq.end = sq.W = sq.L = src.n
+                sq.start = 1
+                sq.C = 0
+                sq.salloc = src.n + 2
+                sq.idx = nseq
+                sq.roff = sq.hoff = sq.doff = sq.eoff = -1
+                sq.abc = self.alphabet._abc
+                # record the length if maximum
+                if <ssize_t> src.n > self._max_len:
+                    self._max_len = src.n
+                nseq += 1
+
+            # allocate an array to store pointers to the packed sequences
+            self._nref = nseq
+            self._refs = <const ESL_SQ**> malloc(sizeof(ESL_SQ*) * (nseq+1))
+            if self._refs == NULL:
+                raise AllocationError("ESL_SQ**", sizeof(ESL_SQ*), nseq+1)
+
+            # set the pointers now that the buffers will not move anymore
+            with nogil:
+                for i in range(nseq):
+                    sq = &self._arena[i]
+                    sq.dsq = &self._residues[offsets[4*i]]
+                    sq.name = &self._strings[offsets[4*i + 1]]
+                    sq.acc = &self._strings[offsets[4*i + 2]]
+                    sq.desc = &self._strings[offsets[4*i + 3]]
+                    # the source is never used for search targets, so the
+                    # trailing NUL byte of the description is used instead
+                    sq.source = &self._strings[offsets[4*i + 3] + strlen(sq.desc)]
+                    sq.nalloc = strlen(sq.name) + 1
+                    sq.aalloc = strlen(sq.acc) + 1
+                    sq.dalloc = strlen(sq.desc) + 1
+                    sq.srcalloc = 1
+                    self._refs[i] = sq
+                self._refs[nseq] = NULL
+        finally:
+            free(offsets)
+
+        return 0
+
+    cdef int _reverse_complement(self) except 1:
+        """_reverse_complement(self)\n--
+
+        Compute the reverse complement of all the sequences, if needed.
+
+        The reverse complements are stored in a single contiguous buffer,
+        and are only computed the first time they are requested, so that
+        a `LongTargetsPipeline` searching the bottom strand of the targets
+        with several queries only complements each target once.
+
+        """
+        if self._revcomp != NULL or self._nref == 0:
+            return 0
+
+        cdef size_t        i
+        cdef int           status
+        cdef const ESL_SQ* sq
+        cdef size_t        nres    = 0
+        cdef ESL_DSQ**     revcomp = NULL
+        cdef ESL_DSQ*      dsq     = NULL
+
+        for i in range(self._nref):
+            nres += self._refs[i].n + 2
+
+        try:
+            revcomp = <ESL_DSQ**> malloc(sizeof(ESL_DSQ*) * (self._nref + 1))
+            if revcomp == NULL:
+                raise AllocationError("ESL_DSQ*", sizeof(ESL_DSQ*), self._nref + 1)
+            dsq = <ESL_DSQ*> malloc(sizeof(ESL_DSQ) * nres)
+            if dsq == NULL:
+                raise AllocationError("ESL_DSQ", sizeof(ESL_DSQ), nres)
+
+            with nogil:
+                nres = 0
+                for i in range(self._nref):
+                    sq = self._refs[i]
+                    revcomp[i] = &dsq[nres]
+                    memcpy(revcomp[i], sq.dsq, sq.n + 2)
+                    status = libeasel.alphabet.esl_abc_revcomp(sq.abc, revcomp[i], sq.n)
+                    if status == libeasel.eslEINCOMPAT:
+                        raise ValueError("Cannot reverse complement sequences with a non-nucleotide alphabet")
+                    elif status != libeasel.eslOK:
+                        raise UnexpectedError(status, "esl_abc_revcomp")
+                    nres += sq.n + 2
+                revcomp[self._nref] = NULL
+
+            # another thread may have computed the reverse complements while
+            # the GIL was released, in which case the new buffers are dropped
+            if self._revcomp == NULL:
+                self._revcomp, revcomp = revcomp, NULL
+                self._revcomp_dsq, dsq = dsq, NULL
+        finally:
+            free(revcomp)
+            free(dsq)
+
+        return 0
+
+
+cdef class Pipeline:
+    """An HMMER3 accelerated sequence/profile comparison pipeline.
+
+    The Plan7 pipeline handles the platform-accelerated comparison of
+    sequences to profile HMMs. It performs either a *search* (comparing
+    a single query profile to a target sequence database) or a *scan*
+    (comparing a single query sequence to a target profile database). The
+    two methods are yielding equivalent results: if you have a collection
+    of :math:`M` sequences and :math:`N` HMMs to compare, doing a search
+    or a scan should give the same hits.
+
+    The main reason for which you should choose *search* or *scan* is the
+    relative size of the sequences and HMMs databases. In the original
+    HMMER3 code, the memory was managed in a way that you never had to
+    load the entirety of the target sequences in memory. In PyHMMER, the
+    *search* methods will **require** that you have the entirety of target
+    sequences loaded in memory, which may not be feasible if you have too
+    many sequences.
+
+    Attributes:
+        alphabet (`~pyhmmer.easel.Alphabet`): The alphabet for which the
+            pipeline is configured.
+        background (`~pyhmmer.plan7.Background`): The null background model
             to use to compute scores.
         randomness (`~pyhmmer.easel.Randomness`): The random number generator
             being used by the pipeline.
@@ -3956,6 +5828,8 @@ cdef class Pipeline:
 
     def __cinit__(self):
         self._pli = NULL
+        self._pressed_hfp = NULL
+        self._pressed_db = None
         self.alphabet = None
         self.profile = None
         self.background = None
@@ -4108,6 +5982,7 @@ cdef class Pipeline:
 
     def __dealloc__(self):
         libhmmer.p7_pipeline.p7_pipeline_Destroy(self._pli)
+        libhmmer.p7_hmmfile.p7_hmmfile_Close(self._pressed_hfp)
 
     # --- Properties ---------------------------------------------------------
 
@@ -4471,6 +6346,7 @@ cdef class Pipeline:
         assert self._pli != NULL
 
         if isinstance(query, OptimizedProfile):
+            (<OptimizedProfile> query)._read_rest()
             return (<OptimizedProfile> query)._om
 
         if isinstance(query, HMM):
@@ -4495,7 +6371,7 @@ cdef class Pipeline:
                 if self.opt._om == NULL:
                     raise AllocationError("P7_OPROFILE", sizeof(P7_OPROFILE))
             # convert the profile to an optimized one
-            self.opt._convert(self.profile._gm)
+            self.opt._convert((<Profile> query)._gm)
             # use the temporary optimized profile
             return self.opt._om
 
@@ -4503,6 +6379,29 @@ cdef class Pipeline:
             ty = type(query).__name__
             raise TypeError(f"Expected HMM, Profile or OptimizedProfile, found {ty}")
 
+    cdef int _prepare_lazy_scan(self, bytes pressed_db, int M) except 1:
+        assert self._pli != NULL
+
+        # open a private handle to the pressed database, so that the rest
+        # of partially loaded profiles can be read from the `.h3p` file
+        # without sharing the file position with other pipelines
+        if self._pressed_db != pressed_db:
+            libhmmer.p7_hmmfile.p7_hmmfile_Close(self._pressed_hfp)
+            self._pressed_hfp = NULL
+            self._pressed_db = None
+            self._pressed_hfp = HMMPressedFile._open_pressed(pressed_db)
+            self._pressed_db = pressed_db
+
+        # reallocate the optimized profile if it is too small, since it
+        # will be used to store the rest of the partially loaded profiles
+        if self.opt._om.allocM < M:
+            p7_oprofile.p7_oprofile_Destroy(self.opt._om)
+            self.opt._om = p7_oprofile.p7_oprofile_Create(M, self.alphabet._abc)
+            if self.opt._om == NULL:
+                raise AllocationError("P7_OPROFILE", sizeof(P7_OPROFILE))
+
+        return 0
+
     cpdef list arguments(self):
         """arguments(self)\n--
 
@@ -4695,7 +6594,7 @@ cdef class Pipeline:
             raise ValueError("sequence length over comparison pipeline limit (100,000)")
         # check that the alphabet of the sequences is the same as
         # the alphabet of the pipeline
-        if not self.alphabet._eq(search_targets.alphabet):
+        if search_targets._nref > 0 and not self.alphabet._eq(search_targets.alphabet):
             raise AlphabetMismatch(self.alphabet, search_targets.alphabet)
 
         # convert the query to an optimized profile, using the
@@ -4834,6 +6733,122 @@ cdef class Pipeline:
         hmm, profile, opt = builder.build(query, self.background)
         return self.search_hmm(opt, sequences)
 
+    cpdef TopHits search_hmm_translated(
+        self,
+        object query,
+        object sequences,
+        GeneticCode genetic_code = None,
+        int min_length = 20,
+        int64_t block_length = 1000000,
+    ):
+        """search_hmm_translated(self, query, sequences, genetic_code=None, min_length=20, block_length=1000000)\n--
+
+        Run the pipeline using a query HMM against translated nucleotide sequences.
+
+        The nucleotide sequences are read in blocks of about
+        ``block_length`` nucleotides. The open reading frames of each
+        block are extracted in all six frames with
+        `~pyhmmer.easel.GeneticCode.orfs`, and searched with
+        `Pipeline.search_hmm`. The hits of all blocks are then merged
+        together with `TopHits.merge`, so only the ORFs of a single block
+        are kept in memory at once.
+
+        Arguments:
+            query (`HMM`, `Profile` or `OptimizedProfile`): The protein
+                object to use to query the translated sequences.
+            sequences (iterable of `~pyhmmer.easel.DigitalSequence`): The
+                nucleotide sequences to translate and query with the HMM.
+                An open `~pyhmmer.easel.SequenceFile` in digital mode can
+                be given to stream the sequences from a file.
+            genetic_code (`~pyhmmer.easel.GeneticCode`, optional): The
+                genetic code to use to translate the sequences. If `None`
+                given, use the standard code.
+            min_length (`int`): The minimum length of the ORFs to search,
+                in amino acids.
+            block_length (`int`): The number of nucleotides to translate
+                and search at once.
+
+        Returns:
+            `~pyhmmer.plan7.TopHits`: the hits found in the translated
+            sequences. Each hit is named after the nucleotide sequence
+            its ORF was extracted from, and keeps the description of the
+            ORF (with its frame and coordinates). The coordinates of the
+            domains and alignments are given in nucleotides, and are
+            reversed (i.e. ``target_from > target_to``) for hits on the
+            reverse strand.
+
+        Raises:
+            `~pyhmmer.errors.AlphabetMismatch`: When the alphabet of the
+                current pipeline does not match the alphabet of the given
+                HMM, or the alphabets of the genetic code.
+            `ValueError`: When ``block_length`` is not strictly positive.
+
+        Hint:
+            This method corresponds to running ``hmmsearch`` with the
+            ``query`` HMM against the output of ``esl-translate`` for
+            the ``sequences`` database. The ``Z`` value used to compute
+            E-values is the total number of ORFs searched, unless set
+            explicitly in the pipeline.
+
+        Caution:
+            The target sequence of the `Alignment` of each domain is the
+            translated ORF, so `Alignment.target_name` is the name of the
+            ORF and not the name of the nucleotide sequence.
+
+        .. versionadded:: 0.7.0
+
+        """
+        assert self._pli != NULL
+
+        cdef DigitalSequence seq
+        cdef list            orfs
+        cdef TopHits         hits
+        cdef int64_t         residues = 0
+        cdef list            batch    = []
+        cdef list            results  = []
+
+        # check the alphabets of the query and of the genetic code
+        if not self.alphabet._eq(query.alphabet):
+            raise AlphabetMismatch(self.alphabet, query.alphabet)
+        if genetic_code is None:
+            genetic_code = GeneticCode(amino_alphabet=self.alphabet)
+        elif not self.alphabet._eq(genetic_code.amino_alphabet):
+            raise AlphabetMismatch(self.alphabet, genetic_code.amino_alphabet)
+        if block_length <= 0:
+            raise ValueError(f"`block_length` must be strictly positive, got {block_length!r}")
+        if isinstance(sequences, SequenceFile) and sequences.alphabet is None:
+            raise ValueError("Sequence file must be opened in digital mode")
+
+        # translate and search the sequences block by block, also searching
+        # an empty block if there were no sequences so that the returned
+        # hits record the pipeline configuration
+        sequences = iter(sequences)
+        while True:
+            seq = next(sequences, None)
+            if seq is not None:
+                batch.append(seq)
+                residues += len(seq)
+                if residues < block_length:
+                    continue
+            elif results and not batch:
+                break
+            # reset the pipeline accounting so that the counts of each
+            # block are only summed once when the hits are merged
+            if results:
+                self.clear()
+            orfs = genetic_code.orfs(batch, min_length)
+            hits = Pipeline.search_hmm(self, query, orfs)
+            Pipeline._map_translated_hits(hits, orfs)
+            results.append(hits)
+            batch = []
+            residues = 0
+            if seq is None:
+                break
+
+        if len(results) == 1:
+            return results[0]
+        return results[0].merge(*results[1:])
+
     @staticmethod
     cdef int _search_loop(
               P7_PIPELINE* pli,
@@ -4883,21 +6898,81 @@ cdef class Pipeline:
         # Return 0 to indicate success
         return 0
 
+    @staticmethod
+    cdef int _map_translated_hits(TopHits hits, list orfs) except 1:
+        cdef size_t          i
+        cdef int             j
+        cdef char*           name
+        cdef P7_HIT*         hit
+        cdef P7_DOMAIN*      dom
+        cdef ESL_SQ*         orf
+        cdef DigitalSequence seq
+        cdef dict            index  = {}
+
+        # ORF names are unique within a block
+        for seq in orfs:
+            index[seq.name] = seq
+
+        for i in range(hits._th.N):
+            hit = &hits._th.unsrt[i]
+            seq = index[<bytes> hit.name]
+            orf = seq._sq
+            # name the hit after the nucleotide sequence of the ORF
+            name = strdup(orf.source)
+            if name == NULL:
+                raise AllocationError("char", sizeof(char), strlen(orf.source) + 1)
+            free(hit.name)
+            hit.name = name
+            # convert the coordinates from the ORF to the nucleotide sequence,
+            # keeping the ORF coordinates of the alignment like HMMER does
+            with nogil:
+                for j in range(hit.ndom):
+                    dom = &hit.dcl[j]
+                    dom.iorf = dom.iali
+                    dom.jorf = dom.jali
+                    dom.ienv = Pipeline._orf_codon_start(orf, dom.ienv)
+                    dom.jenv = Pipeline._orf_codon_end(orf, dom.jenv)
+                    dom.iali = Pipeline._orf_codon_start(orf, dom.iali)
+                    dom.jali = Pipeline._orf_codon_end(orf, dom.jali)
+                    if dom.ad != NULL:
+                        dom.ad.sqfrom = Pipeline._orf_codon_start(orf, dom.ad.sqfrom)
+                        dom.ad.sqto = Pipeline._orf_codon_end(orf, dom.ad.sqto)
+                        dom.ad.L = orf.L
+
+        return 0
+
+    @staticmethod
+    cdef int64_t _orf_codon_start(const ESL_SQ* orf, int64_t pos) nogil:
+        # the nucleotide coordinate of the first base of the codon at `pos`
+        if orf.start <= orf.end:
+            return orf.start + 3 * (pos - 1)
+        else:
+            return orf.start - 3 * (pos - 1)
+
+    @staticmethod
+    cdef int64_t _orf_codon_end(const ESL_SQ* orf, int64_t pos) nogil:
+        # the nucleotide coordinate of the last base of the codon at `pos`
+        if orf.start <= orf.end:
+            return orf.start + 3 * pos - 1
+        else:
+            return orf.start - 3 * pos + 1
+
     cpdef TopHits scan_seq(
         self,
         DigitalSequence query,
-        object hmms,
+        object targets,
     ):
-        """scan_seq(self, query, hmms)\n--
+        """scan_seq(self, query, targets)\n--
 
         Run the pipeline using a query sequence against a profile database.
 
         Arguments:
             query (`~pyhmmer.easel.DigitalSequence`): The sequence object to
                 use to query the profile database.
-            hmms (iterable of `~pyhmmer.easel.DigitalSequence`): The
-                HMM profiles to query. Pass a `~pyhmmer.easel.HMMFile`
-                instance to read from disk iteratively.
+            targets (iterable of `HMM`, `Profile` or `OptimizedProfile`): The
+                profiles to query. Pass a `~pyhmmer.plan7.HMMFile` instance
+                to read from disk iteratively, or a `PipelineScanTargets`
+                to reuse the same profiles between several queries.
 
         Returns:
             `~pyhmmer.plan7.TopHits`: the hits found in the profile database.
@@ -4908,55 +6983,93 @@ cdef class Pipeline:
                 query or profile.
 
         Caution:
-            In the current version, this method is not optimized to use
-            the *pressed* database, even if it exists. This will cause the
-            MSV and SSV filters to be rebuilt at each iteration, which could
-            be slow. Consider at least pre-fetching the HMM database if
-            calling this method several times in a row.
+            Unless a `PipelineScanTargets` is given, `HMM` and `Profile`
+            targets are converted to an `OptimizedProfile` at each
+            iteration, which could be slow. Consider building a
+            `PipelineScanTargets` once if calling this method several times
+            in a row.
 
         Hint:
             This method corresponds to running ``hmmscan`` with the
-            ``query`` sequence against the ``hmms`` database.
+            ``query`` sequence against the ``targets`` database.
 
         .. versionadded:: 0.4.0
 
+        .. versionchanged:: 0.7.0
+           Allow using `Profile`, `OptimizedProfile` and `PipelineScanTargets`
+           targets.
+
         """
-        cdef int                  allocM
-        cdef Profile              profile
-        cdef HMM                  hmm
-        cdef OptimizedProfile     opt
-        cdef TopHits              hits    = TopHits()
+        cdef int                 status
+        cdef const P7_OPROFILE** refs
+        cdef const P7_OPROFILE*  om[2]
+        cdef object              target
+        cdef P7_HMMFILE*         hfp
+        cdef PipelineScanTargets scan_targets
+        cdef TopHits             hits         = TopHits()
 
         assert self._pli != NULL
 
         # check the pipeline was configure with the same alphabet
         if not self.alphabet._eq(query.alphabet):
             raise AlphabetMismatch(self.alphabet, query.alphabet)
+        # verify the length
+        if query._sq.n > 100000:
+            raise ValueError("sequence length over comparison pipeline limit (100,000)")
 
         # make sure the pipeline is set to scan mode and ready for a new sequence
         self._pli.mode = p7_pipemodes_e.p7_SCAN_MODELS
         self._pli.nmodels = 0
 
-        # get an iterator over the input hmms, with an early return if
-        # no sequences were given, and extract the raw pointer to the
-        # HMM from the Python object
-        hmms_iter = iter(hmms)
-        hmm = next(hmms_iter, None)
-        if hmm is None:
-            return hits
-        if not self.alphabet._eq(hmm.alphabet):
-            raise AlphabetMismatch(self.alphabet, hmm.alphabet)
-
-        # run the search loop on all database sequences while recycling memory
-        self._scan_loop(
-            self._pli,
-            query._sq,
-            self.background._bg,
-            hmm._hmm,
-            hits._th,
-            hmms_iter,
-            hmm.alphabet
-        )
+        # configure the pipeline for the current sequence
+        with nogil:
+            status = libhmmer.p7_pipeline.p7_pli_NewSeq(self._pli, query._sq)
+        if status != libeasel.eslOK:
+            raise UnexpectedError(status, "p7_pli_NewSeq")
+
+        if isinstance(targets, PipelineScanTargets):
+            # run the scan loop on all the target profiles without
+            # acquiring the GIL, since they were all converted already
+            scan_targets = targets
+            if scan_targets._nref > 0 and not self.alphabet._eq(scan_targets.alphabet):
+                raise AlphabetMismatch(self.alphabet, scan_targets.alphabet)
+            if scan_targets._pressed_db is not None:
+                self._prepare_lazy_scan(scan_targets._pressed_db, scan_targets._max_M)
+            refs = scan_targets._refs
+            hfp = self._pressed_hfp
+            with nogil:
+                Pipeline._scan_loop(
+                    self._pli,
+                    query._sq,
+                    self.background._bg,
+                    refs,
+                    hits._th,
+                    hfp,
+                    self.opt._om,
+                )
+        else:
+            # convert each target to an optimized profile in the pipeline
+            # scratch space, and run the scan loop on that single profile
+            om[1] = NULL
+            for target in targets:
+                if not self.alphabet._eq(target.alphabet):
+                    raise AlphabetMismatch(self.alphabet, target.alphabet)
+                if isinstance(target, OptimizedProfile) and (<OptimizedProfile> target)._pressed is not None:
+                    self._prepare_lazy_scan((<OptimizedProfile> target)._pressed.path, target.M)
+                    om[0] = (<OptimizedProfile> target)._om
+                else:
+                    om[0] = self._get_om_from_query(target, query._sq.n)
+                hfp = self._pressed_hfp
+                with nogil:
+                    Pipeline._scan_loop(
+                        self._pli,
+                        query._sq,
+                        self.background._bg,
+                        om,
+                        hits._th,
+                        hfp,
+                        self.opt._om,
+                    )
 
         # threshold hits
         hits._sort_by_key()
@@ -4965,92 +7078,85 @@ cdef class Pipeline:
         # return the hits
         return hits
 
+    @staticmethod
     cdef int _scan_loop(
-                           self,
-              P7_PIPELINE* pli,
-        const ESL_SQ*      sq,
-              P7_BG*       bg,
-              P7_HMM*      hm,
-              P7_TOPHITS*  th,
-              object       hmm_iter,
-              Alphabet     hmm_alphabet
-    ) except 1:
-        cdef int              status
-        cdef Alphabet         self_alphabet = self.alphabet
-        cdef Profile          profile       = Profile(hm.M, hmm_alphabet)
-        cdef OptimizedProfile optimized     = OptimizedProfile(hm.M, hmm_alphabet)
-        cdef P7_PROFILE*      gm            = profile._gm
-        cdef P7_OPROFILE*     om            = optimized._om
-        cdef HMM              hmm
+              P7_PIPELINE*  pli,
+        const ESL_SQ*       sq,
+              P7_BG*        bg,
+        const P7_OPROFILE** om,
+              P7_TOPHITS*   th,
+              P7_HMMFILE*   hfp,
+              P7_OPROFILE*  scratch,
+    ) nogil except 1:
+        cdef int         status
+        cdef bint        partial
+        cdef P7_OPROFILE om_view
+
+        # run the inner loop on all profiles
+        while om[0] != NULL:
+            # make a shallow copy of the optimized profile, so that the
+            # length configuration can be updated without modifying the
+            # target (which may be shared with other threads): all
+            # length-dependent parameters are stored inline in the
+            # `P7_OPROFILE` struct, the score vectors are never written to
+            memcpy(&om_view, om[0], sizeof(P7_OPROFILE))
+
+            # if only the MSV part of the profile was loaded, let the
+            # pipeline read the rest of the profile from the pressed
+            # database (only if the target passes the MSV filter), but
+            # redirect the storage to the scratch profile so that the
+            # target itself is never modified
+            partial = om_view.mode == p7_NO_MODE
+            if partial:
+                if hfp == NULL:
+                    raise ValueError("cannot read the rest of a partially loaded profile")
+                IF HMMER_IMPL == "SSE":
+                    om_view.rwv = scratch.rwv
+                    om_view.twv = scratch.twv
+                    om_view.rfv = scratch.rfv
+                    om_view.tfv = scratch.tfv
+                om_view.rf = scratch.rf
+                om_view.mm = scratch.mm
+                om_view.cs = scratch.cs
+                om_view.consensus = scratch.consensus
+                om_view.acc = NULL
+                om_view.desc = NULL
+                pli.hfp = hfp
+            else:
+                pli.hfp = NULL
 
-        with nogil:
-            # verify the alphabet
-            if not self_alphabet._eq(hmm_alphabet):
-                raise AlphabetMismatch(self_alphabet, hmm_alphabet)
-            # verify the length
-            if sq.n > 100000:
-                raise ValueError("sequence length over comparison pipeline limit (100,000)")
-
-            # configure the pipeline for the current sequence
-            status = libhmmer.p7_pipeline.p7_pli_NewSeq(pli, sq)
+            # configure the profile, background and pipeline for the new HMM
+            status = libhmmer.p7_pipeline.p7_pli_NewModel(pli, &om_view, bg)
             if status != libeasel.eslOK:
-                raise UnexpectedError(status, "p7_pli_NewSeq")
-
-            # run the inner loop on all HMMs
-            while hm != NULL:
-                # reallocate if too small
-                if gm.M < hm.M:
-                    with gil:
-                        profile = Profile(hm.M, hmm_alphabet)
-                        optimized = OptimizedProfile(hm.M, hmm_alphabet)
-                        gm, om = profile._gm, optimized._om
-
-                # configure the new profile
-                status = libhmmer.modelconfig.p7_ProfileConfig(hm, bg, gm, sq.L, p7_LOCAL)
-                if status != libeasel.eslOK:
-                    raise UnexpectedError(status, "p7_ProfileConfig")
-
-                # convert the new profile to an optimized one
-                status = p7_oprofile.p7_oprofile_Convert(gm, om)
-                if status != libeasel.eslOK:
-                    raise UnexpectedError(status, "p7_oprofile_Convert")
-
-                # configure the profile, background and pipeline for the new HMM
-                status = libhmmer.p7_pipeline.p7_pli_NewModel(pli, om, bg)
-                if status != libeasel.eslOK:
-                    raise UnexpectedError(status, "p7_pli_NewModel")
-                status = libhmmer.p7_bg.p7_bg_SetLength(bg, sq.n)
-                if status != libeasel.eslOK:
-                    raise UnexpectedError(status, "p7_bg_SetLength")
-                status = p7_oprofile.p7_oprofile_ReconfigLength(om, sq.n)
-                if status != libeasel.eslOK:
-                    raise UnexpectedError(status, "p7_oprofile_ReconfigLength")
-
-                # run the pipeline on the sequence
-                status = libhmmer.p7_pipeline.p7_Pipeline(pli, om, bg, sq, NULL, th)
-                if status == libeasel.eslEINVAL:
-                    raise ValueError("model does not have bit score thresholds expected by the pipeline")
-                elif status == libeasel.eslERANGE:
-                    raise OverflowError("numerical overflow in the optimized vector implementation")
-                elif status != libeasel.eslOK:
-                    raise UnexpectedError(status, "p7_Pipeline")
+                raise UnexpectedError(status, "p7_pli_NewModel")
+            status = libhmmer.p7_bg.p7_bg_SetLength(bg, sq.n)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "p7_bg_SetLength")
+            status = p7_oprofile.p7_oprofile_ReconfigLength(&om_view, sq.n)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "p7_oprofile_ReconfigLength")
 
-                # clear pipeline for reuse for next target
-                libhmmer.p7_pipeline.p7_pipeline_Reuse(pli)
+            # run the pipeline on the sequence
+            status = libhmmer.p7_pipeline.p7_Pipeline(pli, &om_view, bg, sq, NULL, th)
+            if status == libeasel.eslEINVAL:
+                raise ValueError("model does not have bit score thresholds expected by the pipeline")
+            elif status == libeasel.eslERANGE:
+                raise OverflowError("numerical overflow in the optimized vector implementation")
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "p7_Pipeline")
 
-                # acquire the GIL just long enough to get the next HMM
-                with gil:
-                    hmm = next(hmm_iter, None)
-                    if hmm is None:
-                        hm = NULL
-                    else:
-                        hm = hmm._hmm
-                        hmm_alphabet = hmm.alphabet
-                        # verify the alphabet
-                        if not self_alphabet._eq(hmm_alphabet):
-                            raise AlphabetMismatch(self_alphabet, hmm_alphabet)
+            # clear pipeline for reuse for next target
+            libhmmer.p7_pipeline.p7_pipeline_Reuse(pli)
+            # release the metadata read from the pressed database, which
+            # has been copied already to the hits if needed
+            if partial:
+                free(om_view.acc)
+                free(om_view.desc)
+            # advance to next profile
+            om += 1
 
         # Return 0 to indicate success
+        pli.hfp = NULL
         return 0
 
     def iterate_hmm(
@@ -5113,7 +7219,7 @@ cdef class Pipeline:
         # check that alphabets are consistent
         if not self.alphabet._eq(query.alphabet):
             raise AlphabetMismatch(self.alphabet, query.alphabet)
-        if not self.alphabet._eq(targets.alphabet):
+        if targets._nref > 0 and not self.alphabet._eq(targets.alphabet):
             raise AlphabetMismatch(self.alphabet, targets.alphabet)
         # check that builder is in hand architecture, not fast
         if builder is None:
@@ -5220,7 +7326,7 @@ cdef class Pipeline:
         # check that alphabets are consistent
         if not self.alphabet._eq(query.alphabet):
             raise AlphabetMismatch(self.alphabet, query.alphabet)
-        if not self.alphabet._eq(targets.alphabet):
+        if targets._nref > 0 and not self.alphabet._eq(targets.alphabet):
             raise AlphabetMismatch(self.alphabet, targets.alphabet)
         # check that builder is in hand architecture, not fast
         if builder is None:
@@ -5277,9 +7383,10 @@ cdef class LongTargetsPipeline(Pipeline):
         int B2=DEFAULT_B2,
         int B3=DEFAULT_B3,
         int block_length=DEFAULT_BLOCK_LENGTH,
+        int threads=1,
         **kwargs,
     ):
-        """__init__(self, alphabet, background=None, *, F1=0.02, F2=3e-3, F3=3e-5, strand=None, B1=100, B2=240, B3=1000, block_length=0x40000, **kwargs)\n--
+        """__init__(self, alphabet, background=None, *, F1=0.02, F2=3e-3, F3=3e-5, strand=None, B1=100, B2=240, B3=1000, block_length=0x40000, threads=1, **kwargs)\n--
 
         Instantiate and configure a new long targets pipeline.
 
@@ -5307,9 +7414,15 @@ cdef class LongTargetsPipeline(Pipeline):
             block_length (`int`): The number of residues to use as the
                 window size :math:`W` when reading blocks from the long
                 target sequences.
+            threads (`int`): The number of threads to use to process the
+                windows of the target sequences in parallel. Pass ``0`` to
+                use one thread per CPU.
             **kwargs: Any additional parameter will be passed to the
                 `~pyhmmer.plan7.Pipeline` constructor.
 
+        .. versionchanged:: 0.7.0
+           Added the ``threads`` keyword argument.
+
         """
         # check that a nucleotide alphabet is given
         if not alphabet.is_nucleotide():
@@ -5323,8 +7436,7 @@ cdef class LongTargetsPipeline(Pipeline):
         self.B1 = B1
         self.B2 = B2
         self.B3 = B3
-        # create a temporary sequence to use to store the current window
-        self._tmpsq = DigitalSequence(alphabet)
+        self.threads = threads
 
     # --- Properties ---------------------------------------------------------
 
@@ -5383,6 +7495,28 @@ cdef class LongTargetsPipeline(Pipeline):
         else:
             raise ValueError(f"invalid strand: {strand!r}")
 
+    @property
+    def threads(self):
+        """`int`: The number of threads processing the windows of a search.
+
+        When greater than one, the windows of the target sequences are
+        split into contiguous batches, which are searched by worker
+        threads with their own copy of the pipeline. The hits of each
+        batch are merged in the order of the windows, so the results are
+        the same as the ones of a single-threaded search. Use ``0`` to
+        use one thread per CPU.
+
+        .. versionadded:: 0.7.0
+
+        """
+        return self._threads
+
+    @threads.setter
+    def threads(self, int threads):
+        if threads < 0:
+            raise ValueError(f"`threads` must be a positive integer or zero, got {threads!r}")
+        self._threads = threads
+
     # --- Methods ------------------------------------------------------------
 
     cpdef list arguments(self):
@@ -5499,6 +7633,16 @@ cdef class LongTargetsPipeline(Pipeline):
     ):
         raise NotImplementedError("Cannot run a database scan with the long target pipeline")
 
+    cpdef TopHits search_hmm_translated(
+        self,
+        object query,
+        object sequences,
+        GeneticCode genetic_code = None,
+        int min_length = 20,
+        int64_t block_length = 1000000,
+    ):
+        raise NotImplementedError("Cannot run a translated search with the long target pipeline")
+
     cpdef TopHits search_hmm(
         self,
         object query,
@@ -5511,8 +7655,9 @@ cdef class LongTargetsPipeline(Pipeline):
         Arguments:
             query (`HMM`, `Profile` or `OptimizedProfile`): The object to use
                 to query the sequence database.
-            sequences (collection of `~pyhmmer.easel.DigitalSequence`): The
-                sequences to query with the HMM.
+            sequences (collection of `~pyhmmer.easel.DigitalSequence`, or `FMIndex`):
+                The sequences to query with the HMM, or an FM-index built
+                over the target sequences.
 
         Returns:
             `~pyhmmer.plan7.TopHits`: the hits found in the sequence database.
@@ -5524,16 +7669,34 @@ cdef class LongTargetsPipeline(Pipeline):
             `~pyhmmer.errors.AlphabetMismatch`: When the alphabet of the
                 current pipeline does not match the alphabet of the given
                 HMM.
+            `TypeError`: When searching an `FMIndex` with an
+                `OptimizedProfile`, since the seed search requires the
+                generic profile of the query.
 
         Hint:
             This method corresponds to running ``nhmmer`` with the
-            ``query`` HMM against the ``sequences`` database.
+            ``query`` HMM against the ``sequences`` database. Giving an
+            `FMIndex` corresponds to running ``nhmmer --tformat fmindex``.
+
+        Note:
+            When searching an `FMIndex`, the seed parameters of ``nhmmer``
+            are used, and the SSV filter threshold is taken from the
+            `~Pipeline.F1` attribute of the pipeline, like with any other
+            target. ``nhmmer`` uses a threshold of *0.03* for FM-index
+            searches, which can be set before the search if needed.
+
+        .. versionchanged:: 0.7.0
+            Support searching an `FMIndex` instead of a sequence collection.
 
         """
         assert self._pli != NULL
 
+        if isinstance(sequences, FMIndex):
+            return self._search_hmm_fm(query, sequences)
+
         cdef size_t                L
         cdef uint64_t              j
+        cdef int                   threads
         cdef ssize_t               nseqs
         cdef int                   status
         cdef int64_t               res_count
@@ -5555,12 +7718,17 @@ cdef class LongTargetsPipeline(Pipeline):
             search_targets = sequences
         # check that the alphabet of the sequences is the same as
         # the alphabet of the pipeline
-        if not self.alphabet._eq(search_targets.alphabet):
+        if search_targets._nref > 0 and not self.alphabet._eq(search_targets.alphabet):
             raise AlphabetMismatch(self.alphabet, search_targets.alphabet)
 
         # convert the query to an optimized profile
         L = self.L_HINT if search_targets._nref == 0 else search_targets._refs[0].L
         om = self._get_om_from_query(query, L=L)
+        # compute the reverse complement of the targets once if needed
+        if self._pli.strands != p7_strands_e.p7_STRAND_TOPONLY:
+            search_targets._reverse_complement()
+        # get the number of threads to use for the windows
+        threads = self._threads if self._threads > 0 else os.cpu_count() or 1
 
         with nogil:
             # make sure the pipeline is set to search mode and ready for a new HMM
@@ -5570,17 +7738,24 @@ cdef class LongTargetsPipeline(Pipeline):
             scoredata._sd = libhmmer.p7_scoredata.p7_hmm_ScoreDataCreate(om, NULL)
             if scoredata._sd == NULL:
                 raise AllocationError("P7_SCOREDATA", sizeof(P7_SCOREDATA))
+
+        if threads > 1:
+            # split the windows of the targets between several threads
+            self._search_loop_parallel(om, search_targets, hits, scoredata, threads)
+        else:
             # run the search loop on all database sequences while recycling memory
-            LongTargetsPipeline._search_loop_longtargets(
-                self._pli,
-                om,
-                self.background._bg,
-                search_targets._refs,
-                hits._th,
-                scoredata._sd,
-                self._tmpsq._sq
-            )
+            with nogil:
+                LongTargetsPipeline._search_loop_longtargets(
+                    self._pli,
+                    om,
+                    self.background._bg,
+                    search_targets._refs,
+                    <const ESL_DSQ**> search_targets._revcomp,
+                    hits._th,
+                    scoredata._sd,
+                )
 
+        with nogil:
             # threshold with user-provided Z if any
             if self._Z is None:
                 res_count = self._pli.nres
@@ -5620,8 +7795,9 @@ cdef class LongTargetsPipeline(Pipeline):
         Arguments:
             query (`~pyhmmer.easel.DigitalSequence`): The sequence object to
                 use to query the sequence database.
-            sequences (collection of `~pyhmmer.easel.DigitalSequence`): The
-                sequences to query.
+            sequences (collection of `~pyhmmer.easel.DigitalSequence`, or `FMIndex`):
+                The sequences to query, or an FM-index built over the
+                target sequences.
             builder (`~pyhmmer.plan7.Builder`, optional): A HMM builder to
                 use to convert the query to a `~pyhmmer.plan7.HMM`. If
                 `None` is given, it will use a default one.
@@ -5660,8 +7836,9 @@ cdef class LongTargetsPipeline(Pipeline):
         Arguments:
             query (`~pyhmmer.easel.DigitalMSA`): The multiple sequence
                 alignment to use to query the sequence database.
-            sequences (collection of `~pyhmmer.easel.DigitalSequence`): The
-                sequences to query.
+            sequences (collection of `~pyhmmer.easel.DigitalSequence`, or `FMIndex`):
+                The sequences to query, or an FM-index built over the
+                target sequences.
             builder (`~pyhmmer.plan7.Builder`, optional): A HMM builder to
                 use to convert the query to a `~pyhmmer.plan7.HMM`. If
                 `None` is given, it will use a default one.
@@ -5689,30 +7866,330 @@ cdef class LongTargetsPipeline(Pipeline):
         assert hmm._hmm.max_length != -1
         return self.search_hmm(hmm, sequences)
 
+    cdef TopHits _search_hmm_fm(self, object query, FMIndex index):
+        assert self._pli != NULL
+        assert index._cfg != NULL
+
+        cdef int               status
+        cdef int               i
+        cdef int               j
+        cdef uint16_t          b
+        cdef float             sc
+        cdef float             max_score
+        cdef float             best_sc_avg
+        cdef int64_t           res_count
+        cdef FM_CFG            cfg
+        cdef P7_PROFILE*       gm
+        cdef P7_OPROFILE*      om
+        cdef P7_HIT*           hit
+        cdef ScoreData         scoredata  = ScoreData.__new__(ScoreData)
+        cdef TopHits           hits       = TopHits()
+
+        # check the pipeline was configured with the same alphabet
+        if not self.alphabet._eq(query.alphabet):
+            raise AlphabetMismatch(self.alphabet, query.alphabet)
+        # the FM seed search needs the generic profile of the query
+        if isinstance(query, OptimizedProfile):
+            raise TypeError("Cannot search an FMIndex with an OptimizedProfile query")
+
+        # convert the query to an optimized profile, and get the generic one
+        om = self._get_om_from_query(query, L=self.L_HINT)
+        gm = self.profile._gm if isinstance(query, HMM) else (<Profile> query)._gm
+        if om.max_length <= 0:
+            raise ValueError(f"invalid context size: {om.max_length!r}")
+
+        # use a private copy of the configuration, since the score threshold
+        # ratio depends on the query and the index may be shared by threads
+        cfg = index._cfg[0]
+
+        with nogil:
+            # make sure the pipeline is set to search mode and ready for a new HMM
+            self._pli.mode = p7_pipemodes_e.p7_SEARCH_SEQS
+            # capture a measure of score density, and lower the seed score
+            # threshold accordingly for low-density models (see `nhmmer.c`)
+            best_sc_avg = 0
+            for i in range(1, om.M + 1):
+                max_score = 0
+                for j in range(om.abc.K):
+                    sc = gm.rsc[j][i * p7P_NR + p7P_MSC]
+                    if sc > max_score:
+                        max_score = sc
+                best_sc_avg += max_score
+            best_sc_avg /= sqrt(<double> om.M)
+            best_sc_avg = max(5.0, best_sc_avg)
+            cfg.sc_thresh_ratio = min(best_sc_avg / 7.0, 1.0)
+            # create the score data struct
+            scoredata.Kp = om.abc.Kp
+            scoredata._sd = libhmmer.p7_scoredata.p7_hmm_ScoreDataCreate(om, gm)
+            if scoredata._sd == NULL:
+                raise AllocationError("P7_SCOREDATA", sizeof(P7_SCOREDATA))
+            # configure the pipeline for the current HMM
+            status = libhmmer.p7_pipeline.p7_pli_NewModel(self._pli, om, self.background._bg)
+            if status == libeasel.eslEINVAL:
+                raise ValueError("model does not have bit score thresholds expected by the pipeline")
+            elif status != libeasel.eslOK:
+                raise UnexpectedError(status, "p7_pli_NewModel")
+            # run the pipeline on every block of the index
+            for b in range(cfg.meta.block_count):
+                status = libhmmer.p7_pipeline.p7_Pipeline_LongTarget(
+                    self._pli,
+                    om,
+                    scoredata._sd,
+                    self.background._bg,
+                    hits._th,
+                    -1,
+                    NULL,
+                    <p7_complementarity_e> -1,
+                    &index._fwd[b],
+                    &index._bwd[b],
+                    &cfg,
+                )
+                if status == libeasel.eslEINVAL:
+                    raise ValueError("model does not have bit score thresholds expected by the pipeline")
+                elif status == libeasel.eslERANGE:
+                    raise OverflowError("numerical overflow in the optimized vector implementation")
+                elif status != libeasel.eslOK:
+                    raise UnexpectedError(status, "p7_Pipeline_LongTarget")
+
+            # threshold with user-provided Z if any, otherwise with the
+            # number of residues in the index
+            if self._Z is None:
+                res_count = cfg.meta.char_count
+            else:
+                res_count = <int64_t> (1000000 * self._pli.Z)
+            if self._pli.strands == p7_strands_e.p7_STRAND_BOTH:
+                res_count *= 2
+            self._pli.nseqs = index._ntargets
+            self._pli.nres = res_count
+            libhmmer.p7_tophits.p7_tophits_ComputeNhmmerEvalues(hits._th, res_count, om.max_length)
+            # assign lengths and remove duplicates
+            hits._sort_by_seqidx()
+            for j in range(hits._th.N):
+                hit = hits._th.hit[j]
+                hit.dcl[0].ad.L = index._lengths[hit.seqidx]
+            libhmmer.p7_tophits.p7_tophits_RemoveDuplicates(hits._th, self._pli.use_bit_cutoffs)
+            # sort hits
+            hits._sort_by_key()
+            hits._threshold(self)
+
+        # return the hits
+        return hits
+
+    cdef int _search_loop_parallel(
+        self,
+        P7_OPROFILE*          om,
+        PipelineSearchTargets targets,
+        TopHits               hits,
+        ScoreData             scoredata,
+        int                   threads,
+    ) except 1:
+        """_search_loop_parallel(self, om, targets, hits, scoredata, threads)\n--
+
+        Search the windows of the targets in several threads.
+
+        The windows of all targets are split into contiguous batches,
+        which may span several targets or only cover part of a target.
+        Each worker thread gets its own copy of the pipeline, of the
+        optimized profile, of the background model and of the score data,
+        and searches the batches it takes from the queue into their own
+        hit list. The hits of all batches are merged into ``hits`` in the
+        order of the batches, so that the hits are stored in the same
+        order as in a serial search.
+
+        """
+        cdef size_t       i
+        cdef int          status
+        cdef int64_t      n
+        cdef int64_t      nwin
+        cdef int64_t      step
+        cdef int64_t      offset
+        cdef int64_t      count
+        cdef int64_t      chunk
+        cdef int64_t      first        = 0
+        cdef int64_t      first_offset = 0
+        cdef int64_t      total        = 0
+        cdef list         batches      = []
+        cdef size_t       nbatch       = 0
+        cdef uint64_t     base         = self._pli.nseqs
+        cdef P7_TOPHITS** results      = NULL
+
+        # configure the pipeline for the current HMM, so that the model
+        # thresholds are available to the main pipeline as well
+        with nogil:
+            LongTargetsPipeline._new_model(self._pli, om, self.background._bg)
+        step = self._pli.block_length - om.max_length
+
+        # count the windows of every target, and split them into batches
+        # so that each thread gets several batches to balance the load
+        for i in range(targets._nref):
+            total += (targets._refs[i].n + step - 1) // step
+        chunk = max(1, (total + 4*threads - 1) // (4*threads))
+        count = 0
+        for i in range(targets._nref):
+            nwin = (targets._refs[i].n + step - 1) // step
+            offset = 0
+            while offset < nwin:
+                if count == 0:
+                    first = i
+                    first_offset = offset
+                n = min(nwin - offset, chunk - count)
+                count += n
+                offset += n
+                if count == chunk:
+                    batches.append((first, first_offset, count))
+                    count = 0
+        if count > 0:
+            batches.append((first, first_offset, count))
+        nbatch = len(batches)
+
+        # process the batches in the worker threads
+        lock = threading.Lock()
+        queue = iter(enumerate(batches))
+
+        def work():
+            cdef int           status
+            cdef size_t        index
+            cdef int64_t       t
+            cdef int64_t       off
+            cdef int64_t       k
+            cdef int64_t       nwin_
+            cdef int64_t       remaining
+            cdef P7_PIPELINE*  pli = NULL
+            cdef P7_OPROFILE*  wom = NULL
+            cdef P7_BG*        wbg = NULL
+            cdef P7_SCOREDATA* wsd = NULL
+            cdef P7_TOPHITS*   th  = NULL
+
+            try:
+                with nogil:
+                    pli = LongTargetsPipeline._clone_pipeline(self._pli)
+                    if pli == NULL:
+                        raise AllocationError("P7_PIPELINE", sizeof(P7_PIPELINE))
+                    wom = p7_oprofile.p7_oprofile_Copy(om)
+                    if wom == NULL:
+                        raise AllocationError("P7_OPROFILE", sizeof(P7_OPROFILE))
+                    wbg = libhmmer.p7_bg.p7_bg_Clone(self.background._bg)
+                    if wbg == NULL:
+                        raise AllocationError("P7_BG", sizeof(P7_BG))
+                    wsd = libhmmer.p7_scoredata.p7_hmm_ScoreDataClone(scoredata._sd, om.abc.Kp)
+                    if wsd == NULL:
+                        raise AllocationError("P7_SCOREDATA", sizeof(P7_SCOREDATA))
+                    LongTargetsPipeline._new_model(pli, wom, wbg)
+
+                while True:
+                    with lock:
+                        batch = next(queue, None)
+                    if batch is None:
+                        break
+                    index, (t, off, remaining) = batch
+                    with nogil:
+                        th = results[index] = libhmmer.p7_tophits.p7_tophits_Create()
+                        if th == NULL:
+                            raise AllocationError("P7_TOPHITS", sizeof(P7_TOPHITS))
+                        while remaining > 0:
+                            nwin_ = (targets._refs[t].n + step - 1) // step
+                            k = min(nwin_ - off, remaining)
+                            if k > 0:
+                                LongTargetsPipeline._search_windows(
+                                    pli,
+                                    wom,
+                                    wbg,
+                                    targets._refs[t],
+                                    NULL if targets._revcomp == NULL else targets._revcomp[t],
+                                    base + t,
+                                    off * step,
+                                    min(targets._refs[t].n, (off + k) * step),
+                                    th,
+                                    wsd,
+                                )
+                                remaining -= k
+                            t += 1
+                            off = 0
+
+                # merge the statistics of the worker pipeline, with the GIL
+                # held so that workers do not update the main pipeline at once
+                status = libhmmer.p7_pipeline.p7_pipeline_Merge(self._pli, pli)
+                if status != libeasel.eslOK:
+                    raise UnexpectedError(status, "p7_pipeline_Merge")
+            finally:
+                libhmmer.p7_pipeline.p7_pipeline_Destroy(pli)
+                p7_oprofile.p7_oprofile_Destroy(wom)
+                libhmmer.p7_bg.p7_bg_Destroy(wbg)
+                libhmmer.p7_scoredata.p7_hmm_ScoreDataDestroy(wsd)
+
+        results = <P7_TOPHITS**> calloc(max(nbatch, 1), sizeof(P7_TOPHITS*))
+        if results == NULL:
+            raise AllocationError("P7_TOPHITS*", sizeof(P7_TOPHITS*), nbatch)
+        try:
+            threads = min(threads, nbatch)
+            if threads > 0:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                    futures = [executor.submit(work) for _ in range(threads)]
+                    for future in futures:
+                        future.result()
+            # merge the hits in the order of the batches
+            with nogil:
+                for i in range(nbatch):
+                    status = libhmmer.p7_tophits.p7_tophits_Merge(hits._th, results[i])
+                    if status != libeasel.eslOK:
+                        raise UnexpectedError(status, "p7_tophits_Merge")
+        finally:
+            for i in range(nbatch):
+                libhmmer.p7_tophits.p7_tophits_Destroy(results[i])
+            free(results)
+
+        # count the targets as processed, and set `Z` to the index of the
+        # last non-empty target like `p7_pli_NewSeq` does in a serial loop
+        if self._pli.Z_setby == p7_zsetby_e.p7_ZSETBY_NTARGETS:
+            for i in range(targets._nref):
+                if targets._refs[i].n > 0:
+                    self._pli.Z = base + i
+        self._pli.nseqs = base + targets._nref
+
+        return 0
+
     @staticmethod
-    cdef int _search_loop_longtargets(
-              P7_PIPELINE*  pli,
-              P7_OPROFILE*  om,
-              P7_BG*        bg,
-        const ESL_SQ**      sq,
-              P7_TOPHITS*   th,
-              P7_SCOREDATA* scoredata,
-              ESL_SQ*       tmpsq,
-    ) nogil except 1:
-        cdef int      status
-        cdef int      nres
-        cdef int64_t  index  = 0
-        cdef int64_t  j      = 0
-        cdef int64_t  rem    = 0
-        cdef int64_t i       = 0
-        cdef int64_t C       = om.max_length
-        cdef int64_t W       = pli.block_length
+    cdef P7_PIPELINE* _clone_pipeline(const P7_PIPELINE* pli) nogil:
+        cdef P7_PIPELINE  buffers
+        cdef P7_PIPELINE* clone   = libhmmer.p7_pipeline.p7_pipeline_Create(
+            NULL,
+            100,
+            100,
+            pli.long_targets,
+            pli.mode,
+        )
+        if clone == NULL:
+            return NULL
+
+        # copy the configuration of the pipeline, but keep the buffers
+        # and the random number generator of the clone
+        memcpy(&buffers, clone, sizeof(P7_PIPELINE))
+        memcpy(clone, pli, sizeof(P7_PIPELINE))
+        clone.oxf = buffers.oxf
+        clone.oxb = buffers.oxb
+        clone.fwd = buffers.fwd
+        clone.bck = buffers.bck
+        clone.r = buffers.r
+        clone.ddef = buffers.ddef
+        clone.hfp = NULL
+        clone.ddef.do_reseeding = pli.ddef.do_reseeding
+        libeasel.random.esl_randomness_Init(clone.r, libeasel.random.esl_randomness_GetSeed(pli.r))
+
+        # reset the accounting values
+        clone.nmodels = clone.nseqs = clone.nres = clone.nnodes = 0
+        clone.n_past_msv = clone.n_past_bias = clone.n_past_vit = clone.n_past_fwd = clone.n_output = 0
+        clone.pos_past_msv = clone.pos_past_bias = clone.pos_past_vit = clone.pos_past_fwd = clone.pos_output = 0
+        return clone
+
+    @staticmethod
+    cdef int _new_model(P7_PIPELINE* pli, P7_OPROFILE* om, P7_BG* bg) nogil except 1:
+        cdef int status
 
         if om.max_length <= 0:
             raise ValueError(f"invalid context size: {om.max_length!r}")
         if pli.block_length <= 0:
             raise ValueError(f"invalid window size: {pli.block_length!r}")
-        if W <= C:
+        if pli.block_length <= om.max_length:
             # TODO: see if this is handled in nhmmer, and how to emulate it
             raise ValueError("cannot have window size smaller than context")
 
@@ -5723,87 +8200,136 @@ cdef class LongTargetsPipeline(Pipeline):
         elif status != libeasel.eslOK:
             raise UnexpectedError(status, "p7_pli_NewModel")
 
-        # create a temporary sequence in digital mode to store the current window
-        tmpsq = libeasel.sq.esl_sq_CreateDigital(om.abc)
-        if tmpsq == NULL:
-            raise AllocationError("ESL_SQ", sizeof(ESL_SQ))
+        return 0
+
+    @staticmethod
+    cdef int _search_windows(
+              P7_PIPELINE*  pli,
+              P7_OPROFILE*  om,
+              P7_BG*        bg,
+        const ESL_SQ*       sq,
+        const ESL_DSQ*      rc,
+              int64_t       seqidx,
+              int64_t       start,
+              int64_t       end,
+              P7_TOPHITS*   th,
+              P7_SCOREDATA* scoredata,
+    ) nogil except 1:
+        cdef int      status
+        cdef ESL_SQ   window
+        cdef int64_t  i
+        cdef int64_t  C       = om.max_length
+        cdef int64_t  W       = pli.block_length
+
+        # the window is a view over the residues of the target (or of its
+        # reverse complement), which the pipeline only reads from, so it
+        # does not need to copy the residues of every window
+        memset(&window, 0, sizeof(ESL_SQ))
+        window.abc = om.abc
+        window.L = -1
+        window.idx = seqidx
+        window.name = sq.name
+        window.acc = sq.acc
+        window.desc = sq.desc
+        window.source = sq.name
+
+        # iterate over successive windows of width W, keeping C residues
+        # from the previous iteration as context, starting from `start`
+        # (which must be the start of a window)
+        # NB: this is basically the PyRex equivalent for this:
+        #     ```
+        #     for i in range(start, end, W-C)
+        #     ```
+        #     but Cython refuses to optimize that because it cannot be
+        #     sure that W-C is strictly positive, even though we do check
+        #     that it is.
+        for i from start <= i < end by W - C:
+            # update window coordinates
+            window.C     = 0 if i == 0 else min(C, sq.n - i)
+            window.W     = min(W, sq.n - i - window.C)
+            window.n     = window.C + window.W
+            # DEBUG: show loop state
+            # printf("[i=%li] C=%li W=%li n=%li\n", i, window.C, window.W, window.n);
+
+            # configure the profile, background and pipeline for the new sequence
+            status = libhmmer.p7_pipeline.p7_pli_NewSeq(pli, &window)
+            if status != libeasel.eslOK:
+                raise UnexpectedError(status, "p7_pli_NewSeq")
+
+            # process coding strand
+            if pli.strands != p7_strands_e.p7_STRAND_BOTTOMONLY:
+                # point the window to residues [i+1, i+n] of the target
+                window.dsq   = <ESL_DSQ*> &sq.dsq[i]
+                window.start = i + 1
+                window.end   = i + window.n
+                # account for overlapping region of windows
+                pli.nres -= window.C
+                # run the pipeline on the forward strand
+                status = libhmmer.p7_pipeline.p7_Pipeline_LongTarget(pli, om, scoredata, bg, th, seqidx, &window, p7_complementarity_e.p7_NOCOMPLEMENT, NULL, NULL, NULL)
+                if status == libeasel.eslEINVAL:
+                    raise ValueError("model does not have bit score thresholds expected by the pipeline")
+                elif status == libeasel.eslERANGE:
+                    raise OverflowError("numerical overflow in the optimized vector implementation")
+                elif status != libeasel.eslOK:
+                    raise UnexpectedError(status, "p7_Pipeline_LongTarget")
+                # clear pipeline for reuse for next target
+                libhmmer.p7_pipeline.p7_pipeline_Reuse(pli)
+            else:
+                pli.nres -= window.n
+
+            # process reverse strand
+            if pli.strands != p7_strands_e.p7_STRAND_TOPONLY:
+                # point the window to the reverse complement of residues
+                # [i+1, i+n], which are stored in reverse order
+                window.dsq   = <ESL_DSQ*> &rc[sq.n - i - window.n]
+                window.start = i + window.n
+                window.end   = i + 1
+                # run the pipeline on the reverse strand
+                status = libhmmer.p7_pipeline.p7_Pipeline_LongTarget(pli, om, scoredata, bg, th, seqidx, &window, p7_complementarity_e.p7_COMPLEMENT, NULL, NULL, NULL)
+                if status == libeasel.eslEINVAL:
+                    raise ValueError("model does not have bit score thresholds expected by the pipeline")
+                elif status == libeasel.eslERANGE:
+                    raise OverflowError("numerical overflow in the optimized vector implementation")
+                elif status != libeasel.eslOK:
+                    raise UnexpectedError(status, "p7_Pipeline_LongTarget")
+                # clear pipeline for reuse for next target
+                libhmmer.p7_pipeline.p7_pipeline_Reuse(pli)
+                pli.nres += window.W
+
+        return 0
+
+    @staticmethod
+    cdef int _search_loop_longtargets(
+              P7_PIPELINE*  pli,
+              P7_OPROFILE*  om,
+              P7_BG*        bg,
+        const ESL_SQ**      sq,
+        const ESL_DSQ**     rc,
+              P7_TOPHITS*   th,
+              P7_SCOREDATA* scoredata,
+    ) nogil except 1:
+        # configure the pipeline for the current HMM
+        LongTargetsPipeline._new_model(pli, om, bg)
 
         # run the inner loop on all sequences
         while sq[0] != NULL:
-            # initialize the sequence window storage
-            tmpsq.idx = index
-            tmpsq.L = -1 #sq[0].n
-            libeasel.sq.esl_sq_SetAccession(tmpsq, sq[0].acc)
-            libeasel.sq.esl_sq_SetName(tmpsq, sq[0].name)
-            libeasel.sq.esl_sq_SetDesc(tmpsq, sq[0].desc)
-            libeasel.sq.esl_sq_SetSource(tmpsq, sq[0].name)
-            libeasel.sq.esl_sq_GrowTo(tmpsq, min(W+C, sq[0].n))
-
-            # iterate over successive windows of width W, keeping C residues
-            # from the previous iteration as context
-            # NB: this is basically the PyRex equivalent for this:
-            #     ```
-            #     for i in range(0, sq[0].n, W-C)
-            #     ```
-            #     but Cython refuses to optimize that because it cannot be
-            #     sure that W-C is strictly positive, even though we do check
-            #     that it is.
-            for i from 0 <= i < sq[0].n by W - C:
-                # update window coordinates in the temporary sequence
-                tmpsq.C     = 0 if i == 0 else min(C, sq[0].n - i)
-                tmpsq.W     = min(W, sq[0].n - i - tmpsq.C)
-                tmpsq.n     = tmpsq.C + tmpsq.W
-                tmpsq.start = i + 1
-                tmpsq.end   = i + tmpsq.n
-                # DEBUG: show loop state
-                # printf("[i=%li] C=%li W=%li n=%li start=%li end=%li\n", i, tmpsq.C, tmpsq.W, tmpsq.n, tmpsq.start, tmpsq.end);
-
-                # copy sequence digits from the target sequence to the temporary sequence
-                memcpy(&tmpsq.dsq[1], &sq[0].dsq[i+1], tmpsq.n)
-                tmpsq.dsq[0] = tmpsq.dsq[tmpsq.n+1] = libeasel.eslDSQ_SENTINEL
-
-                # configure the profile, background and pipeline for the new sequence
-                status = libhmmer.p7_pipeline.p7_pli_NewSeq(pli, tmpsq)
-                if status != libeasel.eslOK:
-                    raise UnexpectedError(status, "p7_pli_NewSeq")
-
-                # process coding strand
-                if pli.strands != p7_strands_e.p7_STRAND_BOTTOMONLY:
-                    # account for overlapping region of windows
-                    pli.nres -= tmpsq.C
-                    # run the pipeline on the forward strand
-                    status = libhmmer.p7_pipeline.p7_Pipeline_LongTarget(pli, om, scoredata, bg, th, pli.nseqs, tmpsq, p7_complementarity_e.p7_NOCOMPLEMENT, NULL, NULL, NULL)
-                    if status == libeasel.eslEINVAL:
-                        raise ValueError("model does not have bit score thresholds expected by the pipeline")
-                    elif status == libeasel.eslERANGE:
-                        raise OverflowError("numerical overflow in the optimized vector implementation")
-                    elif status != libeasel.eslOK:
-                        raise UnexpectedError(status, "p7_Pipeline_LongTarget")
-                    # clear pipeline for reuse for next target
-                    libhmmer.p7_pipeline.p7_pipeline_Reuse(pli)
-                else:
-                    pli.nres -= tmpsq.n
-
-                # process reverse strand
-                if pli.strands != p7_strands_e.p7_STRAND_TOPONLY:
-                    # reverse complement sequence
-                    libeasel.sq.esl_sq_ReverseComplement(tmpsq)
-                    # run the pipeline on the reverse strand
-                    status = libhmmer.p7_pipeline.p7_Pipeline_LongTarget(pli, om, scoredata, bg, th, pli.nseqs, tmpsq, p7_complementarity_e.p7_COMPLEMENT, NULL, NULL, NULL)
-                    if status == libeasel.eslEINVAL:
-                        raise ValueError("model does not have bit score thresholds expected by the pipeline")
-                    elif status == libeasel.eslERANGE:
-                        raise OverflowError("numerical overflow in the optimized vector implementation")
-                    elif status != libeasel.eslOK:
-                        raise UnexpectedError(status, "p7_Pipeline_LongTarget")
-                    # clear pipeline for reuse for next target
-                    libhmmer.p7_pipeline.p7_pipeline_Reuse(pli)
-                    pli.nres += tmpsq.W
-
-            # clear the allocated sequence and advance to next sequence
-            libeasel.sq.esl_sq_Reuse(tmpsq)
+            LongTargetsPipeline._search_windows(
+                pli,
+                om,
+                bg,
+                sq[0],
+                NULL if rc == NULL else rc[0],
+                pli.nseqs,
+                0,
+                sq[0].n,
+                th,
+                scoredata,
+            )
+            # advance to next sequence
             pli.nseqs += 1
             sq += 1
+            if rc != NULL:
+                rc += 1
 
         # Return 0 to indicate success
         return 0
@@ -6177,6 +8703,139 @@ cdef class TopHits:
 
     """
 
+    @classmethod
+    def loads(cls, const uint8_t[::1] data not None):
+        """loads(cls, data)\n--
+
+        Load a `TopHits` instance from a compact binary representation.
+
+        Arguments:
+            data (`bytes`, `bytearray` or `memoryview`): The serialized
+                hits, as obtained with `TopHits.dumps`.
+
+        Returns:
+            `~pyhmmer.plan7.TopHits`: The deserialized hits, including the
+            pipeline parameters used to compute E-values and to threshold
+            the hits.
+
+        Raises:
+            `ValueError`: When ``data`` is not a valid serialized `TopHits`.
+
+        Example:
+            >>> hits = Pipeline(thioesterase.alphabet).search_hmm(thioesterase, proteins)
+            >>> hits2 = TopHits.loads(hits.dumps())
+            >>> hits2[0].name == hits[0].name
+            True
+
+        .. versionadded:: 0.7.0
+
+        """
+        cdef int               status
+        cdef size_t            i
+        cdef HMMD_SEARCH_STATS stats
+        cdef tuple             pli
+        cdef ptrdiff_t         record_size
+        cdef uint32_t          offset     = 0
+        cdef uint32_t          hits_start
+        cdef size_t            end
+        cdef size_t            size       = data.shape[0]
+        cdef TopHits           hits       = cls()
+
+        # check the buffer is large enough for the fixed-size parts, and
+        # small enough for the 32-bit offsets used by HMMER
+        if size < HMMD_SEARCH_STATS_SERIAL_BASE + sizeof(uint64_t) + TOPHITS_PIPELINE_STRUCT.size:
+            raise ValueError("Invalid serialized `TopHits`: buffer is too short")
+        if size > UINT32_MAX:
+            raise ValueError("Invalid serialized `TopHits`: buffer is too long")
+        end = size - TOPHITS_PIPELINE_STRUCT.size
+
+        memset(&stats, 0, sizeof(HMMD_SEARCH_STATS))
+        stats.hit_offsets = NULL
+
+        try:
+            with nogil:
+                # deserialize the search statistics
+                record_size = TopHits._check_stats(&data[0], end)
+                if record_size < 0:
+                    raise ValueError("Invalid serialized `TopHits`: invalid search statistics")
+                status = libhmmer.hmmpgmd.p7_hmmd_search_stats_Deserialize(&data[0], &offset, &stats)
+                if status != libeasel.eslOK or offset != <size_t> record_size:
+                    with gil:
+                        PyErr_Clear() # discard the error from the Easel handler
+                        raise ValueError("Invalid serialized `TopHits`: invalid search statistics")
+
+                # reallocate hit arrays
+                if stats.nhits > hits._th.Nalloc:
+                    hits._th.unsrt = <P7_HIT*> realloc(hits._th.unsrt, stats.nhits * sizeof(P7_HIT))
+                    if hits._th.unsrt == NULL:
+                        raise AllocationError("P7_HIT", sizeof(P7_HIT), stats.nhits)
+                    hits._th.hit = <P7_HIT**> realloc(hits._th.hit, stats.nhits * sizeof(P7_HIT*))
+                    if hits._th.hit == NULL:
+                        raise AllocationError("P7_HIT*", sizeof(P7_HIT*), stats.nhits)
+                    hits._th.Nalloc = stats.nhits
+
+                # deserialize hits, which were stored in sorted order
+                hits_start = offset
+                for i in range(stats.nhits):
+                    if offset - hits_start != stats.hit_offsets[i]:
+                        raise ValueError("Invalid serialized `TopHits`: inconsistent hit offsets")
+                    record_size = TopHits._check_hit(&data[offset], end - offset)
+                    if record_size < 0:
+                        raise ValueError("Invalid serialized `TopHits`: invalid hit")
+                    # clean pointers in hit data to force reallocation
+                    hits._th.unsrt[i].name = NULL
+                    hits._th.unsrt[i].acc  = NULL
+                    hits._th.unsrt[i].desc = NULL
+                    hits._th.unsrt[i].dcl  = NULL
+                    # deserialize and record the hit
+                    status = libhmmer.p7_hit.p7_hit_Deserialize(&data[0], &offset, &hits._th.unsrt[i])
+                    if status != libeasel.eslOK:
+                        with gil:
+                            PyErr_Clear() # discard the error from the Easel handler
+                            raise ValueError("Invalid serialized `TopHits`: invalid hit")
+                    hits._th.hit[i] = &hits._th.unsrt[i]
+                    hits._th.N += 1
+                if offset != end:
+                    raise ValueError("Invalid serialized `TopHits`: unexpected data after hits")
+
+                # copy the search statistics
+                hits._th.nreported = stats.nreported
+                hits._th.nincluded = stats.nincluded
+                hits._pli.Z = stats.Z
+                hits._pli.domZ = stats.domZ
+                hits._pli.Z_setby = stats.Z_setby
+                hits._pli.domZ_setby = stats.domZ_setby
+                hits._pli.nmodels = stats.nmodels
+                hits._pli.nseqs = stats.nseqs
+                hits._pli.n_past_msv = stats.n_past_msv
+                hits._pli.n_past_bias = stats.n_past_bias
+                hits._pli.n_past_vit = stats.n_past_vit
+                hits._pli.n_past_fwd = stats.n_past_fwd
+        finally:
+            free(stats.hit_offsets)
+
+        # copy the remaining pipeline parameters
+        pli = TOPHITS_PIPELINE_STRUCT.unpack_from(data, end)
+        (
+            hits._pli.by_E, hits._pli.E, hits._pli.T,
+            hits._pli.dom_by_E, hits._pli.domE, hits._pli.domT,
+            hits._pli.use_bit_cutoffs,
+            hits._pli.inc_by_E, hits._pli.incE, hits._pli.incT,
+            hits._pli.incdom_by_E, hits._pli.incdomE, hits._pli.incdomT,
+            hits._pli.do_max, hits._pli.F1, hits._pli.F2, hits._pli.F3,
+            hits._pli.B1, hits._pli.B2, hits._pli.B3,
+            hits._pli.do_biasfilter, hits._pli.do_null2,
+            hits._pli.nres, hits._pli.nnodes, hits._pli.n_output,
+            hits._pli.pos_past_msv, hits._pli.pos_past_bias,
+            hits._pli.pos_past_vit, hits._pli.pos_past_fwd,
+            hits._pli.pos_output,
+            hits._pli.mode, hits._pli.long_targets, hits._pli.strands,
+            hits._pli.W, hits._pli.block_length,
+            hits._th.is_sorted_by_sortkey, hits._th.is_sorted_by_seqidx,
+        ) = pli
+
+        return hits
+
     # --- Magic methods ------------------------------------------------------
 
     def __cinit__(self):
@@ -6224,6 +8883,9 @@ cdef class TopHits:
     def __add__(TopHits self, TopHits other):
         return self.merge(other)
 
+    def __reduce__(self):
+        return TopHits.loads, (self.dumps(),)
+
     # --- Properties ---------------------------------------------------------
 
     @property
@@ -6440,6 +9102,194 @@ cdef class TopHits:
             raise UnexpectedError(status, "p7_tophits_SortBySeqidxAndAlipos")
         return 0
 
+    # --- Serialization checks -----------------------------------------------
+
+    # NOTE(@althonos): The HMMER deserializers trust their input entirely,
+    #                  so the records are checked against the buffer before
+    #                  being deserialized. The fixed sizes below follow the
+    #                  layouts in `p7_hit.c`, `p7_domain.c`, `p7_alidisplay.c`
+    #                  and `p7_hmmd_search_stats.c`.
+    DEF HIT_SERIAL_BASE        = 109
+    DEF DOMAIN_SERIAL_BASE     = 92
+    DEF ALIDISPLAY_SERIAL_BASE = 45
+
+    @staticmethod
+    cdef uint32_t _load_u32(const uint8_t* buf) nogil:
+        # read a 32-bit integer stored in network byte order
+        return (
+                (<uint32_t> buf[0] << 24)
+            |   (<uint32_t> buf[1] << 16)
+            |   (<uint32_t> buf[2] << 8)
+            |   (<uint32_t> buf[3])
+        )
+
+    @staticmethod
+    cdef uint64_t _load_u64(const uint8_t* buf) nogil:
+        # read a 64-bit integer stored in network byte order
+        return (<uint64_t> TopHits._load_u32(buf) << 32) | TopHits._load_u32(&buf[4])
+
+    @staticmethod
+    cdef const uint8_t* _check_string(
+        const uint8_t* ptr,
+        const uint8_t* end,
+        uint64_t length,
+    ) nogil:
+        # check that a nul-terminated string at `ptr` ends before `end`, and
+        # that it has the given `length` unless it is `UINT64_MAX`; returns
+        # a pointer past the string, or NULL if it is invalid (or if `ptr`
+        # is NULL already, so that checks can be chained)
+        cdef const uint8_t* nul
+        if ptr == NULL or ptr >= end:
+            return NULL
+        nul = <const uint8_t*> memchr(ptr, 0, end - ptr)
+        if nul == NULL:
+            return NULL
+        if length != UINT64_MAX and <uint64_t> (nul - ptr) != length:
+            return NULL
+        return nul + 1
+
+    @staticmethod
+    cdef ptrdiff_t _check_alidisplay(const uint8_t* buf, size_t size) nogil:
+        # check a serialized `P7_ALIDISPLAY` and return its size, or -1
+        cdef uint32_t       obj_size
+        cdef int            i
+        cdef uint64_t       N
+        cdef uint8_t        presence
+        cdef const uint8_t* ptr
+        cdef const uint8_t* end
+
+        if size < ALIDISPLAY_SERIAL_BASE:
+            return -1
+        obj_size = TopHits._load_u32(buf)
+        if obj_size < ALIDISPLAY_SERIAL_BASE or obj_size > size:
+            return -1
+
+        # the aligned lines all have the alignment length, except the
+        # nucleotide sequence of translated alignments which has 3 bases
+        # per aligned residue; the target sequence is always present
+        N = TopHits._load_u32(&buf[4])
+        presence = buf[ALIDISPLAY_SERIAL_BASE - 1]
+        if not presence & 0x10:
+            return -1
+        ptr = &buf[ALIDISPLAY_SERIAL_BASE]
+        end = &buf[obj_size]
+        if presence & 0x01: # rfline
+            ptr = TopHits._check_string(ptr, end, N)
+        if presence & 0x02: # mmline
+            ptr = TopHits._check_string(ptr, end, N)
+        if presence & 0x04: # csline
+            ptr = TopHits._check_string(ptr, end, N)
+        ptr = TopHits._check_string(ptr, end, N) # model
+        ptr = TopHits._check_string(ptr, end, N) # mline
+        ptr = TopHits._check_string(ptr, end, N) # aseq
+        if presence & 0x20: # ntseq
+            ptr = TopHits._check_string(ptr, end, 3*N)
+        if presence & 0x08: # ppline
+            ptr = TopHits._check_string(ptr, end, N)
+        # hmmname, hmmacc, hmmdesc, sqname, sqacc and sqdesc
+        for i in range(6):
+            ptr = TopHits._check_string(ptr, end, UINT64_MAX)
+        if ptr != end:
+            return -1
+        return obj_size
+
+    @staticmethod
+    cdef ptrdiff_t _check_domain(const uint8_t* buf, size_t size) nogil:
+        # check a serialized `P7_DOMAIN` with its alignment and return its
+        # size, or -1
+        cdef uint32_t  obj_size
+        cdef uint64_t  spp_length
+        cdef ptrdiff_t ad_size
+
+        if size < DOMAIN_SERIAL_BASE:
+            return -1
+        obj_size = TopHits._load_u32(buf)
+        spp_length = TopHits._load_u32(&buf[DOMAIN_SERIAL_BASE - sizeof(uint32_t)])
+        if obj_size != DOMAIN_SERIAL_BASE + spp_length * sizeof(float) or obj_size > size:
+            return -1
+
+        # the scores per position, if any, are read for every aligned residue
+        ad_size = TopHits._check_alidisplay(&buf[obj_size], size - obj_size)
+        if ad_size < 0:
+            return -1
+        if spp_length != 0 and spp_length != TopHits._load_u32(&buf[obj_size + 4]):
+            return -1
+        return obj_size + ad_size
+
+    @staticmethod
+    cdef ptrdiff_t _check_hit(const uint8_t* buf, size_t size) nogil:
+        # check a serialized `P7_HIT` with its domains and return its size,
+        # or -1
+        cdef uint32_t       i
+        cdef uint32_t       obj_size
+        cdef uint32_t       ndom
+        cdef uint8_t        presence
+        cdef size_t         offset
+        cdef ptrdiff_t      dom_size
+        cdef const uint8_t* ptr
+        cdef const uint8_t* end
+
+        if size < HIT_SERIAL_BASE:
+            return -1
+        obj_size = TopHits._load_u32(buf)
+        if obj_size < HIT_SERIAL_BASE or obj_size > size:
+            return -1
+
+        # name, and accession and description if present
+        presence = buf[HIT_SERIAL_BASE - 1]
+        ptr = &buf[HIT_SERIAL_BASE]
+        end = &buf[obj_size]
+        ptr = TopHits._check_string(ptr, end, UINT64_MAX)
+        if presence & 0x01:
+            ptr = TopHits._check_string(ptr, end, UINT64_MAX)
+        if presence & 0x02:
+            ptr = TopHits._check_string(ptr, end, UINT64_MAX)
+        if ptr != end:
+            return -1
+
+        # hits have at least one domain, and the best domain is used as
+        # an index into the domains
+        ndom = TopHits._load_u32(&buf[72])
+        if ndom == 0 or TopHits._load_u32(&buf[88]) >= ndom:
+            return -1
+
+        offset = obj_size
+        for i in range(ndom):
+            dom_size = TopHits._check_domain(&buf[offset], size - offset)
+            if dom_size < 0:
+                return -1
+            offset += dom_size
+        return offset
+
+    @staticmethod
+    cdef ptrdiff_t _check_stats(const uint8_t* buf, size_t size) nogil:
+        # check serialized `HMMD_SEARCH_STATS` and return their size, or -1
+        cdef uint64_t nhits
+        cdef uint64_t first_offset
+        cdef size_t   stats_size = HMMD_SEARCH_STATS_SERIAL_BASE + sizeof(uint64_t)
+
+        if size < stats_size:
+            return -1
+        # `Z_setby` and `domZ_setby` must be valid `p7_zsetby_e` values
+        if buf[5*sizeof(double)] > 2 or buf[5*sizeof(double) + 1] > 2:
+            return -1
+        # reported and included hits are a subset of all the hits
+        nhits = TopHits._load_u64(&buf[HMMD_SEARCH_STATS_SERIAL_BASE - 3*sizeof(uint64_t)])
+        if TopHits._load_u64(&buf[HMMD_SEARCH_STATS_SERIAL_BASE - 2*sizeof(uint64_t)]) > nhits:
+            return -1
+        if TopHits._load_u64(&buf[HMMD_SEARCH_STATS_SERIAL_BASE - sizeof(uint64_t)]) > nhits:
+            return -1
+        # the hit offsets are only absent (marked with -1) when there
+        # are no hits, otherwise there is one offset per hit
+        first_offset = TopHits._load_u64(&buf[HMMD_SEARCH_STATS_SERIAL_BASE])
+        if (first_offset == UINT64_MAX) != (nhits == 0):
+            return -1
+        if nhits > 0:
+            if nhits - 1 > (size - stats_size) // sizeof(uint64_t):
+                return -1
+            stats_size += (nhits - 1) * sizeof(uint64_t)
+        return stats_size
+
     # --- Methods ------------------------------------------------------------
 
     cpdef TopHits copy(self):
@@ -6720,6 +9570,202 @@ cdef class TopHits:
             free(sqarr)
             free(trarr)
 
+    cpdef dict to_arrays(self, bint domains=False):
+        """to_arrays(self, domains=False)\n--
+
+        Export the hits or their domains as columns of contiguous arrays.
+
+        The arrays are filled in a single pass over the hits, without
+        creating a `Hit` or a `Domain` for each row, and support the
+        buffer protocol so that they can be wrapped without copy with
+        `numpy.asarray` (or passed as columns to a `pandas.DataFrame`).
+
+        Arguments:
+            domains (`bool`): Whether to export one row per domain instead
+                of one row per hit.
+
+        Returns:
+            `dict`: A dictionary mapping column names to `array.array`
+            objects. Rows are in the same order as the hits (and as
+            the domains of each hit) of this `TopHits`.
+
+            The hit columns are ``score``, ``bias`` (*float32*),
+            ``evalue``, ``pvalue`` (*float64*), ``flags`` (*uint32*),
+            ``reported``, ``included`` (*uint8*) and ``domains``
+            (*int32*, the number of domains of each hit). The names of
+            the hits are stored in Arrow layout: ``names`` is a `bytes`
+            buffer with the concatenated names, and ``name_offsets`` an
+            *int64* array of length :math:`N+1`, so that the name of the
+            :math:`i`-th hit is ``names[name_offsets[i]:name_offsets[i+1]]``.
+
+            The domain columns are ``hit`` (*int64*, the index of the hit
+            of each domain), ``env_from``, ``env_to``, ``ali_from``,
+            ``ali_to``, ``hmm_from``, ``hmm_to`` (*int64*), ``score``,
+            ``bias`` (*float32*), ``c_evalue``, ``i_evalue``, ``pvalue``
+            (*float64*), ``reported`` and ``included`` (*uint8*).
+
+        Example:
+            >>> hits = Pipeline(thioesterase.alphabet).search_hmm(thioesterase, proteins)
+            >>> columns = hits.to_arrays()
+            >>> len(columns["score"]) == len(hits)
+            True
+            >>> domains = hits.to_arrays(domains=True)
+            >>> len(domains["score"]) == sum(len(hit.domains) for hit in hits)
+            True
+
+        .. versionadded:: 0.7.0
+
+        """
+        assert self._th != NULL
+
+        cdef size_t       i
+        cdef size_t       k
+        cdef int          j
+        cdef size_t       length
+        cdef P7_HIT*      hit
+        cdef P7_DOMAIN*   dom
+        cdef bytes        names
+        cdef char*        names_data
+        cdef size_t       n            = 0
+        cdef bint         long_targets = self._pli.long_targets
+        cdef double       Z            = 1.0 if long_targets else self._pli.Z
+        cdef double       domZ         = 1.0 if long_targets else self._pli.domZ
+        cdef array.array  float32      = array.array("f")
+        cdef array.array  float64      = array.array("d")
+        cdef array.array  int64        = array.array("q")
+        cdef array.array  uint8        = array.array("B")
+
+        # hit columns
+        cdef array.array  score
+        cdef array.array  bias
+        cdef array.array  evalue
+        cdef array.array  pvalue
+        cdef array.array  flags
+        cdef array.array  reported
+        cdef array.array  included
+        cdef array.array  ndom
+        cdef array.array  name_offsets
+        # domain columns
+        cdef array.array  hits
+        cdef array.array  env_from
+        cdef array.array  env_to
+        cdef array.array  ali_from
+        cdef array.array  ali_to
+        cdef array.array  hmm_from
+        cdef array.array  hmm_to
+        cdef array.array  c_evalue
+        cdef array.array  i_evalue
+
+        if not domains:
+            n = self._th.N
+            score = array.clone(float32, n, False)
+            bias = array.clone(float32, n, False)
+            evalue = array.clone(float64, n, False)
+            pvalue = array.clone(float64, n, False)
+            flags = array.clone(array.array("I"), n, False)
+            reported = array.clone(uint8, n, False)
+            included = array.clone(uint8, n, False)
+            ndom = array.clone(array.array("i"), n, False)
+            name_offsets = array.clone(int64, n + 1, False)
+            # record name offsets first to allocate the name buffer at once
+            with nogil:
+                length = 0
+                for i in range(n):
+                    name_offsets.data.as_longlongs[i] = length
+                    length += strlen(self._th.hit[i].name)
+                name_offsets.data.as_longlongs[n] = length
+            names = PyBytes_FromStringAndSize(NULL, length)
+            names_data = <char*> names
+            with nogil:
+                for i in range(n):
+                    hit = self._th.hit[i]
+                    score.data.as_floats[i] = hit.score
+                    bias.data.as_floats[i] = hit.pre_score - hit.score
+                    pvalue.data.as_doubles[i] = exp(hit.lnP)
+                    evalue.data.as_doubles[i] = exp(hit.lnP) * Z
+                    flags.data.as_uints[i] = hit.flags
+                    reported.data.as_uchars[i] = (hit.flags & p7_hitflags_e.p7_IS_REPORTED) != 0
+                    included.data.as_uchars[i] = (hit.flags & p7_hitflags_e.p7_IS_INCLUDED) != 0
+                    ndom.data.as_ints[i] = hit.ndom
+                    memcpy(
+                        &names_data[name_offsets.data.as_longlongs[i]],
+                        hit.name,
+                        name_offsets.data.as_longlongs[i+1] - name_offsets.data.as_longlongs[i],
+                    )
+            return {
+                "names": names,
+                "name_offsets": name_offsets,
+                "score": score,
+                "bias": bias,
+                "evalue": evalue,
+                "pvalue": pvalue,
+                "flags": flags,
+                "reported": reported,
+                "included": included,
+                "domains": ndom,
+            }
+
+        with nogil:
+            for i in range(self._th.N):
+                n += self._th.hit[i].ndom
+        hits = array.clone(int64, n, False)
+        env_from = array.clone(int64, n, False)
+        env_to = array.clone(int64, n, False)
+        ali_from = array.clone(int64, n, False)
+        ali_to = array.clone(int64, n, False)
+        hmm_from = array.clone(int64, n, False)
+        hmm_to = array.clone(int64, n, False)
+        score = array.clone(float32, n, False)
+        bias = array.clone(float32, n, False)
+        c_evalue = array.clone(float64, n, False)
+        i_evalue = array.clone(float64, n, False)
+        pvalue = array.clone(float64, n, False)
+        reported = array.clone(uint8, n, False)
+        included = array.clone(uint8, n, False)
+        with nogil:
+            k = 0
+            for i in range(self._th.N):
+                hit = self._th.hit[i]
+                for j in range(hit.ndom):
+                    dom = &hit.dcl[j]
+                    hits.data.as_longlongs[k] = i
+                    env_from.data.as_longlongs[k] = dom.ienv
+                    env_to.data.as_longlongs[k] = dom.jenv
+                    if dom.ad != NULL:
+                        ali_from.data.as_longlongs[k] = dom.ad.sqfrom
+                        ali_to.data.as_longlongs[k] = dom.ad.sqto
+                        hmm_from.data.as_longlongs[k] = dom.ad.hmmfrom
+                        hmm_to.data.as_longlongs[k] = dom.ad.hmmto
+                    else:
+                        ali_from.data.as_longlongs[k] = dom.iali
+                        ali_to.data.as_longlongs[k] = dom.jali
+                        hmm_from.data.as_longlongs[k] = 0
+                        hmm_to.data.as_longlongs[k] = 0
+                    score.data.as_floats[k] = dom.bitscore
+                    bias.data.as_floats[k] = dom.dombias * eslCONST_LOG2R
+                    pvalue.data.as_doubles[k] = exp(dom.lnP)
+                    c_evalue.data.as_doubles[k] = exp(dom.lnP) * domZ
+                    i_evalue.data.as_doubles[k] = exp(dom.lnP) * Z
+                    reported.data.as_uchars[k] = dom.is_reported
+                    included.data.as_uchars[k] = dom.is_included
+                    k += 1
+        return {
+            "hit": hits,
+            "env_from": env_from,
+            "env_to": env_to,
+            "ali_from": ali_from,
+            "ali_to": ali_to,
+            "hmm_from": hmm_from,
+            "hmm_to": hmm_to,
+            "score": score,
+            "bias": bias,
+            "c_evalue": c_evalue,
+            "i_evalue": i_evalue,
+            "pvalue": pvalue,
+            "reported": reported,
+            "included": included,
+        }
+
     def merge(self, *others):
         """merge(self, *others)\n--
 
@@ -6759,6 +9805,8 @@ cdef class TopHits:
         """
         assert self._th != NULL
 
+        cdef size_t  i
+        cdef int     j
         cdef TopHits other
         cdef TopHits other_copy
         cdef TopHits merged     = self.copy()
@@ -6795,6 +9843,20 @@ cdef class TopHits:
                 if status != libeasel.eslOK:
                     raise UnexpectedError(status, "p7_pipeline_Merge")
 
+        # clear the reporting and inclusion flags set with the parameters of
+        # each individual search, so that `p7_tophits_Threshold` recomputes
+        # them from the merged ones (with model-specific bit cutoffs, the
+        # flags were set by the pipeline and only need to be counted again)
+        with nogil:
+            for i in range(merged._th.N):
+                merged._th.unsrt[i].nreported = 0
+                merged._th.unsrt[i].nincluded = 0
+                if not merged._pli.use_bit_cutoffs:
+                    merged._th.unsrt[i].flags &= ~(p7_hitflags_e.p7_IS_REPORTED | p7_hitflags_e.p7_IS_INCLUDED)
+                    for j in range(merged._th.unsrt[i].ndom):
+                        merged._th.unsrt[i].dcl[j].is_reported = False
+                        merged._th.unsrt[i].dcl[j].is_included = False
+
         # threshold the merged hits with new values
         status = libhmmer.p7_tophits.p7_tophits_Threshold(merged._th, &merged._pli)
         if status != libeasel.eslOK:
@@ -6803,6 +9865,103 @@ cdef class TopHits:
         # return the merged hits
         return merged
 
+    cpdef bytes dumps(self):
+        """dumps(self)\n--
+
+        Serialize the hits into a compact binary representation.
+
+        The hits are serialized with the same functions used by the
+        HMMER daemon to send search results over the network: the data
+        starts with the search statistics, followed by every hit (with
+        its domains and alignments) in the current order, and ends with
+        the reporting and inclusion parameters of the pipeline. Integers
+        and floating-point numbers are stored in network byte order.
+
+        Returns:
+            `bytes`: The serialized hits, which can be loaded back with
+            `TopHits.loads`.
+
+        Hint:
+            `TopHits` objects are pickled using this representation,
+            which is much more compact than pickling each `Hit` or
+            `Domain` individually.
+
+        .. versionadded:: 0.7.0
+
+        """
+        assert self._th != NULL
+
+        cdef int               status
+        cdef size_t            i
+        cdef P7_HIT*           hit
+        cdef HMMD_SEARCH_STATS stats
+        cdef uint8_t*          stats_buffer = NULL
+        cdef uint32_t          stats_offset = 0
+        cdef uint32_t          stats_nalloc = 0
+        cdef uint8_t*          hits_buffer  = NULL
+        cdef uint32_t          hits_offset  = 0
+        cdef uint32_t          hits_nalloc  = 0
+        cdef bint              sorted       = self._th.is_sorted_by_sortkey or self._th.is_sorted_by_seqidx
+
+        memset(&stats, 0, sizeof(HMMD_SEARCH_STATS))
+        stats.Z          = self._pli.Z
+        stats.domZ       = self._pli.domZ
+        stats.Z_setby    = self._pli.Z_setby
+        stats.domZ_setby = self._pli.domZ_setby
+        stats.nmodels    = self._pli.nmodels
+        stats.nseqs      = self._pli.nseqs
+        stats.n_past_msv = self._pli.n_past_msv
+        stats.n_past_bias = self._pli.n_past_bias
+        stats.n_past_vit = self._pli.n_past_vit
+        stats.n_past_fwd = self._pli.n_past_fwd
+        stats.nhits      = self._th.N
+        stats.nreported  = self._th.nreported
+        stats.nincluded  = self._th.nincluded
+        stats.hit_offsets = NULL
+
+        try:
+            with nogil:
+                # serialize the hits, recording the offset of each hit
+                if self._th.N > 0:
+                    stats.hit_offsets = <uint64_t*> malloc(self._th.N * sizeof(uint64_t))
+                    if stats.hit_offsets == NULL:
+                        raise AllocationError("uint64_t", sizeof(uint64_t), self._th.N)
+                for i in range(self._th.N):
+                    hit = self._th.hit[i] if sorted else &self._th.unsrt[i]
+                    stats.hit_offsets[i] = hits_offset
+                    status = libhmmer.p7_hit.p7_hit_Serialize(hit, &hits_buffer, &hits_offset, &hits_nalloc)
+                    if status != libeasel.eslOK:
+                        raise UnexpectedError(status, "p7_hit_Serialize")
+                # serialize the search statistics
+                status = libhmmer.hmmpgmd.p7_hmmd_search_stats_Serialize(&stats, &stats_buffer, &stats_offset, &stats_nalloc)
+                if status != libeasel.eslOK:
+                    raise UnexpectedError(status, "p7_hmmd_search_stats_Serialize")
+            return b"".join((
+                PyBytes_FromStringAndSize(<char*> stats_buffer, stats_offset),
+                PyBytes_FromStringAndSize(<char*> hits_buffer, hits_offset),
+                TOPHITS_PIPELINE_STRUCT.pack(
+                    self._pli.by_E, self._pli.E, self._pli.T,
+                    self._pli.dom_by_E, self._pli.domE, self._pli.domT,
+                    self._pli.use_bit_cutoffs,
+                    self._pli.inc_by_E, self._pli.incE, self._pli.incT,
+                    self._pli.incdom_by_E, self._pli.incdomE, self._pli.incdomT,
+                    self._pli.do_max, self._pli.F1, self._pli.F2, self._pli.F3,
+                    self._pli.B1, self._pli.B2, self._pli.B3,
+                    self._pli.do_biasfilter, self._pli.do_null2,
+                    self._pli.nres, self._pli.nnodes, self._pli.n_output,
+                    self._pli.pos_past_msv, self._pli.pos_past_bias,
+                    self._pli.pos_past_vit, self._pli.pos_past_fwd,
+                    self._pli.pos_output,
+                    self._pli.mode, self._pli.long_targets, self._pli.strands,
+                    self._pli.W, self._pli.block_length,
+                    self._th.is_sorted_by_sortkey, self._th.is_sorted_by_seqidx,
+                ),
+            ))
+        finally:
+            free(stats.hit_offsets)
+            free(stats_buffer)
+            free(hits_buffer)
+
 
 @cython.freelist(8)
 @cython.no_gc_clear
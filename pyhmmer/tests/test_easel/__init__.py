@@ -1,6 +1,8 @@
 from . import (
     test_alphabet,
     test_bitfield,
+    test_dsqdata,
+    test_geneticcode,
     test_keyhash,
     test_matrix,
     test_msa,
@@ -15,6 +17,8 @@ from . import (
 def load_tests(loader, suite, pattern):
     suite.addTests(loader.loadTestsFromModule(test_alphabet))
     suite.addTests(loader.loadTestsFromModule(test_bitfield))
+    suite.addTests(loader.loadTestsFromModule(test_dsqdata))
+    suite.addTests(loader.loadTestsFromModule(test_geneticcode))
     suite.addTests(loader.loadTestsFromModule(test_keyhash))
     suite.addTests(loader.loadTestsFromModule(test_matrix))
     suite.addTests(loader.loadTestsFromModule(test_msa))
@@ -0,0 +1,144 @@
+import os
+import random
+import unittest
+import tempfile
+
+import pkg_resources
+
+from pyhmmer import easel
+
+
+class TestDigitalSequenceDatabase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.faa = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/LuxC.faa")
+        with easel.SequenceFile(cls.faa, digital=True) as sf:
+            cls.sequences = list(sf)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "LuxC")
+        with easel.SequenceFile(self.faa, digital=True) as sf:
+            easel.DigitalSequenceDatabase.write(sf, self.db)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertSequencesEqual(self, sequences):
+        self.assertEqual(len(sequences), len(self.sequences))
+        for seq, expected in zip(sequences, self.sequences):
+            self.assertEqual(seq.name, expected.name)
+            self.assertEqual(seq.description, expected.description)
+            self.assertEqual(seq.accession, expected.accession)
+            self.assertEqual(seq.sequence, expected.sequence)
+            self.assertEqual(seq.taxonomy_id, expected.taxonomy_id)
+            self.assertEqual(seq.alphabet, expected.alphabet)
+
+    def test_write_files(self):
+        for ext in ("", ".dsqi", ".dsqm", ".dsqs"):
+            self.assertTrue(os.path.exists(self.db + ext))
+
+    def test_write_text_sequence_file(self):
+        with easel.SequenceFile(self.faa) as sf:
+            self.assertRaises(ValueError, easel.DigitalSequenceDatabase.write, sf, self.db)
+
+    def test_write_closed(self):
+        sf = easel.SequenceFile(self.faa, digital=True)
+        sf.close()
+        self.assertRaises(ValueError, easel.DigitalSequenceDatabase.write, sf, self.db)
+
+    def test_write_rewind(self):
+        with easel.SequenceFile(self.faa, digital=True) as sf:
+            sf.read()
+            easel.DigitalSequenceDatabase.write(sf, self.db)
+        with easel.DigitalSequenceDatabase(self.db) as dsqdata:
+            self.assertSequencesEqual(list(dsqdata))
+
+    def test_init_error_filenotfound(self):
+        path = os.path.join(self.tmp.name, "missing")
+        self.assertRaises(FileNotFoundError, easel.DigitalSequenceDatabase, path)
+
+    def test_init_error_wrongformat(self):
+        path = os.path.join(self.tmp.name, "invalid")
+        for ext in ("", ".dsqi", ".dsqm", ".dsqs"):
+            with open(path + ext, "w") as f:
+                f.write("invalid\n")
+        self.assertRaises(ValueError, easel.DigitalSequenceDatabase, path)
+
+    def test_init_error_alphabet(self):
+        dna = easel.Alphabet.dna()
+        self.assertRaises(ValueError, easel.DigitalSequenceDatabase, self.db, dna)
+
+    def test_init_alphabet(self):
+        amino = easel.Alphabet.amino()
+        with easel.DigitalSequenceDatabase(self.db, amino) as dsqdata:
+            self.assertIs(dsqdata.alphabet, amino)
+            self.assertSequencesEqual(list(dsqdata))
+
+    def test_len(self):
+        with easel.DigitalSequenceDatabase(self.db) as dsqdata:
+            self.assertEqual(len(dsqdata), len(self.sequences))
+
+    def test_iter(self):
+        with easel.DigitalSequenceDatabase(self.db) as dsqdata:
+            self.assertEqual(dsqdata.alphabet, easel.Alphabet.amino())
+            self.assertSequencesEqual(list(dsqdata))
+
+    def test_read(self):
+        with easel.DigitalSequenceDatabase(self.db) as dsqdata:
+            sequences = []
+            seq = dsqdata.read()
+            while seq is not None:
+                sequences.append(seq)
+                seq = dsqdata.read()
+            self.assertSequencesEqual(sequences)
+            self.assertIs(dsqdata.read(), None)
+
+    def test_read_chunk(self):
+        with easel.DigitalSequenceDatabase(self.db) as dsqdata:
+            first = dsqdata.read()
+            chunk = dsqdata.read_chunk()
+            self.assertSequencesEqual([first, *chunk])
+            self.assertIs(dsqdata.read_chunk(), None)
+
+    def test_close_early(self):
+        dsqdata = easel.DigitalSequenceDatabase(self.db)
+        self.assertIsNot(dsqdata.read(), None)
+        dsqdata.close()
+        self.assertTrue(dsqdata.closed)
+        self.assertRaises(ValueError, dsqdata.read)
+        self.assertRaises(ValueError, len, dsqdata)
+        dsqdata.close()
+
+    def _write_large_database(self, n):
+        # write a database with more chunks than the loader keeps in flight
+        path = os.path.join(self.tmp.name, "large")
+        rng = random.Random(42)
+        with open(path + ".faa", "w") as f:
+            for i in range(n):
+                f.write(">seq{}\n".format(i))
+                f.write("".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=10)))
+                f.write("\n")
+        with easel.SequenceFile(path + ".faa", digital=True, alphabet=easel.Alphabet.amino()) as sf:
+            easel.DigitalSequenceDatabase.write(sf, path)
+        return path
+
+    def test_close_early_large(self):
+        path = self._write_large_database(100000)
+        dsqdata = easel.DigitalSequenceDatabase(path)
+        self.assertEqual(dsqdata.read().name, b"seq0")
+        dsqdata.close()
+        self.assertTrue(dsqdata.closed)
+        # closing the database without reading should also stop the loader
+        dsqdata = easel.DigitalSequenceDatabase(path)
+        dsqdata.close()
+        # databases closed early can be opened and read again
+        with easel.DigitalSequenceDatabase(path) as dsqdata:
+            self.assertEqual(sum(1 for _ in dsqdata), 100000)
+
+    def test_dealloc_early_large(self):
+        path = self._write_large_database(100000)
+        dsqdata = easel.DigitalSequenceDatabase(path)
+        self.assertEqual(dsqdata.read().name, b"seq0")
+        del dsqdata
@@ -0,0 +1,93 @@
+import re
+import unittest
+import pkg_resources
+
+from pyhmmer.easel import Alphabet, GeneticCode, SequenceFile, TextSequence
+from pyhmmer.errors import AlphabetMismatch
+
+
+class TestGeneticCode(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dna = Alphabet.dna()
+        cls.amino = Alphabet.amino()
+
+        seqs_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/BGC0001090.gbk")
+        with SequenceFile(seqs_path, "genbank", digital=True, alphabet=cls.dna) as seqs_file:
+            cls.sequences = list(seqs_file)
+
+    def test_init(self):
+        gencode = GeneticCode()
+        self.assertEqual(gencode.translation_table, 1)
+        self.assertEqual(gencode.nucleotide_alphabet, self.dna)
+        self.assertEqual(gencode.amino_alphabet, self.amino)
+        gencode = GeneticCode(11)
+        self.assertEqual(gencode.translation_table, 11)
+        self.assertIn("plastid", gencode.description)
+
+    def test_init_error(self):
+        self.assertRaises(ValueError, GeneticCode, 7)
+        self.assertRaises(ValueError, GeneticCode, 100)
+        self.assertRaises(ValueError, GeneticCode, nucleotide_alphabet=self.amino)
+        self.assertRaises(ValueError, GeneticCode, amino_alphabet=self.dna)
+
+    def test_translate(self):
+        gencode = GeneticCode()
+        seq = TextSequence(name=b"seq1", sequence="ATGTTTTGGTGANNN").digitize(self.dna)
+        protein = gencode.translate(seq)
+        self.assertEqual(protein.alphabet, self.amino)
+        self.assertEqual(protein.name, b"seq1")
+        self.assertEqual(protein.textize().sequence, "MFW*X")
+
+    def test_translate_table(self):
+        seq = TextSequence(name=b"seq1", sequence="ATGTGA").digitize(self.dna)
+        self.assertEqual(GeneticCode(1).translate(seq).textize().sequence, "M*")
+        self.assertEqual(GeneticCode(4).translate(seq).textize().sequence, "MW")
+
+    def test_translate_error(self):
+        gencode = GeneticCode()
+        seq = TextSequence(name=b"seq1", sequence="ATGTT").digitize(self.dna)
+        self.assertRaises(ValueError, gencode.translate, seq)
+        protein = TextSequence(name=b"seq1", sequence="MFW").digitize(self.amino)
+        self.assertRaises(AlphabetMismatch, gencode.translate, protein)
+
+    def test_orfs(self):
+        gencode = GeneticCode(11)
+        orfs = gencode.orfs(self.sequences)
+        self.assertGreater(len(orfs), 0)
+        self.assertEqual(len(set(orf.name for orf in orfs)), len(orfs))
+
+        text = self.sequences[0].textize().sequence
+        for orf in orfs:
+            self.assertEqual(orf.source, self.sequences[0].name)
+            self.assertGreaterEqual(len(orf), 20)
+            # check the ORF is the translation of its coordinates
+            start, end = map(int, re.search(rb"coords=(\d+)\.\.(\d+)", orf.description).groups())
+            if start < end:
+                nt = TextSequence(sequence=text[start-1:end]).digitize(self.dna)
+            else:
+                nt = TextSequence(sequence=text[end-1:start]).digitize(self.dna)
+                nt.reverse_complement(inplace=True)
+            self.assertEqual(gencode.translate(nt).textize().sequence, orf.textize().sequence)
+
+    def test_orfs_strand(self):
+        gencode = GeneticCode(11)
+        orfs = gencode.orfs(self.sequences)
+        watson = gencode.orfs(self.sequences, strand="watson")
+        crick = gencode.orfs(self.sequences, strand="crick")
+        self.assertEqual(len(watson) + len(crick), len(orfs))
+        self.assertRaises(ValueError, gencode.orfs, self.sequences, strand="both")
+
+    def test_orfs_min_length(self):
+        gencode = GeneticCode(11)
+        orfs = gencode.orfs(self.sequences, min_length=100)
+        self.assertTrue(all(len(orf) >= 100 for orf in orfs))
+        self.assertLess(len(orfs), len(gencode.orfs(self.sequences)))
+        self.assertRaises(ValueError, gencode.orfs, self.sequences, min_length=-1)
+
+    def test_orfs_short(self):
+        gencode = GeneticCode()
+        seq = TextSequence(name=b"seq1", sequence="AT").digitize(self.dna)
+        self.assertEqual(gencode.orfs([seq]), [])
+        self.assertEqual(gencode.orfs([]), [])
@@ -6,6 +6,8 @@ import unittest
 import tempfile
 from itertools import zip_longest
 
+import pkg_resources
+
 from pyhmmer import easel
 
 from ..utils import EASEL_FOLDER
@@ -227,3 +229,82 @@ class TestStockholmFile(_TestReadFilename, _TestReadFileObject, unittest.TestCas
     lengths   = [38]
     counts    = [7]
     alphabet  = [easel.Alphabet.amino()]
+
+
+class TestIncrementalStockholm(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.msa_folder = pkg_resources.resource_filename("pyhmmer.tests", "data/msa")
+        with open(os.path.join(cls.msa_folder, "LuxC.sto"), "rb") as f:
+            cls.single = f.read()
+        with open(os.path.join(cls.msa_folder, "LuxC.hmmalign.sto"), "rb") as f:
+            cls.multiblock = f.read()
+
+    def test_read_sequences(self):
+        with easel.MSAFile(io.BytesIO(self.single)) as f:
+            msa = f.read()
+        with easel.MSAFile(io.BytesIO(self.single)) as f:
+            sequences = list(f.read_sequences())
+            self.assertIs(f.read_sequences(), None)
+        self.assertEqual(len(sequences), len(msa.sequences))
+        for seq, expected in zip(sequences, msa.sequences):
+            self.assertEqual(seq.name, expected.name)
+            self.assertEqual(seq.accession, expected.accession)
+            self.assertEqual(seq.sequence, expected.sequence)
+
+    def test_read_sequences_digital(self):
+        with easel.MSAFile(io.BytesIO(self.single), digital=True) as f:
+            msa = f.read()
+        with easel.MSAFile(io.BytesIO(self.single), digital=True) as f:
+            sequences = list(f.read_sequences())
+        self.assertEqual(len(sequences), len(msa.sequences))
+        for seq, expected in zip(sequences, msa.sequences):
+            self.assertIsInstance(seq, easel.DigitalSequence)
+            self.assertEqual(seq.name, expected.name)
+            self.assertEqual(list(seq.sequence), list(expected.sequence))
+
+    def test_read_sequences_multiblock(self):
+        with easel.MSAFile(io.BytesIO(self.multiblock)) as f:
+            sequences = f.read_sequences()
+            self.assertRaises(ValueError, list, sequences)
+
+    def test_read_sequences_error(self):
+        clustal = os.path.join(self.msa_folder, "laccase.clw")
+        with easel.MSAFile(clustal) as f:
+            self.assertRaises(ValueError, f.read_sequences)
+        self.assertRaises(ValueError, f.read_sequences)
+
+    def test_scan(self):
+        data = self.single + self.multiblock + self.single
+        with easel.MSAFile(io.BytesIO(data)) as f:
+            entries = f.scan()
+            self.assertEqual(
+                entries,
+                [
+                    (b"LuxC", 0),
+                    (None, len(self.single)),
+                    (b"LuxC", len(self.single) + len(self.multiblock))
+                ]
+            )
+            # the position is restored after the scan
+            self.assertEqual(f.read().name, b"LuxC")
+            self.assertEqual(len(f.read().sequences), 12)
+
+    def test_scan_seek(self):
+        data = self.single + self.multiblock
+        with tempfile.NamedTemporaryFile(suffix=".sto") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            with easel.MSAFile(tmp.name) as f:
+                entries = f.scan()
+                f.seek(entries[1][1])
+                self.assertEqual(len(f.read().sequences), 12)
+                f.seek(entries[0][1])
+                self.assertEqual(f.read().name, b"LuxC")
+
+    def test_seek_error(self):
+        with easel.MSAFile(io.BytesIO(self.single)) as f:
+            self.assertRaises(ValueError, f.seek, -1)
+        self.assertRaises(ValueError, f.seek, 0)
+        self.assertRaises(ValueError, f.scan)
@@ -3,6 +3,7 @@ import copy
 import gc
 import io
 import os
+import pickle
 import unittest
 import tempfile
 import warnings
@@ -66,6 +67,16 @@ class TestDigitalSequence(_TestSequenceBase, unittest.TestCase):
         self.assertEqual(bytearray(seq.sequence), arr)
         self.assertEqual(len(seq), 4)
 
+    def test_pickle(self):
+        arr = bytearray([0, 1, 2, 3])
+        seq = easel.DigitalSequence(self.abc, name=b"TEST", description=b"test", sequence=arr)
+        seq.residue_markups = {b"quality": b"!!!!"}
+        new = pickle.loads(pickle.dumps(seq))
+        self.assertEqual(seq, new)
+        self.assertEqual(new.alphabet, self.abc)
+        self.assertEqual(bytearray(new.sequence), arr)
+        self.assertEqual(new.residue_markups, seq.residue_markups)
+
     def test_copy(self):
         arr = bytearray([0, 1, 2, 3])
         seq = easel.DigitalSequence(self.abc, name=b"TEST", sequence=arr)
@@ -151,6 +162,13 @@ class TestTextSequence(_TestSequenceBase, unittest.TestCase):
         self.assertEqual(seq.sequence, "ATGC")
         self.assertEqual(len(seq), 4)
 
+    def test_pickle(self):
+        seq = easel.TextSequence(name=b"TEST", accession=b"TST001", sequence="ATGC")
+        new = pickle.loads(pickle.dumps(seq))
+        self.assertEqual(seq, new)
+        self.assertEqual(new.sequence, "ATGC")
+        self.assertEqual(new.accession, b"TST001")
+
     def test_copy(self):
         seq = easel.TextSequence(name=b"TEST", sequence="ATGC")
 
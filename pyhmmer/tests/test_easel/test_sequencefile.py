@@ -2,6 +2,7 @@ import copy
 import gc
 import io
 import os
+import shutil
 import unittest
 import tempfile
 from itertools import zip_longest
@@ -92,6 +93,207 @@ class TestSequenceFile(unittest.TestCase):
             sequences = list(seq_file)
             self.assertEqual(len(sequences), 13)
 
+    def _luxc(self):
+        return os.path.realpath(
+            os.path.join(__file__, os.pardir, os.pardir, "data", "seqs", "LuxC.faa")
+        )
+
+    def test_read_block(self):
+        with easel.SequenceFile(self._luxc(), digital=True) as seq_file:
+            expected = list(seq_file)
+        for threads in (1, 4):
+            with easel.SequenceFile(self._luxc(), digital=True) as seq_file:
+                blocks = []
+                block = seq_file.read_block(5, threads=threads)
+                while block:
+                    blocks.append(block)
+                    block = seq_file.read_block(5, threads=threads)
+            self.assertEqual([len(block) for block in blocks], [5, 5, 2])
+            self.assertEqual([seq for block in blocks for seq in block], expected)
+
+    def test_read_block_text(self):
+        with easel.SequenceFile(self._luxc()) as seq_file:
+            expected = list(seq_file)
+        with easel.SequenceFile(self._luxc()) as seq_file:
+            block = seq_file.read_block(threads=4)
+            self.assertIsInstance(block[0], easel.TextSequence)
+            self.assertEqual(block, expected)
+            self.assertEqual(seq_file.read_block(threads=4), [])
+
+    def test_read_block_interleaved(self):
+        with easel.SequenceFile(self._luxc(), digital=True) as seq_file:
+            expected = list(seq_file)
+        with easel.SequenceFile(self._luxc(), digital=True) as seq_file:
+            first = seq_file.read()
+            block = seq_file.read_block(3, threads=2)
+            last = seq_file.read()
+        self.assertEqual([first, *block, last], expected[:5])
+
+    def test_read_block_residues(self):
+        with easel.SequenceFile(self._luxc(), digital=True) as seq_file:
+            block = seq_file.read_block(residues=1)
+            self.assertEqual(len(block), 1)
+            block = seq_file.read_block(residues=1000)
+            self.assertGreaterEqual(sum(len(seq) for seq in block), 1000)
+            self.assertLess(sum(len(seq) for seq in block[:-1]), 1000)
+
+    def test_read_block_fileobject(self):
+        with open(self._luxc(), "rb") as f:
+            with easel.SequenceFile(f, "fasta") as seq_file:
+                self.assertEqual(len(seq_file.read_block(threads=4)), 12)
+
+    def test_readinto_block(self):
+        with easel.SequenceFile(self._luxc(), digital=True) as seq_file:
+            expected = list(seq_file)
+        for threads in (1, 4):
+            with easel.SequenceFile(self._luxc(), digital=True) as seq_file:
+                block = [easel.DigitalSequence(seq_file.alphabet) for _ in range(5)]
+                buffers = list(block)
+                sequences = []
+                n = seq_file.readinto_block(block, threads=threads)
+                while n > 0:
+                    self.assertEqual(block, buffers)
+                    self.assertTrue(all(x is y for x, y in zip(block, buffers)))
+                    sequences.extend(seq.copy() for seq in block[:n])
+                    n = seq_file.readinto_block(block, threads=threads)
+            self.assertEqual(sequences, expected)
+
+    def test_read_block_parse_error(self):
+        with open(self._luxc()) as f:
+            lines = f.read().splitlines()
+        # add an invalid character in the sequence of the 7th record
+        index = [i for i, line in enumerate(lines) if line.startswith(">")][6]
+        lines[index + 1] = "1" + lines[index + 1][1:]
+        with tempfile.NamedTemporaryFile("w", suffix=".faa") as tmp:
+            tmp.write("\n".join(lines))
+            tmp.flush()
+            errors = []
+            for threads in (1, 4):
+                with easel.SequenceFile(tmp.name, digital=True, alphabet=easel.Alphabet.amino()) as seq_file:
+                    self.assertEqual(len(seq_file.read_block(3, threads=threads)), 3)
+                    with self.assertRaises(ValueError) as ctx:
+                        seq_file.read_block(threads=threads)
+                    errors.append(str(ctx.exception))
+        self.assertIn("Line {}".format(index + 2), errors[0])
+        self.assertEqual(errors[0], errors[1])
+
+    def test_read_block_missing_header(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".faa") as tmp:
+            tmp.write("\n\nMKVLAA\n>seq1\nMKVLAA\n")
+            tmp.flush()
+            errors = []
+            for threads in (1, 4):
+                with easel.SequenceFile(tmp.name, "fasta") as seq_file:
+                    with self.assertRaises(ValueError) as ctx:
+                        seq_file.read_block(threads=threads)
+                    errors.append(str(ctx.exception))
+        self.assertEqual(errors[0], errors[1])
+
+    def test_read_block_error(self):
+        seq_file = easel.SequenceFile(self._luxc())
+        self.assertRaises(ValueError, seq_file.read_block, -1)
+        self.assertRaises(ValueError, seq_file.read_block, residues=-1)
+        self.assertRaises(ValueError, seq_file.read_block, threads=-1)
+        seq_file.close()
+        self.assertRaises(ValueError, seq_file.read_block)
+
+class TestSequenceFileIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = shutil.copy(
+            os.path.realpath(
+                os.path.join(__file__, os.pardir, os.pardir, "data", "seqs", "LuxC.faa")
+            ),
+            self.tmp.name,
+        )
+        with easel.SequenceFile(self.path, digital=True) as seq_file:
+            self.sequences = list(seq_file)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_index(self):
+        with easel.SequenceFile(self.path) as seq_file:
+            first = seq_file.read()
+            index = seq_file.build_index()
+            self.assertEqual(index, self.path + ".ssi")
+            self.assertTrue(os.path.exists(index))
+            # the position of the file is unchanged
+            self.assertEqual(seq_file.read().name, self.sequences[1].name)
+        with easel.SSIReader(index) as reader:
+            for seq in self.sequences:
+                self.assertEqual(reader.find_name(seq.name).fd, 0)
+
+    def test_build_index_exclusive(self):
+        with easel.SequenceFile(self.path) as seq_file:
+            seq_file.build_index()
+            self.assertRaises(FileExistsError, seq_file.build_index, exclusive=True)
+
+    def test_build_index_fileobject(self):
+        with open(self.path, "rb") as f:
+            with easel.SequenceFile(f, "fasta") as seq_file:
+                self.assertRaises(ValueError, seq_file.build_index)
+
+    def test_fetch(self):
+        with easel.SequenceFile(self.path, digital=True) as seq_file:
+            seq_file.build_index()
+        with easel.SequenceFile(self.path, digital=True) as seq_file:
+            for seq in reversed(self.sequences):
+                self.assertEqual(seq_file.fetch(seq.name), seq)
+            self.assertRaises(KeyError, seq_file.fetch, b"missing")
+
+    def test_fetch_resume(self):
+        with easel.SequenceFile(self.path) as seq_file:
+            seq_file.build_index()
+            seq_file.fetch(self.sequences[5].name)
+            self.assertEqual(seq_file.read().name, self.sequences[6].name)
+
+    def test_fetch_many(self):
+        keys = [seq.name for seq in self.sequences[::-3]]
+        with easel.SequenceFile(self.path, digital=True) as seq_file:
+            seq_file.build_index()
+            fetched = seq_file.fetch_many(keys)
+        self.assertEqual(fetched, self.sequences[::-3])
+        with easel.SequenceFile(self.path, digital=True) as seq_file:
+            self.assertRaises(KeyError, seq_file.fetch_many, [keys[0], b"missing"])
+
+    def test_fetch_subsequence(self):
+        seq = self.sequences[3]
+        with easel.SequenceFile(self.path, digital=True) as seq_file:
+            seq_file.build_index()
+            subseq = seq_file.fetch_subsequence(seq.name, 70, 130)
+            self.assertEqual(subseq.name, seq.name + b"/70-130")
+            self.assertEqual(subseq.sequence, seq.sequence[69:130])
+            suffix = seq_file.fetch_subsequence(seq.name, 100)
+            self.assertEqual(suffix.sequence, seq.sequence[99:])
+
+    def test_fetch_subsequence_error(self):
+        seq = self.sequences[3]
+        with easel.SequenceFile(self.path) as seq_file:
+            seq_file.build_index()
+            self.assertRaises(KeyError, seq_file.fetch_subsequence, b"missing", 1, 10)
+            self.assertRaises(ValueError, seq_file.fetch_subsequence, seq.name, 0, 10)
+            self.assertRaises(ValueError, seq_file.fetch_subsequence, seq.name, 10, 5)
+            self.assertRaises(ValueError, seq_file.fetch_subsequence, seq.name, 1, len(seq) + 1)
+
+    def test_open_index(self):
+        index = os.path.join(self.tmp.name, "index.ssi")
+        with easel.SequenceFile(self.path) as seq_file:
+            seq_file.build_index(index)
+        with easel.SequenceFile(self.path) as seq_file:
+            self.assertRaises(FileNotFoundError, seq_file.fetch, self.sequences[0].name)
+            seq_file.open_index(index)
+            self.assertEqual(seq_file.fetch(self.sequences[0].name).name, self.sequences[0].name)
+
+    def test_index_closed(self):
+        seq_file = easel.SequenceFile(self.path)
+        seq_file.close()
+        self.assertRaises(ValueError, seq_file.build_index)
+        self.assertRaises(ValueError, seq_file.open_index)
+        self.assertRaises(ValueError, seq_file.fetch, self.sequences[0].name)
+
+
 class _TestReadFilename(object):
 
     def test_read_filename_guess_format(self):
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from pyhmmer.easel import Alphabet
@@ -37,3 +38,15 @@ class TestErrors(unittest.TestCase):
 
         err3 = AlphabetMismatch(Alphabet.dna(), Alphabet.amino())
         self.assertNotEqual(err, err3)
+
+    def test_pickle(self):
+        errors = [
+            UnexpectedError(1, "p7_ReconfigLength"),
+            AllocationError("float", 4, 32),
+            EaselError(1, "failure"),
+            AlphabetMismatch(Alphabet.dna(), Alphabet.rna()),
+        ]
+        for err in errors:
+            err2 = pickle.loads(pickle.dumps(err))
+            self.assertIs(type(err2), type(err))
+            self.assertEqual(repr(err2), repr(err))
@@ -9,8 +9,9 @@ import threading
 import pkg_resources
 
 import pyhmmer
-from pyhmmer.plan7 import Pipeline, HMMFile, TopHits, Hit
-from pyhmmer.easel import Alphabet, MSAFile, SequenceFile, TextSequence
+from pyhmmer.errors import AlphabetMismatch
+from pyhmmer.plan7 import Builder, Background, Pipeline, HMM, HMMFile, TopHits, Hit
+from pyhmmer.easel import Alphabet, MSAFile, SequenceFile, TextSequence, DigitalSequenceDatabase, SSIReader
 
 
 class _TestSearch(metaclass=abc.ABCMeta):
@@ -223,6 +224,119 @@ class TestHmmsearchSingle(TestHmmsearch, unittest.TestCase):
         self.assertIs(None, next(hits, None))
 
 
+class TestHmmsearchProcess(TestHmmsearch, unittest.TestCase):
+
+    def get_hits(self, hmm, seqs):
+        return next(pyhmmer.hmmsearch([hmm], seqs, cpus=2, backend="process"))
+
+    @unittest.skip("optimized profiles cannot be sent to worker processes")
+    def test_hmm_vs_optimized_profile(self):
+        pass
+
+    def test_invalid_backend(self):
+        with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+            seqs = list(seqs_file)
+        self.assertRaises(ValueError, pyhmmer.hmmsearch, [], seqs, backend="nonsense")
+
+
+class TestHmmsearchSharded(TestHmmsearch, unittest.TestCase):
+
+    def get_hits(self, hmm, seqs):
+        return next(pyhmmer.hmmsearch([hmm], seqs, cpus=2, shards=3))
+
+    def test_invalid_shards(self):
+        with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+            seqs = list(seqs_file)
+        self.assertRaises(ValueError, pyhmmer.hmmsearch, [], seqs, shards=0)
+        self.assertRaises(ValueError, pyhmmer.hmmsearch, [], seqs, shards=2, backend="process")
+
+    def test_callback(self):
+        with self.hmm_file("PF02826") as hmm_file:
+            hmm = next(hmm_file)
+        with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+            seqs = list(seqs_file)
+        queries = []
+        hits = list(pyhmmer.hmmsearch([hmm, hmm], seqs, cpus=2, shards=3, callback=lambda q, n: queries.append(q)))
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(queries, [hmm, hmm])
+
+
+class TestHmmsearchStreaming(TestHmmsearch, unittest.TestCase):
+
+    def get_hits(self, hmm, seqs):
+        return next(pyhmmer.hmmsearch([hmm], seqs, block_size=500))
+
+    def test_sequence_file(self):
+        with self.hmm_file("PF02826") as hmm_file:
+            hmm = next(hmm_file)
+        with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+            seqs = list(seqs_file)
+        expected = next(pyhmmer.hmmsearch([hmm], seqs, cpus=1))
+        with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+            hits = next(pyhmmer.hmmsearch([hmm], seqs_file, block_size=300))
+        self.assertEqual(hits.Z, expected.Z)
+        self.assertEqual(hits.domZ, expected.domZ)
+        self.assertEqual(hits.hits_reported, expected.hits_reported)
+        self.assertEqual(hits.hits_included, expected.hits_included)
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertEqual(hit.evalue, expected_hit.evalue)
+
+    def test_digital_sequence_database(self):
+        with self.hmm_file("PF02826") as hmm_file:
+            hmm = next(hmm_file)
+        with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+            expected = next(pyhmmer.hmmsearch([hmm], seqs_file, cpus=1))
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "938293.PRJEB85.HG003687")
+            with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+                DigitalSequenceDatabase.write(seqs_file, db)
+            with DigitalSequenceDatabase(db) as dsqdata:
+                hits = next(pyhmmer.hmmsearch([hmm], dsqdata, block_size=300))
+        self.assertEqual(hits.Z, expected.Z)
+        self.assertEqual(hits.hits_reported, expected.hits_reported)
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertEqual(hit.evalue, expected_hit.evalue)
+
+    def test_shards(self):
+        with self.hmm_file("PF02826") as hmm_file:
+            hmm = next(hmm_file)
+        with self.seqs_file("938293.PRJEB85.HG003687", digital=True) as seqs_file:
+            seqs = list(seqs_file)
+        expected = next(pyhmmer.hmmsearch([hmm], seqs, cpus=1))
+        # the last block is smaller than the others
+        self.assertNotEqual(len(seqs) % 1000, 0)
+        hits = next(pyhmmer.hmmsearch([hmm], seqs, cpus=2, block_size=1000, shards=2))
+        self.assertEqual(hits.Z, expected.Z)
+        self.assertEqual(hits.domZ, expected.domZ)
+        self.assertEqual(hits.hits_reported, expected.hits_reported)
+        self.assertEqual(hits.hits_included, expected.hits_included)
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertEqual(hit.evalue, expected_hit.evalue)
+            for domain, expected_domain in zip(hit.domains, expected_hit.domains):
+                self.assertEqual(domain.i_evalue, expected_domain.i_evalue)
+                self.assertEqual(domain.c_evalue, expected_domain.c_evalue)
+
+    def test_no_targets(self):
+        with self.hmm_file("PF02826") as hmm_file:
+            hmm = next(hmm_file)
+        hits = next(pyhmmer.hmmsearch([hmm], [], block_size=500))
+        self.assertEqual(len(hits), 0)
+
+    def test_invalid_block_size(self):
+        with self.hmm_file("PF02826") as hmm_file:
+            hmm = next(hmm_file)
+        self.assertRaises(ValueError, pyhmmer.hmmsearch, [hmm], [], block_size=0)
+
+    def test_text_sequence_file(self):
+        with self.hmm_file("PF02826") as hmm_file:
+            hmm = next(hmm_file)
+        with self.seqs_file("938293.PRJEB85.HG003687") as seqs_file:
+            self.assertRaises(ValueError, pyhmmer.hmmsearch, [hmm], seqs_file, block_size=500)
+
+
 class TestPipelinesearch(_TestSearch, unittest.TestCase):
 
     def get_hits(self, hmm, seqs):
@@ -231,6 +345,61 @@ class TestPipelinesearch(_TestSearch, unittest.TestCase):
         return hits
 
 
+class TestHmmscan(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alphabet = Alphabet.amino()
+        seq_path = pkg_resources.resource_filename(__name__, "data/seqs/938293.PRJEB85.HG003687.faa")
+        with SequenceFile(seq_path, digital=True, alphabet=cls.alphabet) as f:
+            cls.references = list(f)
+        cls.hmm_path = pkg_resources.resource_filename(__name__, "data/hmms/txt/t2pks.hmm")
+        cls.db_path = pkg_resources.resource_filename(__name__, "data/hmms/db/t2pks.hmm")
+
+    def test_no_queries(self):
+        with HMMFile(self.hmm_path) as hmm_file:
+            hits = pyhmmer.hmmscan([], hmm_file, cpus=1)
+            self.assertIs(None, next(hits, None))
+
+    def test_hmms(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        with HMMFile(self.hmm_path) as hmm_file:
+            hits = next(pyhmmer.hmmscan([seq], hmm_file, cpus=1))
+        self.assertEqual(len(hits), 6)  # number found with `hmmscan`
+
+    def test_pressed(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        with HMMFile(self.db_path) as hmm_file:
+            self.assertTrue(hmm_file.is_pressed())
+            hits = next(pyhmmer.hmmscan([seq], hmm_file, cpus=1))
+        self.assertEqual(len(hits), 6)  # number found with `hmmscan`
+
+    def test_multithreaded(self):
+        with HMMFile(self.db_path) as hmm_file:
+            profiles = list(hmm_file.optimized_profiles())
+        single = list(pyhmmer.hmmscan(self.references, profiles, cpus=1))
+        multi = list(pyhmmer.hmmscan(self.references, profiles, cpus=4))
+        self.assertEqual(len(single), len(self.references))
+        self.assertEqual(len(multi), len(self.references))
+        for hits1, hits2 in zip(single, multi):
+            self.assertEqual(len(hits1), len(hits2))
+            for hit1, hit2 in zip(hits1, hits2):
+                self.assertEqual(hit1.name, hit2.name)
+                self.assertEqual(hit1.score, hit2.score)
+
+    def test_multiprocess(self):
+        with HMMFile(self.db_path) as hmm_file:
+            profiles = list(hmm_file.optimized_profiles())
+        single = list(pyhmmer.hmmscan(self.references[:100], profiles, cpus=1))
+        multi = list(pyhmmer.hmmscan(self.references[:100], profiles, cpus=4, backend="process"))
+        self.assertEqual(len(multi), len(single))
+        for hits1, hits2 in zip(single, multi):
+            self.assertEqual(len(hits1), len(hits2))
+            for hit1, hit2 in zip(hits1, hits2):
+                self.assertEqual(hit1.name, hit2.name)
+                self.assertEqual(hit1.score, hit2.score)
+
+
 class TestHmmpress(unittest.TestCase):
 
     def setUp(self):
@@ -238,8 +407,9 @@ class TestHmmpress(unittest.TestCase):
 
     def tearDown(self):
         for ext in ['', '.h3m', '.h3p', '.h3i', '.h3f']:
-            if os.path.exists(self.tmp + ext):
-                os.remove(self.tmp + ext)
+            for path in (self.tmp + ext, self.tmp + ".st" + ext):
+                if os.path.exists(path):
+                    os.remove(path)
 
     def test_roundtrip(self):
         self.hmm = pkg_resources.resource_filename(__name__, "data/hmms/txt/Thioesterase.hmm")
@@ -254,6 +424,93 @@ class TestHmmpress(unittest.TestCase):
             hmm = next(hmm_file)
             self.assertEqual(hmm.name, b"Thioesterase")
 
+    def test_multithreaded(self):
+        h3m = pkg_resources.resource_filename(__name__, "data/hmms/db/t2pks.hmm.h3m")
+        with HMMFile(h3m) as hmm_file:
+            hmms = list(hmm_file)
+        n1 = pyhmmer.hmmer.hmmpress(hmms, self.tmp + ".st", cpus=1)
+        n4 = pyhmmer.hmmer.hmmpress(hmms, self.tmp, cpus=4)
+        self.assertEqual(n1, len(hmms))
+        self.assertEqual(n4, len(hmms))
+        for ext in [".h3m", ".h3p", ".h3f"]:
+            with open(self.tmp + ".st" + ext, "rb") as f1, open(self.tmp + ext, "rb") as f4:
+                self.assertEqual(f1.read(), f4.read(), ext)
+        with SSIReader(self.tmp + ".st.h3i") as r1, SSIReader(self.tmp + ".h3i") as r4:
+            for hmm in hmms:
+                self.assertEqual(r1.find_name(hmm.name), r4.find_name(hmm.name))
+        with HMMFile(self.tmp) as hmm_file:
+            profiles = list(hmm_file.optimized_profiles())
+        self.assertEqual([p.name for p in profiles], [hmm.name for hmm in hmms])
+
+    def test_append(self):
+        h3m = pkg_resources.resource_filename(__name__, "data/hmms/db/t2pks.hmm.h3m")
+        with HMMFile(h3m) as hmm_file:
+            hmms = list(hmm_file)
+        # press the whole database at once, and in two steps
+        pyhmmer.hmmer.hmmpress(hmms, self.tmp + ".st", cpus=1)
+        n1 = pyhmmer.hmmer.hmmpress(hmms[:25], self.tmp, cpus=1, append=True)
+        n2 = pyhmmer.hmmer.hmmpress(hmms[15:], self.tmp, cpus=1, append=True)
+        self.assertEqual(n1, 25)
+        self.assertEqual(n2, len(hmms) - 25)
+        for ext in [".h3m", ".h3p", ".h3f"]:
+            with open(self.tmp + ".st" + ext, "rb") as f1, open(self.tmp + ext, "rb") as f2:
+                self.assertEqual(f1.read(), f2.read(), ext)
+        with SSIReader(self.tmp + ".st.h3i") as r1, SSIReader(self.tmp + ".h3i") as r2:
+            for hmm in hmms:
+                self.assertEqual(r1.find_name(hmm.name), r2.find_name(hmm.name))
+                if hmm.accession is not None:
+                    self.assertEqual(r1.find_name(hmm.accession), r2.find_name(hmm.accession))
+        with HMMFile(self.tmp) as hmm_file:
+            profiles = list(hmm_file.optimized_profiles())
+        self.assertEqual([p.name for p in profiles], [hmm.name for hmm in hmms])
+
+    def test_append_name_conflict(self):
+        h3m = pkg_resources.resource_filename(__name__, "data/hmms/db/t2pks.hmm.h3m")
+        with HMMFile(h3m) as hmm_file:
+            hmms = list(hmm_file)
+        pyhmmer.hmmer.hmmpress(hmms[:2], self.tmp, cpus=1)
+        renamed = hmms[2].copy()
+        renamed.name = hmms[0].name
+        self.assertRaises(ValueError, pyhmmer.hmmer.hmmpress, [renamed], self.tmp, append=True)
+
+    def _pressed(self):
+        data = {}
+        for ext in [".h3m", ".h3p", ".h3f", ".h3i"]:
+            with open(self.tmp + ext, "rb") as f:
+                data[ext] = f.read()
+        return data
+
+    def test_append_same_checksum(self):
+        h3m = pkg_resources.resource_filename(__name__, "data/hmms/db/t2pks.hmm.h3m")
+        with HMMFile(h3m) as hmm_file:
+            hmms = list(hmm_file)
+        pyhmmer.hmmer.hmmpress(hmms[:2], self.tmp, cpus=1)
+        renamed = hmms[0].copy()
+        renamed.name = b"renamed"
+        renamed.accession = None
+        n = pyhmmer.hmmer.hmmpress([hmms[0], renamed], self.tmp, cpus=1, append=True)
+        self.assertEqual(n, 1)
+        with HMMFile(self.tmp) as hmm_file:
+            names = [hmm.name for hmm in hmm_file]
+        self.assertEqual(names, [hmms[0].name, hmms[1].name, b"renamed"])
+
+    def test_append_invalid_untouched(self):
+        h3m = pkg_resources.resource_filename(__name__, "data/hmms/db/t2pks.hmm.h3m")
+        with HMMFile(h3m) as hmm_file:
+            hmms = list(hmm_file)
+        pyhmmer.hmmer.hmmpress(hmms[:2], self.tmp, cpus=1)
+        before = self._pressed()
+        # a model with the name of a different model of the database
+        renamed = hmms[3].copy()
+        renamed.name = hmms[0].name
+        self.assertRaises(ValueError, pyhmmer.hmmer.hmmpress, [hmms[2], renamed], self.tmp, append=True)
+        self.assertEqual(self._pressed(), before)
+        # a model with a different alphabet
+        nucleotide = HMM(10, Alphabet.dna())
+        nucleotide.name = b"nucleotide"
+        self.assertRaises(AlphabetMismatch, pyhmmer.hmmer.hmmpress, [hmms[2], nucleotide], self.tmp, append=True)
+        self.assertEqual(self._pressed(), before)
+
 
 class TestPhmmer(unittest.TestCase):
 
@@ -301,6 +558,75 @@ class TestPhmmer(unittest.TestCase):
                 self.assertEqual(domain.env_from, int(fields[19]))
                 self.assertEqual(domain.env_to, int(fields[20]))
 
+    def test_cache(self):
+        alphabet = Alphabet.amino()
+        path = pkg_resources.resource_filename(__name__, "data/seqs/PKSI.faa")
+        with SequenceFile(path, digital=True, alphabet=alphabet) as seqs_file:
+            seqs = list(seqs_file)
+
+        queries = [seqs[-1], seqs[0], seqs[-1]]
+        builder = Builder(alphabet, EmN=100, EvN=100, EfN=100, Eft=0.02)
+        expected = list(pyhmmer.phmmer(queries, seqs, cpus=1, builder=builder))
+        cache = pyhmmer.hmmer.ModelCache()
+        for cpus in (1, 2):
+            results = list(pyhmmer.phmmer(queries, seqs, cpus=cpus, cache=cache, builder=builder))
+            for hits, exp in zip(results, expected):
+                self.assertEqual(len(hits), len(exp))
+                for hit, exp_hit in zip(hits, exp):
+                    self.assertEqual(hit.name, exp_hit.name)
+                    self.assertEqual(hit.score, exp_hit.score)
+                    self.assertEqual(hit.evalue, exp_hit.evalue)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 4)
+
+    def test_cache_builder(self):
+        alphabet = Alphabet.amino()
+        path = pkg_resources.resource_filename(__name__, "data/seqs/PKSI.faa")
+        with SequenceFile(path, digital=True, alphabet=alphabet) as seqs_file:
+            seqs = list(seqs_file)
+
+        cache = pyhmmer.hmmer.ModelCache(maxsize=1)
+        list(pyhmmer.phmmer(seqs[:1], seqs, cpus=1, cache=cache))
+        builder = Builder(alphabet, popen=0.05)
+        list(pyhmmer.phmmer(seqs[:1], seqs, cpus=1, cache=cache, builder=builder))
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(len(cache), 1)
+        # builders with different calibration parameters must not share models
+        builder = Builder(alphabet, popen=0.05, EfN=100)
+        list(pyhmmer.phmmer(seqs[:1], seqs, cpus=1, cache=cache, builder=builder))
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 0)
+        list(pyhmmer.phmmer(seqs[:1], seqs, cpus=1, cache=cache, builder=builder.copy()))
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_background(self):
+        alphabet = Alphabet.amino()
+        path = pkg_resources.resource_filename(__name__, "data/seqs/PKSI.faa")
+        with SequenceFile(path, digital=True, alphabet=alphabet) as seqs_file:
+            seqs = list(seqs_file)
+
+        background = Background(alphabet, uniform=True)
+        expected = next(pyhmmer.phmmer(seqs[:1], seqs, cpus=1, background=background))
+        cache = pyhmmer.hmmer.ModelCache()
+        list(pyhmmer.phmmer(seqs[:1], seqs, cpus=1, cache=cache))
+        hits = next(pyhmmer.phmmer(seqs[:1], seqs, cpus=1, cache=cache, background=background))
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(len(hits), len(expected))
+        for hit, exp_hit in zip(hits, expected):
+            self.assertEqual(hit.name, exp_hit.name)
+            self.assertEqual(hit.score, exp_hit.score)
+            self.assertEqual(hit.evalue, exp_hit.evalue)
+
+    def test_cache_invalid_size(self):
+        self.assertRaises(ValueError, pyhmmer.hmmer.ModelCache, 0)
+
 
 class TestNhmmer(unittest.TestCase):
 
@@ -418,3 +744,52 @@ class TestHmmalign(unittest.TestCase):
 
         msa = pyhmmer.hmmalign(hmm, seqs, trim=True)
         self.assertEqual(msa, ref)
+
+
+class TestHmmbuild(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alphabet = Alphabet.amino()
+        cls.msas = []
+        for name in ["LuxC.sto", "LuxC.hmmalign.sto", "laccase.clw"]:
+            path = pkg_resources.resource_filename("pyhmmer.tests", "data/msa/{}".format(name))
+            with MSAFile(path, digital=True, alphabet=cls.alphabet) as msa_file:
+                msa = msa_file.read()
+            msa.name = name.encode()
+            cls.msas.append(msa)
+
+    def test_single_threaded(self):
+        builder = Builder(self.alphabet)
+        background = Background(self.alphabet)
+        msas = [msa.copy() for msa in self.msas]
+        results = list(pyhmmer.hmmbuild(msas, builder, background, cpus=1))
+        self.assertEqual(len(results), len(self.msas))
+        for msa, (hmm, profile, opti) in zip(self.msas, results):
+            expected, _, expected_opti = builder.build_msa(msa.copy(), background)
+            self.assertEqual(hmm.name, msa.name)
+            self.assertEqual(hmm.M, expected.M)
+            self.assertEqual(opti, expected_opti)
+
+    def test_multithreaded(self):
+        # building a HMM modifies the alignment, so use new copies each time
+        expected = list(pyhmmer.hmmbuild([msa.copy() for msa in self.msas * 3], cpus=1))
+        results = list(pyhmmer.hmmbuild((msa.copy() for msa in self.msas * 3), cpus=4))
+        self.assertEqual(len(results), len(expected))
+        for (hmm, _, opti), (expected_hmm, _, expected_opti) in zip(results, expected):
+            self.assertEqual(hmm.name, expected_hmm.name)
+            self.assertEqual(opti, expected_opti)
+
+    def test_empty(self):
+        self.assertEqual(list(pyhmmer.hmmbuild([], cpus=2)), [])
+
+    def test_alphabet_mismatch(self):
+        builder = Builder(Alphabet.dna())
+        results = pyhmmer.hmmbuild([msa.copy() for msa in self.msas], builder, cpus=2)
+        self.assertRaises(pyhmmer.errors.AlphabetMismatch, list, results)
+
+    def test_unnamed_msa(self):
+        msa = self.msas[0].copy()
+        msa.name = None
+        results = pyhmmer.hmmbuild([self.msas[1].copy(), msa], cpus=2)
+        self.assertRaises(ValueError, list, results)
@@ -0,0 +1,125 @@
+import os
+import unittest
+import tempfile
+import pkg_resources
+
+import pyhmmer
+from pyhmmer.easel import Alphabet, SequenceFile, TextSequence
+from pyhmmer.plan7 import FMIndex, HMMFile, LongTargetsPipeline, Profile
+
+
+class TestFMIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alphabet = Alphabet.dna()
+
+        hmm_path = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/txt/bmyD.hmm")
+        with HMMFile(hmm_path) as hmm_file:
+            cls.hmm = hmm_file.read()
+
+        seqs_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/BGC0001090.gbk")
+        with SequenceFile(seqs_path, "genbank", digital=True, alphabet=cls.alphabet) as seqs_file:
+            cls.sequences = list(seqs_file)
+
+    def setUp(self):
+        self.tmp = tempfile.NamedTemporaryFile(suffix=".fmi", delete=False)
+        self.tmp.close()
+
+    def tearDown(self):
+        os.remove(self.tmp.name)
+
+    def test_write_load(self):
+        FMIndex.write(self.sequences, self.tmp.name)
+        index = FMIndex(self.tmp.name)
+        self.assertEqual(len(index), len(self.sequences))
+        self.assertEqual(index.residues, sum(len(seq) for seq in self.sequences))
+        self.assertEqual(index.alphabet, self.alphabet)
+
+    def test_write_load_blocks(self):
+        # use small blocks so that the sequence is split across blocks
+        FMIndex.write(self.sequences, self.tmp.name, block_size=50000)
+        index = FMIndex(self.tmp.name)
+        self.assertEqual(len(index), len(self.sequences))
+        self.assertEqual(index.residues, sum(len(seq) for seq in self.sequences))
+
+    def test_write_ambiguous(self):
+        seq = TextSequence(name=b"seq1", sequence="ACGTNNNNACGTRYACGT" * 10)
+        FMIndex.write([seq.digitize(self.alphabet)], self.tmp.name)
+        index = FMIndex(self.tmp.name)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.residues, len(seq))
+
+    def test_write_empty(self):
+        FMIndex.write([], self.tmp.name)
+        index = FMIndex(self.tmp.name)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.residues, 0)
+        hits = LongTargetsPipeline(self.alphabet).search_hmm(self.hmm, index)
+        self.assertEqual(len(hits), 0)
+
+    def test_write_invalid_parameters(self):
+        self.assertRaises(ValueError, FMIndex.write, self.sequences, self.tmp.name, bin_length=100)
+        self.assertRaises(ValueError, FMIndex.write, self.sequences, self.tmp.name, bin_length=8192)
+        self.assertRaises(ValueError, FMIndex.write, self.sequences, self.tmp.name, sa_freq=3)
+        self.assertRaises(ValueError, FMIndex.write, self.sequences, self.tmp.name, block_size=0)
+
+    def test_write_protein(self):
+        seq = TextSequence(name=b"seq1", sequence="IRGIYNIIKSVAEDIEIGIIPPSKDHVTISSFKSPRIADT")
+        dsq = seq.digitize(Alphabet.amino())
+        self.assertRaises(ValueError, FMIndex.write, [dsq], self.tmp.name)
+
+    def test_load_missing(self):
+        self.assertRaises(FileNotFoundError, FMIndex, self.tmp.name + ".missing")
+
+    def test_load_truncated(self):
+        FMIndex.write(self.sequences, self.tmp.name)
+        with open(self.tmp.name, "rb") as f:
+            data = f.read()
+        for size in (10, 50, len(data) // 2):
+            with open(self.tmp.name, "wb") as f:
+                f.write(data[:size])
+            self.assertRaises(ValueError, FMIndex, self.tmp.name)
+
+    def test_search_hmm(self):
+        FMIndex.write(self.sequences, self.tmp.name, block_size=50000)
+        index = FMIndex(self.tmp.name)
+
+        expected = LongTargetsPipeline(self.alphabet).search_hmm(self.hmm, self.sequences)
+        hits = LongTargetsPipeline(self.alphabet).search_hmm(self.hmm, index)
+
+        expected_hits = [hit for hit in expected if hit.is_reported()]
+        reported_hits = [hit for hit in hits if hit.is_reported()]
+        self.assertEqual(len(reported_hits), len(expected_hits))
+        for hit, expected_hit in zip(reported_hits, expected_hits):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertAlmostEqual(hit.score, expected_hit.score, places=1)
+            self.assertAlmostEqual(hit.evalue, expected_hit.evalue, delta=0.1)
+            self.assertEqual(
+                hit.best_domain.alignment.target_from,
+                expected_hit.best_domain.alignment.target_from
+            )
+            self.assertEqual(
+                hit.best_domain.alignment.target_to,
+                expected_hit.best_domain.alignment.target_to
+            )
+
+    def test_search_optimized_profile(self):
+        FMIndex.write(self.sequences, self.tmp.name)
+        index = FMIndex(self.tmp.name)
+        pipeline = LongTargetsPipeline(self.alphabet)
+        profile = Profile(self.hmm.M, self.alphabet)
+        profile.configure(self.hmm, pipeline.background, L=pipeline.L_HINT, multihit=False)
+        self.assertRaises(TypeError, pipeline.search_hmm, profile.optimized(), index)
+        hits = pipeline.search_hmm(profile, index)
+        self.assertGreater(len(hits), 0)
+
+    def test_nhmmer(self):
+        FMIndex.write(self.sequences, self.tmp.name)
+        index = FMIndex(self.tmp.name)
+        expected = LongTargetsPipeline(self.alphabet).search_hmm(self.hmm, index)
+        hits = next(pyhmmer.nhmmer([self.hmm], index, cpus=1))
+        self.assertEqual(len(hits), len(expected))
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertEqual(hit.score, expected_hit.score)
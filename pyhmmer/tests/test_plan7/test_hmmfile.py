@@ -1,9 +1,13 @@
+import concurrent.futures
+import gzip
 import io
 import itertools
 import os
 import shutil
+import struct
 import unittest
 import tempfile
+import zlib
 import pkg_resources
 
 import pyhmmer
@@ -58,6 +62,39 @@ class _TestHMMFile:
         with self.open_hmm(path) as f:
             self.check_hmmfile(f)
 
+    def test_read_all_hmm3(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with self.open_hmm(path) as f:
+            expected = list(f)
+        for threads in (1, 4):
+            with self.open_hmm(path) as f:
+                hmms = f.read_all(threads=threads)
+                self.assertIs(f.read(), None)
+            self.assertEqual(hmms, expected)
+
+    def test_read_all_hmm2(self):
+        path = os.path.join(self.hmms_folder, "txt2", "{}.hmm2".format(self.ID))
+        with self.open_hmm(path) as f:
+            self.check_hmmfile(f.read_all(threads=2))
+
+    def test_read_all_h3m(self):
+        path = os.path.join(self.hmms_folder, "bin", "{}.h3m".format(self.ID))
+        with self.open_hmm(path) as f:
+            self.check_hmmfile(f.read_all(threads=2))
+
+    def test_read_all_after_read(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with self.open_hmm(path) as f:
+            first = f.read()
+            hmms = f.read_all(threads=2)
+        self.check_hmmfile([first, *hmms])
+
+    def test_read_all_error(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with self.open_hmm(path) as f:
+            self.assertRaises(ValueError, f.read_all, threads=-1)
+        self.assertRaises(ValueError, f.read_all)
+
 
 class _TestHMMFileobj:
 
@@ -80,6 +117,170 @@ class _TestHMMPath:
         with self.open_hmm(path) as f:
             self.check_hmmfile(f.optimized_profiles())
 
+    def test_read_optimized_profiles_lazy(self):
+        path = os.path.join(self.hmms_folder, "db", "{}.hmm".format(self.ID))
+        with self.open_hmm(path) as f:
+            profiles = list(f.optimized_profiles())
+        with self.open_hmm(path) as f:
+            lazy_profiles = list(f.optimized_profiles(lazy=True))
+        self.assertEqual(len(profiles), len(lazy_profiles))
+        for om, lazy_om in zip(profiles, lazy_profiles):
+            self.assertEqual(lazy_om.name, om.name)
+            self.assertEqual(lazy_om.accession, om.accession)
+            self.assertEqual(lazy_om, om)
+
+    def test_read_optimized_profiles_lazy_chdir(self):
+        path = os.path.join(self.hmms_folder, "db", "{}.hmm".format(self.ID))
+        with self.open_hmm(path) as f:
+            profiles = list(f.optimized_profiles())
+        cwd = os.getcwd()
+        try:
+            # open the database with a relative path, and change the
+            # working directory before reading the rest of the profiles
+            os.chdir(os.path.join(self.hmms_folder, "db"))
+            with self.open_hmm("{}.hmm".format(self.ID)) as f:
+                lazy_profiles = list(f.optimized_profiles(lazy=True))
+            with tempfile.TemporaryDirectory() as tmp:
+                os.chdir(tmp)
+                self.assertEqual(lazy_profiles, profiles)
+        finally:
+            os.chdir(cwd)
+
+    def test_read_optimized_profiles_lazy_threads(self):
+        path = os.path.join(self.hmms_folder, "db", "{}.hmm".format(self.ID))
+        with self.open_hmm(path) as f:
+            profiles = list(f.optimized_profiles())
+        with self.open_hmm(path) as f:
+            lazy_profiles = list(f.optimized_profiles(lazy=True))
+        # read the rest of the same profiles from several threads at once
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            accessions = list(pool.map(
+                lambda _: [om.accession for om in lazy_profiles],
+                range(4),
+            ))
+        for result in accessions:
+            self.assertEqual(result, [om.accession for om in profiles])
+        self.assertEqual(lazy_profiles, profiles)
+
+
+    def _compress_members(self, path, dst, block_size=0x10000):
+        # compress the file as independent gzip members, in a way similar
+        # to `bgzip`, and return the compressed and uncompressed offsets
+        offsets = []
+        with open(path, "rb") as src, open(dst, "wb") as out:
+            for block in iter(lambda: src.read(block_size), b""):
+                compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+                data = compressor.compress(block) + compressor.flush()
+                offsets.append((out.tell(), src.tell() - len(block)))
+                # write a header with a `BC` extra subfield storing the
+                # total size of the member minus one
+                out.write(b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff")
+                out.write(struct.pack("<HccHH", 6, b"B", b"C", 2, len(data) + 25))
+                out.write(data)
+                out.write(struct.pack("<II", zlib.crc32(block), len(block)))
+        return offsets
+
+    def test_read_gzip(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = os.path.join(tmp, "{}.hmm.gz".format(self.ID))
+            with open(path, "rb") as src, gzip.open(dst, "wb") as out:
+                shutil.copyfileobj(src, out)
+            with self.open_hmm(dst) as f:
+                self.check_hmmfile(f)
+
+    def test_read_gzip_multimember(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = os.path.join(tmp, "{}.hmm.gz".format(self.ID))
+            with open(path, "rb") as src, open(dst, "wb") as out:
+                for block in iter(lambda: src.read(0x10000), b""):
+                    out.write(gzip.compress(block))
+            with self.open_hmm(dst) as f:
+                self.check_hmmfile(f)
+
+    def test_read_bgzf(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = os.path.join(tmp, "{}.hmm.gz".format(self.ID))
+            self._compress_members(path, dst)
+            for threads in (1, 4):
+                with HMMFile(dst, threads=threads) as f:
+                    self.check_hmmfile(f)
+
+    def test_read_gzip_index(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = os.path.join(tmp, "{}.hmm.gz".format(self.ID))
+            offsets = self._compress_members(path, dst, block_size=0x4000)
+            # remove the `BC` subfields so that the members can only be
+            # located with the index
+            with open(dst, "rb") as f:
+                data = f.read()
+            members = []
+            with open(dst, "wb") as f:
+                for (start, _), (end, _) in zip(offsets, offsets[1:] + [(len(data), None)]):
+                    members.append(f.tell())
+                    f.write(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff")
+                    f.write(data[start+18:end])
+            with open(dst + ".gzi", "wb") as f:
+                f.write(struct.pack("<Q", len(members) - 1))
+                for coffset, (_, uoffset) in zip(members[1:], offsets[1:]):
+                    f.write(struct.pack("<QQ", coffset, uoffset))
+            with HMMFile(dst, threads=2) as f:
+                self.check_hmmfile(f)
+
+    def test_cache(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with tempfile.TemporaryDirectory() as tmp:
+            src = shutil.copy(path, tmp)
+            with HMMFile(src) as f:
+                expected = list(f)
+            # the cache is created when the file is first opened
+            with HMMFile(src, cache=True) as f:
+                self.assertEqual(list(f), expected)
+            self.assertTrue(os.path.exists(src + ".h3c"))
+            # the cache is used afterwards
+            mtime = os.stat(src + ".h3c").st_mtime_ns
+            with HMMFile(src, cache=True) as f:
+                self.assertFalse(f.is_pressed())
+                self.assertEqual(list(f), expected)
+            self.assertEqual(os.stat(src + ".h3c").st_mtime_ns, mtime)
+
+    def test_cache_outdated(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with open(path, "rb") as f:
+            data = f.read()
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "x.hmm")
+            dst = os.path.join(tmp, "cache.h3c")
+            with open(src, "wb") as f:
+                f.write(data)
+            with HMMFile(src, cache=dst) as f:
+                expected = list(f)
+            # update the source file after the cache was created
+            with open(src, "wb") as f:
+                f.write(data * 2)
+            with HMMFile(src, cache=dst) as f:
+                self.assertEqual(list(f), expected + expected)
+
+    def test_cache_binary(self):
+        path = os.path.join(self.hmms_folder, "bin", "{}.h3m".format(self.ID))
+        with tempfile.TemporaryDirectory() as tmp:
+            src = shutil.copy(path, tmp)
+            with HMMFile(src, cache=True) as f:
+                self.check_hmmfile(f)
+            self.assertFalse(os.path.exists(src + ".h3c"))
+
+    def test_cache_fileobj(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        with open(path, "rb") as f:
+            self.assertRaises(TypeError, HMMFile, f, cache=True)
+
+    def test_invalid_threads(self):
+        path = os.path.join(self.hmms_folder, "txt", "{}.hmm".format(self.ID))
+        self.assertRaises(ValueError, HMMFile, path, threads=-1)
+
 
 class _TestThioesterase(_TestHMMFile):
     ID = "Thioesterase"
@@ -1,18 +1,29 @@
 import abc
+import gc
 import io
 import itertools
+import multiprocessing
 import os
+import pickle
 import unittest
 import tempfile
 import threading
 import pkg_resources
 
 import pyhmmer
-from pyhmmer.plan7 import Background, Builder, Pipeline, HMMFile, TopHits
-from pyhmmer.easel import Alphabet, SequenceFile, DigitalSequence, TextSequence, MSAFile, DigitalMSA
+from pyhmmer.plan7 import Background, Builder, LongTargetsPipeline, Pipeline, PipelineScanTargets, PipelineSearchTargets, HMMFile, OptimizedProfile, Profile, TopHits
+from pyhmmer.easel import Alphabet, GeneticCode, SequenceFile, DigitalSequence, TextSequence, MSAFile, DigitalMSA
 from pyhmmer.errors import AlphabetMismatch
 
 
+def _scan_shared_targets(path, seq):
+    # scan a sequence against shared scan targets attached by path, to be
+    # run in a separately spawned process
+    targets = PipelineScanTargets.attach(path)
+    hits = Pipeline(alphabet=targets.alphabet).scan_seq(seq, targets)
+    return [(hit.name, hit.score) for hit in hits]
+
+
 class TestSearchPipeline(unittest.TestCase):
 
     @classmethod
@@ -63,12 +74,43 @@ class TestSearchPipeline(unittest.TestCase):
         hits = pipeline.search_hmm(hmm, self.references)
         self.assertEqual(len(hits), 1)
 
+    def test_search_hmm_empty_targets(self):
+        seq = TextSequence(sequence="IRGIYNIIKSVAEDIEIGIIPPSKDHVTISSFKSPRIADT")
+        bg = Background(self.alphabet)
+        hmm, _, _ = Builder(self.alphabet).build(seq.digitize(self.alphabet), bg)
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.search_hmm(hmm, [])
+        self.assertEqual(len(hits), 0)
+        self.assertEqual(hits.searched_sequences, 0)
+
     def test_search_seq(self):
         seq = TextSequence(sequence="IRGIYNIIKSVAEDIEIGIIPPSKDHVTISSFKSPRIADT")
         pipeline = Pipeline(alphabet=self.alphabet)
         hits = pipeline.search_seq(seq.digitize(self.alphabet), self.references)
         self.assertEqual(len(hits), 1)
 
+    def test_search_seq_empty_targets(self):
+        seq = TextSequence(sequence="IRGIYNIIKSVAEDIEIGIIPPSKDHVTISSFKSPRIADT")
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.search_seq(seq.digitize(self.alphabet), [])
+        self.assertEqual(len(hits), 0)
+
+    def test_search_hmm_targets_file(self):
+        seq = TextSequence(sequence="IRGIYNIIKSVAEDIEIGIIPPSKDHVTISSFKSPRIADT")
+        bg = Background(self.alphabet)
+        hmm, _, _ = Builder(self.alphabet).build(seq.digitize(self.alphabet), bg)
+        seq_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/938293.PRJEB85.HG003687.faa")
+        with SequenceFile(seq_path, digital=True, alphabet=self.alphabet) as f:
+            targets = PipelineSearchTargets(f)
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.search_hmm(hmm, targets)
+        expected = Pipeline(alphabet=self.alphabet).search_hmm(hmm, self.references)
+        self.assertEqual(len(hits), len(expected))
+        self.assertEqual(hits.searched_sequences, len(self.references))
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertEqual(hit.score, expected_hit.score)
+
     def test_Z(self):
         seq = TextSequence(sequence="IRGIYNIIKSVAEDIEIGIIPPSKDHVTISSFKSPRIADT")
         bg = Background(self.alphabet)
@@ -116,6 +158,58 @@ class TestSearchPipeline(unittest.TestCase):
         self.assertEqual(len(hits), 0)
 
 
+class TestPipelineSearchTargets(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alphabet = Alphabet.amino()
+        cls.seq_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/938293.PRJEB85.HG003687.faa")
+        with SequenceFile(cls.seq_path, digital=True, alphabet=cls.alphabet) as f:
+            cls.references = list(f)
+
+    def assertSequencesEqual(self, sequences, expected):
+        self.assertEqual(len(sequences), len(expected))
+        for seq, expected_seq in zip(sequences, expected):
+            self.assertEqual(seq.name, expected_seq.name)
+            self.assertEqual(seq.accession, expected_seq.accession)
+            self.assertEqual(seq.description, expected_seq.description)
+            self.assertEqual(seq.sequence, expected_seq.sequence)
+
+    def test_init_sequence_file(self):
+        with SequenceFile(self.seq_path, digital=True, alphabet=self.alphabet) as f:
+            targets = PipelineSearchTargets(f)
+        self.assertIs(targets.alphabet, self.alphabet)
+        self.assertSequencesEqual(list(targets), self.references)
+
+    def test_init_sequence_file_text(self):
+        with SequenceFile(self.seq_path) as f:
+            self.assertRaises(ValueError, PipelineSearchTargets, f)
+
+    def test_init_sequence_file_consumed(self):
+        with SequenceFile(self.seq_path, digital=True, alphabet=self.alphabet) as f:
+            sequences = list(f)
+            targets = PipelineSearchTargets(f)
+        self.assertIs(targets.alphabet, self.alphabet)
+        self.assertEqual(len(targets), 0)
+        self.assertEqual(list(targets), [])
+
+    def test_getitem(self):
+        with SequenceFile(self.seq_path, digital=True, alphabet=self.alphabet) as f:
+            targets = PipelineSearchTargets(f)
+        self.assertEqual(targets[0].name, self.references[0].name)
+        self.assertEqual(targets[-1].name, self.references[-1].name)
+        self.assertRaises(IndexError, targets.__getitem__, len(self.references))
+
+    def test_getitem_slice(self):
+        with SequenceFile(self.seq_path, digital=True, alphabet=self.alphabet) as f:
+            targets = PipelineSearchTargets(f)
+        view = targets[10:100:3]
+        del targets
+        self.assertIsInstance(view, PipelineSearchTargets)
+        self.assertSequencesEqual(list(view), self.references[10:100:3])
+        self.assertSequencesEqual(list(view[::-1]), self.references[10:100:3][::-1])
+
+
 class TestScanPipeline(unittest.TestCase):
 
     @classmethod
@@ -147,6 +241,129 @@ class TestScanPipeline(unittest.TestCase):
         hits = pipeline.scan_seq(seq, self.hmms)
         self.assertEqual(len(hits), 6)  # number found with `hmmscan`
 
+    def test_scan_seq_pressed(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        db_file = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/db/t2pks.hmm")
+        with HMMFile(db_file) as f:
+            optimized_profiles = list(f.optimized_profiles())
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.scan_seq(seq, optimized_profiles)
+        self.assertEqual(len(hits), 6)  # number found with `hmmscan`
+        # make sure the optimized profiles were not modified by the scan
+        self.assertTrue(all(om.L == 400 for om in optimized_profiles))
+        hits = pipeline.scan_seq(seq, optimized_profiles)
+        self.assertEqual(len(hits), 6)
+
+    def test_scan_seq_targets(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        targets = PipelineScanTargets(self.hmms)
+        self.assertEqual(len(targets), len(self.hmms))
+        self.assertTrue(all(isinstance(om, OptimizedProfile) for om in targets))
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.scan_seq(seq, targets)
+        self.assertEqual(len(hits), 6)  # number found with `hmmscan`
+        hits2 = pipeline.scan_seq(seq, self.hmms)
+        self.assertEqual([hit.name for hit in hits], [hit.name for hit in hits2])
+        self.assertEqual([hit.score for hit in hits], [hit.score for hit in hits2])
+
+    def test_scan_seq_targets_lazy(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        db_file = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/db/t2pks.hmm")
+        with HMMFile(db_file) as f:
+            targets = PipelineScanTargets(f.optimized_profiles(lazy=True))
+        with HMMFile(db_file) as f:
+            full_targets = PipelineScanTargets(f.optimized_profiles())
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.scan_seq(seq, targets)
+        self.assertEqual(len(hits), 6)  # number found with `hmmscan`
+        hits2 = pipeline.scan_seq(seq, full_targets)
+        self.assertEqual([hit.name for hit in hits], [hit.name for hit in hits2])
+        self.assertEqual([hit.accession for hit in hits], [hit.accession for hit in hits2])
+        self.assertEqual([hit.score for hit in hits], [hit.score for hit in hits2])
+
+    def test_scan_seq_targets_shared(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        db_file = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/db/t2pks.hmm")
+        with HMMFile(db_file) as f:
+            targets = PipelineScanTargets(f.optimized_profiles(lazy=True), shared=True)
+        with HMMFile(db_file) as f:
+            full_targets = PipelineScanTargets(f.optimized_profiles())
+        self.assertEqual(list(targets), list(full_targets))
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.scan_seq(seq, targets)
+        self.assertEqual(len(hits), 6)  # number found with `hmmscan`
+        hits2 = pipeline.scan_seq(seq, full_targets)
+        self.assertEqual([hit.name for hit in hits], [hit.name for hit in hits2])
+        self.assertEqual([hit.score for hit in hits], [hit.score for hit in hits2])
+        # profiles must stay valid after the targets have been deallocated
+        profiles = list(targets[:2])
+        del targets
+        self.assertEqual(profiles, list(full_targets[:2]))
+
+    def test_scan_seq_targets_shared_attach(self):
+        targets = PipelineScanTargets(self.hmms, shared=True)
+        self.assertTrue(os.path.exists(targets.path))
+        attached = PipelineScanTargets.attach(targets.path)
+        self.assertEqual(attached.alphabet, targets.alphabet)
+        self.assertEqual(list(attached), list(targets))
+        unpickled = pickle.loads(pickle.dumps(targets))
+        self.assertEqual(unpickled.path, targets.path)
+        self.assertEqual(list(unpickled), list(targets))
+        # the file is only removed with the targets that created it
+        path = targets.path
+        del attached, unpickled
+        gc.collect()
+        self.assertTrue(os.path.exists(path))
+        del targets
+        gc.collect()
+        self.assertFalse(os.path.exists(path))
+
+    def test_scan_seq_targets_shared_spawn(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        targets = PipelineScanTargets(self.hmms, shared=True)
+        hits = Pipeline(alphabet=self.alphabet).scan_seq(seq, targets)
+        expected = [(hit.name, hit.score) for hit in hits]
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(1) as pool:
+            result = pool.apply(_scan_shared_targets, (targets.path, seq))
+        self.assertEqual(len(result), 6)  # number found with `hmmscan`
+        self.assertEqual(result, expected)
+
+    def test_scan_seq_targets_shared_invalid(self):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b"not shared scan targets, just some bytes")
+            f.flush()
+            self.assertRaises(ValueError, PipelineScanTargets.attach, f.name)
+        self.assertRaises(FileNotFoundError, PipelineScanTargets.attach, "path/to/missing/file")
+        self.assertRaises(TypeError, pickle.dumps, PipelineScanTargets(self.hmms))
+
+    def test_scan_seq_targets_shared_readonly(self):
+        targets = PipelineScanTargets(self.hmms, shared=True)
+        profile = Profile(self.hmms[0].M, self.alphabet)
+        self.assertRaises(ValueError, targets[0].convert, profile)
+        copy = targets[0].copy()
+        copy.convert(profile)
+
+    def test_scan_seq_lazy(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        db_file = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/db/t2pks.hmm")
+        pipeline = Pipeline(alphabet=self.alphabet)
+        with HMMFile(db_file) as f:
+            hits = pipeline.scan_seq(seq, f.optimized_profiles(lazy=True))
+        self.assertEqual(len(hits), 6)  # number found with `hmmscan`
+
+    def test_scan_seq_targets_alphabet_mismatch(self):
+        pipeline = Pipeline(alphabet=Alphabet.dna())
+        targets = PipelineScanTargets(self.hmms)
+        dsq = TextSequence(sequence="ATGC").digitize(pipeline.alphabet)
+        self.assertRaises(AlphabetMismatch, pipeline.scan_seq, dsq, targets)
+
+    def test_scan_seq_targets_empty(self):
+        seq = next(x for x in self.references if x.name == b"938293.PRJEB85.HG003687_188")
+        pipeline = Pipeline(alphabet=self.alphabet)
+        hits = pipeline.scan_seq(seq, PipelineScanTargets([]))
+        self.assertEqual(len(hits), 0)
+
 
 class TestIteratePipeline(unittest.TestCase):
 
@@ -190,3 +407,161 @@ class TestIteratePipeline(unittest.TestCase):
 
         self.assertEqual(iteration.iteration, 3)
         self.assertTrue(iteration.converged)
+
+
+class TestLongTargetsPipeline(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alphabet = Alphabet.dna()
+
+        hmm_path = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/txt/bmyD.hmm")
+        with HMMFile(hmm_path) as hmm_file:
+            cls.hmm = hmm_file.read()
+
+        seqs_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/BGC0001090.gbk")
+        with SequenceFile(seqs_path, "genbank", digital=True, alphabet=cls.alphabet) as seqs_file:
+            cls.references = list(seqs_file)
+
+    def assertHitsEqual(self, hits1, hits2):
+        self.assertEqual(len(hits1), len(hits2))
+        for hit1, hit2 in zip(hits1, hits2):
+            self.assertEqual(hit1.name, hit2.name)
+            self.assertEqual(hit1.score, hit2.score)
+            self.assertEqual(hit1.evalue, hit2.evalue)
+            self.assertEqual(hit1.best_domain.alignment.target_from, hit2.best_domain.alignment.target_from)
+            self.assertEqual(hit1.best_domain.alignment.target_to, hit2.best_domain.alignment.target_to)
+            self.assertEqual(hit1.best_domain.alignment.target_sequence, hit2.best_domain.alignment.target_sequence)
+
+    def test_search_hmm_targets_reuse(self):
+        targets = PipelineSearchTargets(self.references)
+        for strand in (None, "watson", "crick"):
+            pipeline = LongTargetsPipeline(self.alphabet, strand=strand, block_length=10000)
+            expected = pipeline.search_hmm(self.hmm, self.references)
+            self.assertGreater(len(expected), 0)
+            for _ in range(2):
+                pipeline = LongTargetsPipeline(self.alphabet, strand=strand, block_length=10000)
+                hits = pipeline.search_hmm(self.hmm, targets)
+                self.assertHitsEqual(hits, expected)
+
+    def test_search_hmm_targets_file(self):
+        seqs_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/BGC0001090.gbk")
+        with SequenceFile(seqs_path, "genbank", digital=True, alphabet=self.alphabet) as seqs_file:
+            targets = PipelineSearchTargets(seqs_file)
+        pipeline = LongTargetsPipeline(self.alphabet, block_length=10000)
+        expected = pipeline.search_hmm(self.hmm, self.references)
+        pipeline = LongTargetsPipeline(self.alphabet, block_length=10000)
+        hits = pipeline.search_hmm(self.hmm, targets)
+        self.assertHitsEqual(hits, expected)
+
+    def test_search_hmm_threads(self):
+        targets = PipelineSearchTargets(self.references)
+        for strand in (None, "watson", "crick"):
+            pipeline = LongTargetsPipeline(self.alphabet, strand=strand, block_length=10000)
+            expected = pipeline.search_hmm(self.hmm, targets)
+            for threads in (2, 4):
+                pipeline = LongTargetsPipeline(self.alphabet, strand=strand, block_length=10000, threads=threads)
+                hits = pipeline.search_hmm(self.hmm, targets)
+                self.assertHitsEqual(hits, expected)
+                self.assertEqual(hits.searched_residues, expected.searched_residues)
+                self.assertEqual(hits.searched_sequences, expected.searched_sequences)
+
+    def test_search_hmm_threads_empty(self):
+        pipeline = LongTargetsPipeline(self.alphabet, threads=2)
+        hits = pipeline.search_hmm(self.hmm, [])
+        self.assertEqual(len(hits), 0)
+
+    def test_threads_invalid(self):
+        self.assertRaises(ValueError, LongTargetsPipeline, self.alphabet, threads=-1)
+        pipeline = LongTargetsPipeline(self.alphabet)
+        with self.assertRaises(ValueError):
+            pipeline.threads = -1
+
+
+class TestTranslatedSearch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alphabet = Alphabet.amino()
+        cls.dna = Alphabet.dna()
+        cls.genetic_code = GeneticCode(11)
+
+        hmm_path = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/txt/PKSI-AT.hmm")
+        with HMMFile(hmm_path) as hmm_file:
+            cls.hmm = hmm_file.read()
+
+        seqs_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/BGC0001090.gbk")
+        with SequenceFile(seqs_path, "genbank", digital=True, alphabet=cls.dna) as seqs_file:
+            cls.references = list(seqs_file)
+
+    def test_search_hmm_translated(self):
+        orfs = self.genetic_code.orfs(self.references)
+        expected = Pipeline(self.alphabet).search_hmm(self.hmm, orfs)
+        hits = Pipeline(self.alphabet).search_hmm_translated(self.hmm, self.references, self.genetic_code)
+        self.assertGreater(len(hits), 0)
+        self.assertEqual(len(hits), len(expected))
+        self.assertEqual(hits.Z, len(orfs))
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, self.references[0].name)
+            self.assertEqual(hit.description, expected_hit.description)
+            self.assertEqual(hit.score, expected_hit.score)
+            self.assertEqual(hit.evalue, expected_hit.evalue)
+
+    def test_search_hmm_translated_coordinates(self):
+        hits = Pipeline(self.alphabet).search_hmm_translated(self.hmm, self.references, self.genetic_code)
+        text = self.references[0].textize().sequence
+        for hit in hits:
+            for domain in hit.domains:
+                ali = domain.alignment
+                residues = ali.target_sequence.replace("-", "").upper()
+                self.assertEqual(abs(ali.target_to - ali.target_from) + 1, 3 * len(residues))
+                # check the nucleotides under the alignment translate to
+                # the aligned residues of the ORF
+                if ali.target_from < ali.target_to:
+                    nt = TextSequence(sequence=text[ali.target_from-1:ali.target_to]).digitize(self.dna)
+                else:
+                    nt = TextSequence(sequence=text[ali.target_to-1:ali.target_from]).digitize(self.dna)
+                    nt.reverse_complement(inplace=True)
+                protein = self.genetic_code.translate(nt).textize().sequence
+                self.assertEqual(protein, residues)
+
+    def test_search_hmm_translated_blocks(self):
+        seqs_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/CP040672.1.genes_100.fna")
+        with SequenceFile(seqs_path, digital=True, alphabet=self.dna) as seqs_file:
+            sequences = list(seqs_file)
+        hmm_path = pkg_resources.resource_filename("pyhmmer.tests", "data/hmms/txt/PF02826.hmm")
+        with HMMFile(hmm_path) as hmm_file:
+            hmm = hmm_file.read()
+        expected = Pipeline(self.alphabet).search_hmm_translated(hmm, sequences)
+        hits = Pipeline(self.alphabet).search_hmm_translated(hmm, sequences, block_length=5000)
+        self.assertGreater(len(hits), 0)
+        self.assertEqual(hits.Z, expected.Z)
+        self.assertEqual(hits.searched_sequences, expected.searched_sequences)
+        self.assertEqual(hits.searched_residues, expected.searched_residues)
+        self.assertEqual(len(hits), len(expected))
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertEqual(hit.score, expected_hit.score)
+            self.assertEqual(hit.evalue, expected_hit.evalue)
+
+    def test_search_hmm_translated_file(self):
+        expected = Pipeline(self.alphabet).search_hmm_translated(self.hmm, self.references, self.genetic_code)
+        seqs_path = pkg_resources.resource_filename("pyhmmer.tests", "data/seqs/BGC0001090.gbk")
+        with SequenceFile(seqs_path, "genbank", digital=True, alphabet=self.dna) as seqs_file:
+            hits = Pipeline(self.alphabet).search_hmm_translated(self.hmm, seqs_file, self.genetic_code)
+        self.assertEqual(len(hits), len(expected))
+        for hit, expected_hit in zip(hits, expected):
+            self.assertEqual(hit.name, expected_hit.name)
+            self.assertEqual(hit.score, expected_hit.score)
+
+    def test_search_hmm_translated_empty(self):
+        hits = Pipeline(self.alphabet).search_hmm_translated(self.hmm, [])
+        self.assertEqual(len(hits), 0)
+
+    def test_search_hmm_translated_errors(self):
+        pipeline = Pipeline(self.alphabet)
+        rna_code = GeneticCode(nucleotide_alphabet=Alphabet.rna())
+        self.assertRaises(AlphabetMismatch, pipeline.search_hmm_translated, self.hmm, self.references, rna_code)
+        self.assertRaises(ValueError, pipeline.search_hmm_translated, self.hmm, self.references, block_length=0)
+        dna_pipeline = LongTargetsPipeline(self.dna)
+        self.assertRaises(NotImplementedError, dna_pipeline.search_hmm_translated, self.hmm, self.references)
@@ -1,6 +1,7 @@
 import io
 import itertools
 import os
+import pickle
 import shutil
 import unittest
 import tempfile
@@ -193,10 +194,101 @@ class TestTopHits(unittest.TestCase):
         hits = pipeline.search_hmm(self.hmm, self.seqs)
         self.assertHitsEqual(merged, hits)
 
+    def test_merge_pipeline_thresholds(self):
+        # hits reported with the `Z` of a single chunk must be thresholded
+        # again with the `Z` of all the chunks after merging
+        pipeline = Pipeline(alphabet=self.hmm.alphabet, E=10.0)
+        hits = pipeline.search_hmm(self.hmm, self.seqs)
+        chunks = [
+            pipeline.search_hmm(self.hmm, self.seqs[i:i+100])
+            for i in range(0, len(self.seqs), 100)
+        ]
+        merged = chunks[0].merge(*chunks[1:])
+        self.assertEqual(merged.Z, hits.Z)
+        self.assertEqual(merged.domZ, hits.domZ)
+        self.assertEqual(merged.hits_reported, hits.hits_reported)
+        self.assertEqual(merged.hits_included, hits.hits_included)
+        self.assertEqual(
+            [hit.name for hit in merged if hit.is_reported()],
+            [hit.name for hit in hits if hit.is_reported()],
+        )
+
     def test_copy(self):
         copy = self.hits.copy()
         self.assertHitsEqual(copy, self.hits)
 
+    def test_pickle(self):
+        hits = pickle.loads(pickle.dumps(self.hits))
+        self.assertHitsEqual(hits, self.hits)
+        self.assertEqual(hits.Z, self.hits.Z)
+        self.assertEqual(hits.domZ, self.hits.domZ)
+        self.assertEqual(hits.E, self.hits.E)
+        self.assertEqual(hits.hits_reported, self.hits.hits_reported)
+        self.assertEqual(hits.hits_included, self.hits.hits_included)
+        self.assertEqual(hits.searched_sequences, self.hits.searched_sequences)
+        self.assertTrue(hits.is_sorted())
+        for h1, h2 in zip(hits, self.hits):
+            self.assertEqual(h1.is_included(), h2.is_included())
+            self.assertEqual(h1.is_reported(), h2.is_reported())
+
+    def test_pickle_sorted_by_seqidx(self):
+        self.hits.sort(by="seqidx")
+        hits = pickle.loads(pickle.dumps(self.hits))
+        self.assertTrue(hits.is_sorted(by="seqidx"))
+        self.assertHitsEqual(hits, self.hits)
+
+    def test_dumps_loads(self):
+        data = self.hits.dumps()
+        self.assertIsInstance(data, bytes)
+        hits = TopHits.loads(data)
+        self.assertHitsEqual(hits, self.hits)
+        self.assertEqual(hits.Z, self.hits.Z)
+        self.assertEqual(hits.domZ, self.hits.domZ)
+        self.assertEqual(hits.incE, self.hits.incE)
+        self.assertEqual(hits.searched_models, self.hits.searched_models)
+        self.assertEqual(hits.searched_residues, self.hits.searched_residues)
+        self.assertEqual(hits.dumps(), data)
+
+    def test_loads_memoryview(self):
+        data = memoryview(bytearray(self.hits.dumps()))
+        hits = TopHits.loads(data)
+        self.assertHitsEqual(hits, self.hits)
+
+    def test_loads_invalid(self):
+        data = self.hits.dumps()
+        self.assertRaises(ValueError, TopHits.loads, b"")
+        self.assertRaises(ValueError, TopHits.loads, data[:-1])
+        self.assertRaises(ValueError, TopHits.loads, data + b"\0")
+
+    def test_loads_truncated(self):
+        data = self.hits.dumps()
+        for i in range(len(data)):
+            with self.subTest(size=i):
+                self.assertRaises(ValueError, TopHits.loads, data[:i])
+
+    def test_loads_corrupted(self):
+        data = self.hits.dumps()
+        for i in range(len(data)):
+            corrupted = bytearray(data)
+            corrupted[i] ^= 1 << (i % 8)
+            with self.subTest(offset=i):
+                try:
+                    hits = TopHits.loads(corrupted)
+                except ValueError:
+                    continue
+                # payloads that are still valid must be usable
+                for hit in hits.copy():
+                    hit.best_domain.alignment.target_name
+                    for domain in hit.domains:
+                        try:
+                            str(domain.alignment)
+                        except UnicodeDecodeError:
+                            pass # corrupted residues may not be ASCII
+    def test_pickle_empty(self):
+        hits = pickle.loads(pickle.dumps(TopHits()))
+        self.assertEqual(len(hits), 0)
+        self.assertEqual(hits.Z, 0)
+
     def test_sort(self):
         # check the hits are sorted by default
         self.assertTrue(self.hits.is_sorted())
@@ -242,3 +334,53 @@ class TestTopHits(unittest.TestCase):
             all_consensus_cols=True
         )
         self.assertIsInstance(msa_d, DigitalMSA)
+
+    def test_to_arrays(self):
+        columns = self.hits.to_arrays()
+        self.assertEqual(len(columns["name_offsets"]), len(self.hits) + 1)
+        for i, hit in enumerate(self.hits):
+            start, end = columns["name_offsets"][i], columns["name_offsets"][i+1]
+            self.assertEqual(columns["names"][start:end], hit.name)
+            self.assertEqual(columns["score"][i], hit.score)
+            self.assertAlmostEqual(columns["bias"][i], hit.bias, places=5)
+            self.assertEqual(columns["evalue"][i], hit.evalue)
+            self.assertEqual(columns["pvalue"][i], hit.pvalue)
+            self.assertEqual(columns["reported"][i], hit.is_reported())
+            self.assertEqual(columns["included"][i], hit.is_included())
+            self.assertEqual(columns["domains"][i], len(hit.domains))
+
+    def test_to_arrays_domains(self):
+        columns = self.hits.to_arrays(domains=True)
+        domains = [
+            (i, domain)
+            for i, hit in enumerate(self.hits)
+            for domain in hit.domains
+        ]
+        self.assertEqual(len(columns["hit"]), len(domains))
+        for k, (i, domain) in enumerate(domains):
+            self.assertEqual(columns["hit"][k], i)
+            self.assertEqual(columns["env_from"][k], domain.env_from)
+            self.assertEqual(columns["env_to"][k], domain.env_to)
+            self.assertEqual(columns["ali_from"][k], domain.alignment.target_from)
+            self.assertEqual(columns["ali_to"][k], domain.alignment.target_to)
+            self.assertEqual(columns["hmm_from"][k], domain.alignment.hmm_from)
+            self.assertEqual(columns["hmm_to"][k], domain.alignment.hmm_to)
+            self.assertEqual(columns["score"][k], domain.score)
+            self.assertAlmostEqual(columns["bias"][k], domain.bias, places=5)
+            self.assertEqual(columns["c_evalue"][k], domain.c_evalue)
+            self.assertEqual(columns["i_evalue"][k], domain.i_evalue)
+            self.assertEqual(columns["pvalue"][k], domain.pvalue)
+            # domains of a hit are reported/included with default thresholds
+            hit = self.hits[i]
+            reported = hit.is_reported() and domain.c_evalue <= self.hits.domE
+            included = hit.is_included() and domain.c_evalue <= self.hits.incdomE
+            self.assertEqual(columns["reported"][k], reported)
+            self.assertEqual(columns["included"][k], included)
+
+    def test_to_arrays_empty(self):
+        columns = TopHits().to_arrays()
+        self.assertEqual(columns["names"], b"")
+        self.assertEqual(list(columns["name_offsets"]), [0])
+        self.assertEqual(len(columns["score"]), 0)
+        columns = TopHits().to_arrays(domains=True)
+        self.assertEqual(len(columns["score"]), 0)
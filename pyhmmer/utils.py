@@ -1,4 +1,10 @@
+import collections
+import concurrent.futures
+import functools
+import io
+import os
 import typing
+import zlib
 
 _Item = typing.TypeVar("_Item")
 
@@ -38,3 +44,202 @@ class peekable(typing.Iterator[_Item], typing.Generic[_Item]):
         if self.peeked is self._sentinel:
             self.peeked = next(self.it)
         return self.peeked  # type: ignore
+
+
+class ParallelGzipReader(io.RawIOBase):
+    """A reader decompressing the members of a gzip file in parallel.
+
+    Files compressed with ``bgzip`` (in the BGZF format) are made of many
+    small gzip members, and record the compressed size of each member in
+    its header, so that members can be located without decompressing
+    the file. The boundaries of the members of other multi-member gzip
+    files can be given with a ``bgzip`` index (``.gzi``). Batches of
+    members are then decompressed in a thread pool, ahead of the reads.
+    Other gzip files are decompressed sequentially in a background
+    thread.
+
+    """
+
+    _BGZF_SUBFIELD = b"BC"
+
+    def __init__(
+        self,
+        path: typing.Union[str, "os.PathLike[str]"],
+        threads: int = 0,
+        index: typing.Union[str, "os.PathLike[str]", None] = None,
+        batch_size: int = 1 << 20,
+    ) -> None:
+        """Create a new reader for the gzip file at the given location.
+
+        Arguments:
+            path (`str` or `os.PathLike`): The path to a gzip file.
+            threads (`int`): The number of threads to use to decompress
+                the file, or ``0`` to use one thread per CPU.
+            index (`str` or `os.PathLike`, optional): The path to a
+                ``bgzip`` index for the file. If `None` given, the
+                ``.gzi`` index next to the file is used if it exists.
+            batch_size (`int`): The number of compressed bytes to
+                decompress in a single task.
+
+        """
+        super().__init__()
+        self.name = os.fspath(path)
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._threads = threads if threads > 0 else os.cpu_count() or 1
+        self._batch_size = batch_size
+        self._buffer = memoryview(b"")
+        self._position = 0
+        self._pending: typing.Deque["concurrent.futures.Future[bytes]"] = collections.deque()
+
+        if index is None and os.path.exists(self.name + ".gzi"):
+            index = self.name + ".gzi"
+        if index is not None:
+            members = self._index_members(index)
+        elif self._is_bgzf(0):
+            members = self._bgzf_members()
+        else:
+            members = None
+
+        if members is None:
+            # members cannot be located, decompress sequentially in a
+            # single worker, with a decompressor shared between tasks
+            self._decompressor = zlib.decompressobj(31)
+            self._executor = concurrent.futures.ThreadPoolExecutor(1)
+            self._tasks = self._sequential_tasks()
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(self._threads)
+            self._tasks = self._parallel_tasks(members)
+
+    # --- Members ------------------------------------------------------------
+
+    def _is_bgzf(self, offset: int) -> bool:
+        self._file.seek(offset)
+        header = self._file.read(18)
+        return (
+            len(header) == 18
+            and header[:4] == b"\x1f\x8b\x08\x04"
+            and header[12:14] == self._BGZF_SUBFIELD
+        )
+
+    def _bgzf_members(self) -> typing.Iterator[typing.Tuple[int, int]]:
+        offset = 0
+        while offset < self._size:
+            if not self._is_bgzf(offset):
+                raise ValueError(f"Invalid BGZF block at offset {offset}")
+            self._file.seek(offset + 16)
+            size = int.from_bytes(self._file.read(2), "little") + 1
+            yield offset, size
+            offset += size
+
+    def _index_members(self, index: typing.Union[str, "os.PathLike[str]"]) -> typing.Iterator[typing.Tuple[int, int]]:
+        # the index contains the number of entries, followed by a pair of
+        # compressed and uncompressed offsets for every member but the
+        # first one, as little-endian 64-bit integers
+        with open(index, "rb") as f:
+            data = f.read()
+        count = int.from_bytes(data[:8], "little")
+        if len(data) != 8 + 16 * count:
+            raise ValueError(f"Invalid gzip index: {os.fspath(index)!r}")
+        offsets = [0]
+        offsets.extend(int.from_bytes(data[8+16*i:16+16*i], "little") for i in range(count))
+        offsets.append(self._size)
+        return ((start, end - start) for start, end in zip(offsets, offsets[1:]) if end > start)
+
+    # --- Tasks --------------------------------------------------------------
+
+    @staticmethod
+    def _inflate_members(data: bytes, sizes: typing.List[int]) -> bytes:
+        # `zlib` releases the GIL while decompressing each member
+        chunks = []
+        offset = 0
+        for size in sizes:
+            chunks.append(zlib.decompress(data[offset:offset+size], 31))
+            offset += size
+        return b"".join(chunks)
+
+    def _parallel_tasks(self, members: typing.Iterable[typing.Tuple[int, int]]) -> typing.Iterator[typing.Callable[[], bytes]]:
+        start = None
+        sizes: typing.List[int] = []
+        for offset, size in members:
+            if start is None:
+                start = offset
+            sizes.append(size)
+            if offset + size - start >= self._batch_size:
+                yield self._batch(start, sizes)
+                start, sizes = None, []
+        if start is not None:
+            yield self._batch(start, sizes)
+
+    def _batch(self, start: int, sizes: typing.List[int]) -> typing.Callable[[], bytes]:
+        self._file.seek(start)
+        data = self._file.read(sum(sizes))
+        return functools.partial(self._inflate_members, data, sizes)
+
+    def _inflate_sequential(self, data: bytes) -> bytes:
+        chunks = []
+        while data:
+            chunks.append(self._decompressor.decompress(data))
+            data = self._decompressor.unused_data
+            if self._decompressor.eof:
+                # start decompressing the next member, if any
+                self._decompressor = zlib.decompressobj(31)
+        return b"".join(chunks)
+
+    def _sequential_tasks(self) -> typing.Iterator[typing.Callable[[], bytes]]:
+        self._file.seek(0)
+        data = self._file.read(self._batch_size)
+        while data:
+            yield functools.partial(self._inflate_sequential, data)
+            data = self._file.read(self._batch_size)
+
+    def _fill(self) -> bool:
+        # submit new tasks to keep the workers busy
+        while len(self._pending) < 2 * self._threads:
+            task = next(self._tasks, None)
+            if task is None:
+                break
+            self._pending.append(self._executor.submit(task))
+        # get the oldest decompressed data, blocking until it is ready
+        while self._pending:
+            self._buffer = memoryview(self._pending.popleft().result())
+            if self._buffer:
+                return True
+        return False
+
+    # --- RawIOBase ----------------------------------------------------------
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b: typing.Any) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not self._buffer and not self._fill():
+            return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        self._position += n
+        return n
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        # only support querying the position, which is required by the
+        # HMMER parsers to record the offset of each HMM
+        if (offset, whence) in ((0, os.SEEK_CUR), (self._position, os.SEEK_SET)):
+            return self._position
+        raise io.UnsupportedOperation("seek")
+
+    def close(self) -> None:
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._file.close()
+        super().close()